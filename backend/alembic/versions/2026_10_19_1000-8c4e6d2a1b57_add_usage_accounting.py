@@ -0,0 +1,65 @@
+"""add usage accounting
+
+Revision ID: 8c4e6d2a1b57
+Revises: 3f1a2b7c9d01
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers
+revision = "8c4e6d2a1b57"
+down_revision = "3f1a2b7c9d01"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Upgrade database schema."""
+    op.create_table(
+        "usage_events",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("site_id", sa.String(length=100), nullable=True),
+        sa.Column("stage", sa.String(length=20), nullable=False),
+        sa.Column("model", sa.String(length=100), nullable=False),
+        sa.Column("prompt_tokens", sa.Integer(), nullable=False),
+        sa.Column("completion_tokens", sa.Integer(), nullable=False),
+        sa.Column("characters", sa.Integer(), nullable=False),
+        sa.Column("audio_seconds", sa.Float(), nullable=False),
+        sa.Column("cost_usd", sa.Float(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_usage_events_user_created",
+        "usage_events",
+        ["user_id", "created_at"],
+    )
+    op.create_table(
+        "usage_daily",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("stage", sa.String(length=20), nullable=False),
+        sa.Column("model", sa.String(length=100), nullable=False),
+        sa.Column("requests", sa.Integer(), nullable=False),
+        sa.Column("prompt_tokens", sa.Integer(), nullable=False),
+        sa.Column("completion_tokens", sa.Integer(), nullable=False),
+        sa.Column("characters", sa.Integer(), nullable=False),
+        sa.Column("audio_seconds", sa.Float(), nullable=False),
+        sa.Column("cost_usd", sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("user_id", "day", "stage", "model"),
+    )
+    op.create_index("ix_usage_daily_day", "usage_daily", ["day"])
+
+
+def downgrade() -> None:
+    """Downgrade database schema."""
+    op.drop_index("ix_usage_daily_day", table_name="usage_daily")
+    op.drop_table("usage_daily")
+    op.drop_index("ix_usage_events_user_created", table_name="usage_events")
+    op.drop_table("usage_events")
@@ -0,0 +1,59 @@
+"""add crawl state
+
+Revision ID: b7d2e9f4a6c3
+Revises: 8c4e6d2a1b57
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers
+revision = "b7d2e9f4a6c3"
+down_revision = "8c4e6d2a1b57"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Upgrade database schema."""
+    op.create_table(
+        "crawl_sites",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("root_url", sa.String(length=2048), nullable=False),
+        sa.Column("last_crawled_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_crawl_sites_user_id", "crawl_sites", ["user_id"])
+    op.create_table(
+        "crawl_pages",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("site_id", sa.Integer(), nullable=False),
+        sa.Column("url", sa.String(length=2048), nullable=False),
+        sa.Column("status_code", sa.Integer(), nullable=True),
+        sa.Column("etag", sa.String(length=256), nullable=True),
+        sa.Column("last_modified", sa.String(length=64), nullable=True),
+        sa.Column("content_hash", sa.String(length=64), nullable=True),
+        sa.Column("rendered", sa.Boolean(), nullable=False),
+        sa.Column("fetched_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("changed_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["site_id"], ["crawl_sites.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("site_id", "url", name="uq_crawl_pages_url"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade database schema."""
+    op.drop_table("crawl_pages")
+    op.drop_index("ix_crawl_sites_user_id", table_name="crawl_sites")
+    op.drop_table("crawl_sites")
@@ -0,0 +1,42 @@
+"""add document chunks
+
+Revision ID: 4a9c1e7b3d25
+Revises: b7d2e9f4a6c3
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers
+revision = "4a9c1e7b3d25"
+down_revision = "b7d2e9f4a6c3"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Upgrade database schema."""
+    op.create_table(
+        "document_chunks",
+        sa.Column("site_id", sa.Integer(), nullable=False),
+        sa.Column("chunk_id", sa.String(length=32), nullable=False),
+        sa.Column("url", sa.String(length=2048), nullable=False),
+        sa.Column("position", sa.Integer(), nullable=False),
+        sa.Column("title", sa.String(length=512), nullable=True),
+        sa.Column("heading", sa.String(length=512), nullable=True),
+        sa.Column("text", sa.Text(), nullable=False),
+        sa.Column("token_count", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["site_id"], ["crawl_sites.id"]),
+        sa.PrimaryKeyConstraint("site_id", "chunk_id"),
+    )
+    op.create_index(
+        "ix_document_chunks_site_url", "document_chunks", ["site_id", "url"]
+    )
+
+
+def downgrade() -> None:
+    """Downgrade database schema."""
+    op.drop_index("ix_document_chunks_site_url", table_name="document_chunks")
+    op.drop_table("document_chunks")
@@ -0,0 +1,32 @@
+"""add user activity timestamps
+
+Revision ID: d41e7a9c2f68
+Revises: 4a9c1e7b3d25
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers
+revision = "d41e7a9c2f68"
+down_revision = "4a9c1e7b3d25"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Upgrade database schema."""
+    op.add_column(
+        "users", sa.Column("last_login_at", sa.DateTime(timezone=True), nullable=True)
+    )
+    op.add_column(
+        "users", sa.Column("last_seen_at", sa.DateTime(timezone=True), nullable=True)
+    )
+
+
+def downgrade() -> None:
+    """Downgrade database schema."""
+    op.drop_column("users", "last_seen_at")
+    op.drop_column("users", "last_login_at")
@@ -0,0 +1,54 @@
+"""add case-insensitive user lookup indexes
+
+Revision ID: 6e3b8f1d0a94
+Revises: d41e7a9c2f68
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers
+revision = "6e3b8f1d0a94"
+down_revision = "d41e7a9c2f68"
+branch_labels = None
+depends_on = None
+
+INDEXES = {
+    "ix_users_lower_email": ([sa.text("lower(email)")], {}),
+    "ix_users_lower_username": (
+        [sa.text("lower(username)")],
+        # Covers login, so it can be answered by an index-only scan
+        {"postgresql_include": ["username", "id", "hashed_password", "is_active"]},
+    ),
+}
+
+
+def upgrade() -> None:
+    """Upgrade database schema."""
+    if op.get_bind().dialect.name != "postgresql":
+        for name, (columns, options) in INDEXES.items():
+            op.create_index(name, "users", columns, **options)
+        return
+    # CONCURRENTLY keeps users writable but cannot run in a transaction
+    with op.get_context().autocommit_block():
+        for name, (columns, options) in INDEXES.items():
+            # A failed concurrent build leaves an INVALID index behind
+            op.drop_index(
+                name, table_name="users", postgresql_concurrently=True, if_exists=True
+            )
+            op.create_index(
+                name, "users", columns, postgresql_concurrently=True, **options
+            )
+
+
+def downgrade() -> None:
+    """Downgrade database schema."""
+    if op.get_bind().dialect.name != "postgresql":
+        for name in INDEXES:
+            op.drop_index(name, table_name="users")
+        return
+    with op.get_context().autocommit_block():
+        for name in INDEXES:
+            op.drop_index(name, table_name="users", postgresql_concurrently=True)
@@ -0,0 +1 @@
+"""Offline performance benchmarks for MemVoice backend components."""
@@ -0,0 +1,72 @@
+"""
+Benchmark prompt tokens per turn and context assembly latency.
+
+Replays a synthetic conversation and compares the budgeted MemoryEngine
+context against the naive approach of sending the full history every turn.
+Summaries use the offline extractive summarizer.
+
+Usage: python -m benchmarks.memory_engine [--turns N] [--budget TOKENS]
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+from src.core.tokens import count_message_tokens
+from src.services.memory import ExtractiveSummarizer, LocalMemoryBackend, MemoryEngine
+
+WORDS = (
+    "order delivery store opening hours refund account password booking table "
+    "tomorrow evening price discount address parking menu allergy vegan card"
+).split()
+
+
+def sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+
+async def main(turns: int, budget: int) -> None:
+    rng = random.Random(0)
+    engine = MemoryEngine(
+        LocalMemoryBackend(),
+        ExtractiveSummarizer(),
+        token_budget=budget,
+        summarize_after_tokens=int(budget * 0.8),
+        keep_recent_tokens=int(budget * 0.3),
+    )
+    facts = [sentence(rng, 12) for _ in range(5)]
+    naive_history = 0
+    naive_tokens, engine_tokens, latencies = [], [], []
+
+    for _ in range(turns):
+        query = sentence(rng, rng.randint(5, 20))
+        answer = " ".join(sentence(rng, rng.randint(8, 25)) for _ in range(2))
+
+        naive_tokens.append(naive_history + count_message_tokens(query))
+        started = time.perf_counter()
+        context = await engine.assemble("bench", query, facts=facts)
+        latencies.append((time.perf_counter() - started) * 1000)
+        engine_tokens.append(context.token_count)
+
+        await engine.add_turn("bench", query, answer)
+        naive_history += count_message_tokens(query) + count_message_tokens(answer)
+
+    latencies.sort()
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    naive_mean = statistics.mean(naive_tokens)
+    engine_mean = statistics.mean(engine_tokens)
+    print(f"turns={turns} budget={budget}")
+    print(f"naive   tokens/turn mean={naive_mean:8.1f} last={naive_tokens[-1]}")
+    print(f"engine  tokens/turn mean={engine_mean:8.1f} last={engine_tokens[-1]}")
+    print(f"reduction={1 - engine_mean / naive_mean:.1%}")
+    print(f"assembly latency p50={statistics.median(latencies):.3f}ms p99={p99:.3f}ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--turns", type=int, default=200)
+    parser.add_argument("--budget", type=int, default=1500)
+    args = parser.parse_args()
+    asyncio.run(main(args.turns, args.budget))
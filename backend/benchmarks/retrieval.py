@@ -0,0 +1,121 @@
+"""
+Benchmark BM25 indexing and hybrid retrieval latency on a synthetic corpus.
+
+Builds a BM25 index over Zipf-distributed chunks (every tenth one carries a
+product SKU), persists and reloads it, then reports p50/p99 latency for
+lexical search, vector search, and their reciprocal rank fusion. Vector
+search runs against a LocalVectorStore of random embeddings of the same size.
+
+Usage: python -m benchmarks.retrieval [--chunks N] [--queries Q] [--dim D]
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+import numpy as np
+
+from src.services.bm25 import BM25Index
+from src.services.retrieval import reciprocal_rank_fusion
+from src.services.vector_store import LocalVectorStore
+
+
+def make_corpus(chunks: int, vocab: int, length: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    words = np.array([f"w{n}" for n in range(vocab)])
+    draws = np.minimum(rng.zipf(1.1, (chunks, length)), vocab) - 1
+    texts = [" ".join(row) for row in words[draws]]
+    for n in range(0, chunks, 10):
+        texts[n] += f" SKU-{n:07d}"
+    return texts, words
+
+
+def report(name, latencies):
+    latencies = sorted(latencies)
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    print(f"{name:<10} p50={statistics.median(latencies):7.2f}ms p99={p99:7.2f}ms")
+
+
+def main(chunks: int, queries: int, dim: int, top_k: int, candidates: int) -> None:
+    rng = np.random.default_rng(1)
+    started = time.perf_counter()
+    texts, words = make_corpus(chunks, vocab=50_000, length=40)
+    ids = [str(n) for n in range(chunks)]
+    print(f"corpus     chunks={chunks} generated={time.perf_counter() - started:.1f}s")
+
+    index = BM25Index()
+    started = time.perf_counter()
+    batch = 10_000
+    for start in range(0, chunks, batch):
+        end = start + batch
+        index.add(ids[start:end], texts[start:end])
+    build = time.perf_counter() - started
+    print(
+        f"bm25 build {build:.1f}s ({build / chunks * 1e6:.1f}us/chunk) "
+        f"postings={index.postings_bytes / 1e6:.1f}MB"
+    )
+
+    with tempfile.TemporaryDirectory() as root:
+        path = os.path.join(root, "bench.bm25.npz")
+        started = time.perf_counter()
+        index.save(path)
+        saved = time.perf_counter() - started
+        started = time.perf_counter()
+        index = BM25Index.load(path)
+        print(
+            f"bm25 save  {saved:.2f}s load={time.perf_counter() - started:.2f}s "
+            f"file={os.path.getsize(path) / 1e6:.1f}MB"
+        )
+
+        store = LocalVectorStore(root, dim)
+        for start in range(0, chunks, 100_000):
+            end = min(start + 100_000, chunks)
+            vectors = rng.standard_normal((end - start, dim), dtype=np.float32)
+            store.upsert_sync("bench", ids[start:end], vectors)
+
+        query_texts = []
+        for n in range(queries):
+            terms = " ".join(words[np.minimum(rng.zipf(1.1, 4), len(words)) - 1])
+            if n % 2:
+                terms += f" SKU-{int(rng.integers(chunks // 10)) * 10:07d}"
+            query_texts.append(terms)
+        query_vectors = rng.standard_normal((queries, dim), dtype=np.float32)
+
+        index.search(query_texts[0], candidates)  # untimed warm-up
+        store.query_batch_sync("bench", query_vectors[0], candidates)
+        lexical, vector, hybrid = [], [], []
+        for text, query_vector in zip(query_texts, query_vectors):
+            started = time.perf_counter()
+            lexical_hits = index.search(text, candidates)
+            lexical.append((time.perf_counter() - started) * 1000)
+
+            started = time.perf_counter()
+            vector_hits = store.query_batch_sync("bench", query_vector, candidates)[0]
+            vector.append((time.perf_counter() - started) * 1000)
+
+            started = time.perf_counter()
+            reciprocal_rank_fusion(
+                [[m.id for m in vector_hits], [doc_id for doc_id, _ in lexical_hits]]
+            )[:top_k]
+            # Both retrievers run concurrently in RetrievalService
+            hybrid.append(
+                max(lexical[-1], vector[-1]) + (time.perf_counter() - started) * 1000
+            )
+        store.close()
+
+    report("bm25", lexical)
+    report("vector", vector)
+    report("hybrid", hybrid)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--chunks", type=int, default=1_000_000)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--dim", type=int, default=128)
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--candidates", type=int, default=20)
+    args = parser.parse_args()
+    main(args.chunks, args.queries, args.dim, args.top_k, args.candidates)
@@ -0,0 +1,120 @@
+"""
+Benchmark session state serialization size and throughput.
+
+Compares the positional msgpack record used by the session stores against
+plain JSON of the same state (keyed fields), then measures get/save
+operations per second on the in-process store and, with --redis-url, on
+Redis (including pipelined multi-session reads).
+
+Usage: python -m benchmarks.session_state [--records N] [--redis-url URL]
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from dataclasses import asdict
+from typing import List
+
+from src.services.session_state import (
+    LocalSessionStore,
+    SessionState,
+    decode_state,
+    encode_state,
+)
+
+
+def make_states(count: int) -> List[SessionState]:
+    rng = random.Random(0)
+    words = "what time do you open tomorrow is parking free near the store".split()
+    return [
+        SessionState(
+            session_id=f"session-{n}",
+            user_id=rng.randrange(100_000),
+            site_id=rng.randrange(1000),
+            history_seq=rng.randrange(200),
+            partial_transcript=" ".join(rng.choices(words, k=rng.randrange(12))),
+            cursors={"llm": f"resp_{n:x}:{rng.randrange(40)}", "tts": f"chunk-{n}"},
+            updated_at=time.time(),
+            version=rng.randrange(1, 50),
+        )
+        for n in range(count)
+    ]
+
+
+def ops_per_second(fn, items) -> float:
+    started = time.perf_counter()
+    for item in items:
+        fn(item)
+    return len(items) / (time.perf_counter() - started)
+
+
+def json_encode(state: SessionState) -> bytes:
+    return json.dumps(vars(state)).encode()
+
+
+def json_decode(data: bytes) -> SessionState:
+    return SessionState(**json.loads(data))
+
+
+async def store_throughput(name: str, store, states: List[SessionState]) -> None:
+    started = time.perf_counter()
+    saved = [await store.save(state) for state in states]
+    save_rate = len(states) / (time.perf_counter() - started)
+    started = time.perf_counter()
+    for state in saved:
+        await store.get(state.session_id)
+    get_rate = len(states) / (time.perf_counter() - started)
+    ids = [state.session_id for state in saved]
+    started = time.perf_counter()
+    for start in range(0, len(ids), 50):
+        end = start + 50
+        await store.get_many(ids[start:end])
+    batch_rate = len(ids) / (time.perf_counter() - started)
+    print(
+        f"{name:<8} save={save_rate:9.0f}/s get={get_rate:9.0f}/s "
+        f"get_many(50)={batch_rate:9.0f} sessions/s"
+    )
+    for session_id in ids:
+        await store.delete(session_id)
+    await store.aclose()
+
+
+async def main(records: int, redis_url: str) -> None:
+    states = make_states(records)
+    packed = [encode_state(state) for state in states]
+    as_json = [json_encode(state) for state in states]
+    msgpack_size = sum(map(len, packed)) / records
+    json_size = sum(map(len, as_json)) / records
+    print(
+        f"size     msgpack={msgpack_size:.0f}B json={json_size:.0f}B "
+        f"({msgpack_size / json_size:.0%} of JSON)"
+    )
+    encode = ops_per_second(encode_state, states)
+    print(
+        f"encode   msgpack={encode:9.0f}/s "
+        f"json={ops_per_second(json_encode, states):9.0f}/s"
+    )
+    decode = ops_per_second(lambda data: decode_state("s", data), packed)
+    print(
+        f"decode   msgpack={decode:9.0f}/s "
+        f"json={ops_per_second(json_decode, as_json):9.0f}/s"
+    )
+
+    fresh = [SessionState(**{**asdict(state), "version": 0}) for state in states]
+    await store_throughput("local", LocalSessionStore(), fresh)
+    if redis_url:
+        from src.services.session_state.redis import RedisSessionStore
+
+        await store_throughput(
+            "redis", RedisSessionStore(redis_url, prefix="bench:session:"), fresh
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--records", type=int, default=20_000)
+    parser.add_argument("--redis-url", default="", help="Also benchmark Redis")
+    args = parser.parse_args()
+    asyncio.run(main(args.records, args.redis_url))
@@ -0,0 +1,138 @@
+"""
+Benchmark user lookup latency before and after the cached query layer.
+
+Fills a users table, then reports p50/p99 latency of:
+
+- before: ``select(User)`` built per call, case-sensitive exact match
+- scan: case-insensitive ``lower()`` match without the functional indexes,
+  which is what case-insensitive lookups cost before this layer
+- after: ``UserService`` prebuilt statements on the functional indexes
+
+Runs on a temporary SQLite file by default; pass a PostgreSQL URL to
+include asyncpg prepared statement caching.
+
+Usage: python -m benchmarks.user_lookup [--users N] [--lookups L] [--url URL]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from sqlalchemy import func, insert, select, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from src.core.config import settings
+from src.models.user import User
+from src.services.user_service import UserService
+
+
+def report(name, latencies):
+    latencies = sorted(latencies)
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    print(f"{name:<16} p50={statistics.median(latencies):7.3f}ms p99={p99:7.3f}ms")
+
+
+async def timed(db: AsyncSession, names, lookup):
+    await lookup(db, names[0])  # untimed warm-up, fills the statement caches
+    latencies = []
+    for name in names:
+        started = time.perf_counter()
+        user = await lookup(db, name)
+        latencies.append((time.perf_counter() - started) * 1000)
+        assert user is not None
+        db.expunge_all()
+    return latencies
+
+
+async def before(db: AsyncSession, username: str):
+    result = await db.execute(select(User).where(User.username == username))
+    return result.scalar_one_or_none()
+
+
+async def scan(db: AsyncSession, username: str):
+    result = await db.execute(
+        select(User).where(func.lower(User.username) == username.lower())
+    )
+    return result.scalar_one_or_none()
+
+
+async def main(url: str, users: int, lookups: int) -> None:
+    connect_args = {}
+    if url.startswith("postgresql+asyncpg"):
+        connect_args["prepared_statement_cache_size"] = (
+            settings.DB_PREPARED_STATEMENT_CACHE_SIZE
+        )
+    engine = create_async_engine(
+        url, query_cache_size=settings.DB_QUERY_CACHE_SIZE, connect_args=connect_args
+    )
+    table = User.__table__
+    async with engine.begin() as conn:
+        await conn.run_sync(table.drop, checkfirst=True)
+        await conn.run_sync(table.create)
+        started = time.perf_counter()
+        batch = 10_000
+        for start in range(0, users, batch):
+            end = min(start + batch, users)
+            await conn.execute(
+                insert(table),
+                [
+                    {
+                        "email": f"User{n}@Example.com",
+                        "username": f"User{n}",
+                        "hashed_password": "x",
+                        "is_active": True,
+                    }
+                    for n in range(start, end)
+                ],
+            )
+    print(f"users            {users} inserted={time.perf_counter() - started:.1f}s")
+
+    rng = random.Random(0)
+    picks = [rng.randrange(users) for _ in range(lookups)]
+    exact = [f"User{n}" for n in picks]
+    folded = [name.lower() for name in exact]
+
+    async with AsyncSession(engine, expire_on_commit=False) as db:
+        report("before (exact)", await timed(db, exact, before))
+
+        async with engine.begin() as conn:
+            for index in table.indexes:
+                if index.name.startswith("ix_users_lower_"):
+                    await conn.execute(text(f"DROP INDEX {index.name}"))
+        report("scan (lower)", await timed(db, folded[: max(1, lookups // 20)], scan))
+
+        async with engine.begin() as conn:
+            for index in table.indexes:
+                if index.name.startswith("ix_users_lower_"):
+                    await conn.run_sync(index.create)
+        report(
+            "after (lower)",
+            await timed(db, folded, UserService.get_user_by_username),
+        )
+        report(
+            "after (email)",
+            await timed(
+                db,
+                [f"user{n}@example.com" for n in picks],
+                UserService.get_user_by_email,
+            ),
+        )
+
+    async with engine.begin() as conn:
+        await conn.run_sync(table.drop)
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--lookups", type=int, default=2000)
+    parser.add_argument("--url", default=None, help="Database URL (default: SQLite)")
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as root:
+        url = args.url or f"sqlite+aiosqlite:///{os.path.join(root, 'bench.db')}"
+        asyncio.run(main(url, args.users, args.lookups))
@@ -0,0 +1,92 @@
+"""
+Benchmark recall and latency of IVF search against exact search.
+
+Builds a clustered synthetic corpus in a temporary LocalVectorStore, then
+sweeps nlist/nprobe and reports recall@k (relative to exact search) with
+p50/p99 single-query latency for each configuration.
+
+Usage: python -m benchmarks.vector_store [--rows N] [--dim D] [--queries Q]
+"""
+
+import argparse
+import statistics
+import tempfile
+import time
+
+import numpy as np
+
+from src.services.vector_store import LocalVectorStore
+
+
+def make_corpus(rows: int, dim: int, clusters: int, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((clusters, dim)).astype(np.float32) * 3
+    labels = rng.integers(0, clusters, rows)
+    noise = rng.standard_normal((rows, dim)).astype(np.float32)
+    return centers[labels] + noise
+
+
+def timed_queries(store, queries, top_k, exact):
+    # Untimed warm-up: opens the namespace and builds the IVF list layout
+    store.query_batch_sync("bench", queries[0], top_k=top_k, exact=exact)
+    results, latencies = [], []
+    for query in queries:
+        started = time.perf_counter()
+        results.append(
+            store.query_batch_sync("bench", query, top_k=top_k, exact=exact)[0]
+        )
+        latencies.append((time.perf_counter() - started) * 1000)
+    return results, latencies
+
+
+def report(name, latencies, recall=None):
+    latencies = sorted(latencies)
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    recall_text = f"recall@k={recall:.3f}" if recall is not None else " " * 14
+    print(
+        f"{name:<24} {recall_text}  p50={statistics.median(latencies):7.2f}ms "
+        f"p99={p99:7.2f}ms"
+    )
+
+
+def main(rows: int, dim: int, queries: int, top_k: int) -> None:
+    corpus = make_corpus(rows, dim, clusters=max(16, rows // 2000))
+    ids = [str(i) for i in range(rows)]
+    probe_queries = corpus[:queries] + 0.05
+
+    for nlist in (64, 256):
+        with tempfile.TemporaryDirectory() as root:
+            store = LocalVectorStore(root, dim, ivf_nlist=nlist, ivf_min_rows=rows)
+            store.upsert_sync("bench", ids, corpus)
+            exact, exact_latencies = timed_queries(store, probe_queries, top_k, True)
+            store.close()
+            if nlist == 64:
+                report("exact", exact_latencies)
+            for nprobe in (1, 4, 16, 64):
+                if nprobe > nlist:
+                    continue
+                # Reopening loads the persisted IVF index with a new nprobe
+                probed = LocalVectorStore(
+                    root, dim, ivf_nlist=nlist, ivf_nprobe=nprobe, ivf_min_rows=rows
+                )
+                approx, latencies = timed_queries(probed, probe_queries, top_k, False)
+                probed.close()
+                hits = sum(
+                    len({m.id for m in a} & {m.id for m in e})
+                    for a, e in zip(approx, exact)
+                )
+                report(
+                    f"ivf nlist={nlist} nprobe={nprobe}",
+                    latencies,
+                    hits / (top_k * len(exact)),
+                )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--top-k", type=int, default=10)
+    args = parser.parse_args()
+    main(args.rows, args.dim, args.queries, args.top_k)
@@ -0,0 +1,67 @@
+"""
+Benchmark time-to-first-audio of the pipelined voice response path.
+
+Compares the sentence-pipelined VoicePipeline against a sequential baseline
+that waits for the complete LLM answer before synthesizing it, using fake
+providers with injected latency so the run is deterministic and offline.
+
+Usage: python -m benchmarks.voice_pipeline [--turns N]
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from src.services.providers import FakeLLMProvider, FakeTTSProvider
+from src.services.voice_pipeline import TurnMetrics, VoicePipeline
+
+MESSAGES = [{"role": "user", "content": "When are you open?"}]
+
+
+def make_providers():
+    llm = FakeLLMProvider(first_token_delay=0.25, token_delay=0.02)
+    tts = FakeTTSProvider(latency=0.15, seconds_per_char=0.001)
+    return llm, tts
+
+
+async def sequential_turn() -> dict:
+    llm, tts = make_providers()
+    started = time.perf_counter()
+    text = "".join([fragment async for fragment in llm.stream(MESSAGES)])
+    first_audio = None
+    async for _chunk in tts.synthesize(text):
+        if first_audio is None:
+            first_audio = time.perf_counter() - started
+    return {"ttfa": first_audio, "total": time.perf_counter() - started}
+
+
+async def pipelined_turn() -> dict:
+    llm, tts = make_providers()
+    metrics = TurnMetrics()
+    async for _chunk in VoicePipeline(llm, tts).stream(MESSAGES, metrics):
+        pass
+    return {"ttfa": metrics.time_to_first_audio, "total": metrics.total_duration}
+
+
+def summarize(name: str, results: list) -> None:
+    ttfa = [r["ttfa"] * 1000 for r in results]
+    total = [r["total"] * 1000 for r in results]
+    print(
+        f"{name:<12} ttfa p50={statistics.median(ttfa):7.1f}ms "
+        f"max={max(ttfa):7.1f}ms  total p50={statistics.median(total):7.1f}ms"
+    )
+
+
+async def main(turns: int) -> None:
+    sequential = [await sequential_turn() for _ in range(turns)]
+    pipelined = [await pipelined_turn() for _ in range(turns)]
+    summarize("sequential", sequential)
+    summarize("pipelined", pipelined)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--turns", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(main(args.turns))
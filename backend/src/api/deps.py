@@ -2,20 +2,56 @@
 Dependencies for FastAPI endpoints.
 """
 
-from typing import AsyncGenerator
+from functools import lru_cache, partial
+from typing import AsyncGenerator, Optional
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, Response, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..core.database import get_session
+from ..core.admission import AdmissionController
+from ..core.config import settings
+from ..core.database import get_session, get_session_factory
+from ..core.etag import etag_matches, weak_etag
+from ..core.profiling import Profiler, ProfileStore
 from ..core.security import verify_token
+from ..core.singleflight import SingleFlight
 from ..models.user import User
+from ..services.activity import ActivityTracker
+from ..services.bm25 import BM25Store
+from ..services.embedding_service import EmbeddingService
+from ..services.ingestion import IngestionPipeline
+from ..services.memory import MemoryEngine, build_memory_engine
+from ..services.providers import (
+    LLMProvider,
+    ProviderError,
+    TTSProvider,
+    build_embedding_provider,
+    build_llm_provider,
+    build_tts_provider,
+)
+from ..services.retrieval import RetrievalService
+from ..services.semantic_cache import SemanticCache
+from ..services.session_state import SessionStore, build_session_store
+from ..services.transcoding import TranscodingPool
+from ..services.usage_service import UsageRecorder
 from ..services.user_service import UserService
+from ..services.vector_store import VectorStore, build_vector_store
+from ..services.voice_pipeline import VoicePipeline
+from ..services.warmup import (
+    Warmup,
+    warm_database,
+    warm_security,
+    warm_serializers,
+    warm_user_lookups,
+)
 
 # Security scheme
 security = HTTPBearer()
 
+# Concurrent requests with the same token share one user lookup
+_user_lookups: SingleFlight[Optional[User]] = SingleFlight("user_lookup")
+
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """Database dependency."""
@@ -23,9 +59,18 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
         yield session
 
 
+@lru_cache
+def get_activity_tracker() -> ActivityTracker:
+    """Write-behind login/activity tracker, shared across requests."""
+    return ActivityTracker(
+        get_session_factory(), flush_interval=settings.ACTIVITY_FLUSH_INTERVAL_SECONDS
+    )
+
+
 async def get_current_user(
     db: AsyncSession = Depends(get_db),
     credentials: HTTPAuthorizationCredentials = Depends(security),
+    activity: ActivityTracker = Depends(get_activity_tracker),
 ) -> User:
     """Get current authenticated user."""
     credentials_exception = HTTPException(
@@ -39,10 +84,18 @@ async def get_current_user(
     if username is None:
         raise credentials_exception
 
-    user = await UserService.get_user_by_username(db, username=username)
+    async def lookup() -> Optional[User]:
+        # Own session: the shared lookup must outlive a cancelled first caller
+        async with AsyncSession(db.bind, expire_on_commit=False) as session:
+            return await UserService.get_user_by_username(session, username)
+
+    user = await _user_lookups.do(username, lookup)
     if user is None:
         raise credentials_exception
+    # Each request gets its own copy of the shared, detached instance
+    user = await db.merge(user, load=False)
 
+    activity.seen(user.id)
     return user
 
 
@@ -55,6 +108,26 @@ async def get_current_active_user(
     return current_user
 
 
+async def get_current_user_if_modified(
+    request: Request,
+    response: Response,
+    current_user: User = Depends(get_current_active_user),
+) -> User:
+    """Current active user; 304 if the client's copy is still current."""
+    # Every field the user schemas expose changes one of these columns
+    etag = weak_etag(
+        current_user.id,
+        current_user.updated_at,
+        current_user.last_login_at,
+        current_user.last_seen_at,
+    )
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+    return current_user
+
+
 async def get_current_superuser(
     current_user: User = Depends(get_current_user),
 ) -> User:
@@ -64,3 +137,213 @@ async def get_current_superuser(
             status_code=400, detail="The user doesn't have enough privileges"
         )
     return current_user
+
+
+@lru_cache
+def _get_providers() -> "tuple[LLMProvider, TTSProvider]":
+    return build_llm_provider(settings), build_tts_provider(settings)
+
+
+async def close_voice_providers() -> None:
+    """Close provider HTTP clients opened by ``get_voice_pipeline``."""
+    if _get_providers.cache_info().currsize:
+        llm, tts = _get_providers()
+        _get_providers.cache_clear()
+        await llm.aclose()
+        await tts.aclose()
+
+
+async def get_voice_pipeline() -> VoicePipeline:
+    """Voice response pipeline dependency."""
+    try:
+        llm, tts = _get_providers()
+    except ProviderError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e)
+        )
+    return VoicePipeline(
+        llm,
+        tts,
+        max_concurrent_tts=settings.TTS_MAX_CONCURRENCY,
+        min_clause_chars=settings.TTS_MIN_CLAUSE_CHARS,
+    )
+
+
+@lru_cache
+def get_memory_engine() -> MemoryEngine:
+    """Conversation memory dependency, shared across requests."""
+    try:
+        llm = _get_providers()[0]
+    except ProviderError:
+        llm = None  # fall back to offline extractive summaries
+    return build_memory_engine(settings, llm)
+
+
+@lru_cache
+def get_session_store() -> SessionStore:
+    """Voice session state store, shared across requests."""
+    return build_session_store(settings)
+
+
+async def close_session_store() -> None:
+    """Close the session store connection pool, if it was opened."""
+    if get_session_store.cache_info().currsize:
+        store = get_session_store()
+        get_session_store.cache_clear()
+        await store.aclose()
+
+
+@lru_cache
+def get_transcoding_pool() -> TranscodingPool:
+    """Audio transcoding worker pool, shared across requests."""
+    return TranscodingPool(
+        workers=settings.TRANSCODE_WORKERS,
+        jobs_per_worker=settings.TRANSCODE_JOBS_PER_WORKER,
+        cpu_seconds_per_job=settings.TRANSCODE_CPU_SECONDS_PER_JOB,
+        chunk_bytes=settings.TRANSCODE_CHUNK_BYTES,
+        slots_per_worker=settings.TRANSCODE_SLOTS_PER_WORKER,
+    )
+
+
+async def close_transcoding_pool() -> None:
+    """Stop the transcoding workers, if they were started."""
+    if get_transcoding_pool.cache_info().currsize:
+        pool = get_transcoding_pool()
+        get_transcoding_pool.cache_clear()
+        await pool.aclose()
+
+
+@lru_cache
+def get_usage_recorder() -> UsageRecorder:
+    """Write-behind usage recorder, shared across requests."""
+    return UsageRecorder(
+        get_session_factory(),
+        prices=settings.USAGE_PRICES,
+        max_batch=settings.USAGE_FLUSH_BATCH_SIZE,
+        flush_interval=settings.USAGE_FLUSH_INTERVAL_SECONDS,
+        max_buffer=settings.USAGE_MAX_BUFFER,
+    )
+
+
+@lru_cache
+def get_vector_store() -> VectorStore:
+    """Vector store shared by ingestion and retrieval."""
+    return build_vector_store(settings)
+
+
+def close_vector_store() -> None:
+    """Release files held by the vector store, if it was opened."""
+    if get_vector_store.cache_info().currsize:
+        store = get_vector_store()
+        get_vector_store.cache_clear()
+        close = getattr(store, "close", None)
+        if close is not None:
+            close()
+
+
+@lru_cache
+def get_bm25_store() -> BM25Store:
+    """Per-site BM25 indexes shared by ingestion and retrieval."""
+    return BM25Store(
+        settings.BM25_INDEX_PATH, cache_bytes=settings.BM25_CACHE_MB * 1024 * 1024
+    )
+
+
+def close_bm25_store() -> None:
+    """Persist changed BM25 indexes, if the store was opened."""
+    if get_bm25_store.cache_info().currsize:
+        store = get_bm25_store()
+        get_bm25_store.cache_clear()
+        store.close()
+
+
+@lru_cache
+def get_embedding_service() -> EmbeddingService:
+    """Cached embedding service, shared across requests."""
+    return EmbeddingService(build_embedding_provider(settings))
+
+
+def get_ingestion_pipeline() -> IngestionPipeline:
+    """Pipeline indexing crawled pages into the vector store."""
+    return IngestionPipeline(
+        get_embedding_service(),
+        get_vector_store(),
+        max_in_flight=settings.INGEST_MAX_IN_FLIGHT,
+        max_tokens=settings.CHUNK_MAX_TOKENS,
+        overlap_tokens=settings.CHUNK_OVERLAP_TOKENS,
+        lexical=get_bm25_store(),
+    )
+
+
+@lru_cache
+def get_semantic_cache() -> SemanticCache:
+    """Per-site answer cache, shared across requests."""
+    return SemanticCache(
+        settings.SEMANTIC_CACHE_PATH,
+        threshold=settings.SEMANTIC_CACHE_THRESHOLD,
+        ttl=settings.SEMANTIC_CACHE_TTL_SECONDS,
+        max_entries=settings.SEMANTIC_CACHE_MAX_ENTRIES,
+    )
+
+
+def close_semantic_cache() -> None:
+    """Delete cached answer audio, if the cache was opened."""
+    if get_semantic_cache.cache_info().currsize:
+        cache = get_semantic_cache()
+        get_semantic_cache.cache_clear()
+        cache.close()
+
+
+def get_retrieval_service() -> RetrievalService:
+    """Hybrid BM25 + vector retrieval dependency."""
+    return RetrievalService(
+        get_embedding_service(),
+        get_vector_store(),
+        get_bm25_store(),
+        rrf_k=settings.RETRIEVAL_RRF_K,
+        candidates=settings.RETRIEVAL_CANDIDATES,
+    )
+
+
+@lru_cache
+def get_profiler() -> Profiler:
+    """Request profiler shared by the middleware and the admin endpoints."""
+    return Profiler(
+        ProfileStore(settings.PROFILING_PATH, max_files=settings.PROFILING_MAX_FILES),
+        secret=settings.SECRET_KEY,
+    )
+
+
+@lru_cache
+def get_admission_controller() -> AdmissionController:
+    """Per-worker admission controller used by the admission middleware."""
+    return AdmissionController(
+        initial_limit=settings.ADMISSION_INITIAL_LIMIT,
+        min_limit=settings.ADMISSION_MIN_LIMIT,
+        max_limit=settings.ADMISSION_MAX_LIMIT,
+        queue_size=settings.ADMISSION_QUEUE_SIZE,
+        max_wait=settings.ADMISSION_MAX_WAIT_SECONDS,
+        target_latency=settings.ADMISSION_TARGET_LATENCY_SECONDS,
+    )
+
+
+async def _warm_caches() -> None:
+    get_session_store()
+    get_vector_store()
+    get_bm25_store()
+    get_semantic_cache()
+
+
+@lru_cache
+def get_warmup() -> Warmup:
+    """Startup warm-up run by the lifespan; gates readiness."""
+    return Warmup(
+        {
+            "database": partial(warm_database, settings.WARMUP_DB_CONNECTIONS),
+            "user_lookups": warm_user_lookups,
+            "serializers": warm_serializers,
+            "security": warm_security,
+            "caches": _warm_caches,
+        },
+        timeout=settings.WARMUP_TIMEOUT_SECONDS,
+    )
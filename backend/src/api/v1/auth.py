@@ -8,13 +8,18 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ...api.deps import get_current_active_user, get_db
+from ...api.deps import (
+    get_activity_tracker,
+    get_current_user_if_modified,
+    get_db,
+)
 from ...core.config import settings
 from ...core.security import create_access_token
 from ...models.user import User
 from ...schemas.user import Token
 from ...schemas.user import User as UserSchema
 from ...schemas.user import UserCreate
+from ...services.activity import ActivityTracker
 from ...services.user_service import UserService
 
 router = APIRouter()
@@ -35,7 +40,9 @@ async def register(
 
 @router.post("/login", response_model=Token)
 async def login(
-    db: AsyncSession = Depends(get_db), form_data: OAuth2PasswordRequestForm = Depends()
+    db: AsyncSession = Depends(get_db),
+    form_data: OAuth2PasswordRequestForm = Depends(),
+    activity: ActivityTracker = Depends(get_activity_tracker),
 ):
     """Login and get access token."""
     user = await UserService.authenticate_user(
@@ -52,6 +59,7 @@ async def login(
             status_code=status.HTTP_400_BAD_REQUEST, detail="Inactive user"
         )
 
+    activity.logged_in(user.id)
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
         subject=user.username, expires_delta=access_token_expires
@@ -65,7 +73,7 @@ async def login(
 
 @router.get("/me", response_model=UserSchema)
 async def read_users_me(
-    current_user: User = Depends(get_current_active_user),
+    current_user: User = Depends(get_current_user_if_modified),
 ):
     """Get current user information."""
     return current_user
@@ -5,12 +5,13 @@ Health check and system status endpoints.
 from datetime import datetime
 from typing import Any, Dict
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response, status
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ...api.deps import get_db
+from ...api.deps import get_db, get_warmup
 from ...core.config import settings
+from ...services.warmup import Warmup
 
 router = APIRouter()
 
@@ -27,7 +28,9 @@ async def health_check():
 
 
 @router.get("/health/detailed")
-async def detailed_health_check(db: AsyncSession = Depends(get_db)) -> Dict[str, Any]:
+async def detailed_health_check(
+    db: AsyncSession = Depends(get_db), warmup: Warmup = Depends(get_warmup)
+) -> Dict[str, Any]:
     """Detailed health check including database connectivity."""
     health_status = {
         "status": "healthy",
@@ -71,9 +74,28 @@ async def detailed_health_check(db: AsyncSession = Depends(get_db)) -> Dict[str,
             "message": "All required configuration present",
         }
 
+    # Startup warm-up; reported, but readiness is /ready's job
+    health_status["checks"]["warmup"] = {
+        "status": "healthy" if warmup.ready else "warming_up",
+        **warmup.report(),
+    }
+
     return health_status
 
 
+@router.get("/ready")
+async def readiness_check(
+    response: Response, warmup: Warmup = Depends(get_warmup)
+) -> Dict[str, Any]:
+    """Readiness probe: 503 until startup warm-up has finished."""
+    if not warmup.ready:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return {
+        "status": "ready" if warmup.ready else "warming_up",
+        "warmup": warmup.report(),
+    }
+
+
 @router.get("/ping")
 async def ping():
     """Simple ping endpoint for load balancer checks."""
@@ -0,0 +1,21 @@
+"""
+Prometheus metrics endpoint.
+"""
+
+from fastapi import APIRouter, HTTPException, status
+from fastapi.responses import PlainTextResponse
+
+from ...core.config import settings
+from ...core.metrics import REGISTRY
+
+router = APIRouter()
+
+
+@router.get("", response_class=PlainTextResponse)
+async def metrics():
+    """Export in-process metrics in the Prometheus text format."""
+    if not settings.METRICS_ENABLED:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    return PlainTextResponse(
+        REGISTRY.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
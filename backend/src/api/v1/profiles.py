@@ -0,0 +1,121 @@
+"""
+Request profiling administration endpoints (superuser only).
+"""
+
+import asyncio
+import os
+import time
+from dataclasses import asdict
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import FileResponse, PlainTextResponse
+
+from ...api.deps import get_current_superuser, get_profiler
+from ...core import profiling
+from ...core.config import settings
+from ...models.user import User
+from ...schemas.profiling import (
+    ProfileInfo,
+    ProfileToken,
+    ProfileTokenRequest,
+    SamplingRule,
+)
+
+router = APIRouter()
+
+
+def _profiler(
+    profiler: profiling.Profiler = Depends(get_profiler),
+) -> profiling.Profiler:
+    if not settings.PROFILING_ENABLED:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    return profiler
+
+
+@router.post("/token", response_model=ProfileToken)
+async def create_profile_token(
+    request: ProfileTokenRequest,
+    current_user: User = Depends(get_current_superuser),
+    profiler: profiling.Profiler = Depends(_profiler),
+):
+    """Issue a token that profiles requests sent with it under ``path``."""
+    ttl = request.ttl_seconds or settings.PROFILING_TOKEN_TTL_SECONDS
+    expires_at = int(time.time()) + ttl
+    return ProfileToken(
+        header=profiling.PROFILE_TOKEN_HEADER,
+        token=profiling.sign_profile_token(profiler.secret, request.path, expires_at),
+        expires_at=expires_at,
+    )
+
+
+@router.get("/", response_model=List[ProfileInfo])
+async def list_profiles(
+    current_user: User = Depends(get_current_superuser),
+    profiler: profiling.Profiler = Depends(_profiler),
+):
+    """Stored profiles, newest first."""
+    infos = await asyncio.to_thread(profiler.store.list)
+    return [asdict(info) for info in infos]
+
+
+@router.get("/sampling", response_model=List[SamplingRule])
+async def list_sampling_rules(
+    current_user: User = Depends(get_current_superuser),
+    profiler: profiling.Profiler = Depends(_profiler),
+):
+    """Active sampling rules."""
+    return [asdict(rule) for rule in profiler.rules.values()]
+
+
+@router.put("/sampling", response_model=SamplingRule)
+async def set_sampling_rule(
+    rule: SamplingRule,
+    current_user: User = Depends(get_current_superuser),
+    profiler: profiling.Profiler = Depends(_profiler),
+):
+    """Add or replace the sampling rule for a route prefix."""
+    profiler.set_rule(
+        profiling.SamplingRule(
+            route=rule.route, rate=rule.rate, max_profiles=rule.max_profiles
+        )
+    )
+    return asdict(profiler.rules[rule.route])
+
+
+@router.delete("/sampling", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_sampling_rule(
+    route: str = Query(..., description="Route prefix of the rule"),
+    current_user: User = Depends(get_current_superuser),
+    profiler: profiling.Profiler = Depends(_profiler),
+):
+    """Stop sampling a route prefix."""
+    if not profiler.remove_rule(route):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Sampling rule not found"
+        )
+
+
+@router.get("/{profile_id}")
+async def read_profile(
+    profile_id: str,
+    format: str = Query("pstats", pattern="^(pstats|text)$"),
+    sort: str = Query("cumulative", pattern="^(cumulative|tottime|calls)$"),
+    current_user: User = Depends(get_current_superuser),
+    profiler: profiling.Profiler = Depends(_profiler),
+):
+    """Download a profile as a pstats file, or as a text report."""
+    try:
+        path = profiler.store.path(profile_id)
+        if not os.path.exists(path):
+            raise FileNotFoundError(path)
+        if format == "text":
+            report = await asyncio.to_thread(profiler.store.report, profile_id, sort)
+            return PlainTextResponse(report)
+    except (ValueError, FileNotFoundError):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found"
+        )
+    return FileResponse(
+        path, media_type="application/octet-stream", filename=f"{profile_id}.prof"
+    )
@@ -0,0 +1,34 @@
+"""
+Retrieval endpoints.
+"""
+
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ...api.deps import get_current_active_user, get_db, get_retrieval_service
+from ...models.crawl import CrawlSite
+from ...models.user import User
+from ...schemas.retrieval import RetrievalRequest, RetrievedChunk
+from ...services.retrieval import RetrievalService
+
+router = APIRouter()
+
+
+@router.post("/search", response_model=List[RetrievedChunk])
+async def search(
+    request: RetrievalRequest,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db),
+    retrieval: RetrievalService = Depends(get_retrieval_service),
+):
+    """Search a site's chunks with BM25, vectors, or both fused."""
+    site = await db.get(CrawlSite, request.site_id)
+    if site is None or site.user_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Site not found"
+        )
+    return await retrieval.search(
+        db, request.site_id, request.query, top_k=request.top_k, mode=request.mode
+    )
@@ -0,0 +1,109 @@
+"""
+Website ingestion endpoints.
+"""
+
+import logging
+from typing import List, Set
+
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ...api.deps import (
+    get_current_active_user,
+    get_db,
+    get_ingestion_pipeline,
+    get_semantic_cache,
+)
+from ...core.config import settings
+from ...core.database import get_session_factory
+from ...models.crawl import CrawlSite
+from ...models.user import User
+from ...schemas.site import Site, SiteCreate
+from ...services.crawler import build_crawler
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+# Sites with a crawl running in this process
+_active_crawls: Set[int] = set()
+
+
+async def _run_crawl(site_id: int) -> None:
+    crawler = build_crawler(settings)
+    session_factory = get_session_factory()
+    try:
+        pipeline = get_ingestion_pipeline()
+        # Crawl state and chunk writes use separate sessions, since both
+        # stages run concurrently
+        async with session_factory() as crawl_db, session_factory() as ingest_db:
+            site = await crawl_db.get(CrawlSite, site_id)
+            if site is not None:
+                stats = await pipeline.ingest(
+                    ingest_db, site_id, crawler.stream(crawl_db, site)
+                )
+                # Cached answers may quote content that just changed
+                if stats.changed and settings.SEMANTIC_CACHE_ENABLED:
+                    get_semantic_cache().invalidate(site_id)
+    except Exception as e:
+        logger.error(f"Crawl aborted - Site: {site_id}, Error: {e}")
+    finally:
+        if crawler.renderer is not None:
+            await crawler.renderer.aclose()
+        _active_crawls.discard(site_id)
+
+
+async def _get_owned_site(db: AsyncSession, site_id: int, user: User) -> CrawlSite:
+    site = await db.get(CrawlSite, site_id)
+    if site is None or site.user_id != user.id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Site not found"
+        )
+    return site
+
+
+@router.post("/", response_model=Site, status_code=status.HTTP_201_CREATED)
+async def create_site(
+    site_in: SiteCreate,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Register a website for ingestion."""
+    site = CrawlSite(user_id=current_user.id, root_url=str(site_in.root_url))
+    db.add(site)
+    await db.commit()
+    await db.refresh(site)
+    return site
+
+
+@router.get("/", response_model=List[Site])
+async def list_sites(
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """List the current user's sites."""
+    result = await db.execute(
+        select(CrawlSite)
+        .where(CrawlSite.user_id == current_user.id)
+        .order_by(CrawlSite.id)
+    )
+    return result.scalars().all()
+
+
+@router.post("/{site_id}/crawl", status_code=status.HTTP_202_ACCEPTED)
+async def crawl_site(
+    site_id: int,
+    background_tasks: BackgroundTasks,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Start an incremental crawl and re-index of the site in the background."""
+    await _get_owned_site(db, site_id, current_user)
+    if site_id in _active_crawls:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT, detail="Crawl already running"
+        )
+    _active_crawls.add(site_id)
+    background_tasks.add_task(_run_crawl, site_id)
+    return {"message": "Crawl started", "site_id": site_id}
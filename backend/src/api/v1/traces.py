@@ -0,0 +1,26 @@
+"""
+Tracing administration endpoints (superuser only).
+"""
+
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query
+
+from ...api.deps import get_current_superuser
+from ...core.tracing import tracer
+from ...models.user import User
+from ...schemas.tracing import LatencyReport
+
+router = APIRouter()
+
+
+@router.get("/latency", response_model=LatencyReport)
+async def stage_latency(
+    route: Optional[str] = Query(None, description="Route template to report"),
+    current_user: User = Depends(get_current_superuser),
+):
+    """Rolling p50/p95/p99 latency of each stage, per route."""
+    return LatencyReport(
+        window_seconds=tracer.latencies.window_seconds,
+        stages=tracer.latencies.summary(route),
+    )
@@ -0,0 +1,71 @@
+"""
+Usage accounting endpoints.
+"""
+
+from datetime import date, datetime, timedelta, timezone
+from typing import List, Optional, Tuple
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ...api.deps import get_current_active_user, get_current_superuser, get_db
+from ...models.user import User
+from ...schemas.usage import UsageDailyRow, UsageDailyStage
+from ...services.usage_service import UsageService
+
+router = APIRouter()
+
+MAX_RANGE_DAYS = 366
+
+
+def _date_range(start: Optional[date], end: Optional[date]) -> Tuple[date, date]:
+    end = end or datetime.now(timezone.utc).date()
+    start = start or end - timedelta(days=29)
+    if start > end:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="start must not be after end",
+        )
+    if (end - start).days >= MAX_RANGE_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Date range must not exceed {MAX_RANGE_DAYS} days",
+        )
+    return start, end
+
+
+@router.get("/me", response_model=List[UsageDailyRow])
+async def read_usage_me(
+    start: Optional[date] = Query(None, description="First day (UTC), inclusive"),
+    end: Optional[date] = Query(None, description="Last day (UTC), inclusive"),
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Daily usage of the current user (last 30 days by default)."""
+    start, end = _date_range(start, end)
+    return await UsageService.get_user_daily(db, current_user.id, start, end)
+
+
+@router.get("/users/{user_id}", response_model=List[UsageDailyRow])
+async def read_user_usage(
+    user_id: int,
+    start: Optional[date] = Query(None),
+    end: Optional[date] = Query(None),
+    current_user: User = Depends(get_current_superuser),
+    db: AsyncSession = Depends(get_db),
+):
+    """Daily usage of a user (superuser only)."""
+    start, end = _date_range(start, end)
+    return await UsageService.get_user_daily(db, user_id, start, end)
+
+
+@router.get("/daily", response_model=List[UsageDailyStage])
+async def read_daily_usage(
+    start: Optional[date] = Query(None),
+    end: Optional[date] = Query(None),
+    current_user: User = Depends(get_current_superuser),
+    db: AsyncSession = Depends(get_db),
+):
+    """Usage across all users per day and stage (superuser only)."""
+    start, end = _date_range(start, end)
+    return await UsageService.get_daily_totals(db, start, end)
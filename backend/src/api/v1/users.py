@@ -5,7 +5,12 @@ User management endpoints.
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ...api.deps import get_current_active_user, get_current_superuser, get_db
+from ...api.deps import (
+    get_current_active_user,
+    get_current_superuser,
+    get_current_user_if_modified,
+    get_db,
+)
 from ...models.user import User
 from ...schemas.user import User as UserSchema
 from ...schemas.user import UserUpdate
@@ -16,7 +21,7 @@ router = APIRouter()
 
 @router.get("/me", response_model=UserSchema)
 async def read_user_me(
-    current_user: User = Depends(get_current_active_user),
+    current_user: User = Depends(get_current_user_if_modified),
 ):
     """Get current user."""
     return current_user
@@ -0,0 +1,148 @@
+"""
+Voice response endpoints.
+"""
+
+import time
+from typing import Iterator, List, Optional
+
+import numpy as np
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ...api.deps import (
+    get_current_active_user,
+    get_db,
+    get_embedding_service,
+    get_semantic_cache,
+    get_usage_recorder,
+    get_voice_pipeline,
+)
+from ...core.config import settings
+from ...core.tracing import span
+from ...models.crawl import CrawlSite
+from ...models.user import User
+from ...schemas.voice import VoiceRespondRequest
+from ...services.embedding_service import EmbeddingService
+from ...services.providers import ProviderError
+from ...services.semantic_cache import CacheLookup, SemanticCache
+from ...services.usage_service import UsageRecorder
+from ...services.voice_pipeline import TurnMetrics, VoicePipeline
+
+router = APIRouter()
+
+AUDIO_CHUNK_SIZE = 32768
+
+
+def _chunked(data: bytes) -> Iterator[bytes]:
+    for start in range(0, len(data), AUDIO_CHUNK_SIZE):
+        end = start + AUDIO_CHUNK_SIZE
+        yield data[start:end]
+
+
+@router.post("/respond")
+async def respond(
+    voice_request: VoiceRespondRequest,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db),
+    pipeline: VoicePipeline = Depends(get_voice_pipeline),
+    usage: UsageRecorder = Depends(get_usage_recorder),
+    embeddings: EmbeddingService = Depends(get_embedding_service),
+    answer_cache: SemanticCache = Depends(get_semantic_cache),
+):
+    """Stream synthesized audio for the assistant's answer to ``text``.
+
+    With a ``site_id`` and no history, the question is first looked up in the
+    site's semantic answer cache; a hit replays the cached audio without
+    calling the LLM or TTS.
+    """
+    site_id = voice_request.site_id
+    if site_id is not None:
+        site = await db.get(CrawlSite, site_id)
+        if site is None or site.user_id != current_user.id:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Site not found"
+            )
+
+    # Answers that depend on earlier turns are not reusable
+    query_vector: Optional[np.ndarray] = None
+    lookup: Optional[CacheLookup] = None
+    if site_id is not None and settings.SEMANTIC_CACHE_ENABLED:
+        if not voice_request.history:
+            vectors, _stats = await embeddings.embed(db, [voice_request.text])
+            query_vector = vectors[0]
+            with span("cache_lookup") as stage:
+                lookup = answer_cache.lookup(site_id, query_vector)
+                stage.set(hit=lookup.entry is not None)
+            if lookup.entry is not None:
+                audio_data = await answer_cache.load_audio(lookup.entry)
+                if audio_data is not None:
+                    return StreamingResponse(
+                        _chunked(audio_data),
+                        media_type=lookup.entry.media_type,
+                        headers={"X-Answer-Cache": "hit"},
+                    )
+
+    messages = [message.model_dump() for message in voice_request.history]
+    messages.append({"role": "user", "content": voice_request.text})
+    metrics = TurnMetrics()
+    started = time.perf_counter()
+    audio = pipeline.stream(messages, metrics)
+
+    usage_site = str(site_id) if site_id is not None else None
+
+    def record_usage() -> None:
+        usage.record(
+            current_user.id,
+            "llm",
+            pipeline.llm.model,
+            site_id=usage_site,
+            prompt_tokens=metrics.prompt_tokens,
+            completion_tokens=metrics.completion_tokens,
+        )
+        usage.record(
+            current_user.id,
+            "tts",
+            pipeline.tts.model,
+            site_id=usage_site,
+            characters=metrics.characters,
+            audio_seconds=metrics.audio_bytes / pipeline.tts.bytes_per_second,
+        )
+
+    # Pull the first chunk before committing to a 200 so that provider
+    # failures (bad key, upstream 4xx) surface as an error status
+    try:
+        first_chunk = await audio.__anext__()
+    except StopAsyncIteration:
+        first_chunk = b""
+    except ProviderError as e:
+        record_usage()
+        raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=str(e))
+
+    async def body():
+        # Audio is kept only when the answer will be cached
+        spoken: Optional[List[bytes]] = [] if lookup is not None else None
+        try:
+            if first_chunk:
+                if spoken is not None:
+                    spoken.append(first_chunk)
+                yield first_chunk
+            async for chunk in audio:
+                if spoken is not None:
+                    spoken.append(chunk)
+                yield chunk
+            if spoken is not None and lookup is not None and site_id is not None:
+                await answer_cache.store(
+                    site_id,
+                    query_vector,
+                    metrics.answer,
+                    b"".join(spoken),
+                    pipeline.media_type,
+                    time.perf_counter() - started,
+                    lookup.generation,
+                )
+        finally:
+            record_usage()
+
+    headers = {"X-Answer-Cache": "miss"} if lookup is not None else None
+    return StreamingResponse(body(), media_type=pipeline.media_type, headers=headers)
@@ -0,0 +1,256 @@
+"""
+Admission control with priority load shedding.
+
+``AdmissionMiddleware`` caps the requests in flight in this worker. Requests
+over the limit wait in a bounded queue per priority class and are admitted
+highest priority first; lower classes may only use part of the limit, which
+keeps headroom for voice traffic. A request is rejected at once with a 503
+and ``Retry-After`` when its queue is full or its estimated wait exceeds the
+maximum wait, instead of timing out after using resources.
+
+Health checks and metrics are always admitted, so an overloaded worker
+still reports itself alive. The limit adapts AIMD-style to the latency
+until response start: it grows additively while saturated and fast, and
+shrinks multiplicatively (at most once per target latency) when slow.
+"""
+
+import asyncio
+import logging
+import math
+import time
+from collections import deque
+from enum import IntEnum
+from typing import Any, Callable, Deque, Dict, NoReturn, Optional
+
+from starlette.responses import JSONResponse
+
+from .config import settings
+from .metrics import counter, gauge, histogram
+from .tracing import span
+
+logger = logging.getLogger(__name__)
+
+ADMISSION_LIMIT = gauge("admission_limit", "Adaptive limit on requests in flight")
+ADMISSION_IN_FLIGHT = gauge("admission_in_flight", "Admitted requests in flight")
+ADMISSION_QUEUED = gauge(
+    "admission_queued", "Requests waiting for admission", ["priority"]
+)
+ADMISSION_REJECTED = counter(
+    "admission_rejected_total", "Requests shed with a 503", ["priority", "reason"]
+)
+ADMISSION_WAIT_SECONDS = histogram(
+    "admission_wait_seconds",
+    "Time queued before admission",
+    buckets=(0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 5.0),
+)
+
+
+class Priority(IntEnum):
+    """Request classes, most important first."""
+
+    CRITICAL = 0  # never queued or shed
+    HIGH = 1
+    NORMAL = 2
+    LOW = 3
+
+
+# Fraction of the limit each class may fill, reserving headroom above it
+_SHARE = {Priority.HIGH: 1.0, Priority.NORMAL: 0.9, Priority.LOW: 0.75}
+
+
+def classify(method: str, path: str, authenticated: bool) -> Priority:
+    """Priority class of a request."""
+    api = settings.API_V1_STR
+    if path == "/health" or path.startswith((f"{api}/health", f"{api}/metrics")):
+        return Priority.CRITICAL
+    if path.startswith(f"{api}/voice") and authenticated:
+        return Priority.HIGH
+    if (
+        (method == "POST" and path == f"{api}/auth/register")
+        or (path.startswith(f"{api}/sites/") and path.endswith("/crawl"))
+        or path.startswith(
+            (
+                f"{api}/usage/daily",
+                f"{api}/usage/users/",
+                f"{api}/profiles",
+                f"{api}/traces",
+            )
+        )
+    ):
+        return Priority.LOW
+    return Priority.NORMAL
+
+
+class Rejected(Exception):
+    """Request shed; retry after ``retry_after`` seconds."""
+
+    def __init__(self, reason: str, retry_after: float):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """Adaptive concurrency limit with per-priority wait queues."""
+
+    def __init__(
+        self,
+        initial_limit: int = 64,
+        min_limit: int = 4,
+        max_limit: int = 512,
+        queue_size: int = 128,
+        max_wait: float = 2.0,
+        target_latency: float = 1.0,
+        backoff: float = 0.9,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.limit = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.queue_size = queue_size
+        self.max_wait = max_wait
+        self.target_latency = target_latency
+        self.backoff = backoff
+        self.clock = clock
+        self.in_flight = 0
+        self._queues: Dict[Priority, Deque[asyncio.Future]] = {
+            priority: deque() for priority in _SHARE
+        }
+        self._latency = target_latency / 2  # EWMA, for wait estimates
+        self._last_decrease = -math.inf
+        ADMISSION_LIMIT.set(self.limit)
+
+    def queued(self, priority: Priority) -> int:
+        """Requests of ``priority`` waiting for admission."""
+        return len(self._queues[priority])
+
+    def _has_room(self, priority: Priority) -> bool:
+        return self.in_flight < max(1.0, self.limit * _SHARE[priority])
+
+    def _estimated_wait(self, priority: Priority) -> float:
+        ahead = 1 + sum(
+            len(queue) for p, queue in self._queues.items() if p <= priority
+        )
+        return ahead * self._latency / max(1.0, self.limit)
+
+    async def acquire(self, priority: Priority) -> None:
+        """Wait for a slot, or raise ``Rejected``; pair with ``release``."""
+        queue = self._queues[priority]
+        if not any(self._queues[p] for p in _SHARE if p <= priority):
+            if self._has_room(priority):
+                self._admit()
+                return
+        if len(queue) >= self.queue_size:
+            self._reject(priority, "queue_full", self._estimated_wait(priority))
+        estimate = self._estimated_wait(priority)
+        if estimate > self.max_wait:
+            self._reject(priority, "deadline", estimate)
+
+        waiter = asyncio.get_running_loop().create_future()
+        queue.append(waiter)
+        ADMISSION_QUEUED.set(len(queue), priority=priority.name.lower())
+        started = self.clock()
+        try:
+            await asyncio.wait({waiter}, timeout=self.max_wait)
+        except asyncio.CancelledError:
+            if waiter.done():  # admitted as the caller went away
+                self.release()
+            raise
+        finally:
+            if not waiter.done():
+                waiter.cancel()
+                queue.remove(waiter)
+            ADMISSION_QUEUED.set(len(queue), priority=priority.name.lower())
+        if waiter.cancelled():
+            self._reject(priority, "timeout", self._estimated_wait(priority))
+        ADMISSION_WAIT_SECONDS.observe(self.clock() - started)
+
+    def release(self, latency: Optional[float] = None) -> None:
+        """Free a slot; ``latency`` is the admitted request's time to respond."""
+        saturated = self.in_flight >= self.limit - 1
+        self.in_flight -= 1
+        if latency is not None:
+            self._adapt(latency, saturated)
+        self._wake()
+        ADMISSION_IN_FLIGHT.set(self.in_flight)
+
+    def _admit(self) -> None:
+        self.in_flight += 1
+        ADMISSION_IN_FLIGHT.set(self.in_flight)
+
+    def _wake(self) -> None:
+        for priority, queue in self._queues.items():
+            while queue and self._has_room(priority):
+                waiter = queue.popleft()
+                if not waiter.done():
+                    self._admit()
+                    waiter.set_result(None)
+            if queue:
+                break  # lower classes never overtake a waiting higher one
+
+    def _adapt(self, latency: float, saturated: bool) -> None:
+        self._latency += 0.2 * (latency - self._latency)
+        if latency > self.target_latency:
+            now = self.clock()
+            if now - self._last_decrease >= self.target_latency:
+                self._last_decrease = now
+                self.limit = max(float(self.min_limit), self.limit * self.backoff)
+                logger.warning(
+                    f"Admission limit decreased - Limit: {self.limit:.1f}, "
+                    f"Latency: {latency * 1000:.0f}ms"
+                )
+        elif saturated:
+            self.limit = min(float(self.max_limit), self.limit + 1 / self.limit)
+        ADMISSION_LIMIT.set(self.limit)
+
+    def _reject(self, priority: Priority, reason: str, wait: float) -> NoReturn:
+        ADMISSION_REJECTED.inc(priority=priority.name.lower(), reason=reason)
+        raise Rejected(reason, retry_after=max(1.0, wait))
+
+
+class AdmissionMiddleware:
+    """ASGI middleware admitting requests through an ``AdmissionController``."""
+
+    def __init__(self, app: Any, controller: AdmissionController):
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        authenticated = any(key == b"authorization" for key, _ in scope["headers"])
+        priority = classify(scope["method"], scope["path"], authenticated)
+        if priority is Priority.CRITICAL:
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            with span("admission", priority=priority.name.lower()):
+                await self.controller.acquire(priority)
+        except Rejected as e:
+            logger.warning(
+                f"Request shed - Path: {scope['path']}, "
+                f"Priority: {priority.name}, Reason: {e.reason}"
+            )
+            response = JSONResponse(
+                status_code=503,
+                content={"detail": "Server is overloaded, retry later"},
+                headers={"Retry-After": str(math.ceil(e.retry_after))},
+            )
+            await response(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        latency: Optional[float] = None
+
+        async def send_timed(message) -> None:
+            nonlocal latency
+            if message["type"] == "http.response.start":
+                latency = time.perf_counter() - started
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_timed)
+        finally:
+            self.controller.release(latency)
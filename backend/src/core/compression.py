@@ -0,0 +1,163 @@
+"""
+Negotiated response compression.
+
+``CompressionMiddleware`` compresses JSON and text responses with brotli
+(when the ``brotli`` package is installed) or gzip, whichever the client
+prefers in ``Accept-Encoding``. Bodies sent in one message are compressed
+only from ``minimum_size`` bytes up; streamed bodies are compressed chunk by
+chunk and flushed after each one, so clients keep receiving data as it is
+produced. Audio and other already-compressed media pass through untouched.
+"""
+
+import zlib
+from typing import Any, List, Optional, Tuple, cast
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - depends on the environment
+    brotli = None
+
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "text/",
+)
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """Preferred supported encoding in an ``Accept-Encoding`` header."""
+    supported = ("br", "gzip") if brotli is not None else ("gzip",)
+    best: Tuple[float, int, Optional[str]] = (0.0, 0, None)
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        name = name.strip().lower()
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                continue
+        if name == "*":
+            candidates = supported
+        elif name in supported:
+            candidates = (name,)
+        else:
+            continue
+        for candidate in candidates:
+            # Ties go to the better ratio: br before gzip
+            rank = (quality, -supported.index(candidate), candidate)
+            if quality > 0 and rank[:2] > best[:2]:
+                best = rank
+    return best[2]
+
+
+class _Encoder:
+    """Incremental compressor for one response body."""
+
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int):
+        self._brotli: Any = None
+        self._gzip: Any = None
+        if encoding == "br":
+            self._brotli = brotli.Compressor(quality=brotli_quality)
+        else:
+            self._gzip = zlib.compressobj(
+                gzip_level, zlib.DEFLATED, 16 + zlib.MAX_WBITS
+            )
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        """Compress ``data``; flushes so the output can be sent right away."""
+        if self._brotli is not None:
+            head = self._brotli.process(data)
+            tail = self._brotli.finish() if final else self._brotli.flush()
+            return cast(bytes, head + tail)
+        head = self._gzip.compress(data)
+        tail = self._gzip.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+        return cast(bytes, head + tail)
+
+
+def _header(headers: List[Tuple[bytes, bytes]], name: bytes) -> Optional[bytes]:
+    for key, value in headers:
+        if key.lower() == name:
+            return value
+    return None
+
+
+class CompressionMiddleware:
+    """ASGI middleware compressing responses the client can decode."""
+
+    def __init__(
+        self,
+        app: Any,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        accept = _header(scope["headers"], b"accept-encoding")
+        encoding = negotiate_encoding(accept.decode("latin-1")) if accept else None
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start: Optional[dict] = None
+        encoder: Optional[_Encoder] = None
+
+        async def send_compressed(message) -> None:
+            nonlocal start, encoder
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                content_type = _header(headers, b"content-type") or b""
+                if _header(headers, b"content-encoding") is not None or not (
+                    content_type.decode("latin-1").startswith(COMPRESSIBLE_TYPES)
+                ):
+                    await send(message)
+                    return
+                # Held until the first body chunk shows whether to compress
+                headers.append((b"vary", b"Accept-Encoding"))
+                start = {**message, "headers": headers}
+                return
+            if message["type"] != "http.response.body" or start is None:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if encoder is None:
+                if not more_body and len(body) < self.minimum_size:
+                    await send(start)
+                    start = None
+                    await send(message)
+                    return
+                encoder = _Encoder(encoding, self.gzip_level, self.brotli_quality)
+                headers = [
+                    (key, value)
+                    for key, value in start["headers"]
+                    if key.lower() != b"content-length"
+                ]
+                headers.append((b"content-encoding", encoding.encode()))
+                if not more_body:
+                    body = encoder.compress(body, final=True)
+                    headers.append((b"content-length", str(len(body)).encode()))
+                    await send({**start, "headers": headers})
+                    await send({"type": "http.response.body", "body": body})
+                    return
+                await send({**start, "headers": headers})
+            await send(
+                {
+                    "type": "http.response.body",
+                    "body": encoder.compress(body, final=not more_body),
+                    "more_body": more_body,
+                }
+            )
+
+        await self.app(scope, receive, send_compressed)
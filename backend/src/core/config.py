@@ -2,7 +2,7 @@
 Configuration management for MemVoice API.
 """
 
-from typing import List, Optional, Union
+from typing import Dict, List, Optional, Union
 
 from pydantic import Field, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -51,6 +51,135 @@ class Settings(BaseSettings):
     MAX_AUDIO_FILE_SIZE: int = 25 * 1024 * 1024  # 25MB
     SUPPORTED_AUDIO_FORMATS: list = ["mp3", "wav", "flac", "m4a"]
 
+    # Audio Transcoding
+    TRANSCODE_WORKERS: int = 0  # 0 uses one worker process per CPU
+    TRANSCODE_JOBS_PER_WORKER: int = 4  # streams multiplexed on each worker
+    TRANSCODE_CPU_SECONDS_PER_JOB: float = 30.0
+    TRANSCODE_CHUNK_BYTES: int = 64 * 1024  # shared-memory slot size
+    TRANSCODE_SLOTS_PER_WORKER: int = 16  # slots per direction per worker
+
+    # Voice Response Pipeline
+    LLM_MODEL: str = "gpt-4o-mini"
+    ELEVENLABS_VOICE_ID: str = "21m00Tcm4TlvDq8ikWAM"
+    ELEVENLABS_MODEL_ID: str = "eleven_turbo_v2_5"
+    TTS_MAX_CONCURRENCY: int = 2  # segments synthesized ahead of playback
+    TTS_MIN_CLAUSE_CHARS: int = 40  # split on , ; : only past this length
+    VOICE_FAKE_PROVIDERS: bool = False  # offline fakes when API keys are unset
+
+    # Vector Store
+    VECTOR_STORE_BACKEND: str = "local"  # "local" or "pinecone"
+    VECTOR_STORE_PATH: str = "./data/vectors"
+    PINECONE_INDEX_NAME: str = "memvoice-vectors"
+    EMBEDDING_MODEL: str = "text-embedding-3-small"
+    EMBEDDING_DIMENSIONS: int = 1536
+    VECTOR_IVF_NLIST: int = 0  # 0 disables IVF partitioning (exact search)
+    VECTOR_IVF_NPROBE: int = 8
+
+    # Conversation Memory
+    MEMORY_BACKEND: str = "local"  # "local" or "zep"
+    ZEP_API_URL: Optional[str] = None  # None uses Zep Cloud
+    MEMORY_TOKEN_BUDGET: int = 1500  # context tokens per turn, query included
+    MEMORY_SUMMARIZE_AFTER_TOKENS: int = 1200
+    MEMORY_KEEP_RECENT_TOKENS: int = 400  # kept verbatim when summarizing
+
+    # Voice Session State
+    SESSION_STORE_BACKEND: str = "local"  # "local" or "redis" (uses REDIS_URL)
+    SESSION_TTL_SECONDS: int = 3600  # extended on every read
+    SESSION_KEY_PREFIX: str = "memvoice:session:"
+
+    # Startup Warm-up
+    WARMUP_ENABLED: bool = True
+    WARMUP_BLOCKING: bool = False  # finish warm-up before accepting connections
+    WARMUP_DB_CONNECTIONS: int = 5  # capped at the pool size
+    WARMUP_TIMEOUT_SECONDS: float = 30.0
+
+    # Website Crawler
+    CRAWL_MAX_CONCURRENCY: int = 16  # requests in flight across all hosts
+    CRAWL_PER_HOST_CONCURRENCY: int = 2
+    CRAWL_PER_HOST_DELAY: float = 0.25  # seconds between request starts per host
+    CRAWL_MAX_PAGES: int = 10000
+    CRAWL_TIMEOUT: float = 20.0
+    CRAWL_USER_AGENT: str = "MemVoiceBot/0.1"
+    CRAWL_RENDER_JAVASCRIPT: bool = True  # headless browser for JS-only pages
+
+    # Content Extraction
+    PROCESS_POOL_WORKERS: int = 0  # 0 uses one worker per CPU
+    CHUNK_MAX_TOKENS: int = 300
+    CHUNK_OVERLAP_TOKENS: int = 40
+    INGEST_MAX_IN_FLIGHT: int = 8  # pages being extracted at once
+
+    # Hybrid Retrieval
+    BM25_INDEX_PATH: str = "./data/bm25"
+    BM25_CACHE_MB: int = 64  # decoded postings kept in memory per site
+    RETRIEVAL_CANDIDATES: int = 20  # per retriever, before rank fusion
+    RETRIEVAL_RRF_K: int = 60
+
+    # Semantic Answer Cache
+    SEMANTIC_CACHE_ENABLED: bool = True
+    SEMANTIC_CACHE_PATH: str = "./data/answer_cache"
+    SEMANTIC_CACHE_THRESHOLD: float = 0.92  # cosine similarity for a hit
+    SEMANTIC_CACHE_TTL_SECONDS: int = 24 * 3600
+    SEMANTIC_CACHE_MAX_ENTRIES: int = 1000  # per site, least recently used evicted
+
+    # Activity Tracking
+    ACTIVITY_FLUSH_INTERVAL_SECONDS: float = 30.0  # per-user write at most this often
+
+    # SQL Statement Caching
+    DB_QUERY_CACHE_SIZE: int = 1200  # compiled SQL kept by SQLAlchemy per engine
+    DB_PREPARED_STATEMENT_CACHE_SIZE: int = 256  # asyncpg, per connection
+
+    # SQL Instrumentation
+    DB_SLOW_QUERY_SECONDS: float = 0.5  # logged with parameters redacted
+    DB_N_PLUS_ONE_THRESHOLD: int = 5  # identical statements in one request
+    DB_QUERY_HEADERS: bool = False  # add X-DB-Queries / X-DB-Time to responses
+
+    # Metrics
+    METRICS_ENABLED: bool = True
+
+    # Admission Control
+    ADMISSION_ENABLED: bool = True
+    ADMISSION_INITIAL_LIMIT: int = 64  # requests in flight per worker
+    ADMISSION_MIN_LIMIT: int = 4
+    ADMISSION_MAX_LIMIT: int = 512
+    ADMISSION_QUEUE_SIZE: int = 128  # waiting requests per priority class
+    ADMISSION_MAX_WAIT_SECONDS: float = 2.0  # longer expected waits get a 503
+    ADMISSION_TARGET_LATENCY_SECONDS: float = 1.0  # slower responses shrink the limit
+
+    # Response Compression
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MIN_BYTES: int = 1024  # smaller single-message bodies sent as is
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4  # fast enough for dynamic responses
+
+    # Request Profiling
+    PROFILING_ENABLED: bool = False  # installs the profiling middleware
+    PROFILING_PATH: str = "./data/profiles"
+    PROFILING_MAX_FILES: int = 50  # oldest profiles deleted past this
+    PROFILING_TOKEN_TTL_SECONDS: int = 600
+
+    # Tracing
+    TRACING_ENABLED: bool = True
+    TRACING_EXPORTER: str = "none"  # none, file or otlp
+    TRACING_FILE_PATH: str = "./data/traces/spans.jsonl"
+    TRACING_FILE_MAX_BYTES: int = 10 * 1024 * 1024  # rotated past this
+    TRACING_FILE_BACKUPS: int = 5
+    TRACING_OTLP_ENDPOINT: str = "http://localhost:4318/v1/traces"
+    TRACING_FLUSH_INTERVAL_SECONDS: float = 5.0
+    TRACING_MAX_QUEUE: int = 10000  # oldest unexported spans dropped past this
+    TRACING_WINDOW_SECONDS: float = 300.0  # latency percentiles cover this long
+    TRACING_WINDOW_SAMPLES: int = 2048  # per route and stage
+
+    # Usage Accounting
+    USAGE_FLUSH_INTERVAL_SECONDS: float = 5.0
+    USAGE_FLUSH_BATCH_SIZE: int = 500  # buffered records that trigger a flush
+    USAGE_MAX_BUFFER: int = 50000  # oldest records dropped past this
+    # USD per 1M prompt/completion tokens and per 1K synthesized characters
+    USAGE_PRICES: Dict[str, Dict[str, float]] = {
+        "gpt-4o-mini": {"prompt_per_1m": 0.15, "completion_per_1m": 0.60},
+        "text-embedding-3-small": {"prompt_per_1m": 0.02},
+        "eleven_turbo_v2_5": {"characters_per_1k": 0.05},
+    }
+
     @field_validator("BACKEND_CORS_ORIGINS", mode="before")
     @classmethod
     def assemble_cors_origins(cls, v: Union[str, List[str]]) -> List[str]:
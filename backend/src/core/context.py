@@ -0,0 +1,17 @@
+"""
+Request-scoped context shared with code that has no access to the request.
+
+Values are held in context variables set by ``error_handling_middleware``,
+so they follow the request into dependencies, services, SQLAlchemy engine
+events and tasks created while handling it.
+"""
+
+from contextvars import ContextVar
+from typing import Optional
+
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+
+def get_request_id() -> Optional[str]:
+    """ID of the request being handled, if any."""
+    return request_id_var.get()
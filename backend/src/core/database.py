@@ -1,14 +1,44 @@
 """
 Database configuration and connection management.
+
+Every engine is instrumented through SQLAlchemy cursor events: statements
+are counted and timed into the ``QueryStats`` collectors active in the
+current context (one per request, set by ``error_handling_middleware``, plus
+any opened with ``track_queries``), slow statements are logged with their
+parameters redacted, and statements repeated within one scope are flagged
+as probable N+1 queries.
 """
 
+import logging
 import os
-from typing import AsyncGenerator
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, AsyncGenerator, Dict, Iterator, Set, Tuple
 
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import declarative_base, sessionmaker
 
 from .config import settings
+from .context import get_request_id
+from .metrics import counter, histogram
+
+logger = logging.getLogger(__name__)
+
+DB_QUERIES = counter("db_queries_total", "SQL statements executed")
+DB_QUERY_SECONDS = histogram(
+    "db_query_seconds",
+    "SQL statement execution time",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+DB_SLOW_QUERIES = counter("db_slow_queries_total", "SQL statements over the slow limit")
+DB_N_PLUS_ONE = counter(
+    "db_n_plus_one_total", "Statements repeated past the N+1 threshold in one request"
+)
 
 # Create declarative base for models
 Base = declarative_base()
@@ -18,6 +48,88 @@ engine = None
 AsyncSessionLocal = None
 
 
+@dataclass
+class QueryStats:
+    """SQL statements executed within a tracked scope."""
+
+    count: int = 0
+    duration: float = 0.0
+    statements: Counter = field(default_factory=Counter)
+    repeated: Set[str] = field(default_factory=set)  # probable N+1 statements
+
+    def record(self, statement: str, duration: float) -> bool:
+        """Count one execution; True when it makes ``statement`` an N+1."""
+        self.count += 1
+        self.duration += duration
+        self.statements[statement] += 1
+        if self.statements[statement] == settings.DB_N_PLUS_ONE_THRESHOLD:
+            self.repeated.add(statement)
+            return True
+        return False
+
+
+_query_collectors: ContextVar[Tuple[QueryStats, ...]] = ContextVar(
+    "query_collectors", default=()
+)
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """Collect the SQL statements executed in this context until exit."""
+    stats = QueryStats()
+    token = _query_collectors.set(_query_collectors.get() + (stats,))
+    try:
+        yield stats
+    finally:
+        _query_collectors.reset(token)
+
+
+def _redact(parameters: Any, executemany: bool) -> str:
+    """Describe bound parameters by type only, never by value."""
+    if executemany:
+        return f"<{len(parameters)} parameter sets>"
+    if isinstance(parameters, dict):
+        values = ", ".join(f"{k}=<{type(v).__name__}>" for k, v in parameters.items())
+        return "{" + values + "}"
+    return "(" + ", ".join(f"<{type(v).__name__}>" for v in parameters or ()) + ")"
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    duration = time.perf_counter() - conn.info["query_started"].pop()
+    DB_QUERIES.inc()
+    DB_QUERY_SECONDS.observe(duration)
+    if duration >= settings.DB_SLOW_QUERY_SECONDS:
+        DB_SLOW_QUERIES.inc()
+        logger.warning(
+            f"Slow query - Request: {get_request_id()}, "
+            f"Duration: {duration * 1000:.1f}ms, Statement: {statement}, "
+            f"Parameters: {_redact(parameters, executemany)}"
+        )
+    repeated = False
+    for stats in _query_collectors.get():
+        repeated = stats.record(statement, duration) or repeated
+    if repeated:
+        DB_N_PLUS_ONE.inc()
+        logger.warning(
+            f"Probable N+1 query - Request: {get_request_id()}, "
+            f"Executions: {settings.DB_N_PLUS_ONE_THRESHOLD}, Statement: {statement}"
+        )
+
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(context):
+    # after_cursor_execute does not fire for failed statements
+    connection = context.connection
+    if connection is not None and connection.info.get("query_started"):
+        connection.info["query_started"].pop()
+
+
 def get_engine():
     """Get or create the database engine."""
     global engine
@@ -27,11 +139,21 @@ def get_engine():
         if os.getenv("TESTING") == "true" or not database_url:
             database_url = "sqlite+aiosqlite:///./test.db"
 
+        connect_args: Dict[str, Any] = {}
+        if database_url.startswith("postgresql+asyncpg"):
+            # Prepared statements are reused per connection; 0 disables them,
+            # as needed behind PgBouncer in transaction pooling mode
+            connect_args["prepared_statement_cache_size"] = (
+                settings.DB_PREPARED_STATEMENT_CACHE_SIZE
+            )
+
         engine = create_async_engine(
             database_url,
             echo=settings.DEBUG,
             future=True,
             pool_pre_ping=True if not database_url.startswith("sqlite") else False,
+            query_cache_size=settings.DB_QUERY_CACHE_SIZE,
+            connect_args=connect_args,
         )
     return engine
 
@@ -61,6 +183,12 @@ async def init_db():
     current_engine = get_engine()
     async with current_engine.begin() as conn:
         # Import all models here to ensure they are registered with SQLAlchemy
-        from ..models import user  # noqa: F401
+        from ..models import (  # noqa: F401
+            crawl,
+            document,
+            embedding_cache,
+            usage,
+            user,
+        )
 
         await conn.run_sync(Base.metadata.create_all)
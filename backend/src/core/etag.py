@@ -0,0 +1,32 @@
+"""
+Weak ETags and conditional GET helpers.
+
+Validators are derived from row version columns already in memory, so a
+matching ``If-None-Match`` is answered with a 304 before any response body
+is built or serialized.
+"""
+
+import hashlib
+from datetime import datetime
+from typing import Optional
+
+
+def weak_etag(*parts: object) -> str:
+    """Weak ETag over ``parts`` (IDs, version timestamps)."""
+    key = "|".join(
+        part.isoformat() if isinstance(part, datetime) else str(part) for part in parts
+    )
+    return f'W/"{hashlib.blake2b(key.encode(), digest_size=8).hexdigest()}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether ``If-None-Match`` lists ``etag``, compared weakly."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque
+        for candidate in if_none_match.split(",")
+    )
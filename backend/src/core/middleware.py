@@ -5,20 +5,63 @@ Middleware for error handling, logging, and request processing.
 import logging
 import time
 import uuid
-from typing import Callable
+from typing import Callable, Dict
 
 from fastapi import HTTPException, Request, Response, status
 from fastapi.responses import JSONResponse
 
+from .config import settings
+from .context import request_id_var
+from .database import QueryStats, track_queries
+from .tracing import UNROUTED, tracer
+
 logger = logging.getLogger(__name__)
 
 
+def _query_headers(stats: QueryStats) -> Dict[str, str]:
+    if not settings.DB_QUERY_HEADERS:
+        return {}
+    return {
+        "X-DB-Queries": str(stats.count),
+        "X-DB-Time": f"{stats.duration * 1000:.2f}",
+    }
+
+
 async def error_handling_middleware(request: Request, call_next: Callable) -> Response:
     """Global error handling middleware."""
     # Generate request ID for tracing
     request_id = str(uuid.uuid4())
     request.state.request_id = request_id
+    token = request_id_var.set(request_id)
+    try:
+        with (
+            track_queries() as query_stats,
+            tracer.trace(
+                "request",
+                request_id,
+                traceparent=request.headers.get("traceparent"),
+                **{"http.method": request.method},
+            ) as root,
+        ):
+            response = await _handle(request, call_next, request_id, query_stats)
+            # Ends at response start; streamed bodies are not included
+            route = request.scope.get("route")
+            root.trace.route = getattr(route, "path", UNROUTED)
+            root.set(
+                **{
+                    "http.status_code": response.status_code,
+                    "db.queries": query_stats.count,
+                    "db.time_ms": round(query_stats.duration * 1000, 3),
+                }
+            )
+            return response
+    finally:
+        request_id_var.reset(token)
+
 
+async def _handle(
+    request: Request, call_next: Callable, request_id: str, query_stats: QueryStats
+) -> Response:
     start_time = time.time()
 
     try:
@@ -31,11 +74,14 @@ async def error_handling_middleware(request: Request, call_next: Callable) -> Re
             f"Method: {request.method}, "
             f"URL: {request.url}, "
             f"Status: {response.status_code}, "
-            f"Duration: {process_time:.4f}s"
+            f"Duration: {process_time:.4f}s, "
+            f"Queries: {query_stats.count}, "
+            f"DB time: {query_stats.duration * 1000:.1f}ms"
         )
 
         # Add request ID to response headers
         response.headers["X-Request-ID"] = request_id
+        response.headers.update(_query_headers(query_stats))
 
         return response
 
@@ -61,7 +107,7 @@ async def error_handling_middleware(request: Request, call_next: Callable) -> Re
                     "request_id": request_id,
                 }
             },
-            headers={"X-Request-ID": request_id},
+            headers={"X-Request-ID": request_id, **_query_headers(query_stats)},
         )
 
     except Exception as exc:
@@ -86,5 +132,5 @@ async def error_handling_middleware(request: Request, call_next: Callable) -> Re
                     "request_id": request_id,
                 }
             },
-            headers={"X-Request-ID": request_id},
+            headers={"X-Request-ID": request_id, **_query_headers(query_stats)},
         )
@@ -0,0 +1,266 @@
+"""
+On-demand cProfile capture of single requests.
+
+``ProfilingMiddleware`` is a plain ASGI middleware installed outermost, and
+only when ``PROFILING_ENABLED`` is set, so a disabled deployment runs no
+profiling code at all. When installed, a request is profiled if it carries a
+valid ``X-Profile-Token`` (an HMAC-signed, expiring grant for a path prefix,
+minted by a superuser through the admin endpoints) or if it matches a
+sampling rule. Profiles cover the whole middleware chain and the streamed
+response body, and are kept in a bounded on-disk ring.
+
+cProfile records everything run on the event loop thread while enabled, so
+work of concurrent requests can appear in a profile; only one request is
+profiled at a time.
+"""
+
+import asyncio
+import base64
+import cProfile
+import hashlib
+import hmac
+import io
+import json
+import logging
+import os
+import pstats
+import random
+import re
+import threading
+import time
+import uuid
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+PROFILE_TOKEN_HEADER = "X-Profile-Token"
+_HEADER_KEY = PROFILE_TOKEN_HEADER.lower().encode("latin-1")
+_PROFILE_ID = re.compile(r"^[0-9]{13}-[0-9a-f]{8}$")
+
+
+def _b64encode(value: str) -> str:
+    return base64.urlsafe_b64encode(value.encode()).decode().rstrip("=")
+
+
+def _b64decode(value: str) -> str:
+    return base64.urlsafe_b64decode(value + "=" * (-len(value) % 4)).decode()
+
+
+def _signature(secret: str, payload: str) -> str:
+    return hmac.new(secret.encode(), payload.encode(), hashlib.sha256).hexdigest()
+
+
+def sign_profile_token(secret: str, path_prefix: str, expires_at: int) -> str:
+    """Token allowing requests under ``path_prefix`` to be profiled."""
+    payload = f"{expires_at}.{_b64encode(path_prefix)}"
+    return f"{payload}.{_signature(secret, payload)}"
+
+
+def verify_profile_token(
+    secret: str, token: str, path: str, now: Optional[float] = None
+) -> bool:
+    """Whether ``token`` is genuine, unexpired and covers ``path``."""
+    try:
+        expires_at, encoded_prefix, signature = token.split(".")
+        payload = f"{expires_at}.{encoded_prefix}"
+        if not hmac.compare_digest(signature, _signature(secret, payload)):
+            return False
+        if int(expires_at) < (now if now is not None else time.time()):
+            return False
+        return path.startswith(_b64decode(encoded_prefix))
+    except ValueError:
+        return False
+
+
+@dataclass
+class ProfileInfo:
+    """Metadata stored next to each profile."""
+
+    id: str
+    method: str
+    path: str
+    status_code: Optional[int]
+    duration_ms: float
+    trigger: str  # "token" or "sampling"
+    created_at: float
+    size_bytes: int = 0
+
+
+@dataclass
+class SamplingRule:
+    """Profile ``rate`` of requests whose path starts with ``route``."""
+
+    route: str
+    rate: float
+    max_profiles: Optional[int] = None  # rule removes itself after this many
+
+    captured: int = 0
+
+
+class ProfileStore:
+    """Ring of at most ``max_files`` profiles in ``root``, oldest dropped."""
+
+    def __init__(self, root: str, max_files: int = 50):
+        self.root = root
+        self.max_files = max_files
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def new_id() -> str:
+        """Time-ordered profile ID."""
+        return f"{int(time.time() * 1000):013d}-{uuid.uuid4().hex[:8]}"
+
+    def path(self, profile_id: str) -> str:
+        """Path of the ``.prof`` file of ``profile_id``."""
+        if not _PROFILE_ID.match(profile_id):
+            raise ValueError(f"Invalid profile ID: {profile_id!r}")
+        return os.path.join(self.root, f"{profile_id}.prof")
+
+    def save(self, profile: cProfile.Profile, info: ProfileInfo) -> ProfileInfo:
+        """Write a profile and its metadata, then trim the ring."""
+        path = self.path(info.id)
+        with self._lock:
+            os.makedirs(self.root, exist_ok=True)
+            profile.dump_stats(path)
+            info.size_bytes = os.path.getsize(path)
+            with open(path[: -len(".prof")] + ".json", "w") as f:
+                json.dump(asdict(info), f)
+            for stale in self._ids()[: -self.max_files]:
+                for suffix in (".prof", ".json"):
+                    try:
+                        os.unlink(os.path.join(self.root, stale + suffix))
+                    except FileNotFoundError:
+                        pass
+        return info
+
+    def _ids(self) -> List[str]:
+        try:
+            names = os.listdir(self.root)
+        except FileNotFoundError:
+            return []
+        return sorted(
+            name[: -len(".prof")]
+            for name in names
+            if name.endswith(".prof") and _PROFILE_ID.match(name[: -len(".prof")])
+        )
+
+    def list(self) -> List[ProfileInfo]:
+        """Stored profiles, newest first."""
+        infos = []
+        for profile_id in reversed(self._ids()):
+            try:
+                with open(os.path.join(self.root, f"{profile_id}.json")) as f:
+                    infos.append(ProfileInfo(**json.load(f)))
+            except (FileNotFoundError, ValueError, TypeError):
+                continue
+        return infos
+
+    def report(self, profile_id: str, sort: str = "cumulative", limit: int = 60) -> str:
+        """Human-readable pstats summary of a stored profile."""
+        out = io.StringIO()
+        stats = pstats.Stats(self.path(profile_id), stream=out)
+        stats.strip_dirs().sort_stats(sort).print_stats(limit)
+        return out.getvalue()
+
+
+class Profiler:
+    """Profile store, signing secret and sampling rules."""
+
+    def __init__(
+        self,
+        store: ProfileStore,
+        secret: str,
+        random_fn: Callable[[], float] = random.random,
+    ):
+        self.store = store
+        self.secret = secret
+        self.random = random_fn
+        self.rules: Dict[str, SamplingRule] = {}
+        self._busy = threading.Lock()
+
+    def set_rule(self, rule: SamplingRule) -> None:
+        """Add or replace the sampling rule for ``rule.route``."""
+        self.rules[rule.route] = rule
+
+    def remove_rule(self, route: str) -> bool:
+        """Delete a sampling rule; returns whether it existed."""
+        return self.rules.pop(route, None) is not None
+
+    def trigger(self, scope: Dict[str, Any]) -> Optional[str]:
+        """Why this request should be profiled, or ``None``."""
+        path = scope["path"]
+        for key, value in scope["headers"]:
+            if key == _HEADER_KEY:
+                token = value.decode("latin-1")
+                if verify_profile_token(self.secret, token, path):
+                    return "token"
+                logger.warning(f"Rejected profile token - Path: {path}")
+                break
+        for rule in list(self.rules.values()):
+            if path.startswith(rule.route) and self.random() < rule.rate:
+                rule.captured += 1
+                if rule.max_profiles is not None and rule.captured >= rule.max_profiles:
+                    self.rules.pop(rule.route, None)
+                return "sampling"
+        return None
+
+
+class ProfilingMiddleware:
+    """ASGI middleware profiling requests selected by ``Profiler.trigger``."""
+
+    def __init__(self, app: Any, profiler: Profiler):
+        self.app = app
+        self.profiler = profiler
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        trigger = self.profiler.trigger(scope)
+        # One profile at a time: cProfile hooks the whole thread
+        if trigger is None or not self.profiler._busy.acquire(blocking=False):
+            await self.app(scope, receive, send)
+            return
+
+        info = ProfileInfo(
+            id=ProfileStore.new_id(),
+            method=scope["method"],
+            path=scope["path"],
+            status_code=None,
+            duration_ms=0.0,
+            trigger=trigger,
+            created_at=time.time(),
+        )
+
+        async def send_with_id(message) -> None:
+            if message["type"] == "http.response.start":
+                info.status_code = message["status"]
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [
+                    (b"x-profile-id", info.id.encode())
+                ]
+            await send(message)
+
+        profile = cProfile.Profile()
+        started = time.perf_counter()
+        try:
+            profile.enable()
+        except ValueError:  # another profiler owns the thread
+            self.profiler._busy.release()
+            await self.app(scope, receive, send)
+            return
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            profile.disable()
+            self.profiler._busy.release()
+            info.duration_ms = (time.perf_counter() - started) * 1000
+            try:
+                await asyncio.to_thread(self.profiler.store.save, profile, info)
+                logger.info(
+                    f"Request profiled - ID: {info.id}, Trigger: {trigger}, "
+                    f"Path: {info.path}, Duration: {info.duration_ms:.1f}ms"
+                )
+            except OSError as e:
+                logger.error(f"Saving profile failed - ID: {info.id}, Error: {e}")
@@ -0,0 +1,83 @@
+"""
+Single-flight coalescing of concurrent identical async calls.
+
+Callers of ``SingleFlight.do`` with the same key while a call is in flight
+await that call instead of starting their own, so a burst of identical
+lookups costs one round trip. Nothing is cached: once the call finishes the
+next caller starts a new one.
+
+The shared call runs as its own task. A cancelled caller only stops waiting;
+the call is cancelled once no caller is waiting for it. Errors are raised to
+every caller that shared the call.
+"""
+
+import asyncio
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, Generic, Hashable, TypeVar
+
+from .metrics import counter, gauge
+
+T = TypeVar("T")
+
+SINGLEFLIGHT_CALLS = counter(
+    "singleflight_calls_total",
+    "Single-flight calls by whether they started the call or shared one",
+    ["name", "role"],
+)
+SINGLEFLIGHT_ERRORS = counter(
+    "singleflight_errors_total", "Single-flight calls that raised", ["name"]
+)
+SINGLEFLIGHT_IN_FLIGHT = gauge(
+    "singleflight_in_flight", "Single-flight calls currently running", ["name"]
+)
+
+
+@dataclass
+class _Call(Generic[T]):
+    task: "asyncio.Task[T]"
+    waiters: int = 0
+
+
+class SingleFlight(Generic[T]):
+    """Coalesces concurrent calls that share a key."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._calls: Dict[Hashable, _Call[T]] = {}
+
+    @property
+    def in_flight(self) -> int:
+        """Calls currently running."""
+        return len(self._calls)
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """Result of ``fn()``, shared with concurrent callers using ``key``."""
+        call = self._calls.get(key)
+        if call is None:
+            call = _Call(asyncio.ensure_future(fn()))
+            self._calls[key] = call
+            SINGLEFLIGHT_IN_FLIGHT.inc(name=self.name)
+            call.task.add_done_callback(lambda task: self._finished(key, call))
+            SINGLEFLIGHT_CALLS.inc(name=self.name, role="leader")
+        else:
+            SINGLEFLIGHT_CALLS.inc(name=self.name, role="shared")
+
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task)
+        finally:
+            call.waiters -= 1
+            if not call.waiters and not call.task.done():
+                # Every caller was cancelled; nobody needs the result
+                call.task.cancel()
+                self._forget(key, call)
+
+    def _forget(self, key: Hashable, call: _Call[T]) -> None:
+        if self._calls.get(key) is call:
+            del self._calls[key]
+            SINGLEFLIGHT_IN_FLIGHT.inc(-1, name=self.name)
+
+    def _finished(self, key: Hashable, call: _Call[T]) -> None:
+        self._forget(key, call)
+        if not call.task.cancelled() and call.task.exception() is not None:
+            SINGLEFLIGHT_ERRORS.inc(name=self.name)
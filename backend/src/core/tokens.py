@@ -0,0 +1,43 @@
+"""
+Token counting for LLM context budgeting.
+
+Uses tiktoken when it is installed; otherwise falls back to a fast
+approximation (roughly one token per four characters of each word, plus one
+per punctuation mark), which tracks cl100k_base within a few percent on
+English prose.
+"""
+
+import math
+import re
+from functools import lru_cache
+from typing import Callable, Optional
+
+_PIECES = re.compile(r"\w+|[^\w\s]")
+
+# Fixed per-message cost of the chat format (role and delimiters)
+MESSAGE_OVERHEAD_TOKENS = 4
+
+_encode: Optional[Callable[[str], list]]
+try:
+    import tiktoken
+
+    _encode = tiktoken.get_encoding("cl100k_base").encode
+except ImportError:  # pragma: no cover - depends on the environment
+    _encode = None
+
+
+def _approximate(text: str) -> int:
+    return sum(math.ceil(len(piece) / 4) for piece in _PIECES.findall(text))
+
+
+@lru_cache(maxsize=4096)
+def count_tokens(text: str) -> int:
+    """Number of tokens in ``text``."""
+    if _encode is not None:
+        return len(_encode(text))
+    return _approximate(text)
+
+
+def count_message_tokens(content: str) -> int:
+    """Tokens a chat message with ``content`` occupies in the prompt."""
+    return count_tokens(content) + MESSAGE_OVERHEAD_TOKENS
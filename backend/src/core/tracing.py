@@ -0,0 +1,455 @@
+"""
+Per-stage request tracing exported as OTLP/JSON.
+
+``error_handling_middleware`` opens a trace for every request. Its trace ID
+is the request ID (a UUID4 is exactly the 16 bytes a trace ID needs), or the
+trace ID of an incoming W3C ``traceparent`` header. Stages open child spans
+with ``span(name)``; the current span is held in a context variable, so it
+follows the request into dependencies and into tasks and ``to_thread``
+calls started while handling it. Work sent to a process pool is timed from
+the server side with ``start_span`` and ended when its result arrives.
+
+Finished spans feed two consumers:
+
+- rolling per-route, per-stage latency windows, summarized as p50/p95/p99
+  by the admin traces endpoint;
+- a bounded queue flushed periodically to a ``SpanExporter``: a rotating
+  local file of OTLP/JSON lines, or an OTLP/HTTP collector.
+
+Spans ending before the request's route is known (every stage that runs
+inside the endpoint) are held by their trace until the middleware sets it.
+"""
+
+import asyncio
+import json
+import logging
+import math
+import os
+import re
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
+
+import httpx
+
+from .config import Settings, settings
+from .metrics import counter
+
+logger = logging.getLogger(__name__)
+
+TRACE_SPANS_DROPPED = counter(
+    "trace_spans_dropped_total", "Spans dropped before export", ["reason"]
+)
+TRACE_SPANS_EXPORTED = counter("trace_spans_exported_total", "Spans exported")
+
+UNROUTED = "unmatched"  # route of requests no endpoint matched
+BACKGROUND = "background"  # route of spans started outside any request
+
+# OTLP span kinds and status codes
+_KIND_INTERNAL = 1
+_KIND_SERVER = 2
+_STATUS_UNSET = 0
+_STATUS_ERROR = 2
+
+_TRACEPARENT = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-[0-9a-f]{2}$")
+
+
+def parse_traceparent(header: Optional[str]) -> Optional[Tuple[str, str]]:
+    """Trace ID and parent span ID of a W3C ``traceparent`` header."""
+    match = _TRACEPARENT.match((header or "").strip().lower())
+    if match is None or set(match.group(1)) == {"0"} or set(match.group(2)) == {"0"}:
+        return None
+    return match.group(1), match.group(2)
+
+
+def _new_span_id() -> str:
+    return os.urandom(8).hex()
+
+
+class _Trace:
+    """Spans of one request, held until the route is known."""
+
+    def __init__(self, trace_id: str, route: Optional[str] = None):
+        self.trace_id = trace_id
+        self.route = route
+        self.held: List["Span"] = []
+
+
+@dataclass
+class Span:
+    """A timed stage of a trace."""
+
+    name: str
+    trace: _Trace
+    tracer: "Tracer"
+    parent_id: Optional[str] = None
+    kind: int = _KIND_INTERNAL
+    span_id: str = field(default_factory=_new_span_id)
+    start_ns: int = field(default_factory=time.time_ns)
+    end_ns: Optional[int] = None
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+
+    @property
+    def duration(self) -> float:
+        """Seconds from start to end (or to now, while open)."""
+        end = self.end_ns if self.end_ns is not None else time.time_ns()
+        return (end - self.start_ns) / 1e9
+
+    def set(self, **attributes: Any) -> None:
+        """Add attributes; names may use dots via ``**{"http.route": ...}``."""
+        self.attributes.update(attributes)
+
+    def end(self, error: Optional[BaseException] = None) -> None:
+        """Finish the span; later calls are ignored."""
+        if self.end_ns is not None:
+            return
+        self.end_ns = time.time_ns()
+        if error is not None:
+            self.error = str(error) or type(error).__name__
+        self.tracer._finish(self)
+
+
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+def current_span() -> Optional[Span]:
+    """Innermost open span in this context, if any."""
+    return _current_span.get()
+
+
+class StageLatencies:
+    """Rolling latency samples per route and stage."""
+
+    def __init__(self, window_seconds: float = 300.0, max_samples: int = 2048):
+        self.window_seconds = window_seconds
+        self.max_samples = max_samples
+        self._samples: Dict[Tuple[str, str], Deque[Tuple[float, float]]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, route: str, stage: str, duration: float) -> None:
+        """Add a ``duration`` (seconds) sample."""
+        with self._lock:
+            samples = self._samples.get((route, stage))
+            if samples is None:
+                samples = self._samples[(route, stage)] = deque(maxlen=self.max_samples)
+            samples.append((time.monotonic(), duration))
+
+    def summary(self, route: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Count and p50/p95/p99 (ms) of samples within the window."""
+        cutoff = time.monotonic() - self.window_seconds
+        with self._lock:
+            items = [
+                (key, [d for at, d in samples if at >= cutoff])
+                for key, samples in self._samples.items()
+                if route is None or key[0] == route
+            ]
+        rows = []
+        for (key_route, stage), durations in sorted(items):
+            if not durations:
+                continue
+            durations.sort()
+            rows.append(
+                {
+                    "route": key_route,
+                    "stage": stage,
+                    "count": len(durations),
+                    "p50_ms": _percentile(durations, 0.50) * 1000,
+                    "p95_ms": _percentile(durations, 0.95) * 1000,
+                    "p99_ms": _percentile(durations, 0.99) * 1000,
+                }
+            )
+        return rows
+
+    def clear(self) -> None:
+        """Forget every sample."""
+        with self._lock:
+            self._samples.clear()
+
+
+def _percentile(ordered: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of sorted values."""
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def _attribute(key: str, value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        encoded: Dict[str, Any] = {"boolValue": value}
+    elif isinstance(value, int):
+        encoded = {"intValue": str(value)}  # int64 is a string in OTLP/JSON
+    elif isinstance(value, float):
+        encoded = {"doubleValue": value}
+    else:
+        encoded = {"stringValue": str(value)}
+    return {"key": key, "value": encoded}
+
+
+def otlp_payload(spans: List[Span], service_name: str) -> Dict[str, Any]:
+    """OTLP/JSON ``ExportTraceServiceRequest`` for ``spans``."""
+    encoded = []
+    for span in spans:
+        attributes = dict(span.attributes)
+        if span.trace.route is not None:
+            attributes.setdefault("http.route", span.trace.route)
+        item: Dict[str, Any] = {
+            "traceId": span.trace.trace_id,
+            "spanId": span.span_id,
+            "name": span.name,
+            "kind": span.kind,
+            "startTimeUnixNano": str(span.start_ns),
+            "endTimeUnixNano": str(span.end_ns),
+            "attributes": [_attribute(k, v) for k, v in attributes.items()],
+            "status": (
+                {"code": _STATUS_ERROR, "message": span.error}
+                if span.error is not None
+                else {"code": _STATUS_UNSET}
+            ),
+        }
+        if span.parent_id is not None:
+            item["parentSpanId"] = span.parent_id
+        encoded.append(item)
+    return {
+        "resourceSpans": [
+            {
+                "resource": {"attributes": [_attribute("service.name", service_name)]},
+                "scopeSpans": [{"scope": {"name": "memvoice"}, "spans": encoded}],
+            }
+        ]
+    }
+
+
+class SpanExporter:
+    """Destination for batches of finished spans."""
+
+    async def export(self, payload: Dict[str, Any]) -> None:
+        """Send one OTLP/JSON ``ExportTraceServiceRequest``."""
+        raise NotImplementedError
+
+    async def aclose(self) -> None:
+        """Release connections or files."""
+
+
+class FileSpanExporter(SpanExporter):
+    """Appends one OTLP/JSON request per line to a size-rotated file."""
+
+    def __init__(self, path: str, max_bytes: int = 10 * 1024 * 1024, backups: int = 5):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    async def export(self, payload: Dict[str, Any]) -> None:
+        line = json.dumps(payload, separators=(",", ":")) + "\n"
+        await asyncio.to_thread(self._write, line.encode())
+
+    def _write(self, data: bytes) -> None:
+        try:
+            size = os.path.getsize(self.path)
+        except FileNotFoundError:
+            size = 0
+        if size and size + len(data) > self.max_bytes:
+            self._rotate()
+        with open(self.path, "ab") as f:
+            f.write(data)
+
+    def _rotate(self) -> None:
+        # spans.jsonl -> spans.jsonl.1 -> ... -> spans.jsonl.<backups> (deleted)
+        for index in range(self.backups, 0, -1):
+            source = f"{self.path}.{index - 1}" if index > 1 else self.path
+            if os.path.exists(source):
+                os.replace(source, f"{self.path}.{index}")
+        if not self.backups:
+            os.remove(self.path)
+
+
+class OtlpHttpSpanExporter(SpanExporter):
+    """Posts OTLP/JSON to a collector's ``/v1/traces`` endpoint."""
+
+    def __init__(self, endpoint: str, client: Optional[httpx.AsyncClient] = None):
+        self.endpoint = endpoint
+        self.client = client or httpx.AsyncClient(timeout=10.0)
+
+    async def export(self, payload: Dict[str, Any]) -> None:
+        response = await self.client.post(self.endpoint, json=payload)
+        response.raise_for_status()
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+
+def build_span_exporter(settings: Settings) -> Optional[SpanExporter]:
+    """Create the exporter selected by ``TRACING_EXPORTER``."""
+    if settings.TRACING_EXPORTER == "file":
+        return FileSpanExporter(
+            settings.TRACING_FILE_PATH,
+            max_bytes=settings.TRACING_FILE_MAX_BYTES,
+            backups=settings.TRACING_FILE_BACKUPS,
+        )
+    if settings.TRACING_EXPORTER == "otlp":
+        return OtlpHttpSpanExporter(settings.TRACING_OTLP_ENDPOINT)
+    if settings.TRACING_EXPORTER == "none":
+        return None
+    raise ValueError(f"Unknown span exporter: {settings.TRACING_EXPORTER!r}")
+
+
+class Tracer:
+    """Creates spans, aggregates their latencies and batches their export."""
+
+    def __init__(
+        self,
+        service_name: str = "memvoice-api",
+        enabled: bool = True,
+        window_seconds: float = 300.0,
+        window_samples: int = 2048,
+        max_queue: int = 10000,
+        flush_interval: float = 5.0,
+    ):
+        self.service_name = service_name
+        self.enabled = enabled
+        self.latencies = StageLatencies(window_seconds, window_samples)
+        self.max_queue = max_queue
+        self.flush_interval = flush_interval
+        self.exporter: Optional[SpanExporter] = None
+        self._queue: Deque[Span] = deque()
+        self._lock = threading.Lock()
+        self._timer_task: Optional[asyncio.Task] = None
+
+    @contextmanager
+    def trace(
+        self,
+        name: str,
+        request_id: str,
+        traceparent: Optional[str] = None,
+        **attributes: Any,
+    ) -> Iterator[Span]:
+        """Open a request's root span as the current span."""
+        parent = parse_traceparent(traceparent)
+        if parent is not None:
+            trace_id, parent_id = parent
+        else:
+            trace_id, parent_id = uuid.UUID(request_id).hex, None
+        root = Span(
+            name,
+            _Trace(trace_id),
+            self,
+            parent_id=parent_id,
+            kind=_KIND_SERVER,
+            attributes={"request.id": request_id, **attributes},
+        )
+        token = _current_span.set(root)
+        try:
+            yield root
+        finally:
+            _current_span.reset(token)
+            with self._lock:
+                if root.trace.route is None:
+                    root.trace.route = UNROUTED
+            root.end()
+            self._release(root.trace)
+
+    def start_span(self, name: str, **attributes: Any) -> Span:
+        """Open a child of the current span without making it current."""
+        parent = _current_span.get()
+        if parent is None:
+            return Span(name, _Trace(os.urandom(16).hex(), BACKGROUND), self)
+        return Span(
+            name,
+            parent.trace,
+            self,
+            parent_id=parent.span_id,
+            attributes=attributes,
+        )
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[Span]:
+        """Time a block as a child of the current span."""
+        span = self.start_span(name, **attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.end(error=e)
+            raise
+        finally:
+            _current_span.reset(token)
+            span.end()
+
+    def _finish(self, span: Span) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            if span.trace.route is None:
+                span.trace.held.append(span)
+                return
+        self._record(span)
+
+    def _release(self, trace: _Trace) -> None:
+        with self._lock:
+            held, trace.held = trace.held, []
+        for span in held:
+            self._record(span)
+
+    def _record(self, span: Span) -> None:
+        assert span.trace.route is not None
+        self.latencies.record(span.trace.route, span.name, span.duration)
+        if self.exporter is None:
+            return
+        with self._lock:
+            self._queue.append(span)
+            if len(self._queue) > self.max_queue:
+                self._queue.popleft()
+                TRACE_SPANS_DROPPED.inc(reason="queue_full")
+
+    def start(self, exporter: Optional[SpanExporter]) -> None:
+        """Export finished spans to ``exporter`` every ``flush_interval``."""
+        self.exporter = exporter
+        if exporter is not None and self._timer_task is None:
+            self._timer_task = asyncio.create_task(self._flush_periodically())
+
+    async def stop(self) -> None:
+        """Flush the queue and close the exporter."""
+        if self._timer_task is not None:
+            self._timer_task.cancel()
+            await asyncio.gather(self._timer_task, return_exceptions=True)
+            self._timer_task = None
+        if self.exporter is not None:
+            await self.flush()
+            await self.exporter.aclose()
+            self.exporter = None
+
+    async def flush(self) -> int:
+        """Export queued spans; returns how many were sent."""
+        with self._lock:
+            batch = list(self._queue)
+            self._queue.clear()
+        if not batch or self.exporter is None:
+            return 0
+        try:
+            await self.exporter.export(otlp_payload(batch, self.service_name))
+        except Exception as e:
+            TRACE_SPANS_DROPPED.inc(len(batch), reason="export_failed")
+            logger.error(f"Span export failed - Spans: {len(batch)}, Error: {e}")
+            return 0
+        TRACE_SPANS_EXPORTED.inc(len(batch))
+        return len(batch)
+
+    async def _flush_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+
+tracer = Tracer(
+    enabled=settings.TRACING_ENABLED,
+    window_seconds=settings.TRACING_WINDOW_SECONDS,
+    window_samples=settings.TRACING_WINDOW_SAMPLES,
+    max_queue=settings.TRACING_MAX_QUEUE,
+    flush_interval=settings.TRACING_FLUSH_INTERVAL_SECONDS,
+)
+span = tracer.span
+start_span = tracer.start_span
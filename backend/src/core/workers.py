@@ -0,0 +1,35 @@
+"""
+Shared process pool for CPU-bound work kept off the event loop.
+"""
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+from .config import settings
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """Get or create the process pool.
+
+    Workers are spawned rather than forked so they don't inherit the event
+    loop, open sockets or database connections of the server process.
+    """
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(
+            max_workers=settings.PROCESS_POOL_WORKERS or os.cpu_count() or 1,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _pool
+
+
+def shutdown_process_pool() -> None:
+    """Stop the pool's worker processes."""
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=True, cancel_futures=True)
+        _pool = None
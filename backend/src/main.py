@@ -2,16 +2,46 @@
 MemVoice FastAPI Application
 """
 
+import asyncio
 import logging
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from .api.v1 import auth, health, users
+from .api.deps import (
+    close_bm25_store,
+    close_semantic_cache,
+    close_session_store,
+    close_transcoding_pool,
+    close_vector_store,
+    close_voice_providers,
+    get_activity_tracker,
+    get_admission_controller,
+    get_profiler,
+    get_usage_recorder,
+    get_warmup,
+)
+from .api.v1 import (
+    auth,
+    health,
+    metrics,
+    profiles,
+    retrieval,
+    sites,
+    traces,
+    usage,
+    users,
+    voice,
+)
+from .core.admission import AdmissionMiddleware
+from .core.compression import CompressionMiddleware
 from .core.config import settings
 from .core.database import init_db
 from .core.middleware import error_handling_middleware
+from .core.profiling import ProfilingMiddleware
+from .core.tracing import build_span_exporter, tracer
+from .core.workers import shutdown_process_pool
 
 # Configure logging
 logging.basicConfig(
@@ -33,9 +63,38 @@ async def lifespan(app: FastAPI):
         logger.error(f"Database initialization failed: {e}")
         raise
 
+    usage_recorder = get_usage_recorder()
+    usage_recorder.start()
+    activity_tracker = get_activity_tracker()
+    activity_tracker.start()
+    tracer.start(build_span_exporter(settings))
+
+    # Readiness is reported by /health/ready once warm-up has run
+    warmup = get_warmup()
+    warmup_task = None
+    if not settings.WARMUP_ENABLED:
+        warmup.mark_ready()
+    elif settings.WARMUP_BLOCKING:
+        await warmup.run()
+    else:
+        warmup_task = asyncio.ensure_future(warmup.run())
+
     yield
 
     logger.info("Shutting down MemVoice API...")
+    if warmup_task is not None:
+        warmup_task.cancel()
+        await asyncio.gather(warmup_task, return_exceptions=True)
+    await usage_recorder.stop()
+    await activity_tracker.stop()
+    await tracer.stop()
+    await close_voice_providers()
+    await close_session_store()
+    await close_transcoding_pool()
+    close_vector_store()
+    close_bm25_store()
+    close_semantic_cache()
+    shutdown_process_pool()
 
 
 # Create FastAPI application
@@ -50,6 +109,10 @@ app = FastAPI(
 )
 
 
+# Innermost, so shed requests still get CORS and request ID headers
+if settings.ADMISSION_ENABLED:
+    app.add_middleware(AdmissionMiddleware, controller=get_admission_controller())
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -63,6 +126,18 @@ app.add_middleware(
 # Add custom middleware
 app.middleware("http")(error_handling_middleware)
 
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MIN_BYTES,
+        gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+        brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+    )
+
+# Outermost, so profiles cover the whole chain; not installed at all when off
+if settings.PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware, profiler=get_profiler())
+
 
 # Include routers
 app.include_router(
@@ -75,6 +150,28 @@ app.include_router(
 
 app.include_router(users.router, prefix=f"{settings.API_V1_STR}/users", tags=["users"])
 
+app.include_router(voice.router, prefix=f"{settings.API_V1_STR}/voice", tags=["voice"])
+
+app.include_router(sites.router, prefix=f"{settings.API_V1_STR}/sites", tags=["sites"])
+
+app.include_router(
+    retrieval.router, prefix=f"{settings.API_V1_STR}/retrieval", tags=["retrieval"]
+)
+
+app.include_router(usage.router, prefix=f"{settings.API_V1_STR}/usage", tags=["usage"])
+
+app.include_router(
+    metrics.router, prefix=f"{settings.API_V1_STR}/metrics", tags=["metrics"]
+)
+
+app.include_router(
+    profiles.router, prefix=f"{settings.API_V1_STR}/profiles", tags=["profiling"]
+)
+
+app.include_router(
+    traces.router, prefix=f"{settings.API_V1_STR}/traces", tags=["tracing"]
+)
+
 
 # Root endpoint
 @app.get("/")
@@ -1,5 +1,17 @@
 """Database models for MemVoice API."""
 
+from .crawl import CrawlPage, CrawlSite
+from .document import DocumentChunk
+from .embedding_cache import EmbeddingCacheEntry
+from .usage import UsageDaily, UsageEvent
 from .user import User
 
-__all__ = ["User"]
+__all__ = [
+    "CrawlPage",
+    "CrawlSite",
+    "DocumentChunk",
+    "EmbeddingCacheEntry",
+    "UsageDaily",
+    "UsageEvent",
+    "User",
+]
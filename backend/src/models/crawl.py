@@ -0,0 +1,57 @@
+"""
+Crawl state models for incremental website ingestion.
+"""
+
+from sqlalchemy import (
+    Boolean,
+    Column,
+    DateTime,
+    ForeignKey,
+    Integer,
+    String,
+    UniqueConstraint,
+)
+from sqlalchemy.sql import func
+
+from ..core.database import Base
+
+
+class CrawlSite(Base):
+    """A website ingested for a user's voice agent."""
+
+    __tablename__ = "crawl_sites"
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    root_url = Column(String(2048), nullable=False)
+    last_crawled_at = Column(DateTime(timezone=True), nullable=True)
+
+    created_at = Column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+    def __repr__(self) -> str:
+        return f"<CrawlSite(id={self.id}, root_url={self.root_url})>"
+
+
+class CrawlPage(Base):
+    """Last fetch of a page, used for conditional re-crawls."""
+
+    __tablename__ = "crawl_pages"
+
+    id = Column(Integer, primary_key=True)
+    site_id = Column(Integer, ForeignKey("crawl_sites.id"), nullable=False)
+    url = Column(String(2048), nullable=False)
+    status_code = Column(Integer, nullable=True)
+    etag = Column(String(256), nullable=True)
+    last_modified = Column(String(64), nullable=True)
+    content_hash = Column(String(64), nullable=True)  # SHA-256 of the raw body
+    rendered = Column(Boolean, default=False, nullable=False)  # needed JavaScript
+
+    fetched_at = Column(DateTime(timezone=True), nullable=True)
+    changed_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (UniqueConstraint("site_id", "url", name="uq_crawl_pages_url"),)
+
+    def __repr__(self) -> str:
+        return f"<CrawlPage(id={self.id}, url={self.url})>"
@@ -0,0 +1,27 @@
+"""
+Indexed document chunk model.
+"""
+
+from sqlalchemy import Column, ForeignKey, Index, Integer, String, Text
+
+from ..core.database import Base
+
+
+class DocumentChunk(Base):
+    """A chunk of page text that is embedded in the site's vector namespace."""
+
+    __tablename__ = "document_chunks"
+
+    site_id = Column(Integer, ForeignKey("crawl_sites.id"), primary_key=True)
+    chunk_id = Column(String(32), primary_key=True)  # see extraction.chunk_id
+    url = Column(String(2048), nullable=False)
+    position = Column(Integer, nullable=False)
+    title = Column(String(512), nullable=True)
+    heading = Column(String(512), nullable=True)
+    text = Column(Text, nullable=False)
+    token_count = Column(Integer, nullable=False)
+
+    __table_args__ = (Index("ix_document_chunks_site_url", "site_id", "url"),)
+
+    def __repr__(self) -> str:
+        return f"<DocumentChunk(site_id={self.site_id}, chunk_id={self.chunk_id})>"
@@ -0,0 +1,29 @@
+"""
+Embedding cache model for deduplicating embedding requests.
+"""
+
+from sqlalchemy import Column, DateTime, Integer, LargeBinary, String
+from sqlalchemy.sql import func
+
+from ..core.database import Base
+
+
+class EmbeddingCacheEntry(Base):
+    """Embedding of normalized text, keyed by model and content hash."""
+
+    __tablename__ = "embedding_cache"
+
+    model = Column(String(100), primary_key=True)
+    content_hash = Column(String(64), primary_key=True)  # SHA-256 hex digest
+    dimensions = Column(Integer, nullable=False)
+    embedding = Column(LargeBinary, nullable=False)  # little-endian float32
+
+    created_at = Column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<EmbeddingCacheEntry(model={self.model}, "
+            f"content_hash={self.content_hash})>"
+        )
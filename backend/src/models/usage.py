@@ -0,0 +1,69 @@
+"""
+Usage accounting models: raw usage events and per-day rollups.
+"""
+
+from sqlalchemy import (
+    Column,
+    Date,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+)
+
+from ..core.database import Base
+
+
+class UsageEvent(Base):
+    """Tokens, characters and audio consumed by one pipeline stage."""
+
+    __tablename__ = "usage_events"
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    site_id = Column(String(100), nullable=True)
+    stage = Column(String(20), nullable=False)  # "llm", "tts", ...
+    model = Column(String(100), nullable=False)
+    prompt_tokens = Column(Integer, nullable=False, default=0)
+    completion_tokens = Column(Integer, nullable=False, default=0)
+    characters = Column(Integer, nullable=False, default=0)
+    audio_seconds = Column(Float, nullable=False, default=0.0)
+    cost_usd = Column(Float, nullable=False, default=0.0)
+
+    # When the usage happened, not when the buffer was flushed
+    created_at = Column(DateTime(timezone=True), nullable=False)
+
+    __table_args__ = (Index("ix_usage_events_user_created", "user_id", "created_at"),)
+
+    def __repr__(self) -> str:
+        return (
+            f"<UsageEvent(id={self.id}, user_id={self.user_id}, "
+            f"stage={self.stage}, model={self.model})>"
+        )
+
+
+class UsageDaily(Base):
+    """Usage totals per user, UTC day, stage and model."""
+
+    __tablename__ = "usage_daily"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    stage = Column(String(20), primary_key=True)
+    model = Column(String(100), primary_key=True)
+    requests = Column(Integer, nullable=False, default=0)
+    prompt_tokens = Column(Integer, nullable=False, default=0)
+    completion_tokens = Column(Integer, nullable=False, default=0)
+    characters = Column(Integer, nullable=False, default=0)
+    audio_seconds = Column(Float, nullable=False, default=0.0)
+    cost_usd = Column(Float, nullable=False, default=0.0)
+
+    __table_args__ = (Index("ix_usage_daily_day", "day"),)
+
+    def __repr__(self) -> str:
+        return (
+            f"<UsageDaily(user_id={self.user_id}, day={self.day}, "
+            f"stage={self.stage}, model={self.model})>"
+        )
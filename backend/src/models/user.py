@@ -4,7 +4,7 @@ User model for authentication and user management.
 
 from typing import TYPE_CHECKING
 
-from sqlalchemy import Boolean, Column, DateTime, Integer, String
+from sqlalchemy import Boolean, Column, DateTime, Index, Integer, String
 from sqlalchemy.sql import func
 
 from ..core.database import Base
@@ -35,6 +35,19 @@ class User(Base):
         onupdate=func.now(),
         nullable=False,
     )
+    # Written behind the request path by ActivityTracker
+    last_login_at = Column(DateTime(timezone=True), nullable=True)
+    last_seen_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        # Case-insensitive lookups; the username one covers login
+        Index("ix_users_lower_email", func.lower(email)),
+        Index(
+            "ix_users_lower_username",
+            func.lower(username),
+            postgresql_include=["username", "id", "hashed_password", "is_active"],
+        ),
+    )
 
     def __repr__(self) -> str:
         return f"<User(id={self.id}, email={self.email}, username={self.username})>"
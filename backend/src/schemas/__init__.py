@@ -1,5 +1,31 @@
 """Pydantic schemas for request/response validation."""
 
+from .profiling import ProfileInfo, ProfileToken, ProfileTokenRequest, SamplingRule
+from .retrieval import RetrievalRequest, RetrievedChunk
+from .site import Site, SiteCreate
+from .tracing import LatencyReport, StageLatency
+from .usage import UsageDailyRow, UsageDailyStage, UsageTotals
 from .user import User, UserCreate, UserInDB, UserUpdate
+from .voice import ChatMessage, VoiceRespondRequest
 
-__all__ = ["User", "UserCreate", "UserUpdate", "UserInDB"]
+__all__ = [
+    "User",
+    "UserCreate",
+    "UserUpdate",
+    "UserInDB",
+    "ChatMessage",
+    "VoiceRespondRequest",
+    "ProfileInfo",
+    "ProfileToken",
+    "ProfileTokenRequest",
+    "SamplingRule",
+    "RetrievalRequest",
+    "RetrievedChunk",
+    "Site",
+    "SiteCreate",
+    "LatencyReport",
+    "StageLatency",
+    "UsageDailyRow",
+    "UsageDailyStage",
+    "UsageTotals",
+]
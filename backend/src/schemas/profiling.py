@@ -0,0 +1,46 @@
+"""
+Request profiling schemas for request/response validation.
+"""
+
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+
+class ProfileTokenRequest(BaseModel):
+    """Grant to profile requests under a path prefix."""
+
+    path: str = Field("/", min_length=1, description="Path prefix to profile")
+    ttl_seconds: Optional[int] = Field(None, ge=1, le=24 * 3600)
+
+
+class ProfileToken(BaseModel):
+    """Signed token to send in the profiling header."""
+
+    header: str
+    token: str
+    expires_at: int
+
+
+class ProfileInfo(BaseModel):
+    """A stored request profile."""
+
+    id: str
+    method: str
+    path: str
+    status_code: Optional[int]
+    duration_ms: float
+    trigger: str
+    created_at: float
+    size_bytes: int
+
+
+class SamplingRule(BaseModel):
+    """Profile a fraction of the requests under a path prefix."""
+
+    route: str = Field(..., min_length=1, description="Path prefix to sample")
+    rate: float = Field(..., gt=0, le=1)
+    max_profiles: Optional[int] = Field(
+        None, ge=1, description="Remove the rule after this many profiles"
+    )
+    captured: int = 0
@@ -0,0 +1,32 @@
+"""
+Retrieval schemas for request/response validation.
+"""
+
+from typing import Literal, Optional
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class RetrievalRequest(BaseModel):
+    """Schema for a chunk search over one site."""
+
+    site_id: int
+    query: str = Field(..., min_length=1, max_length=2000)
+    top_k: int = Field(default=5, ge=1, le=50)
+    mode: Literal["hybrid", "vector", "lexical"] = "hybrid"
+
+
+class RetrievedChunk(BaseModel):
+    """Schema for one retrieved chunk."""
+
+    chunk_id: str
+    score: float
+    url: str
+    text: str
+    position: int
+    title: Optional[str] = None
+    heading: Optional[str] = None
+    vector_rank: Optional[int] = None
+    lexical_rank: Optional[int] = None
+
+    model_config = ConfigDict(from_attributes=True)
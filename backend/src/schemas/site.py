@@ -0,0 +1,25 @@
+"""
+Site schemas for request/response validation.
+"""
+
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel, ConfigDict, HttpUrl
+
+
+class SiteCreate(BaseModel):
+    """Schema for registering a website to ingest."""
+
+    root_url: HttpUrl
+
+
+class Site(BaseModel):
+    """Schema for site responses."""
+
+    id: int
+    root_url: str
+    last_crawled_at: Optional[datetime] = None
+    created_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
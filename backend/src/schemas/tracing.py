@@ -0,0 +1,25 @@
+"""
+Tracing schemas for response validation.
+"""
+
+from typing import List
+
+from pydantic import BaseModel
+
+
+class StageLatency(BaseModel):
+    """Rolling latency percentiles of one stage of a route."""
+
+    route: str
+    stage: str
+    count: int
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+
+
+class LatencyReport(BaseModel):
+    """Per-stage latencies over the rolling window."""
+
+    window_seconds: float
+    stages: List[StageLatency]
@@ -0,0 +1,33 @@
+"""
+Usage accounting schemas for response validation.
+"""
+
+from datetime import date
+
+from pydantic import BaseModel, ConfigDict
+
+
+class UsageTotals(BaseModel):
+    """Summed usage counters."""
+
+    requests: int
+    prompt_tokens: int
+    completion_tokens: int
+    characters: int
+    audio_seconds: float
+    cost_usd: float
+
+
+class UsageDailyStage(UsageTotals):
+    """Usage across all users for one day and pipeline stage."""
+
+    day: date
+    stage: str
+
+
+class UsageDailyRow(UsageDailyStage):
+    """A user's usage for one day, stage and model."""
+
+    model: str
+
+    model_config = ConfigDict(from_attributes=True, protected_namespaces=())
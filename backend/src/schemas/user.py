@@ -66,6 +66,8 @@ class UserInDB(UserBase):
     id: int
     created_at: datetime
     updated_at: datetime
+    last_login_at: Optional[datetime] = None
+    last_seen_at: Optional[datetime] = None
 
     model_config = ConfigDict(from_attributes=True)
 
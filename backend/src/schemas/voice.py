@@ -0,0 +1,24 @@
+"""
+Voice pipeline schemas for request/response validation.
+"""
+
+from typing import List, Literal, Optional
+
+from pydantic import BaseModel, Field
+
+
+class ChatMessage(BaseModel):
+    """A single conversation message."""
+
+    role: Literal["system", "user", "assistant"]
+    content: str
+
+
+class VoiceRespondRequest(BaseModel):
+    """Schema for a spoken response request."""
+
+    text: str = Field(..., min_length=1, description="User utterance to answer")
+    history: List[ChatMessage] = Field(default_factory=list)
+    site_id: Optional[int] = Field(
+        default=None, description="Site being asked about; enables answer caching"
+    )
@@ -1,5 +1,7 @@
 """Business logic services for MemVoice API."""
 
+from .embedding_service import EmbeddingService
 from .user_service import UserService
+from .voice_pipeline import VoicePipeline
 
-__all__ = ["UserService"]
+__all__ = ["EmbeddingService", "UserService", "VoicePipeline"]
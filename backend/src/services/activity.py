@@ -0,0 +1,158 @@
+"""
+Write-behind tracking of user logins and last activity.
+
+Authenticated requests only record a timestamp in memory, coalesced per
+user, so the read path never writes. Every ``flush_interval`` seconds the
+pending timestamps are written with a single batched UPDATE, so each user
+row is updated at most once per interval however many requests it made.
+"""
+
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from sqlalchemy import (
+    DateTime,
+    Integer,
+    bindparam,
+    cast,
+    column,
+    func,
+    update,
+    values,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models.user import User
+from .usage_service import SessionFactory
+
+logger = logging.getLogger(__name__)
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class ActivityTracker:
+    """Coalesces ``last_seen_at``/``last_login_at`` updates per user."""
+
+    def __init__(self, session_factory: SessionFactory, flush_interval: float = 30.0):
+        self.session_factory = session_factory
+        self.flush_interval = flush_interval
+        self._seen: Dict[int, datetime] = {}
+        self._logins: Dict[int, datetime] = {}
+        self._lock = asyncio.Lock()
+        self._timer_task: Optional[asyncio.Task] = None
+
+    @property
+    def pending(self) -> int:
+        """Users with unflushed activity."""
+        return len(self._seen)
+
+    def seen(self, user_id: int, at: Optional[datetime] = None) -> None:
+        """Record that ``user_id`` made a request; never waits on the database."""
+        at = at or _utcnow()
+        previous = self._seen.get(user_id)
+        if previous is None or at > previous:
+            self._seen[user_id] = at
+
+    def logged_in(self, user_id: int, at: Optional[datetime] = None) -> None:
+        """Record a successful login, which also counts as activity."""
+        at = at or _utcnow()
+        self._logins[user_id] = at
+        self.seen(user_id, at)
+
+    def start(self) -> None:
+        """Start the periodic flush timer."""
+        if self._timer_task is None:
+            self._timer_task = asyncio.create_task(self._flush_periodically())
+
+    async def stop(self) -> None:
+        """Stop the timer and flush whatever is still pending."""
+        if self._timer_task is not None:
+            self._timer_task.cancel()
+            await asyncio.gather(self._timer_task, return_exceptions=True)
+            self._timer_task = None
+        await self.flush()
+
+    async def flush(self) -> int:
+        """Write pending activity; returns how many users were updated."""
+        async with self._lock:
+            seen, self._seen = self._seen, {}
+            logins, self._logins = self._logins, {}
+            if not seen:
+                return 0
+            rows = [
+                {
+                    "id": user_id,
+                    "last_seen_at": at,
+                    "last_login_at": logins.get(user_id),
+                }
+                for user_id, at in seen.items()
+            ]
+            try:
+                async with self.session_factory() as db:
+                    await self._write(db, rows)
+            except Exception as e:
+                # Newer activity recorded meanwhile supersedes the failed batch
+                for user_id, at in seen.items():
+                    self.seen(user_id, at)
+                for user_id, at in logins.items():
+                    self._logins.setdefault(user_id, at)
+                logger.error(f"Activity flush failed - Users: {len(rows)}, Error: {e}")
+                return 0
+        logger.info(f"Activity flushed - Users: {len(rows)}")
+        return len(rows)
+
+    async def _flush_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    @staticmethod
+    async def _write(db: AsyncSession, rows: List[dict]) -> None:
+        # updated_at tracks profile edits, so activity must not bump it
+        table = User.__table__
+        if db.get_bind().dialect.name == "postgresql":
+            activity = values(
+                column("id", Integer),
+                column("last_seen_at", DateTime(timezone=True)),
+                column("last_login_at", DateTime(timezone=True)),
+                name="activity",
+            ).data([(r["id"], r["last_seen_at"], r["last_login_at"]) for r in rows])
+            await db.execute(
+                update(table)
+                .where(table.c.id == activity.c.id)
+                .values(
+                    last_seen_at=activity.c.last_seen_at,
+                    # An all-NULL VALUES column would otherwise be typed text
+                    last_login_at=func.coalesce(
+                        cast(activity.c.last_login_at, DateTime(timezone=True)),
+                        table.c.last_login_at,
+                    ),
+                    updated_at=table.c.updated_at,
+                )
+            )
+        else:
+            # SQLite cannot name VALUES columns; one executemany instead
+            await db.execute(
+                update(table)
+                .where(table.c.id == bindparam("user_id"))
+                .values(
+                    last_seen_at=bindparam("seen_at"),
+                    last_login_at=func.coalesce(
+                        bindparam("login_at"), table.c.last_login_at
+                    ),
+                    updated_at=table.c.updated_at,
+                ),
+                [
+                    {
+                        "user_id": r["id"],
+                        "seen_at": r["last_seen_at"],
+                        "login_at": r["last_login_at"],
+                    }
+                    for r in rows
+                ],
+            )
+        await db.commit()
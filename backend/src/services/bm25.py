@@ -0,0 +1,423 @@
+"""
+In-process BM25 inverted index with varint/delta-compressed postings.
+
+Each term owns a ``bytearray`` of interleaved ``(doc delta, term frequency)``
+LEB128 varints. Document numbers only ever grow, so adding a document is an
+append to each of its terms' postings; deleting one flips a liveness flag,
+and the index is rebuilt without dead documents once they pass
+``compact_ratio``. Postings are decoded with vectorized numpy code at query
+time and scored into a dense accumulator. Recently used terms are kept in an
+LRU bounded by ``cache_bytes`` together with their per-document BM25 impacts,
+which stay valid until the next change to the index.
+"""
+
+import asyncio
+import logging
+import math
+import os
+import re
+import threading
+from array import array
+from collections import Counter, OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .vector_store.base import validate_namespace
+
+logger = logging.getLogger(__name__)
+
+_TOKEN = re.compile(r"[a-z0-9]+(?:[-_./][a-z0-9]+)*")
+_TOKEN_PARTS = re.compile(r"[-_./]")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens; compound tokens such as SKUs also emit parts."""
+    tokens = []
+    for token in _TOKEN.findall(text.lower()):
+        tokens.append(token)
+        if _TOKEN_PARTS.search(token):
+            tokens.extend(part for part in _TOKEN_PARTS.split(token) if part)
+    return tokens
+
+
+def encode_varint(value: int, out: bytearray) -> None:
+    """Append ``value`` to ``out`` as an unsigned LEB128 varint."""
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def encode_varints(values: np.ndarray) -> bytes:
+    """Vectorized unsigned LEB128 encoding of ``values``."""
+    values = np.asarray(values, dtype=np.uint64)
+    if not len(values):
+        return b""
+    sizes = np.ones(len(values), dtype=np.int64)
+    for shift in range(7, 64, 7):
+        sizes += values >= np.uint64(1 << shift)
+    starts = np.cumsum(sizes) - sizes
+    out = np.empty(int(sizes.sum()), dtype=np.uint8)
+    for k in range(int(sizes.max())):
+        mask = sizes > k
+        byte = (values[mask] >> np.uint64(7 * k)) & np.uint64(0x7F)
+        more = (sizes[mask] > k + 1).astype(np.uint64) << np.uint64(7)
+        out[starts[mask] + k] = byte | more
+    return out.tobytes()
+
+
+def decode_varints(data: bytes) -> np.ndarray:
+    """Vectorized decoding of concatenated unsigned LEB128 varints."""
+    raw = np.frombuffer(data, dtype=np.uint8)
+    if not len(raw):
+        return np.empty(0, dtype=np.int64)
+    if raw.max() < 0x80:  # every value fits in one byte, common for dense terms
+        return raw.astype(np.int64)
+    ends = np.flatnonzero(raw < 0x80)
+    starts = np.empty_like(ends)
+    starts[0] = 0
+    starts[1:] = ends[:-1] + 1
+    sizes = ends - starts + 1
+    values = (raw[starts] & 0x7F).astype(np.int64)
+    for k in range(1, int(sizes.max())):
+        mask = sizes > k
+        values[mask] |= (raw[starts[mask] + k] & 0x7F).astype(np.int64) << (7 * k)
+    return values
+
+
+_CachedPostings = Tuple[np.ndarray, np.ndarray, np.ndarray, int]
+
+
+def _cached_size(cached: _CachedPostings) -> int:
+    return cached[0].nbytes + cached[1].nbytes + cached[2].nbytes
+
+
+class BM25Index:
+    """BM25 (Okapi) index of one namespace; thread-safe."""
+
+    def __init__(
+        self,
+        k1: float = 1.2,
+        b: float = 0.75,
+        compact_ratio: float = 0.3,
+        cache_bytes: int = 64 * 1024 * 1024,
+    ):
+        self.k1 = k1
+        self.b = b
+        self.compact_ratio = compact_ratio
+        self.cache_bytes = cache_bytes
+        self._lock = threading.RLock()
+        self._clear()
+
+    def _clear(self) -> None:
+        self._vocab: Dict[str, int] = {}
+        self._postings: List[bytearray] = []
+        self._last_doc: List[int] = []
+        self._df: List[int] = []
+        self._doc_ids: List[Optional[str]] = []
+        self._doc_numbers: Dict[str, int] = {}
+        self._doc_len = array("I")
+        self._live = bytearray()
+        self._total_len = 0
+        self._generation = 0
+        self._clear_cache()
+        self.dirty = False
+
+    def _clear_cache(self) -> None:
+        # term -> (docs, tf, impacts, generation); impacts depend on document
+        # frequencies and lengths, so every change bumps the generation
+        self._cache: "OrderedDict[int, _CachedPostings]" = OrderedDict()
+        self._cache_bytes = 0
+        self._norm = np.empty(0, dtype=np.float32)
+        self._norm_generation = -1
+
+    def _uncache(self, term_id: int) -> None:
+        cached = self._cache.pop(term_id, None)
+        if cached is not None:
+            self._cache_bytes -= _cached_size(cached)
+
+    def __len__(self) -> int:
+        return len(self._doc_numbers)
+
+    @property
+    def postings_bytes(self) -> int:
+        """Size of the compressed postings."""
+        return sum(len(postings) for postings in self._postings)
+
+    def add(self, ids: Sequence[str], texts: Sequence[str]) -> None:
+        """Index ``texts`` under ``ids``, replacing documents with the same ID."""
+        with self._lock:
+            self._remove(ids)
+            for doc_id, text in zip(ids, texts):
+                tokens = tokenize(text)
+                doc = len(self._doc_ids)
+                self._doc_ids.append(doc_id)
+                self._doc_numbers[doc_id] = doc
+                self._doc_len.append(len(tokens))
+                self._live.append(1)
+                self._total_len += len(tokens)
+                for term, tf in Counter(tokens).items():
+                    term_id = self._vocab.get(term)
+                    if term_id is None:
+                        term_id = self._vocab[term] = len(self._postings)
+                        self._postings.append(bytearray())
+                        self._last_doc.append(0)
+                        self._df.append(0)
+                    self._uncache(term_id)
+                    postings = self._postings[term_id]
+                    encode_varint(doc - self._last_doc[term_id], postings)
+                    encode_varint(tf, postings)
+                    self._last_doc[term_id] = doc
+                    self._df[term_id] += 1
+            self._generation += 1
+            self.dirty = True
+
+    def remove(self, ids: Sequence[str]) -> None:
+        """Delete documents by ID; unknown IDs are ignored."""
+        with self._lock:
+            if self._remove(ids):
+                self.dirty = True
+                dead = len(self._doc_ids) - len(self._doc_numbers)
+                if dead > self.compact_ratio * len(self._doc_ids):
+                    self.compact()
+
+    def _remove(self, ids: Sequence[str]) -> int:
+        # Document frequencies keep counting dead documents until compaction
+        removed = 0
+        for doc_id in ids:
+            doc = self._doc_numbers.pop(doc_id, None)
+            if doc is not None:
+                self._live[doc] = 0
+                self._doc_ids[doc] = None
+                self._total_len -= self._doc_len[doc]
+                removed += 1
+        if removed:
+            self._generation += 1
+        return removed
+
+    def _decode(self, term_id: int) -> Tuple[np.ndarray, np.ndarray]:
+        values = decode_varints(bytes(self._postings[term_id]))
+        return np.cumsum(values[0::2]).astype(np.int32), values[1::2]
+
+    def _impacts(self, term_id: int, live_docs: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Documents containing ``term_id`` and the term's score in each."""
+        cached = self._cache.get(term_id)
+        if cached is not None:
+            self._cache.move_to_end(term_id)
+            if cached[3] == self._generation:
+                return cached[0], cached[2]
+            docs, tf = cached[0], cached[1]
+            self._uncache(term_id)
+        else:
+            values = self._decode(term_id)
+            docs, tf = values[0], values[1].astype(np.float32)
+
+        if self._norm_generation != self._generation:
+            doc_len = np.frombuffer(self._doc_len, dtype=np.uint32)
+            avg_len = max(self._total_len / live_docs, 1.0)
+            self._norm = (self.k1 * (1.0 - self.b + self.b * doc_len / avg_len)).astype(
+                np.float32
+            )
+            self._norm_generation = self._generation
+        df = self._df[term_id]
+        idf = math.log(1.0 + (live_docs - df + 0.5) / (df + 0.5))
+        impacts = np.float32(idf * (self.k1 + 1.0)) * tf / (tf + self._norm[docs])
+
+        entry = (docs, tf, impacts, self._generation)
+        size = _cached_size(entry)
+        if size <= self.cache_bytes:
+            self._cache[term_id] = entry
+            self._cache_bytes += size
+            while self._cache_bytes > self.cache_bytes:
+                _term_id, evicted = self._cache.popitem(last=False)
+                self._cache_bytes -= _cached_size(evicted)
+        return docs, impacts
+
+    def search(self, query: str, top_k: int = 10) -> List[Tuple[str, float]]:
+        """Return up to ``top_k`` ``(id, score)`` pairs, best first."""
+        with self._lock:
+            live_docs = len(self._doc_numbers)
+            term_ids = {
+                self._vocab[term] for term in tokenize(query) if term in self._vocab
+            }
+            if not live_docs or not term_ids:
+                return []
+            scores = np.zeros(len(self._doc_ids), dtype=np.float32)
+            for term_id in term_ids:
+                docs, impacts = self._impacts(term_id, live_docs)
+                scores[docs] += impacts
+            scores *= np.frombuffer(self._live, dtype=np.uint8)
+
+            candidates = np.flatnonzero(scores)
+            if len(candidates) > top_k:
+                best = np.argpartition(-scores[candidates], top_k - 1)[:top_k]
+                candidates = candidates[best]
+            ranked = candidates[np.argsort(-scores[candidates], kind="stable")]
+            return [(self._doc_ids[doc], float(scores[doc])) for doc in ranked]
+
+    def compact(self) -> None:
+        """Rebuild postings without deleted documents."""
+        with self._lock:
+            live = np.frombuffer(self._live, dtype=np.uint8).astype(bool)
+            renumber = np.cumsum(live) - 1
+            postings: List[bytearray] = []
+            last_doc: List[int] = []
+            df: List[int] = []
+            vocab: Dict[str, int] = {}
+            for term, term_id in self._vocab.items():
+                docs, tf = self._decode(term_id)
+                keep = live[docs]
+                if not keep.any():
+                    continue
+                docs = renumber[docs[keep]]
+                interleaved = np.empty(2 * len(docs), dtype=np.int64)
+                interleaved[0::2] = np.diff(docs, prepend=0)
+                interleaved[1::2] = tf[keep]
+                vocab[term] = len(postings)
+                postings.append(bytearray(encode_varints(interleaved)))
+                last_doc.append(int(docs[-1]))
+                df.append(len(docs))
+            doc_ids = [doc_id for doc_id in self._doc_ids if doc_id is not None]
+            self._clear_cache()
+            self._generation += 1
+            self._vocab, self._postings = vocab, postings
+            self._last_doc, self._df = last_doc, df
+            self._doc_ids = list(doc_ids)
+            self._doc_numbers = {doc_id: n for n, doc_id in enumerate(doc_ids)}
+            self._doc_len = array("I", np.frombuffer(self._doc_len, np.uint32)[live])
+            self._live = bytearray(b"\x01" * len(doc_ids))
+            self.dirty = True
+
+    def save(self, path: str) -> None:
+        """Write the index to ``path`` atomically, compacting it first."""
+        with self._lock:
+            if len(self._doc_ids) != len(self._doc_numbers):
+                self.compact()
+            offsets = np.zeros(len(self._postings) + 1, dtype=np.int64)
+            np.cumsum([len(p) for p in self._postings], out=offsets[1:])
+            terms = sorted(self._vocab, key=self._vocab.__getitem__)
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "wb") as f:
+                np.savez(
+                    f,
+                    params=np.array([self.k1, self.b]),
+                    terms=np.frombuffer("\n".join(terms).encode(), dtype=np.uint8),
+                    doc_ids=np.frombuffer(
+                        "\n".join(d for d in self._doc_ids if d is not None).encode(),
+                        dtype=np.uint8,
+                    ),
+                    offsets=offsets,
+                    blob=np.frombuffer(b"".join(self._postings), dtype=np.uint8),
+                    last_doc=np.array(self._last_doc, dtype=np.int64),
+                    df=np.array(self._df, dtype=np.int64),
+                    doc_len=np.frombuffer(self._doc_len, dtype=np.uint32),
+                )
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+            self.dirty = False
+
+    @classmethod
+    def load(
+        cls, path: str, compact_ratio: float = 0.3, cache_bytes: int = 64 * 1024 * 1024
+    ) -> "BM25Index":
+        """Read an index written by ``save``."""
+        with np.load(path) as data:
+            k1, b = (float(v) for v in data["params"])
+            index = cls(k1, b, compact_ratio, cache_bytes)
+            terms = data["terms"].tobytes().decode()
+            doc_ids = data["doc_ids"].tobytes().decode()
+            offsets = data["offsets"]
+            blob = data["blob"].tobytes()
+            index._vocab = (
+                {t: i for i, t in enumerate(terms.split("\n"))} if terms else {}
+            )
+            index._postings = []
+            for term_id in range(len(offsets) - 1):
+                start, end = offsets[term_id], offsets[term_id + 1]
+                index._postings.append(bytearray(blob[start:end]))
+            index._last_doc = data["last_doc"].tolist()
+            index._df = data["df"].tolist()
+            doc_list = doc_ids.split("\n") if doc_ids else []
+            index._doc_ids = list(doc_list)
+            index._doc_numbers = {doc_id: n for n, doc_id in enumerate(doc_list)}
+            index._doc_len = array("I", data["doc_len"].tobytes())
+            index._live = bytearray(b"\x01" * len(index._doc_ids))
+            index._total_len = int(data["doc_len"].sum())
+        return index
+
+
+class BM25Store:
+    """Per-namespace BM25 indexes persisted under ``root``."""
+
+    def __init__(
+        self,
+        root: str,
+        k1: float = 1.2,
+        b: float = 0.75,
+        compact_ratio: float = 0.3,
+        cache_bytes: int = 64 * 1024 * 1024,
+    ):
+        self.root = root
+        self.k1 = k1
+        self.b = b
+        self.compact_ratio = compact_ratio
+        self.cache_bytes = cache_bytes  # decoded postings kept per index
+        self._indexes: Dict[str, BM25Index] = {}
+        self._lock = threading.Lock()
+
+    def _path(self, namespace: str) -> str:
+        return os.path.join(self.root, f"{namespace}.bm25.npz")
+
+    def index(self, namespace: str) -> BM25Index:
+        """The index of ``namespace``, loaded from disk on first use."""
+        validate_namespace(namespace)
+        with self._lock:
+            index = self._indexes.get(namespace)
+            if index is None:
+                path = self._path(namespace)
+                if os.path.exists(path):
+                    index = BM25Index.load(path, self.compact_ratio, self.cache_bytes)
+                else:
+                    index = BM25Index(
+                        self.k1, self.b, self.compact_ratio, self.cache_bytes
+                    )
+                self._indexes[namespace] = index
+            return index
+
+    def save_sync(self, namespace: str) -> None:
+        """Persist ``namespace`` if it changed since the last save."""
+        index = self.index(namespace)
+        if index.dirty:
+            os.makedirs(self.root, exist_ok=True)
+            index.save(self._path(namespace))
+
+    async def add(
+        self, namespace: str, ids: Sequence[str], texts: Sequence[str]
+    ) -> None:
+        """Index ``texts`` under ``ids``."""
+        await asyncio.to_thread(self.index(namespace).add, ids, texts)
+
+    async def remove(self, namespace: str, ids: Sequence[str]) -> None:
+        """Delete documents by ID."""
+        await asyncio.to_thread(self.index(namespace).remove, ids)
+
+    async def search(
+        self, namespace: str, query: str, top_k: int = 10
+    ) -> List[Tuple[str, float]]:
+        """Top ``top_k`` ``(id, score)`` pairs for ``query``."""
+        return await asyncio.to_thread(self.index(namespace).search, query, top_k)
+
+    async def save(self, namespace: str) -> None:
+        """Persist ``namespace`` if it changed."""
+        await asyncio.to_thread(self.save_sync, namespace)
+
+    def close(self) -> None:
+        """Persist every changed index."""
+        with self._lock:
+            namespaces = list(self._indexes)
+        for namespace in namespaces:
+            self.save_sync(namespace)
+        with self._lock:
+            self._indexes.clear()
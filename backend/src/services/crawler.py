@@ -0,0 +1,509 @@
+"""
+Concurrent, incremental website crawler.
+
+Pages are fetched by a pool of workers under a global concurrency limit and
+a per-host limit with a minimum delay between requests. Stored ETag and
+Last-Modified values are sent back as conditional headers, and bodies whose
+SHA-256 matches the stored hash are treated as unchanged, so a re-crawl only
+hands pages that actually changed to the ingestion callback. Pages that look
+like empty JavaScript shells are re-fetched through a headless browser.
+"""
+
+import asyncio
+import gzip
+import hashlib
+import html
+import logging
+import re
+import time
+from contextlib import asynccontextmanager, suppress
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Protocol,
+    Set,
+    Tuple,
+)
+from urllib.parse import urldefrag, urljoin, urlsplit, urlunsplit
+from urllib.robotparser import RobotFileParser
+
+import aiohttp
+from bs4 import BeautifulSoup
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.config import Settings
+from ..models.crawl import CrawlPage, CrawlSite
+
+if TYPE_CHECKING:
+    from playwright.async_api import Browser, Playwright
+
+logger = logging.getLogger(__name__)
+
+_SITEMAP_LOC = re.compile(r"<loc>\s*(.*?)\s*</loc>", re.IGNORECASE | re.DOTALL)
+_APP_MOUNTS = ("root", "app", "__next", "__nuxt")
+_MAX_SITEMAPS = 50
+_COMMIT_EVERY = 200
+
+
+def normalize_url(url: str) -> str:
+    """Canonical URL: lowercase scheme/host, no fragment or default port."""
+    url, _fragment = urldefrag(url.strip())
+    parts = urlsplit(url)
+    host = (parts.hostname or "").lower()
+    port = parts.port
+    if port and (parts.scheme, port) not in (("http", 80), ("https", 443)):
+        host = f"{host}:{port}"
+    return urlunsplit((parts.scheme.lower(), host, parts.path or "/", parts.query, ""))
+
+
+def needs_javascript(soup: BeautifulSoup) -> bool:
+    """Whether the page is a client-rendered shell with little static text."""
+    if not soup.find("script"):
+        return False
+    for element_id in _APP_MOUNTS:
+        mount = soup.find(id=element_id)
+        if mount is not None and not mount.get_text(strip=True):
+            return True
+    body = soup.body or soup
+    text = " ".join(
+        node.strip()
+        for node in body.find_all(string=True)
+        if node.parent is not None
+        and node.parent.name not in ("script", "style", "noscript")
+    )
+    return len(text.strip()) < 200
+
+
+@dataclass
+class _PageState:
+    """Snapshot of a stored page, so workers never touch ORM objects."""
+
+    status_code: Optional[int] = None
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    content_hash: Optional[str] = None
+
+
+@dataclass
+class CrawledPage:
+    """A new, changed or removed page handed to the ingestion callback."""
+
+    url: str
+    html: str
+    content_hash: str
+    rendered: bool = False
+    removed: bool = False  # previously ingested page now returns 404/410
+
+
+@dataclass
+class CrawlStats:
+    """Outcome counts for one crawl."""
+
+    fetched: int = 0
+    new: int = 0
+    changed: int = 0
+    not_modified: int = 0  # 304 from a conditional request
+    unchanged: int = 0  # 200 with an identical body hash
+    rendered: int = 0
+    failed: int = 0
+    skipped: int = 0  # robots.txt, non-HTML or off-site
+    duration: float = 0.0
+
+
+class Renderer(Protocol):
+    """Headless browser rendering for JavaScript-dependent pages."""
+
+    async def render(self, url: str) -> str:
+        """Return the page HTML after scripts have run."""
+        ...
+
+    async def aclose(self) -> None:
+        """Shut the browser down."""
+        ...
+
+
+class PlaywrightRenderer:
+    """Chromium via Playwright, launched on first use."""
+
+    def __init__(self, max_pages: int = 2, timeout: float = 30.0):
+        self._semaphore = asyncio.Semaphore(max_pages)
+        self.timeout = timeout
+        self._playwright: Optional["Playwright"] = None
+        self._browser: Optional["Browser"] = None
+        self._lock = asyncio.Lock()
+
+    async def _get_browser(self) -> "Browser":
+        async with self._lock:
+            if self._browser is None:
+                from playwright.async_api import async_playwright
+
+                playwright = await async_playwright().start()
+                self._playwright = playwright
+                self._browser = await playwright.chromium.launch()
+            return self._browser
+
+    async def render(self, url: str) -> str:
+        """Load ``url`` and return the DOM once the network is idle."""
+        browser = await self._get_browser()
+        async with self._semaphore:
+            page = await browser.new_page()
+            try:
+                await page.goto(
+                    url, wait_until="networkidle", timeout=self.timeout * 1000
+                )
+                return await page.content()
+            finally:
+                await page.close()
+
+    async def aclose(self) -> None:
+        """Close the browser and the Playwright driver."""
+        if self._browser is not None:
+            await self._browser.close()
+            self._browser = None
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+
+
+class _HostLimiter:
+    """Caps in-flight requests to a host and spaces their start times."""
+
+    def __init__(self, concurrency: int, delay: float):
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._delay = delay
+        self._next_start = 0.0
+        self._lock = asyncio.Lock()
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        async with self._semaphore:
+            if self._delay:
+                async with self._lock:
+                    now = time.monotonic()
+                    wait = self._next_start - now
+                    self._next_start = max(now, self._next_start) + self._delay
+                if wait > 0:
+                    await asyncio.sleep(wait)
+            yield
+
+
+class WebCrawler:
+    """Crawls one site, persisting per-page state for conditional re-crawls."""
+
+    def __init__(
+        self,
+        max_concurrency: int = 16,
+        per_host_concurrency: int = 2,
+        per_host_delay: float = 0.25,
+        max_pages: int = 10000,
+        timeout: float = 20.0,
+        user_agent: str = "MemVoiceBot/0.1",
+        renderer: Optional[Renderer] = None,
+    ):
+        self.max_concurrency = max_concurrency
+        self.per_host_concurrency = per_host_concurrency
+        self.per_host_delay = per_host_delay
+        self.max_pages = max_pages
+        self.timeout = timeout
+        self.user_agent = user_agent
+        self.renderer = renderer
+
+    async def crawl(
+        self,
+        db: AsyncSession,
+        site: CrawlSite,
+        on_page: Optional[Callable[[CrawledPage], Awaitable[None]]] = None,
+        stats: Optional[CrawlStats] = None,
+    ) -> CrawlStats:
+        """Crawl ``site`` and call ``on_page`` for every new or changed page.
+
+        The frontier is seeded with the root URL, the sitemap and every page
+        already known from earlier crawls, so unchanged pages never need to be
+        parsed just to rediscover their links.
+        """
+        started = time.perf_counter()
+        stats = stats if stats is not None else CrawlStats()
+        root = normalize_url(site.root_url)
+        host = urlsplit(root).netloc
+
+        result = await db.execute(select(CrawlPage).where(CrawlPage.site_id == site.id))
+        rows: Dict[str, CrawlPage] = {page.url: page for page in result.scalars()}
+        known = {
+            url: _PageState(
+                row.status_code, row.etag, row.last_modified, row.content_hash
+            )
+            for url, row in rows.items()
+        }
+
+        limiter = _HostLimiter(self.per_host_concurrency, self.per_host_delay)
+        queue: "asyncio.Queue[str]" = asyncio.Queue()
+        seen: Set[str] = set()
+        updates: Dict[str, Dict[str, Any]] = {}
+        db_lock = asyncio.Lock()
+
+        def enqueue(url: str) -> None:
+            url = normalize_url(url)
+            if url in seen or len(seen) >= self.max_pages:
+                return
+            if urlsplit(url).netloc != host or not url.startswith("http"):
+                return
+            seen.add(url)
+            queue.put_nowait(url)
+
+        async def save() -> None:
+            # Single writer: workers only record plain dicts in ``updates``
+            nonlocal updates
+            async with db_lock:
+                pending, updates = updates, {}
+                for url, values in pending.items():
+                    row = rows.get(url)
+                    if row is None:
+                        row = rows[url] = CrawlPage(site_id=site.id, url=url)
+                        db.add(row)
+                    for name, value in values.items():
+                        setattr(row, name, value)
+                await db.commit()
+
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        headers = {"User-Agent": self.user_agent}
+        async with aiohttp.ClientSession(timeout=timeout, headers=headers) as http:
+            robots = await self._load_robots(http, limiter, root)
+            enqueue(root)
+            for url in await self._sitemap_urls(http, limiter, root, robots):
+                enqueue(url)
+            for url in known:
+                enqueue(url)
+
+            async def worker() -> None:
+                while True:
+                    url = await queue.get()
+                    try:
+                        if not robots.can_fetch(self.user_agent, url):
+                            stats.skipped += 1
+                            continue
+                        values, page = await self._fetch(
+                            http, limiter, url, known.get(url), stats, enqueue
+                        )
+                        updates[url] = values
+                        if page is not None and on_page is not None:
+                            await on_page(page)
+                    except Exception as e:
+                        stats.failed += 1
+                        logger.warning(f"Crawl failed - URL: {url}, Error: {e}")
+                    finally:
+                        if len(updates) >= _COMMIT_EVERY:
+                            await save()
+                        queue.task_done()
+
+            workers = [
+                asyncio.create_task(worker()) for _ in range(self.max_concurrency)
+            ]
+            try:
+                await queue.join()
+            finally:
+                for task in workers:
+                    task.cancel()
+                await asyncio.gather(*workers, return_exceptions=True)
+
+        site.last_crawled_at = datetime.now(timezone.utc)
+        await save()
+
+        stats.duration = time.perf_counter() - started
+        logger.info(
+            f"Crawl completed - Site: {site.id}, Fetched: {stats.fetched}, "
+            f"New: {stats.new}, Changed: {stats.changed}, "
+            f"Not modified: {stats.not_modified}, Unchanged: {stats.unchanged}, "
+            f"Rendered: {stats.rendered}, Failed: {stats.failed}, "
+            f"Skipped: {stats.skipped}, Duration: {stats.duration:.2f}s"
+        )
+        return stats
+
+    async def stream(
+        self,
+        db: AsyncSession,
+        site: CrawlSite,
+        stats: Optional[CrawlStats] = None,
+        max_buffered: int = 32,
+    ) -> AsyncIterator[CrawledPage]:
+        """Crawl ``site``, yielding new, changed and removed pages.
+
+        At most ``max_buffered`` pages wait for the consumer; beyond that the
+        crawl workers block, so a slow consumer bounds memory.
+        """
+        queue: "asyncio.Queue[Optional[CrawledPage]]" = asyncio.Queue(max_buffered)
+
+        async def run() -> None:
+            try:
+                await self.crawl(db, site, queue.put, stats)
+            finally:
+                # A full queue means the consumer still has pages to drain and
+                # will notice the finished task once the queue is empty
+                with suppress(asyncio.QueueFull):
+                    queue.put_nowait(None)
+
+        task = asyncio.create_task(run())
+        try:
+            while True:
+                if queue.empty() and task.done():
+                    break
+                page = await queue.get()
+                if page is None:
+                    break
+                yield page
+            await task  # re-raise crawl errors
+        finally:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    async def _fetch(
+        self,
+        http: aiohttp.ClientSession,
+        limiter: _HostLimiter,
+        url: str,
+        state: Optional[_PageState],
+        stats: CrawlStats,
+        enqueue: Callable[[str], None],
+    ) -> Tuple[Dict[str, Any], Optional[CrawledPage]]:
+        """Fetch ``url``; returns the stored-state changes and a changed page."""
+        headers = {}
+        if state is not None and state.status_code == 200:
+            if state.etag:
+                headers["If-None-Match"] = state.etag
+            if state.last_modified:
+                headers["If-Modified-Since"] = state.last_modified
+
+        async with limiter.slot():
+            async with http.get(url, headers=headers) as response:
+                status = response.status
+                content_type = response.headers.get("Content-Type", "")
+                etag = response.headers.get("ETag")
+                last_modified = response.headers.get("Last-Modified")
+                body = b""
+                encoding = "utf-8"
+                if status == 200 and "html" in content_type:
+                    body = await response.read()
+                    encoding = response.get_encoding()
+                final_url = normalize_url(str(response.url))
+        stats.fetched += 1
+        now = datetime.now(timezone.utc)
+
+        values: Dict[str, Any] = {"fetched_at": now}
+        if status == 304:
+            stats.not_modified += 1
+            return values, None
+        values["status_code"] = status
+        if status != 200:
+            stats.failed += 1
+            if status in (404, 410) and state is not None and state.content_hash:
+                values["content_hash"] = None
+                return values, CrawledPage(
+                    url=url, html="", content_hash="", removed=True
+                )
+            return values, None
+        if final_url != url:
+            enqueue(final_url)  # followed a redirect; crawl the target itself
+            stats.skipped += 1
+            return values, None
+        if "html" not in content_type:
+            stats.skipped += 1
+            return values, None
+
+        values["etag"] = etag
+        values["last_modified"] = last_modified
+        digest = hashlib.sha256(body).hexdigest()
+        previous_hash = state.content_hash if state is not None else None
+        if digest == previous_hash:
+            stats.unchanged += 1
+            return values, None
+
+        if previous_hash is None:
+            stats.new += 1
+        else:
+            stats.changed += 1
+        values["content_hash"] = digest
+        values["changed_at"] = now
+
+        text = body.decode(encoding, errors="replace")
+        soup = BeautifulSoup(text, "html.parser")
+        rendered = False
+        if self.renderer is not None and needs_javascript(soup):
+            text = await self.renderer.render(url)
+            soup = BeautifulSoup(text, "html.parser")
+            rendered = True
+            stats.rendered += 1
+        values["rendered"] = rendered
+        for anchor in soup.find_all("a", href=True):
+            enqueue(urljoin(url, str(anchor["href"])))
+
+        return values, CrawledPage(
+            url=url, html=text, content_hash=digest, rendered=rendered
+        )
+
+    async def _load_robots(
+        self, http: aiohttp.ClientSession, limiter: _HostLimiter, root: str
+    ) -> RobotFileParser:
+        robots = RobotFileParser()
+        try:
+            async with limiter.slot():
+                async with http.get(urljoin(root, "/robots.txt")) as response:
+                    lines = (await response.text()).splitlines()
+                    if response.status >= 400:
+                        lines = []
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            lines = []
+        robots.parse(lines)
+        return robots
+
+    async def _sitemap_urls(
+        self,
+        http: aiohttp.ClientSession,
+        limiter: _HostLimiter,
+        root: str,
+        robots: RobotFileParser,
+    ) -> List[str]:
+        pending = list(robots.site_maps() or [urljoin(root, "/sitemap.xml")])
+        urls: List[str] = []
+        fetched = 0
+        while pending and fetched < _MAX_SITEMAPS and len(urls) < self.max_pages:
+            sitemap = pending.pop(0)
+            fetched += 1
+            try:
+                async with limiter.slot():
+                    async with http.get(sitemap) as response:
+                        if response.status != 200:
+                            continue
+                        body = await response.read()
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                logger.warning(f"Sitemap fetch failed - URL: {sitemap}, Error: {e}")
+                continue
+            if body[:2] == b"\x1f\x8b":
+                body = gzip.decompress(body)
+            text = body.decode("utf-8", errors="replace")
+            locations = [html.unescape(loc) for loc in _SITEMAP_LOC.findall(text)]
+            if "<sitemapindex" in text:
+                pending.extend(locations)
+            else:
+                urls.extend(locations)
+        return urls
+
+
+def build_crawler(settings: Settings) -> WebCrawler:
+    """Create a crawler configured from ``CRAWL_*`` settings."""
+    return WebCrawler(
+        max_concurrency=settings.CRAWL_MAX_CONCURRENCY,
+        per_host_concurrency=settings.CRAWL_PER_HOST_CONCURRENCY,
+        per_host_delay=settings.CRAWL_PER_HOST_DELAY,
+        max_pages=settings.CRAWL_MAX_PAGES,
+        timeout=settings.CRAWL_TIMEOUT,
+        user_agent=settings.CRAWL_USER_AGENT,
+        renderer=PlaywrightRenderer() if settings.CRAWL_RENDER_JAVASCRIPT else None,
+    )
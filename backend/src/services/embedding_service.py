@@ -0,0 +1,147 @@
+"""
+Embedding service with a persistent, content-addressed cache.
+"""
+
+import hashlib
+import logging
+import re
+import unicodedata
+from dataclasses import dataclass
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.tracing import span
+from ..models.embedding_cache import EmbeddingCacheEntry
+from .providers import EmbeddingProvider
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+
+# Keys per IN (...) lookup; well below SQLite's 32766 bound-parameter limit,
+# so a typical ingest resolves every key with a single query
+LOOKUP_CHUNK_SIZE = 10000
+
+
+def normalize_text(text: str) -> str:
+    """Canonical form used for hashing: NFKC, collapsed whitespace, stripped."""
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFKC", text)).strip()
+
+
+def content_hash(text: str) -> str:
+    """SHA-256 hex digest of the normalized text."""
+    return hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+
+
+@dataclass
+class EmbeddingStats:
+    """Cache effectiveness for one ``embed`` call."""
+
+    requested: int = 0
+    unique: int = 0
+    hits: int = 0
+    misses: int = 0
+    provider_batches: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of unique texts served from the cache."""
+        return self.hits / self.unique if self.unique else 0.0
+
+
+class EmbeddingService:
+    """Embed texts, reusing cached embeddings of identical normalized content."""
+
+    def __init__(self, provider: EmbeddingProvider):
+        self.provider = provider
+
+    async def embed(
+        self, db: AsyncSession, texts: Sequence[str]
+    ) -> Tuple[np.ndarray, EmbeddingStats]:
+        """Return a ``(len(texts), dimensions)`` float32 matrix and cache stats.
+
+        Cached keys are fetched with batched multi-key lookups; only misses
+        are sent to the provider, in batches of ``provider.max_batch_size``.
+        """
+        with span("embedding", texts=len(texts)) as stage:
+            model = self.provider.model
+            hashes = [content_hash(text) for text in texts]
+            # First occurrence of each hash is the text we embed on a miss
+            unique: Dict[str, str] = {}
+            for digest, text in zip(hashes, texts):
+                unique.setdefault(digest, normalize_text(text))
+            stats = EmbeddingStats(requested=len(texts), unique=len(unique))
+
+            found = await self._lookup(db, model, list(unique))
+            stats.hits = len(found)
+
+            missing = [digest for digest in unique if digest not in found]
+            stats.misses = len(missing)
+            new_rows = []
+            batch_size = self.provider.max_batch_size
+            for start in range(0, len(missing), batch_size):
+                end = start + batch_size
+                batch = missing[start:end]
+                vectors = await self.provider.embed([unique[d] for d in batch])
+                stats.provider_batches += 1
+                for digest, vector in zip(batch, vectors):
+                    embedding = np.asarray(vector, dtype="<f4")
+                    found[digest] = embedding
+                    new_rows.append(
+                        {
+                            "model": model,
+                            "content_hash": digest,
+                            "dimensions": len(embedding),
+                            "embedding": embedding.tobytes(),
+                        }
+                    )
+            if new_rows:
+                await self._store(db, new_rows)
+
+            stage.set(hits=stats.hits, misses=stats.misses)
+            logger.info(
+                f"Embedding cache - Model: {model}, Requested: {stats.requested}, "
+                f"Unique: {stats.unique}, Hits: {stats.hits}, Misses: {stats.misses}, "
+                f"Hit rate: {stats.hit_rate:.1%}, "
+                f"Provider batches: {stats.provider_batches}"
+            )
+            dimensions = self.provider.dimensions
+            if not hashes:
+                return np.empty((0, dimensions), dtype=np.float32), stats
+            return np.stack([found[digest] for digest in hashes]), stats
+
+    @staticmethod
+    async def _lookup(
+        db: AsyncSession, model: str, hashes: List[str]
+    ) -> Dict[str, np.ndarray]:
+        found: Dict[str, np.ndarray] = {}
+        for start in range(0, len(hashes), LOOKUP_CHUNK_SIZE):
+            end = start + LOOKUP_CHUNK_SIZE
+            chunk = hashes[start:end]
+            result = await db.execute(
+                select(
+                    EmbeddingCacheEntry.content_hash, EmbeddingCacheEntry.embedding
+                ).where(
+                    EmbeddingCacheEntry.model == model,
+                    EmbeddingCacheEntry.content_hash.in_(chunk),
+                )
+            )
+            for digest, embedding in result.all():
+                found[digest] = np.frombuffer(embedding, dtype="<f4")
+        return found
+
+    @staticmethod
+    async def _store(db: AsyncSession, rows: List[dict]) -> None:
+        # Concurrent ingests may embed the same text; first writer wins
+        dialect = db.get_bind().dialect.name
+        insert = postgresql_insert if dialect == "postgresql" else sqlite_insert
+        statement = insert(EmbeddingCacheEntry).on_conflict_do_nothing(
+            index_elements=["model", "content_hash"]
+        )
+        await db.execute(statement, rows)
+        await db.commit()
@@ -0,0 +1,226 @@
+"""
+HTML text extraction and token-aware chunking.
+
+Everything here is CPU-bound and free of shared state, so ``chunk_page`` can
+run in a worker process: it takes and returns plain picklable values.
+"""
+
+import hashlib
+import re
+import unicodedata
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from bs4 import BeautifulSoup, Tag
+
+from ..core.tokens import count_tokens
+
+_WHITESPACE = re.compile(r"\s+")
+_SENTENCE = re.compile(r"(?<=[.!?])\s+")
+_BOILERPLATE = re.compile(
+    r"cookie|consent|banner|sidebar|menu|navbar|breadcrumb|footer|share|social|"
+    r"advert|promo|popup|modal|newsletter|subscribe",
+    re.IGNORECASE,
+)
+_REMOVED_TAGS = (
+    "script",
+    "style",
+    "noscript",
+    "template",
+    "svg",
+    "iframe",
+    "nav",
+    "header",
+    "footer",
+    "aside",
+    "form",
+)
+_REMOVED_ROLES = {"navigation", "banner", "contentinfo", "complementary", "dialog"}
+_HEADINGS = {"h1", "h2", "h3", "h4", "h5", "h6"}
+_BLOCKS = _HEADINGS | {"p", "li", "pre", "blockquote", "td", "th", "dt", "dd"}
+
+
+@dataclass
+class TextBlock:
+    """A paragraph-level piece of page text and the heading it falls under."""
+
+    text: str
+    heading: Optional[str] = None
+
+
+@dataclass
+class Chunk:
+    """A retrievable span of page text."""
+
+    id: str
+    url: str
+    position: int
+    text: str
+    token_count: int
+    heading: Optional[str] = None
+
+
+@dataclass
+class PageChunks:
+    """Chunks extracted from one page."""
+
+    url: str
+    title: Optional[str]
+    chunks: List[Chunk] = field(default_factory=list)
+
+
+def normalize_text(text: str) -> str:
+    """NFKC-normalize and collapse whitespace."""
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFKC", text)).strip()
+
+
+def chunk_id(url: str, text: str, occurrence: int = 0) -> str:
+    """Deterministic chunk ID from the source URL and chunk content."""
+    key = f"{url}\x00{text}\x00{occurrence}".encode("utf-8")
+    return hashlib.sha256(key).hexdigest()[:32]
+
+
+def _is_boilerplate(element: Tag) -> bool:
+    if element.get("role") in _REMOVED_ROLES:
+        return True
+    if element.get("aria-hidden") == "true":
+        return True
+    names = " ".join(element.get("class") or []) + " " + str(element.get("id") or "")
+    return bool(_BOILERPLATE.search(names))
+
+
+def extract_blocks(html: str) -> Tuple[Optional[str], List[TextBlock]]:
+    """Return the page title and its main-content text blocks."""
+    soup = BeautifulSoup(html, "html.parser")
+    title = normalize_text(soup.title.get_text()) if soup.title else None
+
+    for element in soup.find_all(_REMOVED_TAGS):
+        element.decompose()
+    for element in soup.find_all(_is_boilerplate):
+        if element.decomposed or element.name in ("html", "body", "main", "article"):
+            continue
+        element.decompose()
+
+    root = soup.find("main") or soup.find("article") or soup.body or soup
+    blocks: List[TextBlock] = []
+    heading: Optional[str] = None
+    previous = None
+    for element in root.find_all(_BLOCKS):
+        # Skip containers whose text is emitted by a nested block
+        if element.find(_BLOCKS):
+            continue
+        text = normalize_text(element.get_text(" "))
+        if not text or text == previous:
+            continue
+        previous = text
+        if element.name in _HEADINGS:
+            heading = text
+        blocks.append(TextBlock(text=text, heading=heading))
+
+    if not blocks:
+        text = normalize_text(root.get_text(" "))
+        if text:
+            blocks.append(TextBlock(text=text))
+    return title, blocks
+
+
+def _split_long(text: str, max_tokens: int) -> Iterator[str]:
+    """Split a block over ``max_tokens`` on sentences, then on words."""
+    pieces: List[str] = []
+    for sentence in _SENTENCE.split(text):
+        if count_tokens(sentence) <= max_tokens:
+            pieces.append(sentence)
+            continue
+        words: List[str] = []
+        word_tokens = 0
+        for word in sentence.split(" "):
+            cost = count_tokens(word)
+            if words and word_tokens + cost > max_tokens:
+                pieces.append(" ".join(words))
+                words, word_tokens = [], 0
+            words.append(word)
+            word_tokens += cost
+        if words:
+            pieces.append(" ".join(words))
+
+    current: List[str] = []
+    tokens = 0
+    for piece in pieces:
+        cost = count_tokens(piece)
+        if current and tokens + cost > max_tokens:
+            yield " ".join(current)
+            current, tokens = [], 0
+        current.append(piece)
+        tokens += cost
+    if current:
+        yield " ".join(current)
+
+
+def chunk_blocks(
+    url: str, blocks: List[TextBlock], max_tokens: int = 300, overlap_tokens: int = 40
+) -> List[Chunk]:
+    """Pack blocks into chunks of at most ``max_tokens``.
+
+    Each chunk after the first starts with the trailing blocks of the
+    previous chunk, up to ``overlap_tokens``, so answers spanning a boundary
+    stay retrievable.
+    """
+    pieces: List[Tuple[str, Optional[str], int]] = []
+    for block in blocks:
+        for text in _split_long(block.text, max_tokens):
+            pieces.append((text, block.heading, count_tokens(text)))
+
+    chunks: List[Chunk] = []
+    occurrences: Dict[str, int] = {}
+    current: List[Tuple[str, Optional[str], int]] = []
+    tokens = 0
+
+    def emit() -> None:
+        text = "\n".join(piece[0] for piece in current)
+        occurrence = occurrences.get(text, 0)
+        occurrences[text] = occurrence + 1
+        chunks.append(
+            Chunk(
+                id=chunk_id(url, text, occurrence),
+                url=url,
+                position=len(chunks),
+                text=text,
+                token_count=tokens,
+                heading=current[0][1],
+            )
+        )
+
+    fresh = 0  # pieces in ``current`` not already emitted in a previous chunk
+    for piece in pieces:
+        cost = piece[2]
+        if current and tokens + cost > max_tokens:
+            emit()
+            overlap: List[Tuple[str, Optional[str], int]] = []
+            kept = 0
+            for previous in reversed(current):
+                if (
+                    kept + previous[2] > overlap_tokens
+                    or kept + previous[2] + cost > max_tokens
+                ):
+                    break
+                overlap.insert(0, previous)
+                kept += previous[2]
+            current, tokens, fresh = overlap, kept, 0
+        current.append(piece)
+        tokens += cost
+        fresh += 1
+    if current and fresh:
+        emit()
+    return chunks
+
+
+def chunk_page(
+    url: str, html: str, max_tokens: int = 300, overlap_tokens: int = 40
+) -> PageChunks:
+    """Extract and chunk one page; safe to run in a worker process."""
+    title, blocks = extract_blocks(html)
+    return PageChunks(
+        url=url,
+        title=title,
+        chunks=chunk_blocks(url, blocks, max_tokens, overlap_tokens),
+    )
@@ -0,0 +1,279 @@
+"""
+Streaming ingestion of crawled pages into the retrieval index.
+
+Pages flow through as an async generator: extraction and chunking run in the
+shared process pool with at most ``max_in_flight`` pages outstanding, and
+each page's chunks are diffed against the stored chunk IDs so only added or
+updated chunks are embedded and only vanished chunks are deleted. The same
+diff is applied to the site's BM25 index when one is configured.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from concurrent.futures import Executor
+from dataclasses import dataclass
+from functools import partial
+from typing import AsyncIterable, AsyncIterator, Deque, Dict, List, Optional, Tuple
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.tracing import Span, start_span
+from ..core.workers import get_process_pool
+from ..models.document import DocumentChunk
+from .bm25 import BM25Store
+from .crawler import CrawledPage
+from .embedding_service import EmbeddingService
+from .extraction import Chunk, PageChunks, chunk_page
+from .vector_store import VectorStore
+
+logger = logging.getLogger(__name__)
+
+
+def _end_span(span: Span, _future: asyncio.Future) -> None:
+    span.end()
+
+
+def site_namespace(site_id: int) -> str:
+    """Vector store namespace holding a site's chunks."""
+    return f"site-{site_id}"
+
+
+def lexical_text(title: Optional[str], chunk: Chunk) -> str:
+    """Text indexed by BM25; title and heading carry most product names."""
+    return "\n".join(part for part in (title, chunk.heading, chunk.text) if part)
+
+
+@dataclass
+class ChunkDiff:
+    """Chunk changes applied for one page."""
+
+    added: int = 0
+    updated: int = 0
+    deleted: int = 0
+    unchanged: int = 0
+
+
+@dataclass
+class IngestStats:
+    """Totals for one ingestion run."""
+
+    pages: int = 0
+    removed_pages: int = 0
+    added: int = 0
+    updated: int = 0
+    deleted: int = 0
+    unchanged: int = 0
+    duration: float = 0.0
+
+    @property
+    def changed(self) -> bool:
+        """Whether any chunk was added, updated or deleted."""
+        return bool(self.added or self.updated or self.deleted)
+
+    def add(self, diff: ChunkDiff) -> None:
+        """Accumulate one page's diff."""
+        self.added += diff.added
+        self.updated += diff.updated
+        self.deleted += diff.deleted
+        self.unchanged += diff.unchanged
+
+
+class IngestionPipeline:
+    """Extracts, chunks and indexes pages with add/update/delete diffs."""
+
+    def __init__(
+        self,
+        embeddings: EmbeddingService,
+        vector_store: VectorStore,
+        executor: Optional[Executor] = None,
+        max_in_flight: int = 8,
+        max_tokens: int = 300,
+        overlap_tokens: int = 40,
+        lexical: Optional[BM25Store] = None,
+    ):
+        self.embeddings = embeddings
+        self.vector_store = vector_store
+        self.lexical = lexical
+        self.executor = executor
+        self.max_in_flight = max_in_flight
+        self.max_tokens = max_tokens
+        self.overlap_tokens = overlap_tokens
+
+    async def extract(
+        self, pages: AsyncIterable[CrawledPage]
+    ) -> AsyncIterator[Tuple[CrawledPage, Optional[PageChunks]]]:
+        """Yield each page with its chunks, in input order.
+
+        Removed pages yield ``None`` chunks. At most ``max_in_flight`` pages
+        are held (and being extracted) at any time.
+        """
+        loop = asyncio.get_running_loop()
+        executor = self.executor or get_process_pool()
+        pending: Deque[Tuple[CrawledPage, Optional[asyncio.Future]]] = deque()
+        try:
+            async for page in pages:
+                future = None
+                if not page.removed:
+                    future = loop.run_in_executor(
+                        executor,
+                        partial(
+                            chunk_page,
+                            page.url,
+                            page.html,
+                            self.max_tokens,
+                            self.overlap_tokens,
+                        ),
+                    )
+                    # Timed from here; the worker process has no span context
+                    stage = start_span("extract", url=page.url)
+                    future.add_done_callback(partial(_end_span, stage))
+                pending.append((page, future))
+                if len(pending) >= self.max_in_flight:
+                    done, future = pending.popleft()
+                    yield done, await future if future is not None else None
+            while pending:
+                done, future = pending.popleft()
+                yield done, await future if future is not None else None
+        finally:
+            for _page, future in pending:
+                if future is not None:
+                    future.cancel()
+
+    async def ingest(
+        self, db: AsyncSession, site_id: int, pages: AsyncIterable[CrawledPage]
+    ) -> IngestStats:
+        """Index a stream of crawled pages for ``site_id``."""
+        started = time.perf_counter()
+        stats = IngestStats()
+        async for page, extracted in self.extract(pages):
+            if extracted is None:
+                stats.removed_pages += 1
+                stats.deleted += await self.remove_page(db, site_id, page.url)
+            else:
+                stats.pages += 1
+                stats.add(await self.apply(db, site_id, extracted))
+        if self.lexical is not None:
+            await self.lexical.save(site_namespace(site_id))
+        stats.duration = time.perf_counter() - started
+        logger.info(
+            f"Ingestion completed - Site: {site_id}, Pages: {stats.pages}, "
+            f"Removed pages: {stats.removed_pages}, Added: {stats.added}, "
+            f"Updated: {stats.updated}, Deleted: {stats.deleted}, "
+            f"Unchanged: {stats.unchanged}, Duration: {stats.duration:.2f}s"
+        )
+        return stats
+
+    async def apply(
+        self, db: AsyncSession, site_id: int, page: PageChunks
+    ) -> ChunkDiff:
+        """Bring the stored chunks of ``page.url`` in line with ``page``.
+
+        Chunk IDs are derived from URL and content, so an edited passage
+        becomes a delete plus an add, while a passage that only moved or got
+        a new title is an update that reuses its cached embedding.
+        """
+        result = await db.execute(
+            select(DocumentChunk).where(
+                DocumentChunk.site_id == site_id, DocumentChunk.url == page.url
+            )
+        )
+        existing: Dict[str, DocumentChunk] = {
+            row.chunk_id: row for row in result.scalars()
+        }
+        current = {chunk.id for chunk in page.chunks}
+
+        diff = ChunkDiff()
+        to_index: List[Chunk] = []
+        for chunk in page.chunks:
+            row = existing.get(chunk.id)
+            if row is None:
+                diff.added += 1
+                to_index.append(chunk)
+                db.add(
+                    DocumentChunk(
+                        site_id=site_id,
+                        chunk_id=chunk.id,
+                        url=chunk.url,
+                        position=chunk.position,
+                        title=page.title,
+                        heading=chunk.heading,
+                        text=chunk.text,
+                        token_count=chunk.token_count,
+                    )
+                )
+            elif (row.position, row.title, row.heading) != (
+                chunk.position,
+                page.title,
+                chunk.heading,
+            ):
+                diff.updated += 1
+                to_index.append(chunk)
+                row.position = chunk.position
+                row.title = page.title
+                row.heading = chunk.heading
+            else:
+                diff.unchanged += 1
+        removed = [chunk_id for chunk_id in existing if chunk_id not in current]
+        diff.deleted = len(removed)
+
+        namespace = site_namespace(site_id)
+        if to_index:
+            vectors, _stats = await self.embeddings.embed(
+                db, [chunk.text for chunk in to_index]
+            )
+            await self.vector_store.upsert(
+                namespace,
+                [chunk.id for chunk in to_index],
+                vectors,
+                [
+                    {
+                        "url": chunk.url,
+                        "position": chunk.position,
+                        "title": page.title,
+                        "heading": chunk.heading,
+                    }
+                    for chunk in to_index
+                ],
+            )
+            if self.lexical is not None:
+                await self.lexical.add(
+                    namespace,
+                    [chunk.id for chunk in to_index],
+                    [lexical_text(page.title, chunk) for chunk in to_index],
+                )
+        if removed:
+            await self.vector_store.delete(namespace, removed)
+            if self.lexical is not None:
+                await self.lexical.remove(namespace, removed)
+            await db.execute(
+                delete(DocumentChunk).where(
+                    DocumentChunk.site_id == site_id,
+                    DocumentChunk.chunk_id.in_(removed),
+                )
+            )
+        await db.commit()
+        return diff
+
+    async def remove_page(self, db: AsyncSession, site_id: int, url: str) -> int:
+        """Delete every chunk of ``url``; returns how many were removed."""
+        result = await db.execute(
+            select(DocumentChunk.chunk_id).where(
+                DocumentChunk.site_id == site_id, DocumentChunk.url == url
+            )
+        )
+        removed = list(result.scalars())
+        if removed:
+            await self.vector_store.delete(site_namespace(site_id), removed)
+            if self.lexical is not None:
+                await self.lexical.remove(site_namespace(site_id), removed)
+            await db.execute(
+                delete(DocumentChunk).where(
+                    DocumentChunk.site_id == site_id,
+                    DocumentChunk.chunk_id.in_(removed),
+                )
+            )
+            await db.commit()
+        return len(removed)
@@ -0,0 +1,65 @@
+"""Conversation memory with token-budgeted context assembly."""
+
+from typing import Optional
+
+from ...core.config import Settings
+from ..providers import LLMProvider
+from .base import (
+    MemoryBackend,
+    MemoryBackendError,
+    MemoryMessage,
+    MemorySummary,
+    SessionSnapshot,
+)
+from .engine import (
+    AssembledContext,
+    ExtractiveSummarizer,
+    LLMSummarizer,
+    MemoryEngine,
+    Summarizer,
+)
+from .local import LocalMemoryBackend
+
+
+def build_memory_backend(settings: Settings) -> MemoryBackend:
+    """Create the memory backend selected by ``MEMORY_BACKEND``."""
+    if settings.MEMORY_BACKEND == "zep":
+        if not settings.ZEP_API_KEY:
+            raise MemoryBackendError("ZEP_API_KEY not configured")
+        from .zep import ZepMemoryBackend
+
+        return ZepMemoryBackend(settings.ZEP_API_KEY, settings.ZEP_API_URL)
+    if settings.MEMORY_BACKEND == "local":
+        return LocalMemoryBackend()
+    raise MemoryBackendError(f"Unknown memory backend: {settings.MEMORY_BACKEND!r}")
+
+
+def build_memory_engine(
+    settings: Settings, llm: Optional[LLMProvider] = None
+) -> MemoryEngine:
+    """Create a memory engine; summaries use ``llm`` when one is given."""
+    summarizer: Summarizer = LLMSummarizer(llm) if llm else ExtractiveSummarizer()
+    return MemoryEngine(
+        build_memory_backend(settings),
+        summarizer,
+        token_budget=settings.MEMORY_TOKEN_BUDGET,
+        summarize_after_tokens=settings.MEMORY_SUMMARIZE_AFTER_TOKENS,
+        keep_recent_tokens=settings.MEMORY_KEEP_RECENT_TOKENS,
+    )
+
+
+__all__ = [
+    "AssembledContext",
+    "ExtractiveSummarizer",
+    "LLMSummarizer",
+    "LocalMemoryBackend",
+    "MemoryBackend",
+    "MemoryBackendError",
+    "MemoryEngine",
+    "MemoryMessage",
+    "MemorySummary",
+    "SessionSnapshot",
+    "Summarizer",
+    "build_memory_backend",
+    "build_memory_engine",
+]
@@ -0,0 +1,63 @@
+"""
+Conversation memory data types and backend interface.
+"""
+
+import time
+from dataclasses import dataclass, field
+from typing import List, Optional, Protocol, Sequence
+
+
+class MemoryBackendError(Exception):
+    """Raised when the memory backend is misconfigured or unavailable."""
+
+
+@dataclass
+class MemoryMessage:
+    """A stored conversation message with its token count cached."""
+
+    role: str
+    content: str
+    token_count: int
+    seq: int = 0
+    created_at: float = field(default_factory=time.time)
+
+
+@dataclass
+class MemorySummary:
+    """Rolling summary of every message up to and including ``covers_seq``."""
+
+    content: str
+    token_count: int
+    covers_seq: int
+
+
+@dataclass
+class SessionSnapshot:
+    """What a backend returns for context assembly."""
+
+    summary: Optional[MemorySummary] = None
+    messages: List[MemoryMessage] = field(default_factory=list)  # oldest first
+    facts: List[str] = field(default_factory=list)
+
+
+class MemoryBackend(Protocol):
+    """Per-session message storage."""
+
+    # True when the backend summarizes old messages itself (e.g. Zep)
+    manages_summaries: bool
+
+    async def append(self, session_id: str, messages: Sequence[MemoryMessage]) -> None:
+        """Store ``messages``; assigns their ``seq`` numbers."""
+        ...
+
+    async def load(self, session_id: str, max_messages: int) -> SessionSnapshot:
+        """Return the summary and up to ``max_messages`` unsummarized messages."""
+        ...
+
+    async def save_summary(self, session_id: str, summary: MemorySummary) -> None:
+        """Replace the session's rolling summary."""
+        ...
+
+    async def delete(self, session_id: str) -> None:
+        """Forget a session entirely."""
+        ...
@@ -0,0 +1,274 @@
+"""
+Token-budgeted conversation memory.
+
+Every stored message carries its token count, so assembling a turn's context
+only adds up cached integers. Once the unsummarized history grows past
+``summarize_after_tokens`` the older part is folded into a rolling summary,
+keeping the newest ``keep_recent_tokens`` verbatim.
+"""
+
+import logging
+import re
+from dataclasses import dataclass
+from typing import List, Optional, Protocol, Sequence, Set, Tuple
+
+from ...core.tokens import MESSAGE_OVERHEAD_TOKENS, count_message_tokens, count_tokens
+from ..providers import ChatMessages, LLMProvider
+from .base import MemoryBackend, MemoryMessage, MemorySummary
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_HEADER = "Summary of the earlier conversation:\n"
+FACTS_HEADER = "Relevant facts:\n"
+
+_FIRST_SENTENCE = re.compile(r"^(.+?[.!?])(\s|$)", re.DOTALL)
+
+
+class Summarizer(Protocol):
+    """Folds older messages into a rolling summary."""
+
+    async def summarize(
+        self,
+        previous: Optional[str],
+        messages: Sequence[MemoryMessage],
+        max_tokens: int,
+    ) -> str:
+        """Return a summary of ``previous`` plus ``messages``."""
+        ...
+
+
+class LLMSummarizer:
+    """Summaries written by the chat LLM."""
+
+    def __init__(self, llm: LLMProvider):
+        self.llm = llm
+
+    async def summarize(
+        self,
+        previous: Optional[str],
+        messages: Sequence[MemoryMessage],
+        max_tokens: int,
+    ) -> str:
+        """Ask the LLM to extend ``previous`` with ``messages``."""
+        transcript = "\n".join(f"{m.role}: {m.content}" for m in messages)
+        prompt = (
+            f"Update the conversation summary in at most {max_tokens} tokens. "
+            "Keep names, numbers, preferences and open questions.\n\n"
+            f"Current summary:\n{previous or '(none)'}\n\n"
+            f"New messages:\n{transcript}"
+        )
+        fragments = [
+            fragment
+            async for fragment in self.llm.stream([{"role": "user", "content": prompt}])
+        ]
+        return "".join(fragments).strip()
+
+
+class ExtractiveSummarizer:
+    """Offline summarizer keeping the first sentence of each user message."""
+
+    async def summarize(
+        self,
+        previous: Optional[str],
+        messages: Sequence[MemoryMessage],
+        max_tokens: int,
+    ) -> str:
+        """Append a line per user message, dropping the oldest over budget."""
+        lines = previous.splitlines() if previous else []
+        for message in messages:
+            if message.role != "user":
+                continue
+            match = _FIRST_SENTENCE.match(message.content.strip())
+            sentence = match.group(1) if match else message.content.strip()
+            lines.append(f"{message.role}: {sentence}")
+        costs = [count_tokens(line) + 1 for line in lines]
+        total = sum(costs)
+        start = 0
+        while total > max_tokens and start < len(lines) - 1:
+            total -= costs[start]
+            start += 1
+        return "\n".join(lines[start:])
+
+
+@dataclass
+class AssembledContext:
+    """Chat messages for one turn and how the budget was spent."""
+
+    messages: ChatMessages
+    token_count: int
+    recent_messages: int
+    facts: int
+    summary: bool
+
+
+class MemoryEngine:
+    """Stores conversation turns and builds budgeted LLM contexts."""
+
+    def __init__(
+        self,
+        backend: MemoryBackend,
+        summarizer: Summarizer,
+        token_budget: int = 1500,
+        summarize_after_tokens: int = 1200,
+        keep_recent_tokens: int = 400,
+        summary_max_tokens: int = 250,
+        recent_share: float = 0.6,
+        max_load_messages: int = 200,
+    ):
+        self.backend = backend
+        self.summarizer = summarizer
+        self.token_budget = token_budget
+        self.summarize_after_tokens = summarize_after_tokens
+        self.keep_recent_tokens = keep_recent_tokens
+        self.summary_max_tokens = summary_max_tokens
+        self.recent_share = recent_share
+        self.max_load_messages = max_load_messages
+        self._summarizing: Set[str] = set()
+
+    async def add_messages(
+        self, session_id: str, messages: Sequence[Tuple[str, str]]
+    ) -> None:
+        """Store ``(role, content)`` pairs, counting their tokens once."""
+        await self.backend.append(
+            session_id,
+            [
+                MemoryMessage(
+                    role=role, content=content, token_count=count_tokens(content)
+                )
+                for role, content in messages
+            ],
+        )
+        await self._maybe_summarize(session_id)
+
+    async def add_turn(self, session_id: str, user_text: str, assistant_text: str):
+        """Store a user utterance and the assistant's answer."""
+        await self.add_messages(
+            session_id, [("user", user_text), ("assistant", assistant_text)]
+        )
+
+    async def assemble(
+        self,
+        session_id: str,
+        query: str,
+        system_prompt: Optional[str] = None,
+        facts: Sequence[str] = (),
+    ) -> AssembledContext:
+        """Build the context for answering ``query`` within the token budget.
+
+        The newest turns get the first ``recent_share`` of the budget, then
+        the summary, then retrieved facts in rank order; whatever is left goes
+        to further (older) turns. Only cached counts are summed, so the cost
+        is linear in the number of pieces considered.
+        """
+        snapshot = await self.backend.load(session_id, self.max_load_messages)
+        used = count_message_tokens(query)
+        if system_prompt:
+            used += count_message_tokens(system_prompt)
+        available = remaining = max(self.token_budget - used, 0)
+
+        history = snapshot.messages
+        included = 0
+
+        def take_recent(limit: int) -> int:
+            nonlocal included
+            spent = 0
+            while included < len(history):
+                message = history[-1 - included]
+                cost = message.token_count + MESSAGE_OVERHEAD_TOKENS
+                if spent + cost > limit:
+                    break
+                spent += cost
+                included += 1
+            return spent
+
+        remaining -= take_recent(int(remaining * self.recent_share))
+
+        summary: Optional[MemorySummary] = None
+        if snapshot.summary is not None:
+            cost = (
+                snapshot.summary.token_count
+                + count_tokens(SUMMARY_HEADER)
+                + MESSAGE_OVERHEAD_TOKENS
+            )
+            if cost <= remaining:
+                summary = snapshot.summary
+                remaining -= cost
+
+        fact_lines: List[str] = []
+        candidates = list(facts) + snapshot.facts
+        if candidates:
+            spent = count_tokens(FACTS_HEADER) + MESSAGE_OVERHEAD_TOKENS
+            for fact in candidates:
+                cost = count_tokens(fact) + 2  # "- " prefix and newline
+                if spent + cost > remaining:
+                    break
+                fact_lines.append(fact)
+                spent += cost
+            if fact_lines:
+                remaining -= spent
+
+        remaining -= take_recent(remaining)
+
+        messages: ChatMessages = []
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+        if summary is not None:
+            messages.append(
+                {"role": "system", "content": SUMMARY_HEADER + summary.content}
+            )
+        if fact_lines:
+            body = "\n".join(f"- {fact}" for fact in fact_lines)
+            messages.append({"role": "system", "content": FACTS_HEADER + body})
+        start = len(history) - included
+        messages.extend({"role": m.role, "content": m.content} for m in history[start:])
+        messages.append({"role": "user", "content": query})
+
+        return AssembledContext(
+            messages=messages,
+            token_count=used + available - remaining,
+            recent_messages=included,
+            facts=len(fact_lines),
+            summary=summary is not None,
+        )
+
+    async def _maybe_summarize(self, session_id: str) -> None:
+        if self.backend.manages_summaries or session_id in self._summarizing:
+            return
+        self._summarizing.add(session_id)
+        try:
+            snapshot = await self.backend.load(session_id, self.max_load_messages)
+            history = snapshot.messages
+            total = sum(m.token_count for m in history)
+            if total <= self.summarize_after_tokens:
+                return
+
+            kept = 0
+            keep_from = len(history)
+            while keep_from > 0:
+                cost = history[keep_from - 1].token_count
+                if kept + cost > self.keep_recent_tokens:
+                    break
+                kept += cost
+                keep_from -= 1
+            older = history[:keep_from]
+            if not older:
+                return
+
+            previous = snapshot.summary.content if snapshot.summary else None
+            content = await self.summarizer.summarize(
+                previous, older, self.summary_max_tokens
+            )
+            await self.backend.save_summary(
+                session_id,
+                MemorySummary(
+                    content=content,
+                    token_count=count_tokens(content),
+                    covers_seq=older[-1].seq,
+                ),
+            )
+            logger.info(
+                f"Conversation summarized - Session: {session_id}, "
+                f"Messages: {len(older)}, Tokens: {total - kept}"
+            )
+        finally:
+            self._summarizing.discard(session_id)
@@ -0,0 +1,74 @@
+"""
+In-process conversation memory backend.
+"""
+
+import asyncio
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import List, Optional, Sequence
+
+from .base import MemoryMessage, MemorySummary, SessionSnapshot
+
+
+@dataclass
+class _Session:
+    messages: List[MemoryMessage] = field(default_factory=list)
+    summary: Optional[MemorySummary] = None
+    # Index of the first message not covered by ``summary``
+    unsummarized_from: int = 0
+
+
+class LocalMemoryBackend:
+    """Memory held in process, evicting least recently used sessions."""
+
+    manages_summaries = False
+
+    def __init__(self, max_sessions: int = 10000):
+        self.max_sessions = max_sessions
+        self._sessions: "OrderedDict[str, _Session]" = OrderedDict()
+        self._lock = asyncio.Lock()
+
+    def _session(self, session_id: str) -> _Session:
+        session = self._sessions.get(session_id)
+        if session is None:
+            session = self._sessions[session_id] = _Session()
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+        else:
+            self._sessions.move_to_end(session_id)
+        return session
+
+    async def append(self, session_id: str, messages: Sequence[MemoryMessage]) -> None:
+        """Store ``messages``; assigns their ``seq`` numbers."""
+        async with self._lock:
+            session = self._session(session_id)
+            next_seq = session.messages[-1].seq + 1 if session.messages else 1
+            for offset, message in enumerate(messages):
+                message.seq = next_seq + offset
+                session.messages.append(message)
+
+    async def load(self, session_id: str, max_messages: int) -> SessionSnapshot:
+        """Return the summary and up to ``max_messages`` unsummarized messages."""
+        async with self._lock:
+            session = self._session(session_id)
+            start = max(session.unsummarized_from, len(session.messages) - max_messages)
+            return SessionSnapshot(
+                summary=session.summary, messages=session.messages[start:]
+            )
+
+    async def save_summary(self, session_id: str, summary: MemorySummary) -> None:
+        """Replace the session's rolling summary."""
+        async with self._lock:
+            session = self._session(session_id)
+            session.summary = summary
+            while (
+                session.unsummarized_from < len(session.messages)
+                and session.messages[session.unsummarized_from].seq
+                <= summary.covers_seq
+            ):
+                session.unsummarized_from += 1
+
+    async def delete(self, session_id: str) -> None:
+        """Forget a session entirely."""
+        async with self._lock:
+            self._sessions.pop(session_id, None)
@@ -0,0 +1,70 @@
+"""
+Zep-backed conversation memory.
+
+Zep summarizes and extracts facts server-side, so this backend reports
+``manages_summaries`` and the engine never asks it to store a summary.
+"""
+
+from typing import Optional, Sequence
+
+from ...core.tokens import count_tokens
+from .base import MemoryMessage, MemorySummary, SessionSnapshot
+
+
+class ZepMemoryBackend:
+    """Memory stored in a Zep server or Zep Cloud."""
+
+    manages_summaries = True
+
+    def __init__(self, api_key: str, base_url: Optional[str] = None):
+        from zep_python.client import AsyncZep
+
+        self._client = AsyncZep(api_key=api_key, base_url=base_url)
+
+    async def append(self, session_id: str, messages: Sequence[MemoryMessage]) -> None:
+        """Store ``messages`` in the Zep session."""
+        from zep_python.types import Message
+
+        await self._client.memory.add(
+            session_id,
+            messages=[
+                Message(
+                    role=message.role,
+                    role_type=message.role,  # type: ignore[arg-type]
+                    content=message.content,
+                )
+                for message in messages
+            ],
+        )
+
+    async def load(self, session_id: str, max_messages: int) -> SessionSnapshot:
+        """Return Zep's summary, recent messages and relevant facts."""
+        memory = await self._client.memory.get(session_id, lastn=max_messages)
+        messages = []
+        for seq, message in enumerate(memory.messages or [], start=1):
+            content = message.content or ""
+            messages.append(
+                MemoryMessage(
+                    role=message.role_type or message.role or "user",
+                    content=content,
+                    token_count=message.token_count or count_tokens(content),
+                    seq=seq,
+                )
+            )
+        summary = None
+        if memory.summary and memory.summary.content:
+            content = memory.summary.content
+            summary = MemorySummary(
+                content=content,
+                token_count=memory.summary.token_count or count_tokens(content),
+                covers_seq=0,
+            )
+        facts = [fact.fact for fact in memory.relevant_facts or [] if fact.fact]
+        return SessionSnapshot(summary=summary, messages=messages, facts=facts)
+
+    async def save_summary(self, session_id: str, summary: MemorySummary) -> None:
+        """Zep maintains its own summaries."""
+
+    async def delete(self, session_id: str) -> None:
+        """Delete the Zep session memory."""
+        await self._client.memory.delete(session_id)
@@ -0,0 +1,306 @@
+"""
+LLM and TTS provider interfaces with real and offline implementations.
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+from typing import TYPE_CHECKING, AsyncIterator, Dict, List, Optional, Protocol, cast
+
+import httpx
+import numpy as np
+
+from ..core.config import Settings
+
+if TYPE_CHECKING:
+    from openai.types.chat import ChatCompletionMessageParam
+
+logger = logging.getLogger(__name__)
+
+ChatMessages = List[Dict[str, str]]
+
+
+class ProviderError(Exception):
+    """Raised when an external provider fails or is not configured."""
+
+
+class LLMProvider(Protocol):
+    """Streaming chat completion provider."""
+
+    model: str
+
+    def stream(self, messages: ChatMessages) -> AsyncIterator[str]:
+        """Yield response text fragments as they are generated."""
+        ...
+
+    async def aclose(self) -> None:
+        """Release network resources held by the provider."""
+        ...
+
+
+class TTSProvider(Protocol):
+    """Streaming text-to-speech provider."""
+
+    media_type: str
+    model: str
+    bytes_per_second: int  # encoded audio bitrate, for audio duration accounting
+
+    def synthesize(self, text: str) -> AsyncIterator[bytes]:
+        """Yield encoded audio chunks for ``text``."""
+        ...
+
+    async def aclose(self) -> None:
+        """Release network resources held by the provider."""
+        ...
+
+
+class OpenAILLMProvider:
+    """Chat completions streamed from the OpenAI API."""
+
+    def __init__(self, api_key: str, model: str):
+        from openai import AsyncOpenAI
+
+        self._client = AsyncOpenAI(api_key=api_key)
+        self.model = model
+
+    async def stream(self, messages: ChatMessages) -> AsyncIterator[str]:
+        """Yield content deltas from a streamed chat completion."""
+        try:
+            response = await self._client.chat.completions.create(
+                model=self.model,
+                messages=cast(List["ChatCompletionMessageParam"], messages),
+                stream=True,
+            )
+            async for event in response:
+                if not event.choices:
+                    continue
+                delta = event.choices[0].delta.content
+                if delta:
+                    yield delta
+        except Exception as e:
+            raise ProviderError(f"LLM request failed: {e}") from e
+
+    async def aclose(self) -> None:
+        """Close the underlying OpenAI HTTP client."""
+        await self._client.close()
+
+
+class ElevenLabsTTSProvider:
+    """Speech synthesis streamed from the ElevenLabs REST API."""
+
+    media_type = "audio/mpeg"
+    base_url = "https://api.elevenlabs.io"
+    bytes_per_second = 16000  # default mp3_44100_128 output format
+
+    def __init__(self, api_key: str, voice_id: str, model_id: str):
+        self.api_key = api_key
+        self.voice_id = voice_id
+        self.model_id = model_id
+        self.model = model_id
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(base_url=self.base_url, timeout=30.0)
+        return self._client
+
+    async def synthesize(self, text: str) -> AsyncIterator[bytes]:
+        """Yield MP3 chunks for ``text`` as ElevenLabs produces them."""
+        client = self._get_client()
+        try:
+            async with client.stream(
+                "POST",
+                f"/v1/text-to-speech/{self.voice_id}/stream",
+                headers={"xi-api-key": self.api_key},
+                json={"text": text, "model_id": self.model_id},
+            ) as response:
+                if response.status_code >= 400:
+                    body = await response.aread()
+                    raise ProviderError(
+                        f"TTS request failed with status {response.status_code}: "
+                        f"{body[:200]!r}"
+                    )
+                async for chunk in response.aiter_bytes():
+                    yield chunk
+        except httpx.HTTPError as e:
+            raise ProviderError(f"TTS request failed: {e}") from e
+
+    async def aclose(self) -> None:
+        """Close the pooled HTTP client, if one was opened."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+class FakeLLMProvider:
+    """Deterministic offline LLM that streams a canned answer word by word."""
+
+    model = "fake-llm"
+
+    def __init__(
+        self,
+        response: str = (
+            "Thanks for asking. Our store is open from nine to five on weekdays, "
+            "and we are closed on public holidays. Is there anything else I can "
+            "help you with today?"
+        ),
+        first_token_delay: float = 0.0,
+        token_delay: float = 0.0,
+    ):
+        self.response = response
+        self.first_token_delay = first_token_delay
+        self.token_delay = token_delay
+
+    async def stream(self, messages: ChatMessages) -> AsyncIterator[str]:
+        """Yield the canned response one whitespace-delimited token at a time."""
+        if self.first_token_delay:
+            await asyncio.sleep(self.first_token_delay)
+        words = self.response.split(" ")
+        for index, word in enumerate(words):
+            if index and self.token_delay:
+                await asyncio.sleep(self.token_delay)
+            yield word if index == 0 else " " + word
+
+    async def aclose(self) -> None:
+        """Nothing to release."""
+
+
+class FakeTTSProvider:
+    """Deterministic offline TTS producing pseudo-audio bytes per character."""
+
+    media_type = "application/octet-stream"
+    model = "fake-tts"
+    bytes_per_second = 16000
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        seconds_per_char: float = 0.0,
+        bytes_per_char: int = 16,
+        chunk_size: int = 1024,
+    ):
+        self.latency = latency
+        self.seconds_per_char = seconds_per_char
+        self.bytes_per_char = bytes_per_char
+        self.chunk_size = chunk_size
+
+    async def synthesize(self, text: str) -> AsyncIterator[bytes]:
+        """Yield audio derived from a hash of ``text`` after simulated latency."""
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        seed = hashlib.sha256(text.encode("utf-8")).digest()
+        total = len(text) * self.bytes_per_char
+        audio = (seed * (total // len(seed) + 1))[:total]
+        chunk_delay = self.seconds_per_char * self.chunk_size / self.bytes_per_char
+        for start in range(0, total, self.chunk_size):
+            if start and chunk_delay:
+                await asyncio.sleep(chunk_delay)
+            end = start + self.chunk_size
+            yield audio[start:end]
+
+    async def aclose(self) -> None:
+        """Nothing to release."""
+
+
+def _fake_providers_allowed(settings: Settings) -> bool:
+    return settings.VOICE_FAKE_PROVIDERS or os.getenv("TESTING") == "true"
+
+
+def build_llm_provider(settings: Settings) -> LLMProvider:
+    """Create the configured LLM provider, or a fake one if explicitly enabled."""
+    if settings.OPENAI_API_KEY:
+        return OpenAILLMProvider(settings.OPENAI_API_KEY, settings.LLM_MODEL)
+    if _fake_providers_allowed(settings):
+        logger.warning("OPENAI_API_KEY not configured, using fake LLM provider")
+        return FakeLLMProvider()
+    raise ProviderError("LLM provider not configured")
+
+
+def build_tts_provider(settings: Settings) -> TTSProvider:
+    """Create the configured TTS provider, or a fake one if explicitly enabled."""
+    if settings.ELEVENLABS_API_KEY:
+        return ElevenLabsTTSProvider(
+            settings.ELEVENLABS_API_KEY,
+            settings.ELEVENLABS_VOICE_ID,
+            settings.ELEVENLABS_MODEL_ID,
+        )
+    if _fake_providers_allowed(settings):
+        logger.warning("ELEVENLABS_API_KEY not configured, using fake TTS provider")
+        return FakeTTSProvider()
+    raise ProviderError("TTS provider not configured")
+
+
+class EmbeddingProvider(Protocol):
+    """Batch text embedding provider."""
+
+    model: str
+    dimensions: int
+    max_batch_size: int
+
+    async def embed(self, texts: List[str]) -> List[List[float]]:
+        """Return one embedding per input text, in order."""
+        ...
+
+
+class OpenAIEmbeddingProvider:
+    """Embeddings from the OpenAI API."""
+
+    max_batch_size = 2048
+
+    def __init__(self, api_key: str, model: str, dimensions: int):
+        from openai import AsyncOpenAI
+
+        self._client = AsyncOpenAI(api_key=api_key)
+        self.model = model
+        self.dimensions = dimensions
+
+    async def embed(self, texts: List[str]) -> List[List[float]]:
+        """Embed ``texts`` in a single API request."""
+        try:
+            response = await self._client.embeddings.create(
+                model=self.model, input=texts, dimensions=self.dimensions
+            )
+        except Exception as e:
+            raise ProviderError(f"Embedding request failed: {e}") from e
+        ordered = sorted(response.data, key=lambda item: item.index)
+        return [item.embedding for item in ordered]
+
+
+class FakeEmbeddingProvider:
+    """Deterministic offline embeddings seeded from a hash of each text."""
+
+    def __init__(
+        self,
+        model: str = "fake-embedding",
+        dimensions: int = 64,
+        max_batch_size: int = 256,
+    ):
+        self.model = model
+        self.dimensions = dimensions
+        self.max_batch_size = max_batch_size
+        self.calls: List[int] = []
+
+    async def embed(self, texts: List[str]) -> List[List[float]]:
+        """Return a pseudo-random unit vector per text; records batch sizes."""
+        self.calls.append(len(texts))
+        vectors = []
+        for text in texts:
+            seed = int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8])
+            vector = np.random.default_rng(seed).standard_normal(self.dimensions)
+            vectors.append((vector / np.linalg.norm(vector)).tolist())
+        return vectors
+
+
+def build_embedding_provider(settings: Settings) -> EmbeddingProvider:
+    """Create the configured embedding provider, or a fake one if enabled."""
+    if settings.OPENAI_API_KEY:
+        return OpenAIEmbeddingProvider(
+            settings.OPENAI_API_KEY,
+            settings.EMBEDDING_MODEL,
+            settings.EMBEDDING_DIMENSIONS,
+        )
+    if _fake_providers_allowed(settings):
+        logger.warning("OPENAI_API_KEY not configured, using fake embeddings")
+        return FakeEmbeddingProvider(dimensions=settings.EMBEDDING_DIMENSIONS)
+    raise ProviderError("Embedding provider not configured")
@@ -0,0 +1,152 @@
+"""
+Hybrid retrieval: BM25 and vector top-k fused with reciprocal rank fusion.
+
+Embeddings miss exact tokens such as product names, SKUs and policy numbers,
+while BM25 misses paraphrases. Each retriever returns ``candidates`` chunk
+IDs and the two rankings are merged by summing ``1 / (rrf_k + rank)``, which
+needs no score calibration between the two.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Literal, Optional, Sequence, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.tracing import span
+from ..models.document import DocumentChunk
+from .bm25 import BM25Store
+from .embedding_service import EmbeddingService
+from .ingestion import site_namespace
+from .vector_store import VectorStore
+
+logger = logging.getLogger(__name__)
+
+RetrievalMode = Literal["hybrid", "vector", "lexical"]
+
+
+def reciprocal_rank_fusion(
+    rankings: Sequence[Sequence[str]], k: int = 60
+) -> List[Tuple[str, float]]:
+    """Merge ranked ID lists into ``(id, score)`` pairs, best first."""
+    scores: Dict[str, float] = {}
+    for ranking in rankings:
+        for rank, doc_id in enumerate(ranking, start=1):
+            scores[doc_id] = scores.get(doc_id, 0.0) + 1.0 / (k + rank)
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)
+
+
+@dataclass
+class RetrievedChunk:
+    """A chunk selected for a query."""
+
+    chunk_id: str
+    score: float
+    url: str
+    text: str
+    position: int
+    title: Optional[str] = None
+    heading: Optional[str] = None
+    vector_rank: Optional[int] = None
+    lexical_rank: Optional[int] = None
+
+
+class RetrievalService:
+    """Retrieve a site's chunks by vector, lexical or fused ranking."""
+
+    def __init__(
+        self,
+        embeddings: EmbeddingService,
+        vector_store: VectorStore,
+        lexical: BM25Store,
+        rrf_k: int = 60,
+        candidates: int = 20,
+    ):
+        self.embeddings = embeddings
+        self.vector_store = vector_store
+        self.lexical = lexical
+        self.rrf_k = rrf_k
+        self.candidates = candidates
+
+    async def _vector_ranking(
+        self, db: AsyncSession, namespace: str, query: str, top_k: int
+    ) -> List[str]:
+        vectors, _stats = await self.embeddings.embed(db, [query])
+        matches = await self.vector_store.query(namespace, vectors[0], top_k)
+        return [match.id for match in matches]
+
+    async def _lexical_ranking(
+        self, namespace: str, query: str, top_k: int
+    ) -> List[str]:
+        return [
+            doc_id
+            for doc_id, _score in await self.lexical.search(namespace, query, top_k)
+        ]
+
+    async def search(
+        self,
+        db: AsyncSession,
+        site_id: int,
+        query: str,
+        top_k: int = 5,
+        mode: RetrievalMode = "hybrid",
+    ) -> List[RetrievedChunk]:
+        """Return the ``top_k`` chunks of ``site_id`` for ``query``."""
+        started = time.perf_counter()
+        with span("retrieval", mode=mode, top_k=top_k):
+            namespace = site_namespace(site_id)
+            candidates = max(self.candidates, top_k)
+
+            vector_ranking: List[str] = []
+            lexical_ranking: List[str] = []
+            if mode == "hybrid":
+                vector_ranking, lexical_ranking = await asyncio.gather(
+                    self._vector_ranking(db, namespace, query, candidates),
+                    self._lexical_ranking(namespace, query, candidates),
+                )
+            elif mode == "vector":
+                vector_ranking = await self._vector_ranking(db, namespace, query, top_k)
+            else:
+                lexical_ranking = await self._lexical_ranking(namespace, query, top_k)
+
+            fused = reciprocal_rank_fusion(
+                [ranking for ranking in (vector_ranking, lexical_ranking) if ranking],
+                self.rrf_k,
+            )[:top_k]
+            if not fused:
+                return []
+
+            result = await db.execute(
+                select(DocumentChunk).where(
+                    DocumentChunk.site_id == site_id,
+                    DocumentChunk.chunk_id.in_([doc_id for doc_id, _score in fused]),
+                )
+            )
+            rows = {row.chunk_id: row for row in result.scalars()}
+            vector_ranks = {doc_id: n for n, doc_id in enumerate(vector_ranking, 1)}
+            lexical_ranks = {doc_id: n for n, doc_id in enumerate(lexical_ranking, 1)}
+            chunks = [
+                RetrievedChunk(
+                    chunk_id=doc_id,
+                    score=score,
+                    url=rows[doc_id].url,
+                    text=rows[doc_id].text,
+                    position=rows[doc_id].position,
+                    title=rows[doc_id].title,
+                    heading=rows[doc_id].heading,
+                    vector_rank=vector_ranks.get(doc_id),
+                    lexical_rank=lexical_ranks.get(doc_id),
+                )
+                for doc_id, score in fused
+                if doc_id in rows
+            ]
+            logger.info(
+                f"Retrieval - Site: {site_id}, Mode: {mode}, "
+                f"Vector hits: {len(vector_ranking)}, "
+                f"Lexical hits: {len(lexical_ranking)}, Returned: {len(chunks)}, "
+                f"Duration: {(time.perf_counter() - started) * 1000:.1f}ms"
+            )
+            return chunks
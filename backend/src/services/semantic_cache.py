@@ -0,0 +1,231 @@
+"""
+Per-site semantic cache of spoken answers.
+
+Standalone questions are embedded and compared against the questions already
+answered for the same site; when the best cosine similarity reaches
+``threshold`` the stored answer text and synthesized audio are replayed and
+the LLM and TTS are skipped. Each site keeps a small contiguous matrix of
+normalized query vectors; at a few thousand rows a single matrix-vector
+product takes microseconds, so no partitioning is needed.
+
+Entries expire after ``ttl`` seconds and a site's entries are dropped when
+its content is re-ingested. Audio is stored in files under ``root``; the
+index itself is process-local.
+"""
+
+import asyncio
+import logging
+import os
+import shutil
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ..core.metrics import counter, gauge, histogram
+
+logger = logging.getLogger(__name__)
+
+CACHE_LOOKUPS = counter(
+    "semantic_cache_lookups_total",
+    "Semantic answer cache lookups by result",
+    ["result"],
+)
+CACHE_HIT_RATIO = gauge(
+    "semantic_cache_hit_ratio", "Fraction of semantic cache lookups that hit"
+)
+CACHE_SAVED_SECONDS = histogram(
+    "semantic_cache_saved_seconds",
+    "Response time saved per semantic cache hit",
+    buckets=(0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 16.0, 32.0),
+)
+CACHE_ENTRIES = gauge("semantic_cache_entries", "Live semantic cache entries")
+
+
+@dataclass
+class CachedAnswer:
+    """A stored answer and where its audio lives."""
+
+    id: str
+    answer: str
+    audio_path: str
+    media_type: str
+    turn_seconds: float  # full LLM + TTS turn duration when it was generated
+    expires_at: float
+    hits: int = 0
+
+
+@dataclass
+class CacheLookup:
+    """Result of a lookup; ``generation`` must be passed back to ``store``."""
+
+    entry: Optional[CachedAnswer]
+    similarity: float
+    generation: int
+
+
+class _SiteCache:
+    """Query vectors and answers of one site."""
+
+    def __init__(self, dim: int, capacity: int):
+        self.vectors = np.zeros((capacity, dim), dtype=np.float32)
+        self.expires_at = np.zeros(capacity, dtype=np.float64)  # 0 marks free
+        self.last_used = np.zeros(capacity, dtype=np.float64)
+        self.entries: List[Optional[CachedAnswer]] = [None] * capacity
+
+    def best(self, vector: np.ndarray, now: float) -> Tuple[int, float]:
+        similarities = self.vectors @ vector
+        similarities[self.expires_at <= now] = -np.inf
+        slot = int(np.argmax(similarities))
+        return slot, float(similarities[slot])
+
+    def free_slot(self, now: float) -> int:
+        """An empty or expired slot, else the least recently used one."""
+        expired = np.flatnonzero(self.expires_at <= now)
+        if len(expired):
+            return int(expired[0])
+        return int(np.argmin(self.last_used))
+
+
+class SemanticCache:
+    """Answer cache keyed by query embedding similarity, per site."""
+
+    def __init__(
+        self,
+        root: str,
+        threshold: float = 0.92,
+        ttl: float = 24 * 3600,
+        max_entries: int = 1000,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.root = root
+        self.threshold = threshold
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.clock = clock
+        self._sites: Dict[int, _SiteCache] = {}
+        self._generations: Dict[int, int] = {}
+        self._lookups = 0
+        self._hits = 0
+
+    def _site_dir(self, site_id: int) -> str:
+        return os.path.join(self.root, f"site-{site_id}")
+
+    @staticmethod
+    def _normalize(vector: Any) -> np.ndarray:
+        normalized: np.ndarray = np.asarray(vector, dtype=np.float32).ravel()
+        norm = float(np.linalg.norm(normalized))
+        return normalized / np.float32(norm) if norm else normalized
+
+    def lookup(self, site_id: int, vector: Any) -> CacheLookup:
+        """Find a stored answer to a question similar to ``vector``."""
+        generation = self._generations.get(site_id, 0)
+        site = self._sites.get(site_id)
+        entry, similarity = None, 0.0
+        if site is not None:
+            now = self.clock()
+            slot, similarity = site.best(self._normalize(vector), now)
+            if similarity >= self.threshold:
+                entry = site.entries[slot]
+                site.last_used[slot] = now
+
+        self._lookups += 1
+        if entry is not None:
+            self._hits += 1
+            entry.hits += 1
+            CACHE_SAVED_SECONDS.observe(entry.turn_seconds)
+        CACHE_LOOKUPS.inc(result="hit" if entry is not None else "miss")
+        CACHE_HIT_RATIO.set(self._hits / self._lookups)
+        return CacheLookup(entry, similarity, generation)
+
+    async def store(
+        self,
+        site_id: int,
+        vector: Any,
+        answer: str,
+        audio: bytes,
+        media_type: str,
+        turn_seconds: float,
+        generation: int,
+    ) -> Optional[CachedAnswer]:
+        """Cache an answer; skipped if the site was re-ingested since lookup."""
+        if generation != self._generations.get(site_id, 0) or not audio:
+            return None
+        vector = self._normalize(vector)
+        site = self._sites.get(site_id)
+        if site is None:
+            site = self._sites[site_id] = _SiteCache(len(vector), self.max_entries)
+        now = self.clock()
+        slot, similarity = site.best(vector, now)
+        if similarity >= self.threshold:
+            return site.entries[slot]  # a concurrent miss already stored it
+
+        entry_id = uuid.uuid4().hex
+        path = os.path.join(self._site_dir(site_id), f"{entry_id}.audio")
+        await asyncio.to_thread(self._write, path, audio)
+        if generation != self._generations.get(site_id, 0):
+            await asyncio.to_thread(self._unlink, path)
+            return None
+
+        slot = site.free_slot(now)
+        previous = site.entries[slot]
+        entry = CachedAnswer(
+            id=entry_id,
+            answer=answer,
+            audio_path=path,
+            media_type=media_type,
+            turn_seconds=turn_seconds,
+            expires_at=now + self.ttl,
+        )
+        site.vectors[slot] = vector
+        site.expires_at[slot] = entry.expires_at
+        site.last_used[slot] = now
+        site.entries[slot] = entry
+        if previous is None:
+            CACHE_ENTRIES.inc()
+        else:
+            await asyncio.to_thread(self._unlink, previous.audio_path)
+        return entry
+
+    async def load_audio(self, entry: CachedAnswer) -> Optional[bytes]:
+        """Audio of ``entry``, or ``None`` if it was evicted meanwhile."""
+        try:
+            return await asyncio.to_thread(self._read, entry.audio_path)
+        except FileNotFoundError:
+            return None
+
+    def invalidate(self, site_id: int) -> int:
+        """Drop every cached answer of ``site_id``; returns how many."""
+        self._generations[site_id] = self._generations.get(site_id, 0) + 1
+        site = self._sites.pop(site_id, None)
+        removed = sum(entry is not None for entry in site.entries) if site else 0
+        if removed:
+            CACHE_ENTRIES.inc(-removed)
+        shutil.rmtree(self._site_dir(site_id), ignore_errors=True)
+        logger.info(f"Semantic cache invalidated - Site: {site_id}, Entries: {removed}")
+        return removed
+
+    def close(self) -> None:
+        """Delete the audio files of every site."""
+        for site_id in list(self._sites):
+            self.invalidate(site_id)
+
+    @staticmethod
+    def _write(path: str, data: bytes) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(data)
+
+    @staticmethod
+    def _read(path: str) -> bytes:
+        with open(path, "rb") as f:
+            return f.read()
+
+    @staticmethod
+    def _unlink(path: str) -> None:
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,41 @@
+"""Voice session state shared across workers."""
+
+from ...core.config import Settings
+from .base import (
+    SessionState,
+    SessionStore,
+    SessionStoreError,
+    VersionConflict,
+    decode_state,
+    encode_state,
+)
+from .local import LocalSessionStore
+
+
+def build_session_store(settings: Settings) -> SessionStore:
+    """Create the session store selected by ``SESSION_STORE_BACKEND``."""
+    if settings.SESSION_STORE_BACKEND == "redis":
+        from .redis import RedisSessionStore
+
+        return RedisSessionStore(
+            settings.REDIS_URL,
+            ttl=settings.SESSION_TTL_SECONDS,
+            prefix=settings.SESSION_KEY_PREFIX,
+        )
+    if settings.SESSION_STORE_BACKEND == "local":
+        return LocalSessionStore(ttl=settings.SESSION_TTL_SECONDS)
+    raise SessionStoreError(
+        f"Unknown session store backend: {settings.SESSION_STORE_BACKEND!r}"
+    )
+
+
+__all__ = [
+    "LocalSessionStore",
+    "SessionState",
+    "SessionStore",
+    "SessionStoreError",
+    "VersionConflict",
+    "build_session_store",
+    "decode_state",
+    "encode_state",
+]
@@ -0,0 +1,105 @@
+"""
+Voice session state record, codec and store interface.
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Protocol, Sequence
+
+import msgpack
+
+# Bumped when the record layout changes; older records are discarded
+RECORD_FORMAT = 1
+
+
+class SessionStoreError(Exception):
+    """Raised when the session store is misconfigured or unavailable."""
+
+
+class VersionConflict(SessionStoreError):
+    """Raised when a session was saved by someone else since it was read."""
+
+
+@dataclass
+class SessionState:
+    """Per-session voice state shared by every worker."""
+
+    session_id: str
+    user_id: Optional[int] = None
+    site_id: Optional[int] = None
+    history_seq: int = 0  # last conversation memory message already used
+    partial_transcript: str = ""
+    cursors: Dict[str, str] = field(default_factory=dict)  # per provider stream
+    updated_at: float = 0.0
+    version: int = 0  # 0 until first saved; each save increments it
+
+
+def encode_state(state: SessionState) -> bytes:
+    """Compact msgpack record: positional fields, session ID left to the key."""
+    data: bytes = msgpack.packb(
+        [
+            RECORD_FORMAT,
+            state.version,
+            state.user_id,
+            state.site_id,
+            state.history_seq,
+            state.partial_transcript,
+            state.cursors,
+            state.updated_at,
+        ],
+        use_bin_type=True,
+    )
+    return data
+
+
+def decode_state(session_id: str, data: bytes) -> Optional[SessionState]:
+    """Record written by ``encode_state``; ``None`` if from another format."""
+    fields = msgpack.unpackb(data, raw=False)
+    if not fields or fields[0] != RECORD_FORMAT:
+        return None
+    _, version, user_id, site_id, history_seq, transcript, cursors, updated_at = fields
+    return SessionState(
+        session_id=session_id,
+        user_id=user_id,
+        site_id=site_id,
+        history_seq=history_seq,
+        partial_transcript=transcript,
+        cursors=cursors,
+        updated_at=updated_at,
+        version=version,
+    )
+
+
+def stored_version(data: Optional[bytes]) -> int:
+    """Version of an encoded record, 0 when absent or from another format."""
+    if data is None:
+        return 0
+    fields = msgpack.unpackb(data, raw=False)
+    return int(fields[1]) if fields and fields[0] == RECORD_FORMAT else 0
+
+
+class SessionStore(Protocol):
+    """Versioned session records with a sliding TTL."""
+
+    async def get(self, session_id: str) -> Optional[SessionState]:
+        """Current state, extending its TTL; ``None`` if absent or expired."""
+        ...
+
+    async def get_many(self, session_ids: Sequence[str]) -> Dict[str, SessionState]:
+        """States of the sessions that exist, in one round trip."""
+        ...
+
+    async def save(self, state: SessionState) -> SessionState:
+        """Store ``state`` if unchanged since read; returns the new version.
+
+        Raises ``VersionConflict`` when the stored version is not
+        ``state.version``.
+        """
+        ...
+
+    async def delete(self, session_id: str) -> None:
+        """Forget a session."""
+        ...
+
+    async def aclose(self) -> None:
+        """Release connections."""
+        ...
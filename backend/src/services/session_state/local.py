@@ -0,0 +1,87 @@
+"""
+In-process session state store for tests and single-node deployments.
+"""
+
+import time
+from collections import OrderedDict
+from dataclasses import replace
+from typing import Callable, Dict, Optional, Sequence, Tuple
+
+from .base import (
+    SessionState,
+    VersionConflict,
+    decode_state,
+    encode_state,
+    stored_version,
+)
+
+
+class LocalSessionStore:
+    """Encoded records in memory, evicting least recently used sessions.
+
+    Records are stored encoded, exactly as in Redis, so callers never share
+    mutable state with the store.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 3600,
+        max_sessions: int = 10000,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.ttl = ttl
+        self.max_sessions = max_sessions
+        self.clock = clock
+        # session ID -> (encoded record, expires at)
+        self._records: "OrderedDict[str, Tuple[bytes, float]]" = OrderedDict()
+
+    def _read(self, session_id: str) -> Optional[bytes]:
+        record = self._records.get(session_id)
+        if record is None:
+            return None
+        now = self.clock()
+        if record[1] <= now:
+            del self._records[session_id]
+            return None
+        self._records[session_id] = (record[0], now + self.ttl)
+        self._records.move_to_end(session_id)
+        return record[0]
+
+    async def get(self, session_id: str) -> Optional[SessionState]:
+        """Current state, extending its TTL."""
+        data = self._read(session_id)
+        return decode_state(session_id, data) if data is not None else None
+
+    async def get_many(self, session_ids: Sequence[str]) -> Dict[str, SessionState]:
+        """States of the sessions that exist."""
+        states = {}
+        for session_id in session_ids:
+            state = await self.get(session_id)
+            if state is not None:
+                states[session_id] = state
+        return states
+
+    async def save(self, state: SessionState) -> SessionState:
+        """Store ``state`` if its version is still current."""
+        current = stored_version(self._read(state.session_id))
+        if current != state.version:
+            raise VersionConflict(
+                f"Session {state.session_id} is at version {current}, "
+                f"not {state.version}"
+            )
+        saved = replace(state, version=current + 1, updated_at=self.clock())
+        self._records[state.session_id] = (
+            encode_state(saved),
+            self.clock() + self.ttl,
+        )
+        self._records.move_to_end(state.session_id)
+        while len(self._records) > self.max_sessions:
+            self._records.popitem(last=False)
+        return saved
+
+    async def delete(self, session_id: str) -> None:
+        """Forget a session."""
+        self._records.pop(session_id, None)
+
+    async def aclose(self) -> None:
+        """Nothing to release."""
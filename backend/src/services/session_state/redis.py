@@ -0,0 +1,92 @@
+"""
+Redis-backed session state store.
+
+Each session is one string key holding its msgpack record. Reads use GETEX
+so every read slides the TTL forward in the same round trip, multi-session
+reads are pipelined, and saves are compare-and-set on the record version
+under WATCH/MULTI, so concurrent writers from any worker cannot overwrite
+each other silently.
+"""
+
+import time
+from dataclasses import replace
+from typing import Any, Dict, Optional, Sequence
+
+from redis.asyncio import Redis
+from redis.exceptions import WatchError
+
+from .base import (
+    SessionState,
+    VersionConflict,
+    decode_state,
+    encode_state,
+    stored_version,
+)
+
+
+class RedisSessionStore:
+    """Session records in Redis with a sliding TTL."""
+
+    def __init__(
+        self,
+        url: str,
+        ttl: int = 3600,
+        prefix: str = "memvoice:session:",
+        client: Optional[Any] = None,
+    ):
+        self.ttl = ttl
+        self.prefix = prefix
+        self._client: Any = client if client is not None else Redis.from_url(url)
+
+    def _key(self, session_id: str) -> str:
+        return f"{self.prefix}{session_id}"
+
+    async def get(self, session_id: str) -> Optional[SessionState]:
+        """Current state, extending its TTL."""
+        data = await self._client.getex(self._key(session_id), ex=self.ttl)
+        return decode_state(session_id, data) if data is not None else None
+
+    async def get_many(self, session_ids: Sequence[str]) -> Dict[str, SessionState]:
+        """States of the sessions that exist, in one pipelined round trip."""
+        if not session_ids:
+            return {}
+        async with self._client.pipeline(transaction=False) as pipe:
+            for session_id in session_ids:
+                pipe.getex(self._key(session_id), ex=self.ttl)
+            results = await pipe.execute()
+        states = {}
+        for session_id, data in zip(session_ids, results):
+            state = decode_state(session_id, data) if data is not None else None
+            if state is not None:
+                states[session_id] = state
+        return states
+
+    async def save(self, state: SessionState) -> SessionState:
+        """Store ``state`` if its version is still current."""
+        key = self._key(state.session_id)
+        async with self._client.pipeline(transaction=True) as pipe:
+            try:
+                await pipe.watch(key)
+                current = stored_version(await pipe.get(key))
+                if current != state.version:
+                    raise VersionConflict(
+                        f"Session {state.session_id} is at version {current}, "
+                        f"not {state.version}"
+                    )
+                saved = replace(state, version=current + 1, updated_at=time.time())
+                pipe.multi()
+                pipe.set(key, encode_state(saved), ex=self.ttl)
+                await pipe.execute()
+            except WatchError:
+                raise VersionConflict(
+                    f"Session {state.session_id} changed while being saved"
+                )
+        return saved
+
+    async def delete(self, session_id: str) -> None:
+        """Forget a session."""
+        await self._client.delete(self._key(session_id))
+
+    async def aclose(self) -> None:
+        """Close the connection pool."""
+        await self._client.aclose()
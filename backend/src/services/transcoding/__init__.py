@@ -0,0 +1,19 @@
+"""Audio transcoding in worker processes, off the event loop."""
+
+from .codecs import (
+    CodecError,
+    CpuLimitExceeded,
+    TranscodeError,
+    TranscodeSpec,
+    check_spec,
+)
+from .pool import TranscodingPool
+
+__all__ = [
+    "CodecError",
+    "CpuLimitExceeded",
+    "TranscodeError",
+    "TranscodeSpec",
+    "TranscodingPool",
+    "check_spec",
+]
@@ -0,0 +1,360 @@
+"""
+Streaming audio decoders and encoders run inside transcoding workers.
+
+A ``Transcoder`` is fed encoded input chunk by chunk and returns whatever
+encoded output is ready, so neither side of a stream is ever held whole
+(except m4a input, whose index may sit at the end of the file). Audio flows
+between decoder and encoder as int16 frames of shape (frames, channels).
+
+WAV input and WAV/raw PCM output are handled with numpy. Compressed
+formats use PyAV (FFmpeg) when it is installed.
+"""
+
+import io
+import struct
+from dataclasses import dataclass
+from typing import Any, List, Optional
+
+import numpy as np
+
+try:
+    import av
+except ImportError:  # pragma: no cover - depends on the environment
+    av = None
+
+INPUT_FORMATS = ("mp3", "wav", "flac", "m4a")
+OUTPUT_FORMATS = ("wav", "pcm", "opus", "mp3", "flac")
+
+# Container and codec for PyAV outputs
+_AV_OUTPUTS = {
+    "opus": ("ogg", "libopus"),
+    "mp3": ("mp3", "libmp3lame"),
+    "flac": ("flac", "flac"),
+}
+# Formats PyAV can parse from a raw byte stream
+_AV_STREAM_INPUTS = {"mp3": "mp3", "flac": "flac"}
+
+_STREAMING_SIZE = 0xFFFFFFFF  # RIFF/data size of a WAV of unknown length
+
+
+class TranscodeError(Exception):
+    """Raised when a transcoding job fails."""
+
+
+class CodecError(TranscodeError):
+    """Raised for unsupported formats or undecodable input."""
+
+
+class CpuLimitExceeded(TranscodeError):
+    """Raised when a job uses more CPU time than it is allowed."""
+
+
+@dataclass
+class TranscodeSpec:
+    """What to convert from and to."""
+
+    src_format: str
+    dst_format: str
+    sample_rate: Optional[int] = None  # None keeps the input rate
+    channels: Optional[int] = None  # None keeps the input channel count
+    bitrate: int = 32000  # for lossy outputs
+
+
+class WavDecoder:
+    """Incremental PCM WAV parser."""
+
+    def __init__(self) -> None:
+        self._buffer = bytearray()
+        self._in_data = False
+        self.sample_rate = 0
+        self.channels = 0
+        self._frame_bytes = 0
+
+    def feed(self, data: memoryview) -> Optional[np.ndarray]:
+        """Frames decoded from ``data``, if any are complete."""
+        self._buffer += data
+        if not self._in_data and not self._parse_header():
+            return None
+        usable = len(self._buffer) - len(self._buffer) % self._frame_bytes
+        if not usable:
+            return None
+        frames = np.frombuffer(bytes(self._buffer[:usable]), dtype="<i2")
+        del self._buffer[:usable]
+        return frames.reshape(-1, self.channels)
+
+    def finish(self) -> Optional[np.ndarray]:
+        """Nothing is pending at the end: partial frames are dropped."""
+        if not self._in_data:
+            raise CodecError("Truncated WAV header")
+        return None
+
+    def _parse_header(self) -> bool:
+        buffer = self._buffer
+        if len(buffer) < 12:
+            return False
+        if buffer[:4] != b"RIFF" or buffer[8:12] != b"WAVE":
+            raise CodecError("Not a WAV file")
+        offset = 12
+        while len(buffer) >= offset + 8:
+            body = offset + 8
+            chunk_id, size = struct.unpack_from("<4sI", buffer, offset)
+            if chunk_id == b"data":
+                if not self.channels:
+                    raise CodecError("WAV data before fmt chunk")
+                del buffer[:body]
+                self._in_data = True
+                return True
+            if len(buffer) < body + size:
+                return False
+            if chunk_id == b"fmt ":
+                tag, channels, rate, _, _, bits = struct.unpack_from(
+                    "<HHIIHH", buffer, body
+                )
+                if tag not in (1, 0xFFFE) or bits != 16:
+                    raise CodecError("Only 16-bit PCM WAV input is supported")
+                self.channels, self.sample_rate = channels, rate
+                self._frame_bytes = 2 * channels
+            offset = body + size + size % 2
+        return False
+
+
+class LinearResampler:
+    """Streaming linear-interpolation resampler and channel mixer."""
+
+    def __init__(self, src_rate: int, dst_rate: int, channels: int):
+        self.step = src_rate / dst_rate
+        self.channels = channels
+        self._previous: Optional[np.ndarray] = None
+        self._position = 0.0  # next output time, in input frames
+
+    def process(self, frames: np.ndarray) -> np.ndarray:
+        """Resample ``frames`` and mix them to ``channels``."""
+        frames = _mix(frames, self.channels)
+        if self.step == 1.0 or not len(frames):
+            return frames
+        samples = frames.astype(np.float32)
+        if self._previous is not None:
+            samples = np.concatenate([self._previous, samples])
+        last = len(samples) - 1
+        times = np.arange(self._position, last, self.step)
+        self._previous = samples[-1:]
+        self._position = (
+            (times[-1] + self.step - last) if len(times) else (self._position - last)
+        )
+        if not len(times):
+            return np.empty((0, self.channels), dtype=np.int16)
+        index = times.astype(np.int64)
+        fraction = (times - index)[:, None].astype(np.float32)
+        out = samples[index] + (samples[index + 1] - samples[index]) * fraction
+        return np.clip(np.rint(out), -32768, 32767).astype(np.int16)
+
+
+def _mix(frames: np.ndarray, channels: int) -> np.ndarray:
+    if frames.shape[1] == channels:
+        return frames
+    if channels == 1:
+        mono: np.ndarray = frames.mean(axis=1, dtype=np.float32)
+        return mono.astype(np.int16)[:, None]
+    return np.repeat(frames[:, :1], channels, axis=1)
+
+
+class PcmEncoder:
+    """Raw little-endian int16 PCM, or WAV with a streaming header."""
+
+    def __init__(self, spec: TranscodeSpec, wav: bool):
+        self.spec = spec
+        self.wav = wav
+        self._resampler: Optional[LinearResampler] = None
+
+    def encode(self, frames: np.ndarray, sample_rate: int) -> bytes:
+        """Encoded bytes for ``frames``."""
+        header = b""
+        if self._resampler is None:
+            channels = self.spec.channels or frames.shape[1]
+            rate = self.spec.sample_rate or sample_rate
+            self._resampler = LinearResampler(sample_rate, rate, channels)
+            if self.wav:
+                header = _wav_header(rate, channels)
+        return header + self._resampler.process(frames).astype("<i2").tobytes()
+
+    def finish(self) -> bytes:
+        """Nothing is buffered."""
+        return b""
+
+
+def _wav_header(rate: int, channels: int) -> bytes:
+    return (
+        b"RIFF"
+        + struct.pack("<I", _STREAMING_SIZE)
+        + b"WAVEfmt "
+        + struct.pack(
+            "<IHHIIHH", 16, 1, channels, rate, rate * channels * 2, 2 * channels, 16
+        )
+        + b"data"
+        + struct.pack("<I", _STREAMING_SIZE)
+    )
+
+
+class _Sink:
+    """Write-only file for PyAV muxers; not seekable, so output streams."""
+
+    def __init__(self) -> None:
+        self._chunks: List[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+class AvDecoder:
+    """PyAV decoder: raw mp3/flac streams parsed as they arrive."""
+
+    def __init__(self, src_format: str):
+        self.src_format = src_format
+        self._buffered = io.BytesIO() if src_format not in _AV_STREAM_INPUTS else None
+        self._context: Any = (
+            av.CodecContext.create(_AV_STREAM_INPUTS[src_format], "r")
+            if self._buffered is None
+            else None
+        )
+        self.sample_rate = 0
+
+    def feed(self, data: memoryview) -> Optional[np.ndarray]:
+        """Frames decoded from ``data``."""
+        if self._buffered is not None:
+            self._buffered.write(data)  # containers may need their index
+            return None
+        return self._decode(self._context.parse(bytes(data)))
+
+    def finish(self) -> Optional[np.ndarray]:
+        """Frames left at the end of the input."""
+        if self._buffered is None:
+            return self._decode(self._context.parse(None))
+        self._buffered.seek(0)
+        try:
+            with av.open(self._buffered) as container:
+                return _stack([self._frame(f) for f in container.decode(audio=0)])
+        except av.FFmpegError as e:
+            raise CodecError(f"Cannot decode {self.src_format}: {e}") from e
+
+    def _decode(self, packets: List[Any]) -> Optional[np.ndarray]:
+        try:
+            return _stack(
+                [self._frame(f) for p in packets for f in self._context.decode(p)]
+            )
+        except av.FFmpegError as e:
+            raise CodecError(f"Cannot decode {self.src_format}: {e}") from e
+
+    def _frame(self, frame: Any) -> np.ndarray:
+        self.sample_rate = frame.sample_rate
+        channels = len(frame.layout.channels)
+        samples: np.ndarray = frame.to_ndarray()
+        if frame.format.is_planar:
+            samples = samples.T
+        else:
+            samples = samples.reshape(-1, channels)
+        if samples.dtype.kind == "f":
+            samples = np.clip(samples * 32767, -32768, 32767)
+        return samples.astype(np.int16)
+
+
+def _stack(frames: List[np.ndarray]) -> Optional[np.ndarray]:
+    return np.concatenate(frames) if frames else None
+
+
+class AvEncoder:
+    """PyAV encoder muxing into a non-seekable, streamed container."""
+
+    def __init__(self, spec: TranscodeSpec):
+        self.spec = spec
+        self._sink = _Sink()
+        self._container: Any = None
+        self._stream: Any = None
+        self._resampler: Any = None
+
+    def _open(self, sample_rate: int, channels: int) -> None:
+        container_format, codec = _AV_OUTPUTS[self.spec.dst_format]
+        rate = self.spec.sample_rate or (48000 if codec == "libopus" else sample_rate)
+        layout = "mono" if (self.spec.channels or channels) == 1 else "stereo"
+        self._container = av.open(self._sink, mode="w", format=container_format)
+        self._stream = self._container.add_stream(codec, rate=rate, layout=layout)
+        if codec != "flac":
+            self._stream.bit_rate = self.spec.bitrate
+        self._resampler = av.AudioResampler(
+            format=self._stream.format.name, layout=layout, rate=rate
+        )
+
+    def encode(self, frames: np.ndarray, sample_rate: int) -> bytes:
+        """Encoded bytes ready after adding ``frames``."""
+        if self._container is None:
+            self._open(sample_rate, frames.shape[1])
+        layout = "mono" if frames.shape[1] == 1 else "stereo"
+        frame = av.AudioFrame.from_ndarray(
+            np.ascontiguousarray(frames).reshape(1, -1), format="s16", layout=layout
+        )
+        frame.sample_rate = sample_rate
+        return self._mux(self._resampler.resample(frame))
+
+    def finish(self) -> bytes:
+        """Flush the encoder and close the container."""
+        if self._container is None:
+            return b""
+        self._mux(self._resampler.resample(None))
+        for packet in self._stream.encode(None):
+            self._container.mux(packet)
+        self._container.close()
+        return self._sink.drain()
+
+    def _mux(self, frames: List[Any]) -> bytes:
+        for frame in frames:
+            for packet in self._stream.encode(frame):
+                self._container.mux(packet)
+        return self._sink.drain()
+
+
+def check_spec(spec: TranscodeSpec) -> None:
+    """Raise ``CodecError`` unless ``spec`` can be transcoded here."""
+    if spec.src_format not in INPUT_FORMATS:
+        raise CodecError(f"Unsupported input format: {spec.src_format!r}")
+    if spec.dst_format not in OUTPUT_FORMATS:
+        raise CodecError(f"Unsupported output format: {spec.dst_format!r}")
+    needs_av = spec.src_format != "wav" or spec.dst_format in _AV_OUTPUTS
+    if needs_av and av is None:
+        raise CodecError(
+            f"Transcoding {spec.src_format} to {spec.dst_format} requires PyAV"
+        )
+
+
+class Transcoder:
+    """Decoder and encoder for one stream."""
+
+    def __init__(self, spec: TranscodeSpec):
+        check_spec(spec)
+        self.decoder: Any = (
+            WavDecoder() if spec.src_format == "wav" else AvDecoder(spec.src_format)
+        )
+        self.encoder: Any = (
+            AvEncoder(spec)
+            if spec.dst_format in _AV_OUTPUTS
+            else PcmEncoder(spec, wav=spec.dst_format == "wav")
+        )
+
+    def feed(self, data: memoryview) -> bytes:
+        """Encoded output available after adding ``data``."""
+        frames = self.decoder.feed(data)
+        if frames is None or not len(frames):
+            return b""
+        return bytes(self.encoder.encode(frames, self.decoder.sample_rate))
+
+    def finish(self) -> bytes:
+        """Remaining output once the input has ended."""
+        frames = self.decoder.finish()
+        out = b""
+        if frames is not None and len(frames):
+            out = self.encoder.encode(frames, self.decoder.sample_rate)
+        return bytes(out + self.encoder.finish())
@@ -0,0 +1,334 @@
+"""
+Pool of transcoding worker processes.
+
+Streams are pinned to one worker for their lifetime, because decoder and
+encoder state lives there; a job goes to the worker with the fewest jobs.
+Input is fed as it arrives and output is yielded as the worker produces
+it. A worker that dies fails its jobs and is replaced.
+"""
+
+import asyncio
+import itertools
+import logging
+import multiprocessing
+import os
+from collections import deque
+from dataclasses import dataclass, field
+from multiprocessing.shared_memory import SharedMemory
+from typing import (
+    AsyncIterable,
+    AsyncIterator,
+    Deque,
+    Dict,
+    List,
+    Optional,
+    Union,
+    cast,
+)
+
+from ...core.metrics import counter, gauge, histogram
+from ...core.tracing import start_span
+from .codecs import (
+    CodecError,
+    CpuLimitExceeded,
+    TranscodeError,
+    TranscodeSpec,
+    check_spec,
+)
+from .worker import serve
+
+logger = logging.getLogger(__name__)
+
+TRANSCODE_JOBS = counter(
+    "transcode_jobs_total", "Transcoding jobs by outcome", ["outcome"]
+)
+TRANSCODE_ACTIVE = gauge("transcode_active_jobs", "Transcoding jobs in progress")
+TRANSCODE_CPU_SECONDS = histogram(
+    "transcode_cpu_seconds",
+    "Worker CPU time per completed transcoding job",
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+
+_ERRORS = {"codec": CodecError, "cpu_limit": CpuLimitExceeded}
+
+
+@dataclass
+class _Job:
+    id: int
+    output: "asyncio.Queue[Union[bytes, BaseException, None]]" = field(
+        default_factory=asyncio.Queue
+    )
+    drained: asyncio.Event = field(default_factory=asyncio.Event)
+    finished: bool = False
+    cpu_seconds: Optional[float] = None
+
+    def fail(self, error: BaseException) -> None:
+        if not self.finished:
+            self.finished = True
+            self.output.put_nowait(error)
+
+
+class _WorkerProcess:
+    """Parent-side handle of one worker: process, pipe and arenas."""
+
+    def __init__(self, index: int, slots: int, chunk_bytes: int):
+        self.index = index
+        self.chunk_bytes = chunk_bytes
+        self.input_memory = SharedMemory(create=True, size=slots * chunk_bytes)
+        self.output_memory = SharedMemory(create=True, size=slots * chunk_bytes)
+        self.input_buffer = cast(memoryview, self.input_memory.buf)
+        self.output_buffer = cast(memoryview, self.output_memory.buf)
+        context = multiprocessing.get_context("spawn")
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(
+            target=serve,
+            args=(
+                child_conn,
+                self.input_memory.name,
+                self.output_memory.name,
+                slots,
+                chunk_bytes,
+            ),
+            name=f"transcode-{index}",
+            daemon=True,
+        )
+        self.process.start()
+        child_conn.close()
+        self.jobs: Dict[int, _Job] = {}
+        self.alive = True
+        self._free_input: Deque[int] = deque(range(slots))
+        self._slot_waiters: Deque[asyncio.Future] = deque()
+
+    async def write(self, job: _Job, data: memoryview) -> None:
+        """Copy ``data`` (at most one slot) into a free input slot and send it."""
+        while self.alive and not self._free_input:
+            waiter = asyncio.get_running_loop().create_future()
+            self._slot_waiters.append(waiter)
+            try:
+                await waiter
+            finally:
+                if waiter in self._slot_waiters:
+                    self._slot_waiters.remove(waiter)
+        if not self.alive:
+            raise TranscodeError("Transcoding worker exited")
+        slot = self._free_input.popleft()
+        start = slot * self.chunk_bytes
+        end = start + len(data)
+        self.input_buffer[start:end] = data
+        self.conn.send(("data", job.id, slot, len(data)))
+
+    def free_input(self, slot: int) -> None:
+        self._free_input.append(slot)
+        while self._slot_waiters:
+            waiter = self._slot_waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                break
+
+    def read_output(self, slot: int, length: int) -> bytes:
+        start = slot * self.chunk_bytes
+        end = start + length
+        data = bytes(self.output_buffer[start:end])
+        self.conn.send(("ack", slot))
+        return data
+
+    def exited(self) -> None:
+        """Fail everything waiting on this worker after it died or stopped."""
+        self.alive = False
+        error = TranscodeError("Transcoding worker exited")
+        for job in self.jobs.values():
+            job.fail(error)
+        self.jobs.clear()
+        for waiter in self._slot_waiters:
+            if not waiter.done():
+                waiter.set_exception(error)
+        self._slot_waiters.clear()
+
+    def release(self) -> None:
+        """Close the pipe and free the shared memory."""
+        self.conn.close()
+        for memory in (self.input_memory, self.output_memory):
+            memory.close()
+            memory.unlink()
+
+
+class TranscodingPool:
+    """Streams audio through a pool of transcoding worker processes."""
+
+    def __init__(
+        self,
+        workers: int = 0,
+        jobs_per_worker: int = 4,
+        cpu_seconds_per_job: float = 30.0,
+        chunk_bytes: int = 64 * 1024,
+        slots_per_worker: int = 16,
+    ):
+        self.workers = workers or os.cpu_count() or 1
+        self.jobs_per_worker = jobs_per_worker
+        self.cpu_seconds_per_job = cpu_seconds_per_job
+        self.chunk_bytes = chunk_bytes
+        self.slots_per_worker = slots_per_worker
+        self._processes: List[_WorkerProcess] = []
+        self._job_ids = itertools.count(1)
+        self._capacity: Optional[asyncio.Semaphore] = None
+        self._closed = False
+
+    def start(self) -> None:
+        """Spawn the worker processes; called on first use."""
+        if self._capacity is not None:
+            return
+        self._capacity = asyncio.Semaphore(self.workers * self.jobs_per_worker)
+        for index in range(self.workers):
+            self._spawn(index)
+        logger.info(
+            f"Transcoding pool started - Workers: {self.workers}, "
+            f"Jobs per worker: {self.jobs_per_worker}"
+        )
+
+    def _spawn(self, index: int) -> None:
+        worker = _WorkerProcess(index, self.slots_per_worker, self.chunk_bytes)
+        asyncio.get_running_loop().add_reader(
+            worker.conn.fileno(), self._on_message, worker
+        )
+        if index < len(self._processes):
+            self._processes[index] = worker
+        else:
+            self._processes.append(worker)
+
+    async def transcode(
+        self, chunks: AsyncIterable[bytes], spec: TranscodeSpec
+    ) -> AsyncIterator[bytes]:
+        """Transcode a stream of encoded chunks, yielding encoded output.
+
+        Raises ``CodecError`` for unsupported or corrupt input,
+        ``CpuLimitExceeded`` when the job runs out of CPU time, and
+        ``TranscodeError`` for other failures.
+        """
+        check_spec(spec)
+        if self._closed:
+            raise TranscodeError("Transcoding pool is closed")
+        self.start()
+        assert self._capacity is not None
+        # Timed here, including the wait for capacity; workers report CPU
+        stage = start_span("transcode", src=spec.src_format, dst=spec.dst_format)
+        error: Optional[BaseException] = None
+        async with self._capacity:
+            worker = min(
+                (w for w in self._processes if w.alive), key=lambda w: len(w.jobs)
+            )
+            job = _Job(next(self._job_ids))
+            worker.jobs[job.id] = job
+            worker.conn.send(("open", job.id, spec, self.cpu_seconds_per_job))
+            TRANSCODE_ACTIVE.inc()
+            feeder = asyncio.ensure_future(self._feed(worker, job, chunks))
+            try:
+                while True:
+                    item = await job.output.get()
+                    job.drained.set()
+                    if item is None:
+                        break
+                    if isinstance(item, BaseException):
+                        TRANSCODE_JOBS.inc(outcome=_outcome(item))
+                        error = item
+                        raise item
+                    yield item
+                TRANSCODE_JOBS.inc(outcome="ok")
+            finally:
+                TRANSCODE_ACTIVE.inc(-1)
+                feeder.cancel()
+                if not job.finished:
+                    job.finished = True
+                    TRANSCODE_JOBS.inc(outcome="abandoned")
+                if worker.jobs.pop(job.id, None) is not None and worker.alive:
+                    worker.conn.send(("abort", job.id))
+                if job.cpu_seconds is not None:
+                    stage.set(cpu_seconds=job.cpu_seconds)
+                stage.end(error=error)
+
+    async def _feed(
+        self, worker: _WorkerProcess, job: _Job, chunks: AsyncIterable[bytes]
+    ) -> None:
+        try:
+            async for chunk in chunks:
+                data = memoryview(chunk)
+                for start in range(0, len(data), self.chunk_bytes):
+                    # Stop reading input while the consumer is behind
+                    while job.output.qsize() >= self.slots_per_worker:
+                        job.drained.clear()
+                        await job.drained.wait()
+                    if job.finished:
+                        return
+                    end = start + self.chunk_bytes
+                    await worker.write(job, data[start:end])
+            if not job.finished:
+                worker.conn.send(("close", job.id))
+        except Exception as e:
+            job.fail(e)
+
+    def _on_message(self, worker: _WorkerProcess) -> None:
+        try:
+            while worker.conn.poll():
+                self._dispatch(worker, worker.conn.recv())
+        except (EOFError, OSError):
+            self._on_exit(worker)
+
+    def _dispatch(self, worker: _WorkerProcess, message: tuple) -> None:
+        kind = message[0]
+        if kind == "freed":
+            worker.free_input(message[1])
+            return
+        if kind == "out":
+            data = worker.read_output(message[2], message[3])
+            job = worker.jobs.get(message[1])
+            if job is not None and not job.finished:
+                job.output.put_nowait(data)
+            return
+        job = worker.jobs.pop(message[1], None)
+        if job is None or job.finished:
+            return
+        if kind == "done":
+            TRANSCODE_CPU_SECONDS.observe(message[2])
+            job.cpu_seconds = message[2]
+            job.finished = True
+            job.output.put_nowait(None)
+        elif kind == "error":
+            job.fail(_ERRORS.get(message[2], TranscodeError)(message[3]))
+
+    def _on_exit(self, worker: _WorkerProcess) -> None:
+        asyncio.get_running_loop().remove_reader(worker.conn.fileno())
+        worker.exited()
+        worker.process.join(timeout=1)
+        worker.release()
+        if not self._closed:
+            logger.error(
+                f"Transcoding worker exited - Worker: {worker.index}, "
+                f"Exit code: {worker.process.exitcode}"
+            )
+            self._spawn(worker.index)
+
+    async def aclose(self) -> None:
+        """Stop the workers, failing jobs still in progress."""
+        self._closed = True
+        for worker in self._processes:
+            if not worker.alive:
+                continue
+            asyncio.get_running_loop().remove_reader(worker.conn.fileno())
+            worker.exited()
+            try:
+                worker.conn.send(("stop",))
+            except OSError:
+                pass
+            await asyncio.to_thread(worker.process.join, 5)
+            if worker.process.is_alive():
+                worker.process.kill()
+                await asyncio.to_thread(worker.process.join)
+            worker.release()
+        self._processes.clear()
+
+
+def _outcome(error: BaseException) -> str:
+    if isinstance(error, CpuLimitExceeded):
+        return "cpu_limit"
+    if isinstance(error, CodecError):
+        return "codec_error"
+    return "error"
@@ -0,0 +1,191 @@
+"""
+Transcoding worker process.
+
+Each worker multiplexes several streams. Audio never crosses the pipe: the
+parent writes input chunks into slots of a shared-memory arena and sends
+``("data", job, slot, length)``; the worker decodes straight from a
+memoryview of the slot and answers ``("freed", slot)``. Output is written
+into slots of a second arena the same way and acknowledged by the parent
+once copied out. Only these small control tuples are pickled.
+
+Messages from the parent: ``open``, ``data``, ``close``, ``abort``, ``ack``
+and ``stop``. Messages to the parent: ``freed``, ``out``, ``done`` and
+``error``.
+"""
+
+import signal
+import time
+from collections import deque
+from dataclasses import dataclass
+from multiprocessing.connection import Connection
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Callable, Deque, Dict, Optional, cast
+
+from .codecs import CodecError, CpuLimitExceeded, Transcoder, TranscodeSpec
+
+
+@dataclass
+class _Job:
+    transcoder: Transcoder
+    cpu_limit: float
+    cpu_used: float = 0.0
+
+
+_armed = False  # a late SIGPROF after disarming must not raise
+
+
+def _on_cpu_limit(signum: int, frame: Any) -> None:
+    if _armed:
+        raise CpuLimitExceeded("CPU time limit exceeded")
+
+
+class Worker:
+    """Serves transcoding jobs sent over ``conn``."""
+
+    def __init__(
+        self,
+        conn: Connection,
+        input_buffer: memoryview,
+        output_buffer: memoryview,
+        slots: int,
+        chunk_bytes: int,
+    ):
+        self.conn = conn
+        self.input_buffer = input_buffer
+        self.output_buffer = output_buffer
+        self.chunk_bytes = chunk_bytes
+        self.jobs: Dict[int, _Job] = {}
+        self._free_output: Deque[int] = deque(range(slots))
+        self._deferred: Deque[tuple] = deque()  # read while waiting for acks
+        # Interrupts a codec call once the job's CPU budget is spent
+        self._timer = hasattr(signal, "setitimer")
+        if self._timer:
+            signal.signal(signal.SIGPROF, _on_cpu_limit)
+
+    def run(self) -> None:
+        """Handle messages until told to stop."""
+        while True:
+            message = self._deferred.popleft() if self._deferred else self.conn.recv()
+            kind = message[0]
+            if kind == "stop":
+                return
+            if kind == "open":
+                self._open(*message[1:])
+            elif kind == "data":
+                self._data(*message[1:])
+            elif kind == "close":
+                self._close(message[1])
+            elif kind == "abort":
+                self.jobs.pop(message[1], None)
+            elif kind == "ack":
+                self._free_output.append(message[1])
+
+    def _open(self, job_id: int, spec: TranscodeSpec, cpu_limit: float) -> None:
+        try:
+            self.jobs[job_id] = _Job(Transcoder(spec), cpu_limit)
+        except CodecError as e:
+            self.conn.send(("error", job_id, "codec", str(e)))
+
+    def _data(self, job_id: int, slot: int, length: int) -> None:
+        start = slot * self.chunk_bytes
+        end = start + length
+        view = self.input_buffer[start:end]
+        try:
+            job = self.jobs.get(job_id)
+            output = self._call(job_id, job, job.transcoder.feed, view) if job else b""
+        finally:
+            view.release()
+            self.conn.send(("freed", slot))
+        if output:
+            self._send_output(job_id, output)
+
+    def _close(self, job_id: int) -> None:
+        job = self.jobs.get(job_id)
+        if job is None:
+            return
+        output = self._call(job_id, job, job.transcoder.finish)
+        if job_id in self.jobs:
+            del self.jobs[job_id]
+            if output:
+                self._send_output(job_id, output)
+            self.conn.send(("done", job_id, job.cpu_used))
+
+    def _call(
+        self, job_id: int, job: _Job, fn: Callable[..., bytes], *args: Any
+    ) -> Optional[bytes]:
+        """``fn(*args)`` charged to ``job``; on failure the job is dropped.
+
+        CPU is measured with the thread clock: while a process CPU timer is
+        armed, Linux only updates the process clock on scheduler ticks.
+        """
+        global _armed
+        started = time.thread_time()
+        remaining = job.cpu_limit - job.cpu_used
+        try:
+            if remaining <= 0:
+                raise CpuLimitExceeded("CPU time limit exceeded")
+            if self._timer:
+                _armed = True
+                signal.setitimer(signal.ITIMER_PROF, remaining)
+            try:
+                return fn(*args)
+            finally:
+                if self._timer:
+                    signal.setitimer(signal.ITIMER_PROF, 0)
+                    _armed = False
+        except CpuLimitExceeded as e:
+            self._fail(job_id, "cpu_limit", str(e))
+        except CodecError as e:
+            self._fail(job_id, "codec", str(e))
+        except Exception as e:
+            self._fail(job_id, "internal", f"{type(e).__name__}: {e}")
+        finally:
+            job.cpu_used += time.thread_time() - started
+        return None
+
+    def _fail(self, job_id: int, kind: str, message: str) -> None:
+        self.jobs.pop(job_id, None)
+        self.conn.send(("error", job_id, kind, message))
+
+    def _send_output(self, job_id: int, output: bytes) -> None:
+        data = memoryview(output)
+        for start in range(0, len(data), self.chunk_bytes):
+            end = start + self.chunk_bytes
+            piece = data[start:end]
+            slot = self._output_slot()
+            offset = slot * self.chunk_bytes
+            limit = offset + len(piece)
+            self.output_buffer[offset:limit] = piece
+            self.conn.send(("out", job_id, slot, len(piece)))
+
+    def _output_slot(self) -> int:
+        while not self._free_output:
+            message = self.conn.recv()
+            if message[0] == "ack":
+                self._free_output.append(message[1])
+            else:
+                self._deferred.append(message)
+        return self._free_output.popleft()
+
+
+def serve(
+    conn: Connection, input_name: str, output_name: str, slots: int, chunk_bytes: int
+) -> None:
+    """Worker process entry point."""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # the server handles Ctrl-C
+    input_memory = SharedMemory(name=input_name)
+    output_memory = SharedMemory(name=output_name)
+    try:
+        Worker(
+            conn,
+            cast(memoryview, input_memory.buf),
+            cast(memoryview, output_memory.buf),
+            slots,
+            chunk_bytes,
+        ).run()
+    except (EOFError, OSError):
+        pass  # the server went away
+    finally:
+        input_memory.close()
+        output_memory.close()
+        conn.close()
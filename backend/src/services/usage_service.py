@@ -0,0 +1,249 @@
+"""
+Usage accounting with write-behind persistence.
+
+Pipeline stages call ``UsageRecorder.record`` on the hot path, which only
+appends to an in-memory buffer. The buffer is flushed in one transaction
+when it reaches ``max_batch`` records or every ``flush_interval`` seconds:
+raw events are bulk-inserted and per-day rollups are upserted, so the
+aggregate endpoints read the small rollup table instead of scanning events.
+"""
+
+import asyncio
+import logging
+from dataclasses import asdict, dataclass, field
+from datetime import date, datetime, timezone
+from typing import (
+    AsyncContextManager,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models.usage import UsageDaily, UsageEvent
+
+logger = logging.getLogger(__name__)
+
+SessionFactory = Callable[[], AsyncContextManager[AsyncSession]]
+
+_TOTALS = (
+    "requests",
+    "prompt_tokens",
+    "completion_tokens",
+    "characters",
+    "audio_seconds",
+    "cost_usd",
+)
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+@dataclass
+class UsageRecord:
+    """Resources consumed by one pipeline stage for one user."""
+
+    user_id: int
+    stage: str
+    model: str
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    characters: int = 0
+    audio_seconds: float = 0.0
+    cost_usd: float = 0.0
+    site_id: Optional[str] = None
+    created_at: datetime = field(default_factory=_utcnow)
+
+
+def estimate_cost(
+    prices: Dict[str, Dict[str, float]],
+    model: str,
+    prompt_tokens: int = 0,
+    completion_tokens: int = 0,
+    characters: int = 0,
+) -> float:
+    """USD cost of the usage at ``prices``; unknown models cost nothing."""
+    price = prices.get(model, {})
+    return (
+        prompt_tokens * price.get("prompt_per_1m", 0.0) / 1_000_000
+        + completion_tokens * price.get("completion_per_1m", 0.0) / 1_000_000
+        + characters * price.get("characters_per_1k", 0.0) / 1000
+    )
+
+
+class UsageRecorder:
+    """Buffers usage records and writes them behind the request path."""
+
+    def __init__(
+        self,
+        session_factory: SessionFactory,
+        prices: Optional[Dict[str, Dict[str, float]]] = None,
+        max_batch: int = 500,
+        flush_interval: float = 5.0,
+        max_buffer: int = 50000,
+    ):
+        self.session_factory = session_factory
+        self.prices = prices or {}
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self.max_buffer = max_buffer
+        self._buffer: List[UsageRecord] = []
+        self._lock = asyncio.Lock()
+        self._flush_task: Optional[asyncio.Task] = None
+        self._timer_task: Optional[asyncio.Task] = None
+
+    @property
+    def pending(self) -> int:
+        """Records waiting to be flushed."""
+        return len(self._buffer)
+
+    def record(
+        self,
+        user_id: int,
+        stage: str,
+        model: str,
+        *,
+        prompt_tokens: int = 0,
+        completion_tokens: int = 0,
+        characters: int = 0,
+        audio_seconds: float = 0.0,
+        site_id: Optional[str] = None,
+    ) -> None:
+        """Buffer a usage record; never waits on the database."""
+        self._buffer.append(
+            UsageRecord(
+                user_id=user_id,
+                stage=stage,
+                model=model,
+                prompt_tokens=prompt_tokens,
+                completion_tokens=completion_tokens,
+                characters=characters,
+                audio_seconds=audio_seconds,
+                cost_usd=estimate_cost(
+                    self.prices, model, prompt_tokens, completion_tokens, characters
+                ),
+                site_id=site_id,
+            )
+        )
+        if len(self._buffer) >= self.max_batch and (
+            self._flush_task is None or self._flush_task.done()
+        ):
+            self._flush_task = asyncio.create_task(self.flush())
+
+    def start(self) -> None:
+        """Start the periodic flush timer."""
+        if self._timer_task is None:
+            self._timer_task = asyncio.create_task(self._flush_periodically())
+
+    async def stop(self) -> None:
+        """Stop the timer and flush whatever is still buffered."""
+        if self._timer_task is not None:
+            self._timer_task.cancel()
+            await asyncio.gather(self._timer_task, return_exceptions=True)
+            self._timer_task = None
+        if self._flush_task is not None:
+            await asyncio.gather(self._flush_task, return_exceptions=True)
+        await self.flush()
+
+    async def flush(self) -> int:
+        """Persist buffered records; returns how many were written."""
+        async with self._lock:
+            batch, self._buffer = self._buffer, []
+            if not batch:
+                return 0
+            try:
+                async with self.session_factory() as db:
+                    await self._write(db, batch)
+            except Exception as e:
+                # Keep the records for the next attempt, bounded by max_buffer
+                self._buffer[:0] = batch
+                dropped = len(self._buffer) - self.max_buffer
+                if dropped > 0:
+                    del self._buffer[:dropped]
+                logger.error(
+                    f"Usage flush failed - Records: {len(batch)}, "
+                    f"Dropped: {max(dropped, 0)}, Error: {e}"
+                )
+                return 0
+        logger.info(f"Usage flushed - Records: {len(batch)}")
+        return len(batch)
+
+    async def _flush_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    @staticmethod
+    async def _write(db: AsyncSession, batch: Sequence[UsageRecord]) -> None:
+        await db.execute(insert(UsageEvent), [asdict(record) for record in batch])
+
+        rollups: Dict[Tuple[int, date, str, str], Dict[str, float]] = {}
+        for record in batch:
+            key = (record.user_id, record.created_at.date(), record.stage, record.model)
+            totals = rollups.setdefault(key, dict.fromkeys(_TOTALS, 0))
+            totals["requests"] += 1
+            totals["prompt_tokens"] += record.prompt_tokens
+            totals["completion_tokens"] += record.completion_tokens
+            totals["characters"] += record.characters
+            totals["audio_seconds"] += record.audio_seconds
+            totals["cost_usd"] += record.cost_usd
+
+        dialect = db.get_bind().dialect.name
+        upsert = postgresql_insert if dialect == "postgresql" else sqlite_insert
+        statement = upsert(UsageDaily)
+        statement = statement.on_conflict_do_update(
+            index_elements=["user_id", "day", "stage", "model"],
+            set_={
+                name: getattr(UsageDaily, name) + getattr(statement.excluded, name)
+                for name in _TOTALS
+            },
+        )
+        await db.execute(
+            statement,
+            [
+                {"user_id": user_id, "day": day, "stage": stage, "model": model}
+                | totals
+                for (user_id, day, stage, model), totals in rollups.items()
+            ],
+        )
+        await db.commit()
+
+
+class UsageService:
+    """Read aggregated usage from the daily rollup table."""
+
+    @staticmethod
+    async def get_user_daily(
+        db: AsyncSession, user_id: int, start: date, end: date
+    ) -> List[UsageDaily]:
+        """Rollup rows for one user between ``start`` and ``end`` inclusive."""
+        result = await db.execute(
+            select(UsageDaily)
+            .where(
+                UsageDaily.user_id == user_id,
+                UsageDaily.day >= start,
+                UsageDaily.day <= end,
+            )
+            .order_by(UsageDaily.day, UsageDaily.stage, UsageDaily.model)
+        )
+        return list(result.scalars().all())
+
+    @staticmethod
+    async def get_daily_totals(db: AsyncSession, start: date, end: date) -> List[dict]:
+        """Totals across all users per day and stage."""
+        columns = [func.sum(getattr(UsageDaily, name)).label(name) for name in _TOTALS]
+        result = await db.execute(
+            select(UsageDaily.day, UsageDaily.stage, *columns)
+            .where(UsageDaily.day >= start, UsageDaily.day <= end)
+            .group_by(UsageDaily.day, UsageDaily.stage)
+            .order_by(UsageDaily.day, UsageDaily.stage)
+        )
+        return [dict(row._mapping) for row in result]
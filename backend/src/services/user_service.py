@@ -4,33 +4,56 @@ User service for business logic and database operations.
 
 from typing import Optional
 
-from sqlalchemy import select
+from sqlalchemy import bindparam, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only
 
 from ..core.security import get_password_hash, verify_password
 from ..models.user import User
 from ..schemas.user import UserCreate, UserUpdate
 
 
+def _by_lower(column):
+    """Case-insensitive match on ``column``, exact case first."""
+    return (
+        select(User)
+        .where(func.lower(column) == bindparam("key"))
+        .order_by(column != bindparam("value"), User.id)
+        .limit(1)
+    )
+
+
+# Built once: executing a prebuilt statement skips constructing it and its
+# cache key each call, and lower() matches the functional indexes on users
+_BY_ID = select(User).where(User.id == bindparam("user_id"))
+_BY_EMAIL = _by_lower(User.email)
+_BY_USERNAME = _by_lower(User.username)
+_LOGIN = _BY_USERNAME.options(
+    load_only(User.id, User.username, User.hashed_password, User.is_active)
+)
+
+
 class UserService:
     """Service class for user-related operations."""
 
     @staticmethod
     async def get_user_by_id(db: AsyncSession, user_id: int) -> Optional[User]:
         """Get user by ID."""
-        result = await db.execute(select(User).where(User.id == user_id))
+        result = await db.execute(_BY_ID, {"user_id": user_id})
         return result.scalar_one_or_none()
 
     @staticmethod
     async def get_user_by_email(db: AsyncSession, email: str) -> Optional[User]:
-        """Get user by email."""
-        result = await db.execute(select(User).where(User.email == email))
+        """Get user by email, case-insensitively (exact match preferred)."""
+        result = await db.execute(_BY_EMAIL, {"key": email.lower(), "value": email})
         return result.scalar_one_or_none()
 
     @staticmethod
     async def get_user_by_username(db: AsyncSession, username: str) -> Optional[User]:
-        """Get user by username."""
-        result = await db.execute(select(User).where(User.username == username))
+        """Get user by username, case-insensitively (exact match preferred)."""
+        result = await db.execute(
+            _BY_USERNAME, {"key": username.lower(), "value": username}
+        )
         return result.scalar_one_or_none()
 
     @staticmethod
@@ -67,8 +90,13 @@ class UserService:
     async def authenticate_user(
         db: AsyncSession, username: str, password: str
     ) -> Optional[User]:
-        """Authenticate user with username/password."""
-        user = await UserService.get_user_by_username(db, username)
+        """Authenticate user with username/password.
+
+        Only the columns login needs are loaded, all held by the covering
+        ``ix_users_lower_username`` index; other attributes are deferred.
+        """
+        result = await db.execute(_LOGIN, {"key": username.lower(), "value": username})
+        user = result.scalar_one_or_none()
         if not user:
             return None
         if not verify_password(password, user.hashed_password):
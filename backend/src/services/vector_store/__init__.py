@@ -0,0 +1,36 @@
+"""Pluggable vector storage for retrieval."""
+
+from ...core.config import Settings
+from .base import VectorMatch, VectorStore, VectorStoreError
+from .local import LocalVectorStore
+
+
+def build_vector_store(settings: Settings) -> VectorStore:
+    """Create the vector store selected by ``VECTOR_STORE_BACKEND``."""
+    if settings.VECTOR_STORE_BACKEND == "pinecone":
+        if not settings.PINECONE_API_KEY:
+            raise VectorStoreError("PINECONE_API_KEY not configured")
+        from .pinecone import PineconeVectorStore
+
+        return PineconeVectorStore(
+            settings.PINECONE_API_KEY, settings.PINECONE_INDEX_NAME
+        )
+    if settings.VECTOR_STORE_BACKEND == "local":
+        return LocalVectorStore(
+            settings.VECTOR_STORE_PATH,
+            settings.EMBEDDING_DIMENSIONS,
+            ivf_nlist=settings.VECTOR_IVF_NLIST,
+            ivf_nprobe=settings.VECTOR_IVF_NPROBE,
+        )
+    raise VectorStoreError(
+        f"Unknown vector store backend: {settings.VECTOR_STORE_BACKEND!r}"
+    )
+
+
+__all__ = [
+    "LocalVectorStore",
+    "VectorMatch",
+    "VectorStore",
+    "VectorStoreError",
+    "build_vector_store",
+]
@@ -0,0 +1,84 @@
+"""
+Vector store interface shared by the local and Pinecone backends.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Protocol, Sequence
+
+import numpy as np
+
+_NAMESPACE_PATTERN = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_.-]{0,127}$")
+
+
+class VectorStoreError(Exception):
+    """Raised for invalid vector store operations."""
+
+
+@dataclass
+class VectorMatch:
+    """A single search result."""
+
+    id: str
+    score: float
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+
+class VectorStore(Protocol):
+    """Namespaced embedding storage with top-k similarity search."""
+
+    async def upsert(
+        self,
+        namespace: str,
+        ids: Sequence[str],
+        vectors: Any,
+        metadata: Optional[Sequence[Dict[str, Any]]] = None,
+    ) -> None:
+        """Insert or replace vectors by ID."""
+        ...
+
+    async def delete(self, namespace: str, ids: Sequence[str]) -> None:
+        """Delete vectors by ID; unknown IDs are ignored."""
+        ...
+
+    async def query(
+        self, namespace: str, vector: Any, top_k: int = 10
+    ) -> List[VectorMatch]:
+        """Return the ``top_k`` most similar vectors to ``vector``."""
+        ...
+
+    async def query_batch(
+        self, namespace: str, vectors: Any, top_k: int = 10
+    ) -> List[List[VectorMatch]]:
+        """Return the ``top_k`` matches for each row of ``vectors``."""
+        ...
+
+    async def count(self, namespace: str) -> int:
+        """Number of live vectors in ``namespace``."""
+        ...
+
+
+def validate_namespace(namespace: str) -> str:
+    """Ensure ``namespace`` is safe to use as a directory or remote name."""
+    if not _NAMESPACE_PATTERN.match(namespace):
+        raise VectorStoreError(f"Invalid namespace: {namespace!r}")
+    return namespace
+
+
+def as_matrix(vectors: Any, dim: int) -> np.ndarray:
+    """Coerce ``vectors`` to a contiguous float32 matrix of width ``dim``."""
+    matrix = np.ascontiguousarray(vectors, dtype=np.float32)
+    if matrix.ndim == 1:
+        matrix = matrix.reshape(1, -1)
+    if matrix.ndim != 2 or matrix.shape[1] != dim:
+        raise VectorStoreError(
+            f"Expected vectors of dimension {dim}, got shape {matrix.shape}"
+        )
+    return matrix
+
+
+def normalize(matrix: np.ndarray) -> np.ndarray:
+    """L2-normalize rows, leaving zero vectors unchanged."""
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return np.asarray(matrix / norms, dtype=np.float32)
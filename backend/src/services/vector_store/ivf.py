@@ -0,0 +1,118 @@
+"""
+Inverted-file (IVF) partitioning for approximate vector search.
+
+Vectors are clustered with spherical k-means; a query only scores the rows
+in its ``nprobe`` nearest partitions instead of the whole namespace.
+"""
+
+import os
+from typing import Optional, Tuple
+
+import numpy as np
+
+from .base import normalize
+
+
+def train_centroids(
+    vectors: np.ndarray,
+    nlist: int,
+    iterations: int = 10,
+    max_samples_per_list: int = 64,
+    seed: int = 0,
+) -> np.ndarray:
+    """Cluster ``vectors`` into ``nlist`` unit-norm centroids."""
+    rng = np.random.default_rng(seed)
+    sample_size = min(len(vectors), nlist * max_samples_per_list)
+    sample_rows = np.sort(rng.choice(len(vectors), sample_size, replace=False))
+    sample = normalize(np.asarray(vectors[sample_rows], dtype=np.float32))
+    nlist = min(nlist, len(sample))
+    centroids = sample[rng.choice(len(sample), nlist, replace=False)].copy()
+
+    for _ in range(iterations):
+        labels = np.argmax(sample @ centroids.T, axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, labels, sample)
+        empty = ~np.bincount(labels, minlength=nlist).astype(bool)
+        # Re-seed empty partitions from random samples so no list stays unused
+        sums[empty] = sample[rng.choice(len(sample), int(empty.sum()))]
+        centroids = normalize(sums)
+
+    return centroids.astype(np.float32)
+
+
+class IVFIndex:
+    """Partition assignments for the rows of one namespace."""
+
+    def __init__(self, centroids: np.ndarray, assignments: Optional[np.ndarray] = None):
+        self.centroids = centroids
+        self.assignments = (
+            assignments if assignments is not None else np.empty(0, dtype=np.int32)
+        )
+        self._order: Optional[np.ndarray] = None
+        self._offsets: Optional[np.ndarray] = None
+
+    @property
+    def nlist(self) -> int:
+        """Number of partitions."""
+        return len(self.centroids)
+
+    def assign(self, vectors: np.ndarray, block_size: int = 65536) -> np.ndarray:
+        """Return the nearest partition of each row of ``vectors``."""
+        labels = np.empty(len(vectors), dtype=np.int32)
+        for start in range(0, len(vectors), block_size):
+            end = start + block_size
+            block = normalize(np.asarray(vectors[start:end], dtype=np.float32))
+            labels[start:end] = np.argmax(block @ self.centroids.T, axis=1)
+        return labels
+
+    def set_rows(self, rows: np.ndarray, labels: np.ndarray) -> None:
+        """Record partition ``labels`` for ``rows``, growing as needed."""
+        needed = int(rows.max()) + 1 if len(rows) else 0
+        if needed > len(self.assignments):
+            grown = np.full(max(needed, 2 * len(self.assignments)), -1, np.int32)
+            grown[: len(self.assignments)] = self.assignments
+            self.assignments = grown
+        self.assignments[rows] = labels
+        self._order = None
+
+    def remove_rows(self, rows: np.ndarray) -> None:
+        """Drop ``rows`` from their partitions."""
+        rows = rows[rows < len(self.assignments)]
+        self.assignments[rows] = -1
+        self._order = None
+
+    def candidates(self, query: np.ndarray, nprobe: int) -> np.ndarray:
+        """Rows in the ``nprobe`` partitions closest to ``query``."""
+        if self._order is None or self._offsets is None:
+            # Rows grouped by partition; -1 (removed) sorts first and is skipped
+            self._order = np.argsort(self.assignments, kind="stable").astype(np.int64)
+            self._offsets = np.searchsorted(
+                self.assignments[self._order], np.arange(self.nlist + 1)
+            )
+        scores = self.centroids @ normalize(query.reshape(1, -1))[0]
+        nprobe = min(nprobe, self.nlist)
+        probes = np.argpartition(-scores, nprobe - 1)[:nprobe]
+        bounds = zip(self._offsets[probes], self._offsets[probes + 1])
+        return np.concatenate([self._order[start:end] for start, end in bounds])
+
+    @staticmethod
+    def paths(directory: str, generation: int) -> Tuple[str, str]:
+        """Centroid and assignment file paths for ``generation``."""
+        return (
+            os.path.join(directory, f"centroids.{generation}.npy"),
+            os.path.join(directory, f"assignments.{generation}.npy"),
+        )
+
+    def save(self, directory: str, generation: int) -> None:
+        """Persist centroids and assignments under ``directory``."""
+        centroids_path, assignments_path = self.paths(directory, generation)
+        np.save(centroids_path, self.centroids)
+        np.save(assignments_path, self.assignments)
+
+    @classmethod
+    def load(cls, directory: str, generation: int) -> Optional["IVFIndex"]:
+        """Load a previously saved index, if present."""
+        centroids_path, assignments_path = cls.paths(directory, generation)
+        if not (os.path.exists(centroids_path) and os.path.exists(assignments_path)):
+            return None
+        return cls(np.load(centroids_path), np.load(assignments_path))
@@ -0,0 +1,495 @@
+"""
+Local vector store backed by memory-mapped float32 files.
+
+Each namespace lives in its own directory:
+
+* ``vectors.<gen>.f32`` - a ``(capacity, dim)`` float32 memmap, grown by
+  doubling
+* ``rows.<gen>.jsonl`` - an append-only journal of row assignments and
+  deletes, replayed on open
+* ``centroids.<gen>.npy`` / ``assignments.<gen>.npy`` - the optional IVF
+  partitioning
+* ``CURRENT`` - the active generation ``<gen>``
+
+Compaction writes a complete new generation and then switches ``CURRENT``
+with a single atomic rename, so a crash never pairs vectors with the journal
+of another generation.
+"""
+
+import asyncio
+import json
+import os
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Tuple, cast
+
+import numpy as np
+
+from .base import (
+    VectorMatch,
+    VectorStoreError,
+    as_matrix,
+    normalize,
+    validate_namespace,
+)
+from .ivf import IVFIndex, train_centroids
+
+_CURRENT_FILE = "CURRENT"
+_INITIAL_CAPACITY = 1024
+_SEARCH_BLOCK_ROWS = 65536
+
+
+class _Namespace:
+    """Vectors, row journal and optional IVF index of one namespace."""
+
+    def __init__(
+        self,
+        path: str,
+        dim: int,
+        metric: str,
+        ivf_nlist: int,
+        ivf_nprobe: int,
+        ivf_min_rows: int,
+        compact_ratio: float,
+    ):
+        self.path = path
+        self.dim = dim
+        self.metric = metric
+        self.ivf_nlist = ivf_nlist
+        self.ivf_nprobe = ivf_nprobe
+        self.ivf_min_rows = ivf_min_rows
+        self.compact_ratio = compact_ratio
+        self.lock = threading.RLock()
+
+        self.ids: List[Optional[str]] = []
+        self.metadata: List[Optional[Dict[str, Any]]] = []
+        self.rows: Dict[str, int] = {}
+        self.live = np.zeros(0, dtype=bool)
+        self.ivf: Optional[IVFIndex] = None
+        self.ivf_trained_rows = 0
+
+        os.makedirs(path, exist_ok=True)
+        self.generation = self._read_generation()
+        self._replay_journal()
+        self.capacity = 0
+        self.vectors = self._open_vectors(max(_INITIAL_CAPACITY, len(self.ids)))
+        self._journal = open(self._journal_path(), "a", encoding="utf-8")
+        if ivf_nlist:
+            ivf = IVFIndex.load(path, self.generation)
+            # Assignments saved before a crash may not cover the newest rows
+            if ivf is not None and len(ivf.assignments) >= self.size:
+                self.ivf = ivf
+                self.ivf_trained_rows = len(self.rows)
+
+    @property
+    def size(self) -> int:
+        """Rows in use, including deleted rows awaiting compaction."""
+        return len(self.ids)
+
+    def _read_generation(self) -> int:
+        try:
+            with open(os.path.join(self.path, _CURRENT_FILE), encoding="utf-8") as f:
+                return int(f.read().strip())
+        except FileNotFoundError:
+            return 0
+
+    def _vectors_path(self, generation: Optional[int] = None) -> str:
+        generation = self.generation if generation is None else generation
+        return os.path.join(self.path, f"vectors.{generation}.f32")
+
+    def _journal_path(self, generation: Optional[int] = None) -> str:
+        generation = self.generation if generation is None else generation
+        return os.path.join(self.path, f"rows.{generation}.jsonl")
+
+    def _replay_journal(self) -> None:
+        journal_path = self._journal_path()
+        if not os.path.exists(journal_path):
+            return
+        with open(journal_path, encoding="utf-8") as journal:
+            for line in journal:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                if entry["op"] == "put":
+                    row = entry["row"]
+                    while len(self.ids) <= row:
+                        self.ids.append(None)
+                        self.metadata.append(None)
+                    previous = self.ids[row]
+                    if previous is not None and self.rows.get(previous) == row:
+                        del self.rows[previous]
+                    self.ids[row] = entry["id"]
+                    self.metadata[row] = entry.get("meta") or {}
+                    self.rows[entry["id"]] = row
+                elif entry["op"] == "del":
+                    row = self.rows.pop(entry["id"], None)
+                    if row is not None:
+                        self.ids[row] = None
+                        self.metadata[row] = None
+        self.live = np.array([i is not None for i in self.ids], dtype=bool)
+
+    def _open_vectors(self, capacity: int) -> np.memmap:
+        vectors_path = self._vectors_path()
+        required = capacity * self.dim * 4
+        mode = "r+b" if os.path.exists(vectors_path) else "w+b"
+        with open(vectors_path, mode) as f:
+            if os.fstat(f.fileno()).st_size < required:
+                f.truncate(required)
+            capacity = os.fstat(f.fileno()).st_size // (self.dim * 4)
+        self.capacity = capacity
+        if len(self.live) < capacity:
+            self.live = np.concatenate(
+                [self.live, np.zeros(capacity - len(self.live), dtype=bool)]
+            )
+        return np.memmap(
+            vectors_path, dtype=np.float32, mode="r+", shape=(capacity, self.dim)
+        )
+
+    def _ensure_capacity(self, rows: int) -> None:
+        if rows <= self.capacity:
+            return
+        capacity = max(self.capacity, _INITIAL_CAPACITY)
+        while capacity < rows:
+            capacity *= 2
+        self.vectors.flush()
+        del self.vectors
+        self.vectors = self._open_vectors(capacity)
+
+    def _append_journal(self, entries: List[Dict[str, Any]]) -> None:
+        self._journal.write("".join(json.dumps(e) + "\n" for e in entries))
+        self._journal.flush()
+
+    def upsert(
+        self,
+        ids: Sequence[str],
+        matrix: np.ndarray,
+        metadata: Optional[Sequence[Dict[str, Any]]],
+    ) -> None:
+        if self.metric == "cosine":
+            matrix = normalize(matrix)
+        with self.lock:
+            # Collapse duplicate IDs within the batch; the last occurrence wins
+            positions = {vector_id: i for i, vector_id in enumerate(ids)}
+            rows = np.empty(len(positions), dtype=np.int64)
+            sources = np.empty(len(positions), dtype=np.int64)
+            next_row = self.size
+            for n, (vector_id, position) in enumerate(positions.items()):
+                row = self.rows.get(vector_id)
+                if row is None:
+                    row = next_row
+                    next_row += 1
+                rows[n] = row
+                sources[n] = position
+
+            self._ensure_capacity(next_row)
+            self.vectors[rows] = matrix[sources]
+            self.vectors.flush()
+
+            entries = []
+            for row, position in zip(rows.tolist(), sources.tolist()):
+                vector_id = ids[position]
+                meta = dict(metadata[position]) if metadata else {}
+                while len(self.ids) <= row:
+                    self.ids.append(None)
+                    self.metadata.append(None)
+                self.ids[row] = vector_id
+                self.metadata[row] = meta
+                self.rows[vector_id] = row
+                entries.append({"op": "put", "row": row, "id": vector_id, "meta": meta})
+            self.live[rows] = True
+            self._append_journal(entries)
+
+            if self.ivf is not None:
+                self.ivf.set_rows(rows, self.ivf.assign(matrix[sources]))
+                if len(self.rows) >= 2 * self.ivf_trained_rows:
+                    self.build_index()
+                else:
+                    self.ivf.save(self.path, self.generation)
+            elif self.ivf_nlist and len(self.rows) >= self.ivf_min_rows:
+                self.build_index()
+
+    def delete(self, ids: Sequence[str]) -> None:
+        with self.lock:
+            removed = [
+                (vector_id, self.rows.pop(vector_id))
+                for vector_id in dict.fromkeys(ids)
+                if vector_id in self.rows
+            ]
+            if not removed:
+                return
+            rows = np.array([row for _, row in removed], dtype=np.int64)
+            for vector_id, row in removed:
+                self.ids[row] = None
+                self.metadata[row] = None
+            self.live[rows] = False
+            self._append_journal([{"op": "del", "id": i} for i, _ in removed])
+            if self.ivf is not None:
+                self.ivf.remove_rows(rows)
+                self.ivf.save(self.path, self.generation)
+            if self.size - len(self.rows) > self.compact_ratio * self.size:
+                self.compact()
+
+    def compact(self) -> None:
+        """Rewrite live rows contiguously into a new generation."""
+        with self.lock:
+            live_rows = np.flatnonzero(self.live[: self.size])
+            generation = self.generation + 1
+            capacity = max(_INITIAL_CAPACITY, len(live_rows))
+            compacted = np.memmap(
+                self._vectors_path(generation),
+                dtype=np.float32,
+                mode="w+",
+                shape=(capacity, self.dim),
+            )
+            for start in range(0, len(live_rows), _SEARCH_BLOCK_ROWS):
+                end = min(start + _SEARCH_BLOCK_ROWS, len(live_rows))
+                compacted[start:end] = self.vectors[live_rows[start:end]]
+            compacted.flush()
+            del compacted
+
+            ids = [cast(str, self.ids[row]) for row in live_rows]
+            metadata = [self.metadata[row] for row in live_rows]
+            with open(self._journal_path(generation), "w", encoding="utf-8") as f:
+                for row, (vector_id, meta) in enumerate(zip(ids, metadata)):
+                    entry = {"op": "put", "row": row, "id": vector_id, "meta": meta}
+                    f.write(json.dumps(entry) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+
+            ivf = None
+            if self.ivf is not None:
+                ivf = IVFIndex(self.ivf.centroids, self.ivf.assignments[live_rows])
+                ivf.save(self.path, generation)
+
+            # Switching CURRENT is the commit point of the new generation
+            current_tmp = os.path.join(self.path, _CURRENT_FILE + ".tmp")
+            with open(current_tmp, "w", encoding="utf-8") as f:
+                f.write(str(generation))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(current_tmp, os.path.join(self.path, _CURRENT_FILE))
+
+            previous = self.generation
+            self._journal.close()
+            del self.vectors
+            self.generation = generation
+            self.ids = list(ids)
+            self.metadata = metadata
+            self.rows = {vector_id: row for row, vector_id in enumerate(ids)}
+            self.live = np.ones(len(ids), dtype=bool)
+            self.vectors = self._open_vectors(capacity)
+            self._journal = open(self._journal_path(), "a", encoding="utf-8")
+            self.ivf = ivf
+
+            for stale in (
+                self._vectors_path(previous),
+                self._journal_path(previous),
+                *IVFIndex.paths(self.path, previous),
+            ):
+                if os.path.exists(stale):
+                    os.remove(stale)
+
+    def build_index(self) -> None:
+        """(Re)train the IVF partitioning on the current live vectors."""
+        with self.lock:
+            live_rows = np.flatnonzero(self.live[: self.size])
+            if not self.ivf_nlist or len(live_rows) < self.ivf_nlist:
+                return
+            centroids = train_centroids(self.vectors[live_rows], self.ivf_nlist)
+            self.ivf = IVFIndex(centroids)
+            self.ivf.set_rows(live_rows, self.ivf.assign(self.vectors[live_rows]))
+            self.ivf_trained_rows = len(live_rows)
+            self.ivf.save(self.path, self.generation)
+
+    def search(
+        self, queries: np.ndarray, top_k: int, exact: bool = False
+    ) -> List[List[Tuple[int, float]]]:
+        if self.metric == "cosine":
+            queries = normalize(queries)
+        with self.lock:
+            if not self.rows or top_k <= 0:
+                return [[] for _ in range(len(queries))]
+            if self.ivf is not None and not exact:
+                return [self._search_ivf(query, top_k) for query in queries]
+            return self._search_exact(queries, top_k)
+
+    def _search_exact(
+        self, queries: np.ndarray, top_k: int
+    ) -> List[List[Tuple[int, float]]]:
+        best_rows = np.empty((len(queries), 0), dtype=np.int64)
+        best_scores = np.empty((len(queries), 0), dtype=np.float32)
+        for start in range(0, self.size, _SEARCH_BLOCK_ROWS):
+            end = min(start + _SEARCH_BLOCK_ROWS, self.size)
+            scores = queries @ np.asarray(self.vectors[start:end]).T
+            scores[:, ~self.live[start:end]] = -np.inf
+            rows = np.broadcast_to(np.arange(start, end), scores.shape)
+            best_scores = np.concatenate([best_scores, scores], axis=1)
+            best_rows = np.concatenate([best_rows, rows], axis=1)
+            if best_scores.shape[1] > top_k:
+                keep = np.argpartition(-best_scores, top_k - 1, axis=1)[:, :top_k]
+                best_scores = np.take_along_axis(best_scores, keep, axis=1)
+                best_rows = np.take_along_axis(best_rows, keep, axis=1)
+
+        order = np.argsort(-best_scores, axis=1)
+        results = []
+        for query_rows, query_scores, query_order in zip(best_rows, best_scores, order):
+            results.append(
+                [
+                    (int(query_rows[i]), float(query_scores[i]))
+                    for i in query_order
+                    if np.isfinite(query_scores[i])
+                ]
+            )
+        return results
+
+    def _search_ivf(self, query: np.ndarray, top_k: int) -> List[Tuple[int, float]]:
+        assert self.ivf is not None
+        candidates = self.ivf.candidates(query, self.ivf_nprobe)
+        if not len(candidates):
+            return []
+        candidates.sort()
+        scores = np.asarray(self.vectors[candidates]) @ query
+        k = min(top_k, len(candidates))
+        keep = np.argpartition(-scores, k - 1)[:k]
+        keep = keep[np.argsort(-scores[keep])]
+        return [(int(candidates[i]), float(scores[i])) for i in keep]
+
+    def close(self) -> None:
+        with self.lock:
+            self.vectors.flush()
+            self._journal.close()
+
+
+class LocalVectorStore:
+    """Vector store persisted to memory-mapped files under ``root``.
+
+    With ``metric="cosine"`` vectors are normalized on insert so search is a
+    single matrix product. Setting ``ivf_nlist`` enables IVF partitioning once
+    a namespace holds ``ivf_min_rows`` vectors; ``exact=True`` on a query
+    bypasses it.
+    """
+
+    def __init__(
+        self,
+        root: str,
+        dim: int,
+        metric: str = "cosine",
+        ivf_nlist: int = 0,
+        ivf_nprobe: int = 8,
+        ivf_min_rows: int = 10000,
+        compact_ratio: float = 0.3,
+    ):
+        if metric not in ("cosine", "dot"):
+            raise VectorStoreError(f"Unsupported metric: {metric!r}")
+        self.root = root
+        self.dim = dim
+        self.metric = metric
+        self.ivf_nlist = ivf_nlist
+        self.ivf_nprobe = ivf_nprobe
+        self.ivf_min_rows = ivf_min_rows
+        self.compact_ratio = compact_ratio
+        self._namespaces: Dict[str, _Namespace] = {}
+        self._lock = threading.Lock()
+
+    def _namespace(self, namespace: str) -> _Namespace:
+        validate_namespace(namespace)
+        with self._lock:
+            ns = self._namespaces.get(namespace)
+            if ns is None:
+                ns = _Namespace(
+                    os.path.join(self.root, namespace),
+                    self.dim,
+                    self.metric,
+                    self.ivf_nlist,
+                    self.ivf_nprobe,
+                    self.ivf_min_rows,
+                    self.compact_ratio,
+                )
+                self._namespaces[namespace] = ns
+            return ns
+
+    def _matches(
+        self, ns: _Namespace, hits: List[Tuple[int, float]]
+    ) -> List[VectorMatch]:
+        matches = []
+        for row, score in hits:
+            vector_id = ns.ids[row]
+            if vector_id is not None:
+                matches.append(VectorMatch(vector_id, score, ns.metadata[row] or {}))
+        return matches
+
+    def upsert_sync(
+        self,
+        namespace: str,
+        ids: Sequence[str],
+        vectors: Any,
+        metadata: Optional[Sequence[Dict[str, Any]]] = None,
+    ) -> None:
+        """Insert or replace vectors by ID."""
+        matrix = as_matrix(vectors, self.dim)
+        if len(ids) != len(matrix):
+            raise VectorStoreError("ids and vectors must have the same length")
+        if metadata is not None and len(metadata) != len(ids):
+            raise VectorStoreError("metadata and ids must have the same length")
+        if len(ids):
+            self._namespace(namespace).upsert(ids, matrix, metadata)
+
+    def delete_sync(self, namespace: str, ids: Sequence[str]) -> None:
+        """Delete vectors by ID; unknown IDs are ignored."""
+        self._namespace(namespace).delete(ids)
+
+    def query_batch_sync(
+        self, namespace: str, vectors: Any, top_k: int = 10, exact: bool = False
+    ) -> List[List[VectorMatch]]:
+        """Return the ``top_k`` matches for each row of ``vectors``."""
+        ns = self._namespace(namespace)
+        hits = ns.search(as_matrix(vectors, self.dim), top_k, exact=exact)
+        return [self._matches(ns, query_hits) for query_hits in hits]
+
+    def count_sync(self, namespace: str) -> int:
+        """Number of live vectors in ``namespace``."""
+        return len(self._namespace(namespace).rows)
+
+    def compact(self, namespace: str) -> None:
+        """Reclaim space held by deleted rows."""
+        self._namespace(namespace).compact()
+
+    def build_index(self, namespace: str) -> None:
+        """Train (or retrain) the IVF index of ``namespace``."""
+        self._namespace(namespace).build_index()
+
+    async def upsert(
+        self,
+        namespace: str,
+        ids: Sequence[str],
+        vectors: Any,
+        metadata: Optional[Sequence[Dict[str, Any]]] = None,
+    ) -> None:
+        """Insert or replace vectors by ID."""
+        await asyncio.to_thread(self.upsert_sync, namespace, ids, vectors, metadata)
+
+    async def delete(self, namespace: str, ids: Sequence[str]) -> None:
+        """Delete vectors by ID; unknown IDs are ignored."""
+        await asyncio.to_thread(self.delete_sync, namespace, ids)
+
+    async def query(
+        self, namespace: str, vector: Any, top_k: int = 10
+    ) -> List[VectorMatch]:
+        """Return the ``top_k`` most similar vectors to ``vector``."""
+        return (await self.query_batch(namespace, vector, top_k))[0]
+
+    async def query_batch(
+        self, namespace: str, vectors: Any, top_k: int = 10
+    ) -> List[List[VectorMatch]]:
+        """Return the ``top_k`` matches for each row of ``vectors``."""
+        return await asyncio.to_thread(self.query_batch_sync, namespace, vectors, top_k)
+
+    async def count(self, namespace: str) -> int:
+        """Number of live vectors in ``namespace``."""
+        return await asyncio.to_thread(self.count_sync, namespace)
+
+    def close(self) -> None:
+        """Flush and close every open namespace."""
+        with self._lock:
+            for ns in self._namespaces.values():
+                ns.close()
+            self._namespaces.clear()
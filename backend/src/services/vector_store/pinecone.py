@@ -0,0 +1,88 @@
+"""
+Pinecone-backed vector store.
+"""
+
+import asyncio
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .base import VectorMatch, validate_namespace
+
+
+class PineconeVectorStore:
+    """Vector store delegating to a hosted Pinecone index."""
+
+    def __init__(self, api_key: str, index_name: str, batch_size: int = 100):
+        from pinecone import Pinecone
+
+        self._index = Pinecone(api_key=api_key).Index(index_name)
+        self.batch_size = batch_size
+
+    def _upsert_sync(
+        self,
+        namespace: str,
+        ids: Sequence[str],
+        vectors: Any,
+        metadata: Optional[Sequence[Dict[str, Any]]],
+    ) -> None:
+        matrix = np.asarray(vectors, dtype=np.float32).reshape(len(ids), -1)
+        items = [
+            (vector_id, row.tolist(), metadata[i] if metadata else {})
+            for i, (vector_id, row) in enumerate(zip(ids, matrix))
+        ]
+        for start in range(0, len(items), self.batch_size):
+            end = start + self.batch_size
+            self._index.upsert(vectors=items[start:end], namespace=namespace)
+
+    def _query_sync(self, namespace: str, vector: Any, top_k: int) -> List[VectorMatch]:
+        response = self._index.query(
+            vector=np.asarray(vector, dtype=np.float32).ravel().tolist(),
+            top_k=top_k,
+            namespace=namespace,
+            include_metadata=True,
+        )
+        return [
+            VectorMatch(match.id, float(match.score), dict(match.metadata or {}))
+            for match in response.matches
+        ]
+
+    async def upsert(
+        self,
+        namespace: str,
+        ids: Sequence[str],
+        vectors: Any,
+        metadata: Optional[Sequence[Dict[str, Any]]] = None,
+    ) -> None:
+        """Insert or replace vectors by ID."""
+        validate_namespace(namespace)
+        await asyncio.to_thread(self._upsert_sync, namespace, ids, vectors, metadata)
+
+    async def delete(self, namespace: str, ids: Sequence[str]) -> None:
+        """Delete vectors by ID; unknown IDs are ignored."""
+        validate_namespace(namespace)
+        await asyncio.to_thread(self._index.delete, ids=list(ids), namespace=namespace)
+
+    async def query(
+        self, namespace: str, vector: Any, top_k: int = 10
+    ) -> List[VectorMatch]:
+        """Return the ``top_k`` most similar vectors to ``vector``."""
+        validate_namespace(namespace)
+        return await asyncio.to_thread(self._query_sync, namespace, vector, top_k)
+
+    async def query_batch(
+        self, namespace: str, vectors: Any, top_k: int = 10
+    ) -> List[List[VectorMatch]]:
+        """Return the ``top_k`` matches for each row of ``vectors``."""
+        matrix = np.asarray(vectors, dtype=np.float32)
+        matrix = matrix.reshape(1, -1) if matrix.ndim == 1 else matrix
+        return list(
+            await asyncio.gather(*(self.query(namespace, row, top_k) for row in matrix))
+        )
+
+    async def count(self, namespace: str) -> int:
+        """Number of vectors in ``namespace``."""
+        validate_namespace(namespace)
+        stats = await asyncio.to_thread(self._index.describe_index_stats)
+        summary = stats.namespaces.get(namespace)
+        return int(summary.vector_count) if summary else 0
@@ -0,0 +1,222 @@
+"""
+Pipelined LLM-to-TTS response streaming.
+
+LLM tokens are segmented into sentences (or long clauses) as they arrive and
+each segment is handed to TTS immediately, so the first audio chunk reaches
+the client while later sentences are still being generated.
+"""
+
+import asyncio
+import logging
+import re
+import time
+from dataclasses import asdict, dataclass, field
+from typing import AsyncIterator, List, Optional, Union
+
+from ..core.tokens import count_message_tokens, count_tokens
+from ..core.tracing import span, start_span
+from .providers import ChatMessages, LLMProvider, TTSProvider
+
+logger = logging.getLogger(__name__)
+
+_SENTENCE_END = re.compile(r"[.!?…]+[\"')\]]*\s")
+_CLAUSE_END = re.compile(r"[,;:—]\s")
+_ABBREVIATIONS = {"mr", "mrs", "ms", "dr", "st", "vs", "etc", "e.g", "i.e"}
+
+
+class SentenceSegmenter:
+    """Incrementally split streamed text into speakable segments."""
+
+    def __init__(self, min_clause_chars: int = 40, max_chars: int = 250):
+        self.min_clause_chars = min_clause_chars
+        self.max_chars = max_chars
+        self._buffer = ""
+
+    def feed(self, fragment: str) -> List[str]:
+        """Add a text fragment and return any segments it completed."""
+        self._buffer += fragment
+        segments = []
+        while True:
+            cut = self._find_boundary()
+            if cut is None:
+                break
+            segment = self._buffer[:cut].strip()
+            self._buffer = self._buffer[cut:].lstrip()
+            if segment:
+                segments.append(segment)
+        return segments
+
+    def flush(self) -> Optional[str]:
+        """Return whatever text remains once the stream has ended."""
+        segment = self._buffer.strip()
+        self._buffer = ""
+        return segment or None
+
+    def _find_boundary(self) -> Optional[int]:
+        buffer = self._buffer
+        for match in _SENTENCE_END.finditer(buffer):
+            words = buffer[: match.start()].split()
+            word = words[-1].lower().rstrip(".") if words else ""
+            if word in _ABBREVIATIONS:
+                continue
+            # "No. 5" is a number abbreviation; a bare "No." ends the sentence
+            start, end = match.end(), match.end() + 1
+            if word == "no" and buffer[start:end].isdigit():
+                continue
+            return match.end()
+
+        if len(buffer) > self.min_clause_chars:
+            clause = _CLAUSE_END.search(buffer, self.min_clause_chars - 1)
+            if clause:
+                return clause.end()
+
+        if len(buffer) >= self.max_chars:
+            cut = buffer.rfind(" ", 0, self.max_chars)
+            return cut + 1 if cut > 0 else self.max_chars
+
+        return None
+
+
+@dataclass
+class TurnMetrics:
+    """Latency breakdown for a single voice response turn (seconds)."""
+
+    time_to_first_token: Optional[float] = None
+    time_to_first_segment: Optional[float] = None
+    time_to_first_audio: Optional[float] = None
+    llm_duration: Optional[float] = None
+    tts_durations: List[float] = field(default_factory=list)
+    total_duration: Optional[float] = None
+    segments: int = 0
+    characters: int = 0
+    audio_bytes: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    answer: str = field(default="", repr=False)  # full LLM response text
+
+    def to_dict(self) -> dict:
+        """Return the metrics as a plain dictionary."""
+        data = asdict(self)
+        del data["answer"]
+        data["tts_duration"] = sum(self.tts_durations)
+        return data
+
+
+_END = object()
+
+
+class VoicePipeline:
+    """Stream synthesized audio for an LLM response, one segment at a time."""
+
+    def __init__(
+        self,
+        llm: LLMProvider,
+        tts: TTSProvider,
+        max_concurrent_tts: int = 2,
+        min_clause_chars: int = 40,
+    ):
+        self.llm = llm
+        self.tts = tts
+        self.max_concurrent_tts = max_concurrent_tts
+        self.min_clause_chars = min_clause_chars
+
+    @property
+    def media_type(self) -> str:
+        """Media type of the audio produced by the TTS provider."""
+        return self.tts.media_type
+
+    async def stream(
+        self, messages: ChatMessages, metrics: Optional[TurnMetrics] = None
+    ) -> AsyncIterator[bytes]:
+        """Yield audio chunks for the response to ``messages`` in spoken order.
+
+        Segments are synthesized concurrently (up to ``max_concurrent_tts``)
+        while the LLM keeps generating; chunks of later segments are buffered
+        until every earlier segment has been emitted.
+        """
+        metrics = metrics if metrics is not None else TurnMetrics()
+        metrics.prompt_tokens = sum(
+            count_message_tokens(message["content"]) for message in messages
+        )
+        started = time.perf_counter()
+        segmenter = SentenceSegmenter(min_clause_chars=self.min_clause_chars)
+        semaphore = asyncio.Semaphore(self.max_concurrent_tts)
+        segment_queues: "asyncio.Queue[Union[asyncio.Queue, BaseException, object]]"
+        segment_queues = asyncio.Queue()
+        tasks: List[asyncio.Task] = []
+
+        async def synthesize(text: str, index: int, chunks: asyncio.Queue) -> None:
+            async with semaphore, span("tts", segment=index) as stage:
+                tts_started = time.perf_counter()
+                try:
+                    async for chunk in self.tts.synthesize(text):
+                        await chunks.put(chunk)
+                except Exception as e:
+                    stage.end(error=e)
+                    await chunks.put(e)
+                finally:
+                    metrics.tts_durations[index] = time.perf_counter() - tts_started
+                    await chunks.put(_END)
+
+        async def schedule(text: str) -> None:
+            if metrics.time_to_first_segment is None:
+                metrics.time_to_first_segment = time.perf_counter() - started
+            metrics.segments += 1
+            metrics.characters += len(text)
+            # Durations are stored by segment index so they follow spoken order
+            metrics.tts_durations.append(0.0)
+            index = len(metrics.tts_durations) - 1
+            chunks: asyncio.Queue = asyncio.Queue()
+            tasks.append(asyncio.create_task(synthesize(text, index, chunks)))
+            await segment_queues.put(chunks)
+
+        async def produce() -> None:
+            fragments = []
+            stage = start_span("llm")
+            try:
+                async for fragment in self.llm.stream(messages):
+                    if metrics.time_to_first_token is None:
+                        metrics.time_to_first_token = time.perf_counter() - started
+                        stage.set(time_to_first_token=metrics.time_to_first_token)
+                    fragments.append(fragment)
+                    for segment in segmenter.feed(fragment):
+                        await schedule(segment)
+                tail = segmenter.flush()
+                if tail:
+                    await schedule(tail)
+                metrics.llm_duration = time.perf_counter() - started
+            except Exception as e:
+                stage.end(error=e)
+                await segment_queues.put(e)
+            finally:
+                stage.end()
+                metrics.answer = "".join(fragments)
+                metrics.completion_tokens = count_tokens(metrics.answer)
+                await segment_queues.put(_END)
+
+        producer = asyncio.create_task(produce())
+        try:
+            while True:
+                item = await segment_queues.get()
+                if item is _END:
+                    break
+                if isinstance(item, BaseException):
+                    raise item
+                assert isinstance(item, asyncio.Queue)
+                while True:
+                    chunk = await item.get()
+                    if chunk is _END:
+                        break
+                    if isinstance(chunk, BaseException):
+                        raise chunk
+                    if metrics.time_to_first_audio is None:
+                        metrics.time_to_first_audio = time.perf_counter() - started
+                    metrics.audio_bytes += len(chunk)
+                    yield chunk
+        finally:
+            producer.cancel()
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(producer, *tasks, return_exceptions=True)
+            metrics.total_duration = time.perf_counter() - started
+            logger.info(f"Voice turn completed - Metrics: {metrics.to_dict()}")
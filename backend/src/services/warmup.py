@@ -0,0 +1,161 @@
+"""
+Startup warm-up, so the first requests to a new worker run at steady-state
+latency.
+
+``Warmup`` runs its steps concurrently once at startup and records how long
+each took. Steps are best effort: a failing or slow step is logged and
+warm-up still completes, since the request path would only pay the same
+cost lazily. Readiness is reported by the health endpoints once it is done.
+"""
+
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.database import get_engine
+from ..core.metrics import gauge
+from ..core.security import create_access_token, pwd_context, verify_token
+from ..models.user import User
+from ..schemas.user import Token
+from ..schemas.user import User as UserSchema
+from ..schemas.user import UserCreate
+from .user_service import UserService
+
+logger = logging.getLogger(__name__)
+
+WARMUP_READY = gauge("warmup_ready", "1 once startup warm-up has finished")
+WARMUP_SECONDS = gauge("warmup_duration_seconds", "Startup warm-up duration")
+WARMUP_STEP_SECONDS = gauge(
+    "warmup_step_seconds", "Duration of each startup warm-up step", ["step"]
+)
+
+Step = Callable[[], Awaitable[Any]]
+
+
+class Warmup:
+    """Startup warm-up steps and the readiness they gate."""
+
+    def __init__(self, steps: Dict[str, Step], timeout: float = 30.0):
+        self.steps = steps
+        self.timeout = timeout
+        self.ready = False
+        self.duration: Optional[float] = None
+        self.step_durations: Dict[str, float] = {}
+        self.errors: Dict[str, str] = {}
+
+    async def run(self) -> None:
+        """Run every step, then report ready."""
+        self.ready = False
+        self.step_durations.clear()
+        self.errors.clear()
+        WARMUP_READY.set(0)
+        started = time.perf_counter()
+        logger.info(f"Warm-up started - Steps: {', '.join(self.steps)}")
+        tasks = {
+            name: asyncio.ensure_future(self._run_step(name, step))
+            for name, step in self.steps.items()
+        }
+        try:
+            _, pending = await asyncio.wait(tasks.values(), timeout=self.timeout)
+        except asyncio.CancelledError:
+            for task in tasks.values():
+                task.cancel()
+            raise
+        for name, task in tasks.items():
+            if task in pending:
+                task.cancel()
+                self.errors[name] = f"timed out after {self.timeout:.0f}s"
+        self.duration = time.perf_counter() - started
+        WARMUP_SECONDS.set(self.duration)
+        self.mark_ready()
+        logger.info(
+            f"Warm-up finished - Duration: {self.duration * 1000:.0f}ms, "
+            f"Errors: {len(self.errors)}"
+        )
+
+    def mark_ready(self) -> None:
+        """Report ready, with or without running the steps."""
+        self.ready = True
+        WARMUP_READY.set(1)
+
+    async def _run_step(self, name: str, step: Step) -> None:
+        started = time.perf_counter()
+        try:
+            await step()
+        except Exception as e:
+            self.errors[name] = str(e) or type(e).__name__
+            logger.warning(f"Warm-up step failed - Step: {name}, Error: {e}")
+        finally:
+            duration = time.perf_counter() - started
+            self.step_durations[name] = duration
+            WARMUP_STEP_SECONDS.set(duration, step=name)
+
+    def report(self) -> Dict[str, Any]:
+        """Readiness and timings for the health endpoints."""
+        return {
+            "ready": self.ready,
+            "duration_ms": (
+                round(self.duration * 1000, 1) if self.duration is not None else None
+            ),
+            "steps_ms": {
+                name: round(duration * 1000, 1)
+                for name, duration in self.step_durations.items()
+            },
+            "errors": dict(self.errors),
+        }
+
+
+async def warm_database(connections: int) -> None:
+    """Open up to ``connections`` pooled connections, so they stay pooled."""
+    engine = get_engine()
+    size = getattr(engine.pool, "size", None)
+    count = min(connections, size()) if callable(size) else connections
+    opened = await asyncio.gather(
+        *(engine.connect().start() for _ in range(count)), return_exceptions=True
+    )
+    conns = [conn for conn in opened if not isinstance(conn, BaseException)]
+    try:
+        await asyncio.gather(*(conn.execute(text("SELECT 1")) for conn in conns))
+    finally:
+        await asyncio.gather(*(conn.close() for conn in conns))
+    for result in opened:
+        if isinstance(result, BaseException):
+            raise result
+
+
+async def warm_user_lookups() -> None:
+    """Compile and cache the statements behind login and authentication."""
+    async with AsyncSession(get_engine()) as session:
+        await UserService.get_user_by_id(session, 0)
+        await UserService.get_user_by_email(session, "warmup@invalid")
+        await UserService.get_user_by_username(session, "warmup")
+        await UserService.authenticate_user(session, "warmup", "")
+
+
+async def warm_serializers() -> None:
+    """Run the user schemas' validators and serializers once."""
+    UserCreate(email="warmup@example.com", username="warmup", password="warmup12")
+    now = datetime.utcnow()
+    user = User(
+        id=0,
+        email="warmup@example.com",
+        username="warmup",
+        is_active=True,
+        is_superuser=False,
+        created_at=now,
+        updated_at=now,
+    )
+    UserSchema.model_validate(user).model_dump_json()
+    Token(access_token="", token_type="bearer").model_dump_json()
+
+
+async def warm_security() -> None:
+    """Load the password hashing backend and exercise JWT signing."""
+    pwd_context.handler().get_backend()
+    if verify_token(create_access_token("warmup")) != "warmup":
+        raise RuntimeError("JWT round trip failed")
@@ -2,7 +2,8 @@
 Pytest configuration and fixtures for MemVoice API tests.
 """
 
-from typing import AsyncGenerator
+from contextlib import contextmanager
+from typing import AsyncGenerator, Callable, ContextManager, Iterator
 
 import pytest
 import pytest_asyncio
@@ -12,7 +13,7 @@ from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
 from src.api.deps import get_db
-from src.core.database import Base
+from src.core.database import Base, QueryStats, track_queries
 from src.main import app
 
 # Test database URL (use SQLite in memory for tests)
@@ -81,3 +82,28 @@ def test_user_data() -> dict:
         "password": "testpassword123",
         "full_name": "Test User",
     }
+
+
+@pytest.fixture
+def query_budget() -> Callable[..., ContextManager[QueryStats]]:
+    """Assert that a block runs at most ``max_queries`` SQL statements.
+
+    Usage: ``with query_budget(3): await async_client.get(...)``. Statements
+    repeated past the N+1 threshold fail the budget unless ``allow_repeated``.
+    """
+
+    @contextmanager
+    def budget(max_queries: int, allow_repeated: bool = False) -> Iterator[QueryStats]:
+        with track_queries() as stats:
+            yield stats
+        executed = "\n".join(
+            f"{count}x {statement}" for statement, count in stats.statements.items()
+        )
+        assert (
+            stats.count <= max_queries
+        ), f"{stats.count} queries over a budget of {max_queries}:\n{executed}"
+        assert (
+            allow_repeated or not stats.repeated
+        ), f"Probable N+1 queries:\n{executed}"
+
+    return budget
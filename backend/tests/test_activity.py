@@ -0,0 +1,118 @@
+"""
+Tests for write-behind user activity tracking.
+"""
+
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from httpx import AsyncClient
+
+from src.api.deps import get_activity_tracker
+from src.main import app
+from src.models.user import User
+from src.services.activity import ActivityTracker
+
+
+def session_factory(db):
+    @asynccontextmanager
+    async def factory():
+        yield db
+
+    return factory
+
+
+async def add_users(db, count: int):
+    users = [
+        User(
+            id=n,
+            username=f"user{n}",
+            email=f"user{n}@example.com",
+            hashed_password="x",
+        )
+        for n in range(1, count + 1)
+    ]
+    db.add_all(users)
+    await db.commit()
+    return users
+
+
+@pytest.mark.asyncio
+async def test_flush_coalesces_per_user(test_db):
+    """Many requests per user become one row update; updated_at is untouched."""
+    users = await add_users(test_db, 3)
+    updated_at = {user.id: user.updated_at for user in users}
+    tracker = ActivityTracker(session_factory(test_db))
+    start = datetime(2026, 10, 19, 12, 0, tzinfo=timezone.utc)
+    for second in range(50):
+        tracker.seen(1, start + timedelta(seconds=second))
+    tracker.seen(1, start)  # out-of-order timestamps never move it back
+    tracker.logged_in(2, start)
+
+    assert tracker.pending == 2
+    assert await tracker.flush() == 2
+    assert await tracker.flush() == 0
+
+    for user in users:
+        await test_db.refresh(user)
+    assert users[0].last_seen_at.replace(tzinfo=None) == datetime(
+        2026, 10, 19, 12, 0, 49
+    )
+    assert users[0].last_login_at is None
+    assert users[1].last_login_at.replace(tzinfo=None) == datetime(2026, 10, 19, 12)
+    assert users[2].last_seen_at is None
+    assert {user.id: user.updated_at for user in users} == updated_at
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_keeps_newest_activity():
+    """A failed flush is retried next interval without overwriting newer data."""
+
+    @asynccontextmanager
+    async def broken():
+        raise RuntimeError("database unavailable")
+        yield  # pragma: no cover
+
+    tracker = ActivityTracker(broken)
+    old = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    tracker.logged_in(1, old)
+
+    assert await tracker.flush() == 0
+    assert tracker.pending == 1
+    tracker.seen(1, old + timedelta(minutes=5))
+    assert tracker._seen[1] == old + timedelta(minutes=5)
+    assert tracker._logins[1] == old
+
+
+@pytest.mark.asyncio
+async def test_authenticated_requests_do_not_write(async_client: AsyncClient, test_db):
+    """Login and authenticated reads only touch memory until the flush."""
+    tracker = ActivityTracker(session_factory(test_db))
+    app.dependency_overrides[get_activity_tracker] = lambda: tracker
+    response = await async_client.post(
+        "/api/v1/auth/register",
+        json={
+            "email": "ana@example.com",
+            "username": "ana",
+            "password": "correct-horse",
+        },
+    )
+    assert response.status_code in (200, 201)
+    response = await async_client.post(
+        "/api/v1/auth/login", data={"username": "ana", "password": "correct-horse"}
+    )
+    token = response.json()["access_token"]
+
+    response = await async_client.get(
+        "/api/v1/auth/me", headers={"Authorization": f"Bearer {token}"}
+    )
+    assert response.status_code == 200
+    assert response.json()["last_seen_at"] is None
+    assert tracker.pending == 1
+
+    await tracker.flush()
+    response = await async_client.get(
+        "/api/v1/auth/me", headers={"Authorization": f"Bearer {token}"}
+    )
+    assert response.json()["last_login_at"] is not None
+    assert response.json()["last_seen_at"] is not None
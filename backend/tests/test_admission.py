@@ -0,0 +1,137 @@
+"""
+Tests for admission control and priority load shedding.
+"""
+
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from src.core.admission import (
+    AdmissionController,
+    AdmissionMiddleware,
+    Priority,
+    Rejected,
+    classify,
+)
+
+
+def test_classify():
+    """Health is never shed, voice comes first, bulk and admin last."""
+    assert classify("GET", "/health", False) is Priority.CRITICAL
+    assert classify("GET", "/api/v1/health/ping", False) is Priority.CRITICAL
+    assert classify("POST", "/api/v1/voice/respond", True) is Priority.HIGH
+    assert classify("POST", "/api/v1/voice/respond", False) is Priority.NORMAL
+    assert classify("GET", "/api/v1/sites/", True) is Priority.NORMAL
+    assert classify("POST", "/api/v1/auth/register", False) is Priority.LOW
+    assert classify("POST", "/api/v1/sites/3/crawl", True) is Priority.LOW
+    assert classify("GET", "/api/v1/usage/daily", True) is Priority.LOW
+
+
+@pytest.mark.asyncio
+async def test_queued_requests_are_admitted_by_priority():
+    """Freed slots go to the highest waiting class; full queues shed at once."""
+    controller = AdmissionController(initial_limit=1, queue_size=1, max_wait=5)
+    await controller.acquire(Priority.HIGH)
+    order = []
+
+    async def wait(priority):
+        await controller.acquire(priority)
+        order.append(priority)
+
+    normal = asyncio.create_task(wait(Priority.NORMAL))
+    await asyncio.sleep(0)
+    high = asyncio.create_task(wait(Priority.HIGH))
+    await asyncio.sleep(0)
+    with pytest.raises(Rejected) as rejected:
+        await controller.acquire(Priority.NORMAL)
+    assert rejected.value.reason == "queue_full"
+    assert rejected.value.retry_after >= 1
+
+    controller.release(0.01)
+    await high
+    controller.release(0.01)
+    await normal
+    assert order == [Priority.HIGH, Priority.NORMAL]
+    assert controller.in_flight == 1
+
+    # Cancelled waiters give their place up
+    waiting = asyncio.create_task(controller.acquire(Priority.LOW))
+    await asyncio.sleep(0)
+    waiting.cancel()
+    await asyncio.gather(waiting, return_exceptions=True)
+    assert controller.queued(Priority.LOW) == 0
+
+
+@pytest.mark.asyncio
+async def test_deadline_rejection_and_timeout():
+    """Waits that cannot finish in time are refused up front or time out."""
+    controller = AdmissionController(initial_limit=1, max_wait=0.05)
+    await controller.acquire(Priority.NORMAL)
+    controller._latency = 1.0  # one slot and one-second responses
+    with pytest.raises(Rejected) as rejected:
+        await controller.acquire(Priority.NORMAL)
+    assert rejected.value.reason == "deadline"
+
+    controller._latency = 0.01
+    with pytest.raises(Rejected) as rejected:
+        await controller.acquire(Priority.NORMAL)
+    assert rejected.value.reason == "timeout"
+    assert controller.queued(Priority.NORMAL) == 0
+
+
+@pytest.mark.asyncio
+async def test_limit_adapts_to_latency():
+    """Fast saturated traffic raises the limit; slow responses cut it."""
+    now = [0.0]
+    controller = AdmissionController(
+        initial_limit=10, min_limit=5, target_latency=0.5, clock=lambda: now[0]
+    )
+    for _ in range(10):
+        await controller.acquire(Priority.HIGH)
+    for _ in range(50):
+        controller.release(0.1)
+        await controller.acquire(Priority.HIGH)
+    assert 10.5 < controller.limit < 11.5  # grows only while the limit is reached
+
+    grown = controller.limit
+    controller.release(2.0)
+    controller.release(2.0)  # within the same window: one decrease only
+    assert controller.limit == pytest.approx(grown * 0.9)
+    for _ in range(8):
+        now[0] += 1
+        controller.release(2.0)
+    assert controller.limit == 5 and controller.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_middleware_sheds_with_retry_after():
+    """Overload yields a fast 503 with Retry-After while health stays up."""
+    release = asyncio.Event()
+    app = FastAPI()
+
+    @app.get("/api/v1/slow")
+    async def slow():
+        await release.wait()
+        return {"ok": True}
+
+    @app.get("/api/v1/health/ping")
+    async def ping():
+        return {"status": "ok"}
+
+    controller = AdmissionController(initial_limit=1, queue_size=1, max_wait=0.05)
+    app.add_middleware(AdmissionMiddleware, controller=controller)
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        busy = asyncio.create_task(client.get("/api/v1/slow"))
+        await asyncio.sleep(0.01)
+
+        shed = await client.get("/api/v1/slow")
+        assert shed.status_code == 503
+        assert int(shed.headers["Retry-After"]) >= 1
+        assert (await client.get("/api/v1/health/ping")).status_code == 200
+
+        release.set()
+        assert (await busy).status_code == 200
+    assert controller.in_flight == 0
@@ -0,0 +1,149 @@
+"""
+Tests for ETag revalidation and response compression.
+"""
+
+import gzip
+import zlib
+from contextlib import asynccontextmanager
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import Response, StreamingResponse
+from httpx import ASGITransport, AsyncClient
+
+from src.api.deps import get_activity_tracker
+from src.core import compression
+from src.core.compression import CompressionMiddleware, negotiate_encoding
+from src.core.etag import etag_matches
+from src.core.security import create_access_token
+from src.main import app
+from src.models.user import User
+from src.services.activity import ActivityTracker
+
+
+@pytest.mark.asyncio
+async def test_me_endpoints_revalidate(async_client: AsyncClient, test_db):
+    """Unchanged users get a bodiless 304; activity changes the ETag."""
+    test_db.add(
+        User(id=1, username="ana", email="ana@example.com", hashed_password="x")
+    )
+    await test_db.commit()
+
+    @asynccontextmanager
+    async def session():
+        yield test_db
+
+    tracker = ActivityTracker(session)
+    app.dependency_overrides[get_activity_tracker] = lambda: tracker
+    headers = {"Authorization": f"Bearer {create_access_token(subject='ana')}"}
+
+    for path in ("/api/v1/users/me", "/api/v1/auth/me"):
+        first = await async_client.get(path, headers=headers)
+        etag = first.headers["ETag"]
+        assert first.status_code == 200 and etag.startswith('W/"')
+
+        cached = await async_client.get(
+            path, headers={**headers, "If-None-Match": etag}
+        )
+        assert cached.status_code == 304
+        assert cached.content == b"" and cached.headers["ETag"] == etag
+
+    await tracker.flush()  # last_seen_at is part of the representation
+    changed = await async_client.get(
+        "/api/v1/users/me", headers={**headers, "If-None-Match": etag}
+    )
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+    assert changed.json()["last_seen_at"] is not None
+
+
+def test_etag_matching_and_negotiation(monkeypatch):
+    """If-None-Match lists compare weakly; encodings honour q-values."""
+    assert etag_matches('"a", W/"b"', 'W/"b"')
+    assert etag_matches("*", 'W/"b"')
+    assert not etag_matches('W/"a"', 'W/"b"') and not etag_matches(None, 'W/"b"')
+
+    monkeypatch.setattr(compression, "brotli", None)
+    assert negotiate_encoding("gzip, deflate, br") == "gzip"
+    assert negotiate_encoding("br;q=1.0, gzip;q=0") is None
+    assert negotiate_encoding("identity") is None
+    assert negotiate_encoding("*") == "gzip"
+
+    monkeypatch.setattr(compression, "brotli", object())
+    assert negotiate_encoding("gzip, br") == "br"
+    assert negotiate_encoding("gzip;q=1, br;q=0.5") == "gzip"
+
+
+@pytest.mark.asyncio
+async def test_compression_thresholds_and_streaming():
+    """Large and streamed text is gzipped; small bodies and audio are not."""
+    rows = [f'{{"id": {n}, "url": "https://example.com/{n}"}}' for n in range(500)]
+    inner = FastAPI()
+
+    @inner.get("/small")
+    async def small():
+        return {"ok": True}
+
+    @inner.get("/large")
+    async def large():
+        return Response("[" + ",".join(rows) + "]", media_type="application/json")
+
+    @inner.get("/stream")
+    async def stream():
+        async def lines():
+            for row in rows:
+                yield row + "\n"
+
+        return StreamingResponse(lines(), media_type="text/plain")
+
+    @inner.get("/audio")
+    async def audio():
+        return Response(b"\0" * 5000, media_type="audio/mpeg")
+
+    inner.add_middleware(CompressionMiddleware, minimum_size=500)
+    transport = ASGITransport(app=inner)
+    accept = {"Accept-Encoding": "gzip"}
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get("/small", headers=accept)
+        assert "content-encoding" not in response.headers
+        assert response.headers["vary"] == "Accept-Encoding"
+
+        response = await client.get("/large", headers=accept)
+        assert response.headers["content-encoding"] == "gzip"
+        assert int(response.headers["content-length"]) < len(response.content) / 5
+        assert len(response.json()) == 500
+
+        response = await client.get("/audio", headers=accept)
+        assert "content-encoding" not in response.headers
+
+    # Drive the ASGI app directly to observe each streamed message
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": "/stream",
+        "raw_path": b"/stream",
+        "query_string": b"",
+        "root_path": "",
+        "scheme": "http",
+        "server": ("test", 80),
+        "asgi": {"version": "3.0", "spec_version": "2.4"},
+        "headers": [(b"accept-encoding", b"gzip")],
+    }
+    await inner.build_middleware_stack()(scope, receive, send)
+    headers = dict(messages[0]["headers"])
+    assert headers[b"content-encoding"] == b"gzip"
+    assert b"content-length" not in headers
+    chunks = [m["body"] for m in messages[1:]]
+    assert len(chunks) == len(rows) + 1  # one per row, then the gzip trailer
+    # Each chunk is flushed, so it decodes as soon as it arrives
+    decoder = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    assert decoder.decompress(chunks[0]) == (rows[0] + "\n").encode()
+    assert gzip.decompress(b"".join(chunks)).decode() == "\n".join(rows) + "\n"
@@ -0,0 +1,247 @@
+"""
+Tests for the incremental website crawler against a local fixture server.
+"""
+
+import asyncio
+import hashlib
+
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from bs4 import BeautifulSoup
+from sqlalchemy import select
+
+from src.api.deps import get_current_active_user
+from src.main import app
+from src.models.crawl import CrawlPage, CrawlSite
+from src.models.user import User
+from src.services.crawler import WebCrawler, needs_javascript, normalize_url
+
+
+def page(title: str, links=(), extra: str = "") -> str:
+    anchors = "".join(f'<a href="{href}">{href}</a>' for href in links)
+    text = f"{title} " + "Plenty of static text for readers. " * 10
+    return f"<html><body><h1>{title}</h1><p>{text}</p>{anchors}{extra}</body></html>"
+
+
+class FixtureSite:
+    """Serves HTML pages with ETags and records what was requested."""
+
+    def __init__(self):
+        self.pages = {
+            "/": page("Home", ["/about", "/contact#form", "https://elsewhere.test/"]),
+            "/about": page("About", ["/"]),
+            "/contact": page("Contact"),
+            "/hidden": page("Only in the sitemap"),
+            "/private": page("Disallowed"),
+            "/app": '<html><body><div id="root"></div><script src="/a.js"></script>'
+            "</body></html>",
+        }
+        self.requests = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def handle(self, request: web.Request) -> web.StreamResponse:
+        path = request.path
+        if path == "/robots.txt":
+            host = f"http://{request.host}"
+            return web.Response(
+                text=f"User-agent: *\nDisallow: /private\nSitemap: {host}/sitemap.xml\n"
+            )
+        if path == "/sitemap.xml":
+            host = f"http://{request.host}"
+            locs = "".join(
+                f"<url><loc>{host}{p}</loc></url>" for p in ("/hidden", "/private")
+            )
+            return web.Response(text=f"<urlset>{locs}</urlset>")
+        if path not in self.pages:
+            return web.Response(status=404)
+
+        self.requests.append((path, request.headers.get("If-None-Match")))
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+            body = self.pages[path]
+            etag = '"' + hashlib.md5(body.encode()).hexdigest() + '"'
+            if request.headers.get("If-None-Match") == etag:
+                return web.Response(status=304, headers={"ETag": etag})
+            return web.Response(
+                text=body, content_type="text/html", headers={"ETag": etag}
+            )
+        finally:
+            self.in_flight -= 1
+
+
+class FakeRenderer:
+    def __init__(self):
+        self.rendered = []
+
+    async def render(self, url: str) -> str:
+        self.rendered.append(url)
+        return page("Rendered app")
+
+    async def aclose(self) -> None:
+        pass
+
+
+@pytest_asyncio.fixture
+async def fixture_site():
+    site = FixtureSite()
+    app = web.Application()
+    app.router.add_route("GET", "/{tail:.*}", site.handle)
+    server = TestServer(app, host="127.0.0.1")
+    await server.start_server()
+    site.url = str(server.make_url("/"))
+    yield site
+    await server.close()
+
+
+async def make_site(db, url: str) -> CrawlSite:
+    db.add(User(id=1, username="owner", email="o@example.com", hashed_password="x"))
+    site = CrawlSite(user_id=1, root_url=url)
+    db.add(site)
+    await db.commit()
+    return site
+
+
+def make_crawler(**kwargs) -> WebCrawler:
+    options = {"per_host_delay": 0.0, "renderer": FakeRenderer()}
+    options.update(kwargs)
+    return WebCrawler(**options)
+
+
+def test_normalize_url():
+    """Fragments and default ports are dropped; host is lowercased."""
+    assert normalize_url("HTTP://Example.COM:80/a?b=1#c") == "http://example.com/a?b=1"
+    assert normalize_url("https://example.com") == "https://example.com/"
+
+
+@pytest.mark.asyncio
+async def test_first_crawl_discovers_links_and_sitemap(test_db, fixture_site):
+    """Links and sitemap URLs are crawled; robots.txt and other hosts are not."""
+    site = await make_site(test_db, fixture_site.url)
+    renderer = FakeRenderer()
+    pages = []
+
+    async def collect(crawled):
+        pages.append(crawled)
+
+    stats = await make_crawler(renderer=renderer).crawl(test_db, site, collect)
+
+    paths = sorted(p.url.removeprefix(fixture_site.url.rstrip("/")) for p in pages)
+    assert paths == ["/", "/about", "/contact", "/hidden"]
+    assert stats.new == 4
+    assert "/private" not in [path for path, _ in fixture_site.requests]
+    stored = (await test_db.execute(select(CrawlPage))).scalars().all()
+    assert len(stored) == 4
+    assert all(row.etag and row.content_hash for row in stored)
+    assert site.last_crawled_at is not None
+
+
+@pytest.mark.asyncio
+async def test_recrawl_only_returns_changed_pages(test_db, fixture_site):
+    """Conditional requests skip unchanged pages; edited pages are re-ingested."""
+    site = await make_site(test_db, fixture_site.url)
+    crawler = make_crawler()
+    await crawler.crawl(test_db, site)
+    fixture_site.requests.clear()
+
+    fixture_site.pages["/about"] = page("About us, updated", ["/"])
+    changed = []
+
+    async def collect(crawled):
+        changed.append(crawled.url)
+
+    stats = await crawler.crawl(test_db, site, collect)
+
+    assert changed == [fixture_site.url.rstrip("/") + "/about"]
+    assert stats.changed == 1
+    assert stats.not_modified == 3
+    assert all(etag is not None for _, etag in fixture_site.requests)
+
+
+@pytest.mark.asyncio
+async def test_per_host_concurrency_is_bounded(test_db, fixture_site):
+    """No more than per_host_concurrency requests are in flight at once."""
+    for i in range(20):
+        fixture_site.pages[f"/p{i}"] = page(f"Page {i}")
+    fixture_site.pages["/"] = page("Home", [f"/p{i}" for i in range(20)])
+    site = await make_site(test_db, fixture_site.url)
+
+    stats = await make_crawler(max_concurrency=8, per_host_concurrency=2).crawl(
+        test_db, site
+    )
+
+    assert stats.new == 22
+    assert fixture_site.max_in_flight <= 2
+
+
+@pytest.mark.asyncio
+async def test_only_javascript_shells_are_rendered(test_db, fixture_site):
+    """The headless renderer is used just for pages without static content."""
+    fixture_site.pages["/"] = page("Home", ["/app", "/about"])
+    site = await make_site(test_db, fixture_site.url)
+    renderer = FakeRenderer()
+    pages = {}
+
+    async def collect(crawled):
+        pages[crawled.url] = crawled
+
+    stats = await make_crawler(renderer=renderer).crawl(test_db, site, collect)
+
+    app_url = fixture_site.url.rstrip("/") + "/app"
+    assert renderer.rendered == [app_url]
+    assert stats.rendered == 1
+    assert pages[app_url].rendered
+    assert "Rendered app" in pages[app_url].html
+
+
+def test_needs_javascript_heuristic():
+    """Static pages are not rendered even when they include scripts."""
+    static = BeautifulSoup(page("Static", extra="<script></script>"), "html.parser")
+    shell = BeautifulSoup(
+        "<html><body><script src='x.js'></script><noscript>Enable JS</noscript>"
+        "</body></html>",
+        "html.parser",
+    )
+    assert not needs_javascript(static)
+    assert needs_javascript(shell)
+
+
+@pytest.mark.asyncio
+async def test_site_endpoints(async_client, test_db):
+    """Sites are created per user and other users' sites are not visible."""
+    owner = User(id=1, username="owner", email="o@example.com", hashed_password="x")
+    test_db.add(owner)
+    await test_db.commit()
+    app.dependency_overrides[get_current_active_user] = lambda: owner
+
+    response = await async_client.post(
+        "/api/v1/sites/", json={"root_url": "https://example.com"}
+    )
+    assert response.status_code == 201
+    assert response.json()["root_url"] == "https://example.com/"
+
+    response = await async_client.get("/api/v1/sites/")
+    assert [site["root_url"] for site in response.json()] == ["https://example.com/"]
+
+    response = await async_client.post("/api/v1/sites/999/crawl")
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_stream_yields_removed_pages(test_db, fixture_site):
+    """A page that starts returning 404 is streamed as removed."""
+    site = await make_site(test_db, fixture_site.url)
+    crawler = make_crawler()
+    first = [page async for page in crawler.stream(test_db, site)]
+    assert len(first) == 4
+
+    del fixture_site.pages["/contact"]
+    second = [page async for page in crawler.stream(test_db, site, max_buffered=1)]
+
+    assert [(p.url.rsplit("/", 1)[-1], p.removed) for p in second] == [
+        ("contact", True)
+    ]
@@ -0,0 +1,67 @@
+"""
+Tests for the content-hash embedding cache.
+"""
+
+import numpy as np
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.services.embedding_service import EmbeddingService, content_hash
+from src.services.providers import FakeEmbeddingProvider
+
+
+def count_selects(session: AsyncSession) -> list:
+    """Record SELECT statements executed through ``session``'s engine."""
+    statements: list = []
+
+    def before_execute(conn, cursor, statement, parameters, context, many):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append(statement)
+
+    event.listen(session.bind.sync_engine, "before_cursor_execute", before_execute)
+    return statements
+
+
+def test_content_hash_normalizes_whitespace_and_unicode():
+    """Formatting-only differences hash to the same key."""
+    assert content_hash("Opening  hours:\n9-5 ") == content_hash("Opening hours: 9-5")
+    assert content_hash("ﬁle") == content_hash("file")
+    assert content_hash("a") != content_hash("b")
+
+
+@pytest.mark.asyncio
+async def test_ingest_embeds_only_misses_in_full_batches(test_db: AsyncSession):
+    """First ingest embeds unique texts in maximal batches; re-ingest hits."""
+    provider = FakeEmbeddingProvider(max_batch_size=400)
+    service = EmbeddingService(provider)
+    texts = [f"chunk {i}" for i in range(1000)] + ["chunk  0"]
+    selects = count_selects(test_db)
+
+    first, stats = await service.embed(test_db, texts)
+
+    assert first.shape == (1001, provider.dimensions)
+    assert provider.calls == [400, 400, 200]
+    assert (stats.unique, stats.hits, stats.misses) == (1000, 0, 1000)
+    assert np.array_equal(first[0], first[1000])
+    assert len(selects) == 1
+
+    provider.calls.clear()
+    second, stats = await service.embed(test_db, texts)
+
+    assert provider.calls == []
+    assert stats.hit_rate == 1.0
+    assert np.array_equal(first, second)
+    assert len(selects) == 2
+
+
+@pytest.mark.asyncio
+async def test_cache_is_scoped_by_model(test_db: AsyncSession):
+    """The same text under another model is a miss."""
+    await EmbeddingService(FakeEmbeddingProvider(model="a")).embed(test_db, ["x"])
+    other = FakeEmbeddingProvider(model="b")
+
+    _, stats = await EmbeddingService(other).embed(test_db, ["x", "y"])
+
+    assert stats.misses == 2
+    assert other.calls == [2]
@@ -0,0 +1,132 @@
+"""
+Tests for text extraction, chunking and diff-based ingestion.
+"""
+
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import get_context
+
+import pytest
+from sqlalchemy import select
+
+from src.core.tokens import count_tokens
+from src.models.document import DocumentChunk
+from src.services.crawler import CrawledPage
+from src.services.embedding_service import EmbeddingService
+from src.services.extraction import chunk_page, extract_blocks
+from src.services.ingestion import IngestionPipeline, site_namespace
+from src.services.providers import FakeEmbeddingProvider
+from src.services.vector_store import LocalVectorStore
+
+URL = "https://example.com/faq"
+
+
+def faq_page(answers) -> str:
+    items = "".join(f"<h2>Q{i}</h2><p>{answer}</p>" for i, answer in enumerate(answers))
+    return (
+        "<html><head><title>FAQ</title></head><body>"
+        "<nav><a href='/'>Home</a></nav>"
+        "<div class='cookie-banner'>We use cookies.</div>"
+        f"<main>{items}</main>"
+        "<footer>Copyright</footer></body></html>"
+    )
+
+
+ANSWERS = [
+    f"Answer number {i} explains the policy in some detail. " * 6 for i in range(8)
+]
+
+
+async def pages(*items):
+    for item in items:
+        yield item
+
+
+def make_pipeline(tmp_path, **kwargs) -> IngestionPipeline:
+    options = {
+        "executor": ThreadPoolExecutor(2),
+        "max_tokens": 120,
+        "overlap_tokens": 0,
+    }
+    options.update(kwargs)
+    return IngestionPipeline(
+        EmbeddingService(FakeEmbeddingProvider(dimensions=16)),
+        LocalVectorStore(str(tmp_path), 16),
+        **options,
+    )
+
+
+def test_extraction_drops_boilerplate():
+    """Navigation, footers and cookie banners are removed; headings kept."""
+    title, blocks = extract_blocks(faq_page(["Open daily."]))
+
+    assert title == "FAQ"
+    assert [block.text for block in blocks] == ["Q0", "Open daily."]
+    assert blocks[1].heading == "Q0"
+
+
+def test_chunks_are_bounded_deterministic_and_overlapping():
+    """Chunk IDs depend only on URL and content; chunks respect the budget."""
+    html = faq_page(ANSWERS)
+    first = chunk_page(URL, html, max_tokens=120, overlap_tokens=30)
+    second = chunk_page(URL, html, max_tokens=120, overlap_tokens=30)
+
+    assert [c.id for c in first.chunks] == [c.id for c in second.chunks]
+    assert len({c.id for c in first.chunks}) == len(first.chunks) > 1
+    assert all(count_tokens(c.text) <= 120 for c in first.chunks)
+    assert first.chunks[1].text.split("\n")[0] in first.chunks[0].text
+    assert chunk_page(URL + "?v=2", html).chunks[0].id != first.chunks[0].id
+
+
+@pytest.mark.asyncio
+async def test_reingestion_applies_a_precise_diff(test_db, tmp_path):
+    """Unchanged chunks are untouched; edits become deletes plus adds."""
+    pipeline = make_pipeline(tmp_path)
+    namespace = site_namespace(1)
+
+    first = await pipeline.ingest(
+        test_db, 1, pages(CrawledPage(URL, faq_page(ANSWERS), "h1"))
+    )
+    total = first.added
+    assert total > 2 and first.deleted == 0
+    assert await pipeline.vector_store.count(namespace) == total
+
+    again = await pipeline.ingest(
+        test_db, 1, pages(CrawledPage(URL, faq_page(ANSWERS), "h1"))
+    )
+    assert (again.added, again.updated, again.deleted) == (0, 0, 0)
+    assert again.unchanged == total
+
+    edited = list(ANSWERS)
+    edited[-1] = "A short new final answer."
+    diff = await pipeline.ingest(
+        test_db, 1, pages(CrawledPage(URL, faq_page(edited), "h2"))
+    )
+    assert diff.added >= 1 and diff.deleted >= 1
+    assert diff.unchanged == total - diff.deleted
+    count = await pipeline.vector_store.count(namespace)
+    rows = (await test_db.execute(select(DocumentChunk))).scalars().all()
+    assert count == len(rows) == total - diff.deleted + diff.added
+
+    removed = await pipeline.ingest(
+        test_db, 1, pages(CrawledPage(URL, "", "", removed=True))
+    )
+    assert removed.removed_pages == 1
+    assert await pipeline.vector_store.count(namespace) == 0
+
+
+@pytest.mark.asyncio
+async def test_extraction_runs_in_worker_processes(tmp_path):
+    """Pages stream through a spawned process pool and keep their order."""
+    executor = ProcessPoolExecutor(2, mp_context=get_context("spawn"))
+    pipeline = make_pipeline(tmp_path, executor=executor, max_in_flight=3)
+    crawled = [
+        CrawledPage(f"https://example.com/{i}", faq_page(ANSWERS[:2]), str(i))
+        for i in range(6)
+    ]
+    try:
+        results = [item async for item in pipeline.extract(pages(*crawled))]
+    finally:
+        executor.shutdown()
+
+    assert [page.url for page, _ in results] == [page.url for page in crawled]
+    assert all(chunks is not None and chunks.chunks for _, chunks in results)
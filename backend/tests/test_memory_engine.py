@@ -0,0 +1,109 @@
+"""
+Tests for the token-budgeted conversation memory engine.
+"""
+
+import pytest
+
+from src.core.tokens import count_tokens
+from src.services.memory import ExtractiveSummarizer, LocalMemoryBackend, MemoryEngine
+
+
+def make_engine(**kwargs) -> MemoryEngine:
+    return MemoryEngine(LocalMemoryBackend(), ExtractiveSummarizer(), **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_short_history_is_included_verbatim():
+    """With room to spare every turn is kept, oldest first, query last."""
+    engine = make_engine()
+    await engine.add_turn("s1", "Hi, I'm Ana.", "Hello Ana!")
+    await engine.add_turn("s1", "When do you open?", "At nine.")
+
+    context = await engine.assemble("s1", "And close?", system_prompt="Be brief.")
+
+    assert [m["content"] for m in context.messages] == [
+        "Be brief.",
+        "Hi, I'm Ana.",
+        "Hello Ana!",
+        "When do you open?",
+        "At nine.",
+        "And close?",
+    ]
+    assert context.recent_messages == 4
+    assert not context.summary
+    assert context.token_count <= engine.token_budget
+
+
+@pytest.mark.asyncio
+async def test_context_respects_budget_and_keeps_newest_turns():
+    """Long histories are trimmed from the oldest end to fit the budget."""
+    engine = make_engine(token_budget=200, summarize_after_tokens=10**6)
+    for i in range(50):
+        await engine.add_turn("s1", f"Question {i} " + "word " * 10, f"Answer {i}.")
+
+    context = await engine.assemble("s1", "Next?")
+
+    assert context.token_count <= 200
+    assert 0 < context.recent_messages < 100
+    assert context.messages[-2]["content"] == "Answer 49."
+    assert context.messages[-1]["content"] == "Next?"
+
+
+@pytest.mark.asyncio
+async def test_older_turns_roll_into_summary():
+    """Past the threshold older turns are summarized and replaced."""
+    engine = make_engine(
+        token_budget=300,
+        summarize_after_tokens=100,
+        keep_recent_tokens=40,
+        summary_max_tokens=100,
+    )
+    await engine.add_turn("s1", "My name is Ana. I like tea.", "Noted, Ana.")
+    for i in range(8):
+        await engine.add_turn("s1", f"Tell me fact number {i}.", f"Fact {i} is true.")
+
+    context = await engine.assemble("s1", "What is my name?")
+
+    assert context.summary
+    summary = context.messages[0]["content"]
+    assert "user: My name is Ana." in summary
+    history = [m["content"] for m in context.messages[1:-1]]
+    assert "Noted, Ana." not in history
+    assert history[-1] == "Fact 7 is true."
+    assert context.token_count <= 300
+
+
+@pytest.mark.asyncio
+async def test_facts_fill_budget_in_rank_order():
+    """Retrieved facts are added in order until the budget runs out."""
+    engine = make_engine(token_budget=60, recent_share=0.0)
+    facts = [f"Fact {i}: " + "detail " * 5 for i in range(10)]
+
+    context = await engine.assemble("s1", "Question?", facts=facts)
+
+    assert 0 < context.facts < 10
+    block = context.messages[0]["content"]
+    assert block.startswith("Relevant facts:")
+    assert f"- {facts[0]}" in block
+    assert facts[context.facts] not in block
+    assert context.token_count <= 60
+
+
+@pytest.mark.asyncio
+async def test_sessions_are_isolated_and_deletable():
+    """Sessions never see each other's turns; deleted sessions start empty."""
+    engine = make_engine()
+    await engine.add_turn("a", "secret a", "ok")
+    await engine.add_turn("b", "secret b", "ok")
+
+    context = await engine.assemble("b", "hi")
+    assert "secret a" not in [m["content"] for m in context.messages]
+
+    await engine.backend.delete("a")
+    assert (await engine.assemble("a", "hi")).recent_messages == 0
+
+
+def test_token_counts_are_positive_and_monotonic():
+    """Longer text never counts as fewer tokens."""
+    assert count_tokens("") == 0
+    assert 0 < count_tokens("hello") <= count_tokens("hello world, again!")
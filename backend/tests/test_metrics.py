@@ -0,0 +1,50 @@
+"""
+Tests for the in-process metrics registry.
+"""
+
+import pytest
+
+from src.core.metrics import Counter, Gauge, Histogram, MetricsRegistry
+
+
+def test_metrics_render_prometheus_text():
+    """Counters, gauges and histograms render in the exposition format."""
+    registry = MetricsRegistry()
+    requests = registry.register(Counter("requests_total", "Requests", ["route"]))
+    inflight = registry.register(Gauge("inflight", "In-flight requests"))
+    latency = registry.register(
+        Histogram("latency_seconds", "Latency", buckets=(0.1, 1.0))
+    )
+    assert isinstance(requests, Counter)
+    assert isinstance(inflight, Gauge)
+    assert isinstance(latency, Histogram)
+
+    requests.inc(route="/a")
+    requests.inc(2, route='/"b"')
+    inflight.inc(3)
+    inflight.inc(-1)
+    for value in (0.05, 0.1, 0.5, 3.0):
+        latency.observe(value)
+
+    text = registry.render()
+    assert "# TYPE requests_total counter\n" in text
+    assert 'requests_total{route="/a"} 1.0' in text
+    assert 'requests_total{route="/\\"b\\""} 2.0' in text
+    assert "inflight 2.0" in text
+    assert 'latency_seconds_bucket{le="0.1"} 2' in text
+    assert 'latency_seconds_bucket{le="1.0"} 3' in text
+    assert 'latency_seconds_bucket{le="+Inf"} 4' in text
+    assert "latency_seconds_count 4" in text
+    assert latency.sum() == pytest.approx(3.65)
+
+
+def test_registry_reuses_metrics_and_checks_labels():
+    """Re-registering a name returns the original; label sets are enforced."""
+    registry = MetricsRegistry()
+    first = registry.register(Counter("hits_total", "Hits", ["result"]))
+
+    assert registry.register(Counter("hits_total", "Hits", ["result"])) is first
+    with pytest.raises(ValueError):
+        registry.register(Gauge("hits_total", "Hits"))
+    with pytest.raises(ValueError):
+        first.inc(route="x")
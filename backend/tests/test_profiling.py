@@ -0,0 +1,135 @@
+"""
+Tests for on-demand request profiling.
+"""
+
+import pstats
+import time
+
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from src.api.deps import get_current_superuser, get_profiler
+from src.core.config import settings
+from src.core.profiling import (
+    PROFILE_TOKEN_HEADER,
+    Profiler,
+    ProfileStore,
+    ProfilingMiddleware,
+    SamplingRule,
+    sign_profile_token,
+    verify_profile_token,
+)
+from src.main import app
+from src.models.user import User
+
+SECRET = "test-secret"
+
+
+def profiled_app(profiler: Profiler) -> FastAPI:
+    inner = FastAPI()
+
+    @inner.get("/api/v1/work")
+    async def work():
+        return {"total": sum(range(10000))}
+
+    inner.add_middleware(ProfilingMiddleware, profiler=profiler)
+    return inner
+
+
+def test_profile_tokens_are_scoped_and_expire():
+    """Tokens only cover their path prefix, until they expire, unaltered."""
+    expires_at = int(time.time()) + 60
+    token = sign_profile_token(SECRET, "/api/v1/voice", expires_at)
+
+    assert verify_profile_token(SECRET, token, "/api/v1/voice/respond")
+    assert not verify_profile_token(SECRET, token, "/api/v1/sites/")
+    assert not verify_profile_token(SECRET, token, "/api/v1/voice", expires_at + 1)
+    assert not verify_profile_token("other", token, "/api/v1/voice/respond")
+    forged = sign_profile_token("other", "/", expires_at)
+    assert not verify_profile_token(SECRET, forged, "/api/v1/voice")
+    assert not verify_profile_token(SECRET, "garbage", "/api/v1/voice")
+
+
+@pytest.mark.asyncio
+async def test_token_and_sampling_profile_requests(tmp_path):
+    """Only selected requests are profiled, into a bounded ring of files."""
+    store = ProfileStore(str(tmp_path), max_files=2)
+    profiler = Profiler(store, SECRET, random_fn=lambda: 0.0)
+    token = sign_profile_token(SECRET, "/api/v1/work", int(time.time()) + 60)
+    transport = ASGITransport(app=profiled_app(profiler))
+
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        plain = await client.get("/api/v1/work")
+        assert "X-Profile-ID" not in plain.headers
+        assert store.list() == []
+
+        for _ in range(3):
+            response = await client.get(
+                "/api/v1/work", headers={PROFILE_TOKEN_HEADER: token}
+            )
+            assert response.json() == {"total": 49995000}
+
+        profiler.set_rule(SamplingRule(route="/api/v1/work", rate=0.5, max_profiles=1))
+        sampled = await client.get("/api/v1/work")
+        await client.get("/api/v1/work")
+
+    infos = store.list()
+    assert [info.id for info in infos] == [sampled.headers["X-Profile-ID"]] + [
+        response.headers["X-Profile-ID"]
+    ]
+    assert infos[0].trigger == "sampling" and infos[1].trigger == "token"
+    assert infos[1].status_code == 200 and infos[1].path == "/api/v1/work"
+    assert profiler.rules == {}  # removed after max_profiles
+    assert len(list(tmp_path.iterdir())) == 4  # .prof and .json per profile
+    stats = pstats.Stats(store.path(infos[1].id))
+    assert any(name == "work" for _, _, name in stats.stats)
+
+
+@pytest.mark.asyncio
+async def test_admin_endpoints(async_client: AsyncClient, tmp_path, monkeypatch):
+    """Superusers mint tokens, manage sampling and read stored profiles."""
+    profiler = Profiler(ProfileStore(str(tmp_path)), SECRET)
+    app.dependency_overrides[get_profiler] = lambda: profiler
+    app.dependency_overrides[get_current_superuser] = lambda: User(
+        id=1, username="root", email="root@example.com", is_superuser=True
+    )
+
+    response = await async_client.get("/api/v1/profiles/")
+    assert response.status_code == 404  # disabled by default
+
+    monkeypatch.setattr(settings, "PROFILING_ENABLED", True)
+    response = await async_client.post(
+        "/api/v1/profiles/token", json={"path": "/api/v1/work"}
+    )
+    body = response.json()
+    assert body["header"] == PROFILE_TOKEN_HEADER
+    assert verify_profile_token(SECRET, body["token"], "/api/v1/work")
+
+    transport = ASGITransport(app=profiled_app(profiler))
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        profiled = await client.get(
+            "/api/v1/work", headers={body["header"]: body["token"]}
+        )
+    profile_id = profiled.headers["X-Profile-ID"]
+
+    listed = (await async_client.get("/api/v1/profiles/")).json()
+    assert [info["id"] for info in listed] == [profile_id]
+    report = await async_client.get(f"/api/v1/profiles/{profile_id}?format=text")
+    assert "function calls" in report.text
+    download = await async_client.get(f"/api/v1/profiles/{profile_id}")
+    assert download.content == (tmp_path / f"{profile_id}.prof").read_bytes()
+    missing = await async_client.get("/api/v1/profiles/..%2F..%2Fetc%2Fpasswd")
+    assert missing.status_code == 404
+
+    rule = {"route": "/api/v1/voice", "rate": 0.1}
+    response = await async_client.put("/api/v1/profiles/sampling", json=rule)
+    assert response.json()["rate"] == 0.1
+    assert [
+        r["route"] for r in (await async_client.get("/api/v1/profiles/sampling")).json()
+    ] == ["/api/v1/voice"]
+    response = await async_client.delete(
+        "/api/v1/profiles/sampling", params={"route": "/api/v1/voice"}
+    )
+    assert response.status_code == 204
+    assert profiler.rules == {}
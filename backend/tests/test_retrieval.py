@@ -0,0 +1,174 @@
+"""
+Tests for the BM25 index and hybrid retrieval.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+from httpx import AsyncClient
+
+from src.api.deps import get_current_active_user, get_retrieval_service
+from src.main import app
+from src.models.crawl import CrawlSite
+from src.models.user import User
+from src.services.bm25 import (
+    BM25Index,
+    BM25Store,
+    decode_varints,
+    encode_varint,
+    encode_varints,
+    tokenize,
+)
+from src.services.crawler import CrawledPage
+from src.services.embedding_service import EmbeddingService
+from src.services.ingestion import IngestionPipeline
+from src.services.providers import FakeEmbeddingProvider
+from src.services.retrieval import RetrievalService, reciprocal_rank_fusion
+from src.services.vector_store import LocalVectorStore
+
+DOCS = {
+    "a": "Our return policy allows refunds within 30 days of delivery.",
+    "b": "The XR-2000 blender ships with a two year warranty.",
+    "c": "Shipping is free on orders over 50 dollars.",
+    "d": "Warranty claims for the XR-1000 require the original receipt.",
+}
+
+
+def build_index(**kwargs) -> BM25Index:
+    index = BM25Index(**kwargs)
+    index.add(list(DOCS), list(DOCS.values()))
+    return index
+
+
+def test_varints_roundtrip():
+    """Scalar and vectorized encoders agree and decode back exactly."""
+    values = np.array([0, 1, 127, 128, 300, 16384, 2**31, 2**40], dtype=np.int64)
+    scalar = bytearray()
+    for value in values:
+        encode_varint(int(value), scalar)
+
+    assert bytes(scalar) == encode_varints(values)
+    assert decode_varints(bytes(scalar)).tolist() == values.tolist()
+    assert decode_varints(encode_varints(np.arange(100))).tolist() == list(range(100))
+
+
+def test_exact_sku_ranks_first():
+    """SKUs are indexed whole and by part, so the exact product wins."""
+    assert tokenize("Model XR-2000!") == ["model", "xr-2000", "xr", "2000"]
+    index = build_index()
+
+    results = index.search("does the xr-2000 have a warranty", top_k=3)
+
+    assert [doc_id for doc_id, _score in results][:2] == ["b", "d"]
+    assert results[0][1] > results[1][1]
+
+
+def test_updates_removals_and_compaction():
+    """Replaced and removed documents disappear, before and after compaction."""
+    index = build_index(compact_ratio=0.4)
+    index.search("warranty")  # populate the decoded postings cache
+
+    index.add(["c"], ["Extended warranty plans are sold separately."])
+    assert {doc_id for doc_id, _ in index.search("warranty")} == {"b", "c", "d"}
+
+    index.remove(["b", "missing"])
+    assert {doc_id for doc_id, _ in index.search("warranty")} == {"c", "d"}
+    assert len(index) == 3
+    size = index.postings_bytes
+
+    index.remove(["d"])  # dead documents now exceed the ratio
+    assert index.postings_bytes < size
+    assert [doc_id for doc_id, _ in index.search("warranty")] == ["c"]
+    assert index.search("refunds")[0][0] == "a"
+
+
+@pytest.mark.asyncio
+async def test_store_persists_indexes(tmp_path):
+    """Indexes survive a close and reload with identical scores."""
+    store = BM25Store(str(tmp_path))
+    await store.add("site-1", list(DOCS), list(DOCS.values()))
+    await store.remove("site-1", ["c"])
+    before = await store.search("site-1", "xr-1000 receipt")
+    store.close()
+
+    reloaded = BM25Store(str(tmp_path))
+    after = await reloaded.search("site-1", "xr-1000 receipt")
+
+    assert [doc_id for doc_id, _ in after] == [doc_id for doc_id, _ in before]
+    assert [score for _, score in after] == pytest.approx([s for _, s in before])
+    assert len(reloaded.index("site-1")) == 3
+    assert await reloaded.search("site-2", "receipt") == []
+
+
+def test_reciprocal_rank_fusion():
+    """Documents ranked well by both retrievers beat single-list winners."""
+    fused = reciprocal_rank_fusion([["x", "y", "z"], ["y", "w"]], k=60)
+
+    assert [doc_id for doc_id, _score in fused] == ["y", "x", "w", "z"]
+    assert fused[0][1] == pytest.approx(1 / 62 + 1 / 61)
+
+
+def product_page(sku: str, body: str) -> str:
+    return (
+        f"<html><head><title>{sku}</title></head>"
+        f"<body><main><h1>Product {sku}</h1><p>{body}</p></main></body></html>"
+    )
+
+
+@pytest.mark.asyncio
+async def test_hybrid_search_endpoint(async_client: AsyncClient, test_db, tmp_path):
+    """Ingested pages are searchable through the API by their owner only."""
+    user = User(id=1, username="u", email="u@example.com", hashed_password="x")
+    test_db.add_all(
+        [
+            user,
+            CrawlSite(id=1, user_id=1, root_url="https://shop.example.com"),
+            CrawlSite(id=2, user_id=2, root_url="https://other.example.com"),
+        ]
+    )
+    await test_db.commit()
+
+    embeddings = EmbeddingService(FakeEmbeddingProvider(dimensions=16))
+    vectors = LocalVectorStore(str(tmp_path / "vectors"), 16)
+    lexical = BM25Store(str(tmp_path / "bm25"))
+    pipeline = IngestionPipeline(
+        embeddings, vectors, executor=ThreadPoolExecutor(2), lexical=lexical
+    )
+
+    async def pages():
+        for n in range(6):
+            sku = f"QX-{7000 + n}"
+            html = product_page(sku, f"A compact kitchen appliance, variant {n}.")
+            yield CrawledPage(f"https://shop.example.com/p/{n}", html, sku)
+
+    await pipeline.ingest(test_db, 1, pages())
+    assert (tmp_path / "bm25" / "site-1.bm25.npz").exists()
+
+    app.dependency_overrides[get_current_active_user] = lambda: user
+    app.dependency_overrides[get_retrieval_service] = lambda: RetrievalService(
+        embeddings, vectors, lexical
+    )
+
+    response = await async_client.post(
+        "/api/v1/retrieval/search",
+        json={"site_id": 1, "query": "is the qx-7004 dishwasher safe", "top_k": 3},
+    )
+    assert response.status_code == 200
+    results = response.json()
+    assert results[0]["url"] == "https://shop.example.com/p/4"
+    assert results[0]["lexical_rank"] == 1
+    assert results[0]["vector_rank"] is not None
+    assert len(results) == 3
+
+    response = await async_client.post(
+        "/api/v1/retrieval/search",
+        json={"site_id": 1, "query": "qx-7002", "mode": "lexical", "top_k": 1},
+    )
+    assert [r["url"] for r in response.json()] == ["https://shop.example.com/p/2"]
+
+    response = await async_client.post(
+        "/api/v1/retrieval/search", json={"site_id": 2, "query": "qx-7002"}
+    )
+    assert response.status_code == 404
+    vectors.close()
@@ -0,0 +1,140 @@
+"""
+Tests for the per-site semantic answer cache.
+"""
+
+import numpy as np
+import pytest
+from httpx import AsyncClient
+
+from src.api.deps import (
+    get_current_active_user,
+    get_embedding_service,
+    get_semantic_cache,
+    get_voice_pipeline,
+)
+from src.main import app
+from src.models.crawl import CrawlSite
+from src.models.user import User
+from src.services.embedding_service import EmbeddingService
+from src.services.providers import (
+    FakeEmbeddingProvider,
+    FakeLLMProvider,
+    FakeTTSProvider,
+)
+from src.services.semantic_cache import CACHE_LOOKUPS, SemanticCache
+from src.services.voice_pipeline import VoicePipeline
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def unit(seed: int, dim: int = 32) -> np.ndarray:
+    vector = np.random.default_rng(seed).standard_normal(dim)
+    return vector / np.linalg.norm(vector)
+
+
+@pytest.mark.asyncio
+async def test_near_duplicates_hit_until_expiry(tmp_path):
+    """Similar questions hit, unrelated ones miss, and entries expire."""
+    clock = FakeClock()
+    cache = SemanticCache(str(tmp_path), threshold=0.9, ttl=60, clock=clock)
+    question = unit(1)
+
+    lookup = cache.lookup(1, question)
+    assert lookup.entry is None
+    await cache.store(1, question, "Open 9-5.", b"audio", "audio/mpeg", 2.5, 0)
+
+    paraphrase = question + 0.1 * unit(2)
+    hit = cache.lookup(1, paraphrase)
+    assert hit.entry is not None and hit.entry.answer == "Open 9-5."
+    assert await cache.load_audio(hit.entry) == b"audio"
+    assert cache.lookup(1, unit(3)).entry is None
+    assert cache.lookup(2, question).entry is None  # other sites are separate
+
+    clock.now += 61
+    assert cache.lookup(1, question).entry is None
+
+
+@pytest.mark.asyncio
+async def test_eviction_and_invalidation(tmp_path):
+    """Full sites evict the least recently used answer; re-ingest drops all."""
+    clock = FakeClock()
+    cache = SemanticCache(str(tmp_path), threshold=0.9, max_entries=2, clock=clock)
+    for seed in (1, 2, 3):
+        clock.now += 1
+        if seed == 3:
+            assert cache.lookup(1, unit(1)).entry is not None  # 1 is now recent
+        await cache.store(1, unit(seed), f"a{seed}", b"x", "audio/mpeg", 1.0, 0)
+
+    assert cache.lookup(1, unit(2)).entry is None
+    assert cache.lookup(1, unit(1)).entry is not None
+    in_flight = cache.lookup(1, unit(4))
+
+    assert cache.invalidate(1) == 2
+    assert cache.lookup(1, unit(1)).entry is None
+    assert not (tmp_path / "site-1").exists()
+    # An answer generated from the old content is not cached
+    stale = await cache.store(
+        1, unit(4), "old", b"x", "audio/mpeg", 1.0, in_flight.generation
+    )
+    assert stale is None
+
+
+@pytest.mark.asyncio
+async def test_respond_replays_cached_answer(
+    async_client: AsyncClient, test_db, tmp_path
+):
+    """The second identical question is answered without calling the LLM."""
+
+    class CountingLLM(FakeLLMProvider):
+        calls = 0
+
+        async def stream(self, messages):
+            CountingLLM.calls += 1
+            async for fragment in super().stream(messages):
+                yield fragment
+
+    user = User(id=1, username="u", email="u@example.com", hashed_password="x")
+    test_db.add_all(
+        [user, CrawlSite(id=1, user_id=1, root_url="https://shop.example.com")]
+    )
+    await test_db.commit()
+    cache = SemanticCache(str(tmp_path))
+    app.dependency_overrides[get_current_active_user] = lambda: user
+    app.dependency_overrides[get_semantic_cache] = lambda: cache
+    app.dependency_overrides[get_embedding_service] = lambda: EmbeddingService(
+        FakeEmbeddingProvider(dimensions=16)
+    )
+    app.dependency_overrides[get_voice_pipeline] = lambda: VoicePipeline(
+        CountingLLM("We open at nine. We close at five."), FakeTTSProvider()
+    )
+    hits = CACHE_LOOKUPS.value(result="hit")
+    request = {"text": "When do you open?", "site_id": 1}
+
+    first = await async_client.post("/api/v1/voice/respond", json=request)
+    second = await async_client.post("/api/v1/voice/respond", json=request)
+
+    assert first.headers["x-answer-cache"] == "miss"
+    assert second.headers["x-answer-cache"] == "hit"
+    assert second.content == first.content
+    assert CountingLLM.calls == 1
+    assert CACHE_LOOKUPS.value(result="hit") == hits + 1
+
+    # Follow-up turns depend on history and always reach the LLM
+    request["history"] = [{"role": "user", "content": "Hi"}]
+    third = await async_client.post("/api/v1/voice/respond", json=request)
+    assert "x-answer-cache" not in third.headers
+    assert CountingLLM.calls == 2
+
+    response = await async_client.get("/api/v1/metrics")
+    assert 'semantic_cache_lookups_total{result="hit"}' in response.text
+
+    response = await async_client.post(
+        "/api/v1/voice/respond", json={"text": "hi", "site_id": 99}
+    )
+    assert response.status_code == 404
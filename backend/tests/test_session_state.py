@@ -0,0 +1,102 @@
+"""
+Tests for the voice session state stores.
+"""
+
+import asyncio
+import json
+from dataclasses import asdict
+
+import fakeredis
+import pytest
+
+from src.services.session_state import (
+    LocalSessionStore,
+    SessionState,
+    VersionConflict,
+    decode_state,
+    encode_state,
+)
+from src.services.session_state.redis import RedisSessionStore
+
+
+@pytest.fixture(params=["local", "redis"])
+def store(request):
+    if request.param == "local":
+        return LocalSessionStore(ttl=60)
+    return RedisSessionStore("", ttl=60, client=fakeredis.FakeAsyncRedis())
+
+
+def sample(session_id: str = "s1") -> SessionState:
+    return SessionState(
+        session_id=session_id,
+        user_id=42,
+        site_id=7,
+        history_seq=12,
+        partial_transcript="what are your opening",
+        cursors={"tts": "chunk-19", "llm": "resp_abc:3"},
+    )
+
+
+def test_records_are_compact():
+    """The positional msgpack record round-trips and beats keyed JSON."""
+    state = sample()
+    data = encode_state(state)
+    assert decode_state("s1", data) == state
+    assert len(data) < len(json.dumps(asdict(state))) * 0.6
+
+
+@pytest.mark.asyncio
+async def test_versions_guard_against_lost_updates(store):
+    """Saving from a stale read fails instead of overwriting newer state."""
+    saved = await store.save(sample())
+    assert saved.version == 1 and saved.updated_at > 0
+    assert await store.get("s1") == saved
+
+    saved.history_seq = 13
+    newer = await store.save(saved)
+    assert newer.version == 2
+    with pytest.raises(VersionConflict):
+        await store.save(saved)  # still at version 1
+    with pytest.raises(VersionConflict):
+        await store.save(sample())  # creating over an existing session
+
+    first, second = await asyncio.gather(
+        store.save(newer), store.save(newer), return_exceptions=True
+    )
+    assert {type(first), type(second)} == {SessionState, VersionConflict}
+    assert (await store.get("s1")).version == 3
+
+    await store.delete("s1")
+    assert await store.get("s1") is None
+    await store.aclose()
+
+
+@pytest.mark.asyncio
+async def test_get_many_returns_existing_sessions(store):
+    """Batch reads skip missing sessions."""
+    for session_id in ("a", "b", "c"):
+        await store.save(sample(session_id))
+    states = await store.get_many(["a", "missing", "c"])
+    assert sorted(states) == ["a", "c"]
+    assert states["c"].session_id == "c" and states["c"].cursors["tts"] == "chunk-19"
+    assert await store.get_many([]) == {}
+
+
+@pytest.mark.asyncio
+async def test_ttl_slides_on_read():
+    """Reads extend a session's lifetime; idle sessions expire."""
+    now = [1000.0]
+    local = LocalSessionStore(ttl=60, clock=lambda: now[0])
+    await local.save(sample())
+    for _ in range(3):
+        now[0] += 50
+        assert await local.get("s1") is not None
+    now[0] += 61
+    assert await local.get("s1") is None
+
+    client = fakeredis.FakeAsyncRedis()
+    redis_store = RedisSessionStore("", ttl=60, client=client)
+    await redis_store.save(sample())
+    await client.expire("memvoice:session:s1", 5)
+    await redis_store.get_many(["s1"])
+    assert 55 < await client.ttl("memvoice:session:s1") <= 60
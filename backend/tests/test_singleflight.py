@@ -0,0 +1,111 @@
+"""
+Tests for single-flight request coalescing.
+"""
+
+import asyncio
+
+import pytest
+from httpx import AsyncClient
+
+from src.core.security import create_access_token
+from src.core.singleflight import SINGLEFLIGHT_CALLS, SingleFlight
+from src.models.user import User
+from src.services.user_service import UserService
+
+
+@pytest.mark.asyncio
+async def test_concurrent_callers_share_one_call():
+    """Same-key callers get one call's result; the next burst starts anew."""
+    flight: SingleFlight[int] = SingleFlight("test_share")
+    calls = []
+
+    async def load(value: int) -> int:
+        calls.append(value)
+        await asyncio.sleep(0.01)
+        return value
+
+    results = await asyncio.gather(
+        *(flight.do("a", lambda: load(1)) for _ in range(10)),
+        flight.do("b", lambda: load(2)),
+    )
+    assert results == [1] * 10 + [2]
+    assert calls == [1, 2] and flight.in_flight == 0
+    assert SINGLEFLIGHT_CALLS.value(name="test_share", role="shared") == 9
+
+    assert await flight.do("a", lambda: load(3)) == 3
+
+
+@pytest.mark.asyncio
+async def test_errors_reach_every_caller():
+    """An exception is raised to all callers sharing the call."""
+    flight: SingleFlight[int] = SingleFlight("test_errors")
+
+    async def fail() -> int:
+        await asyncio.sleep(0.01)
+        raise LookupError("gone")
+
+    results = await asyncio.gather(
+        *(flight.do("k", fail) for _ in range(3)), return_exceptions=True
+    )
+    assert all(isinstance(r, LookupError) for r in results)
+    assert flight.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_cancellation_only_stops_the_cancelled_caller():
+    """The call survives a cancelled caller and stops when none are left."""
+    flight: SingleFlight[str] = SingleFlight("test_cancel")
+    release = asyncio.Event()
+    finished = []
+
+    async def slow() -> str:
+        await release.wait()
+        finished.append(True)
+        return "done"
+
+    first = asyncio.create_task(flight.do("k", slow))
+    second = asyncio.create_task(flight.do("k", slow))
+    await asyncio.sleep(0)
+    first.cancel()
+    await asyncio.sleep(0)
+    release.set()
+    assert await second == "done"
+    assert first.cancelled() and finished == [True]
+
+    release.clear()
+    orphan = asyncio.create_task(flight.do("k", slow))
+    await asyncio.sleep(0)
+    orphan.cancel()
+    await asyncio.gather(orphan, return_exceptions=True)
+    assert flight.in_flight == 0
+    release.set()
+    await asyncio.sleep(0)
+    assert finished == [True]  # abandoned call was cancelled, not completed
+
+
+@pytest.mark.asyncio
+async def test_token_stampede_looks_user_up_once(
+    async_client: AsyncClient, test_db, monkeypatch
+):
+    """Concurrent requests with one token share a single user lookup."""
+    test_db.add(
+        User(id=1, username="ana", email="ana@example.com", hashed_password="x")
+    )
+    await test_db.commit()
+    lookups = []
+    original = UserService.get_user_by_username
+
+    async def counted(db, username):
+        lookups.append(username)
+        await asyncio.sleep(0.05)
+        return await original(db, username)
+
+    monkeypatch.setattr(UserService, "get_user_by_username", counted)
+    headers = {"Authorization": f"Bearer {create_access_token(subject='ana')}"}
+
+    responses = await asyncio.gather(
+        *(async_client.get("/api/v1/auth/me", headers=headers) for _ in range(20))
+    )
+    assert {r.status_code for r in responses} == {200}
+    assert {r.json()["username"] for r in responses} == {"ana"}
+    assert lookups == ["ana"]
@@ -0,0 +1,81 @@
+"""
+Tests for per-request SQL instrumentation.
+"""
+
+import logging
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select
+
+from src.api.deps import get_current_active_user
+from src.core.config import settings
+from src.core.database import track_queries
+from src.main import app
+from src.models.crawl import CrawlSite
+from src.models.user import User
+
+
+async def add_user(db) -> User:
+    user = User(id=1, username="u", email="u@example.com", hashed_password="x")
+    db.add(user)
+    db.add_all(
+        CrawlSite(id=n, user_id=1, root_url=f"https://{n}.example.com")
+        for n in range(1, 7)
+    )
+    await db.commit()
+    return user
+
+
+@pytest.mark.asyncio
+async def test_repeated_statements_are_flagged(test_db, caplog):
+    """Loading rows one by one trips the N+1 detector; a batch query does not."""
+    await add_user(test_db)
+    test_db.expunge_all()
+
+    with caplog.at_level(logging.WARNING), track_queries() as per_row:
+        for site_id in range(1, 7):
+            await test_db.get(CrawlSite, site_id)
+    with track_queries() as batched:
+        await test_db.execute(select(CrawlSite).where(CrawlSite.user_id == 1))
+
+    assert per_row.count == 6 and len(per_row.repeated) == 1
+    assert "Probable N+1 query" in caplog.text
+    assert batched.count == 1 and not batched.repeated
+    assert batched.duration > 0
+
+
+@pytest.mark.asyncio
+async def test_slow_queries_are_logged_redacted(test_db, caplog, monkeypatch):
+    """Slow statements are logged with parameter types, never values."""
+    monkeypatch.setattr(settings, "DB_SLOW_QUERY_SECONDS", 0.0)
+
+    with caplog.at_level(logging.WARNING):
+        await test_db.execute(select(User).where(User.email == "secret@example.com"))
+
+    assert "Slow query" in caplog.text
+    assert "<str>" in caplog.text
+    assert "secret@example.com" not in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_request_headers_and_budget(
+    async_client: AsyncClient, test_db, query_budget, monkeypatch, caplog
+):
+    """Responses report their query count, correlated with the request ID."""
+    user = await add_user(test_db)
+    app.dependency_overrides[get_current_active_user] = lambda: user
+    monkeypatch.setattr(settings, "DB_QUERY_HEADERS", True)
+    monkeypatch.setattr(settings, "DB_SLOW_QUERY_SECONDS", 0.0)
+
+    with caplog.at_level(logging.WARNING), query_budget(1):
+        response = await async_client.get("/api/v1/sites/")
+
+    assert response.status_code == 200
+    assert response.headers["X-DB-Queries"] == "1"
+    assert float(response.headers["X-DB-Time"]) > 0
+    assert f"Request: {response.headers['X-Request-ID']}" in caplog.text
+
+    with pytest.raises(AssertionError, match="over a budget of 0"):
+        with query_budget(0):
+            await async_client.get("/api/v1/sites/")
@@ -0,0 +1,131 @@
+"""
+Tests for per-stage tracing, span export and the latency endpoint.
+"""
+
+import asyncio
+import json
+import uuid
+from typing import Any, Dict, List
+
+import pytest
+from httpx import AsyncClient
+
+from src.api.deps import get_current_superuser
+from src.core.tracing import FileSpanExporter, SpanExporter, Tracer, tracer
+from src.main import app
+from src.models.user import User
+
+
+class CollectingExporter(SpanExporter):
+    def __init__(self):
+        self.payloads: List[Dict[str, Any]] = []
+
+    async def export(self, payload: Dict[str, Any]) -> None:
+        self.payloads.append(payload)
+
+
+def exported_spans(payloads: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    return {
+        span["name"]: span
+        for payload in payloads
+        for resource in payload["resourceSpans"]
+        for scope in resource["scopeSpans"]
+        for span in scope["spans"]
+    }
+
+
+@pytest.mark.asyncio
+async def test_spans_follow_the_request_into_tasks():
+    local = Tracer(service_name="test")
+    exporter = CollectingExporter()
+    local.start(exporter)
+    request_id = str(uuid.uuid4())
+
+    async def retrieve() -> None:
+        with local.span("retrieval"):
+            await asyncio.sleep(0)
+
+    with local.trace("request", request_id) as root:
+        with local.span("llm"):
+            await asyncio.create_task(retrieve())
+        root.trace.route = "/api/v1/voice/respond"
+    assert await local.flush() == 3
+    with local.trace(
+        "request",
+        str(uuid.uuid4()),
+        traceparent=f"00-{'ab' * 16}-{'cd' * 8}-01",
+    ) as remote:
+        pass
+    await local.stop()
+
+    spans = exported_spans(exporter.payloads[:1])
+    assert {span["traceId"] for span in spans.values()} == {uuid.UUID(request_id).hex}
+    assert spans["retrieval"]["parentSpanId"] == spans["llm"]["spanId"]
+    assert spans["llm"]["parentSpanId"] == spans["request"]["spanId"]
+    assert "parentSpanId" not in spans["request"]
+    assert {"key": "http.route", "value": {"stringValue": "/api/v1/voice/respond"}} in (
+        spans["llm"]["attributes"]
+    )
+    assert remote.trace.trace_id == "ab" * 16 and remote.parent_id == "cd" * 8
+
+    routes = {(row["route"], row["stage"]) for row in local.latencies.summary()}
+    assert routes == {
+        ("/api/v1/voice/respond", "request"),
+        ("/api/v1/voice/respond", "llm"),
+        ("/api/v1/voice/respond", "retrieval"),
+        ("unmatched", "request"),
+    }
+
+
+@pytest.mark.asyncio
+async def test_file_exporter_writes_otlp_json_and_rotates(tmp_path):
+    path = tmp_path / "spans.jsonl"
+    local = Tracer()
+    local.start(FileSpanExporter(str(path), max_bytes=2048, backups=2))
+    for _ in range(12):
+        with local.trace("request", str(uuid.uuid4())):
+            with local.span("embedding", texts=3):
+                pass
+        assert await local.flush() == 2
+    await local.stop()
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "spans.jsonl",
+        "spans.jsonl.1",
+        "spans.jsonl.2",
+    ]
+    payload = json.loads(path.read_text().splitlines()[-1])
+    spans = exported_spans([payload])
+    assert spans["embedding"]["kind"] == 1 and spans["request"]["kind"] == 2
+    assert int(spans["embedding"]["endTimeUnixNano"]) >= int(
+        spans["embedding"]["startTimeUnixNano"]
+    )
+    assert {"key": "texts", "value": {"intValue": "3"}} in (
+        spans["embedding"]["attributes"]
+    )
+
+
+@pytest.mark.asyncio
+async def test_latency_endpoint_reports_stage_percentiles(async_client: AsyncClient):
+    app.dependency_overrides[get_current_superuser] = lambda: User(
+        id=1, username="root", email="root@example.com", is_superuser=True
+    )
+    tracer.latencies.clear()
+    for ms in range(1, 101):
+        tracer.latencies.record("/api/v1/voice/respond", "tts", ms / 1000)
+    await async_client.get("/")
+
+    response = await async_client.get("/api/v1/traces/latency")
+    assert response.status_code == 200
+    stages = {(row["route"], row["stage"]): row for row in response.json()["stages"]}
+    tts = stages[("/api/v1/voice/respond", "tts")]
+    assert tts["count"] == 100
+    assert (tts["p50_ms"], tts["p95_ms"], tts["p99_ms"]) == pytest.approx((50, 95, 99))
+    assert stages[("/", "request")]["count"] == 1
+    assert stages[("/", "admission")]["count"] == 1
+
+    response = await async_client.get("/api/v1/traces/latency", params={"route": "/"})
+    assert {row["stage"] for row in response.json()["stages"]} == {
+        "request",
+        "admission",
+    }
@@ -0,0 +1,114 @@
+"""
+Tests for the process-pool audio transcoding service.
+"""
+
+import asyncio
+import io
+import wave
+
+import numpy as np
+import pytest
+import pytest_asyncio
+
+from src.services.transcoding import (
+    CodecError,
+    CpuLimitExceeded,
+    TranscodeError,
+    TranscodeSpec,
+    TranscodingPool,
+)
+from src.services.transcoding.codecs import Transcoder
+
+SPEC = TranscodeSpec("wav", "pcm", sample_rate=16000, channels=1)
+
+
+def make_wav(seconds: float = 1.0, rate: int = 44100, channels: int = 2) -> bytes:
+    t = np.arange(int(seconds * rate)) / rate
+    tone = (np.sin(2 * np.pi * 440 * t) * 10000).astype("<i2")
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(channels)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        wav.writeframes(np.repeat(tone[:, None], channels, axis=1).tobytes())
+    return buffer.getvalue()
+
+
+async def chunked(data: bytes, size: int = 5000, delay: float = 0.0):
+    for start in range(0, len(data), size):
+        end = start + size
+        yield data[start:end]
+        if delay:
+            await asyncio.sleep(delay)
+
+
+async def collect(stream) -> bytes:
+    return b"".join([chunk async for chunk in stream])
+
+
+@pytest_asyncio.fixture
+async def pool():
+    pool = TranscodingPool(workers=1, chunk_bytes=4096, slots_per_worker=4)
+    yield pool
+    await pool.aclose()
+
+
+def test_streaming_resample_matches_whole_input():
+    data = make_wav()
+    whole = Transcoder(SPEC)
+    expected = whole.feed(memoryview(data)) + whole.finish()
+
+    streamed = Transcoder(SPEC)
+    view = memoryview(data)
+    pieces = [streamed.feed(view[start:][:777]) for start in range(0, len(data), 777)]
+    assert b"".join(pieces) + streamed.finish() == expected
+    # 44.1kHz stereo in, 16kHz mono int16 out
+    assert abs(len(expected) // 2 - 16000) <= 1
+
+    with pytest.raises(CodecError):
+        Transcoder(TranscodeSpec("ogg", "pcm"))
+
+
+@pytest.mark.asyncio
+async def test_pool_streams_concurrent_jobs(pool):
+    data = make_wav()
+    reference = Transcoder(SPEC)
+    expected = reference.feed(memoryview(data)) + reference.finish()
+
+    results = await asyncio.gather(
+        *[collect(pool.transcode(chunked(data), SPEC)) for _ in range(6)]
+    )
+    assert all(result == expected for result in results)
+
+    # Output arrives before the input has ended
+    stream = pool.transcode(chunked(data, delay=0.01), SPEC)
+    first = await stream.__anext__()
+    assert first
+    await stream.aclose()
+
+
+@pytest.mark.asyncio
+async def test_pool_reports_job_errors(pool):
+    with pytest.raises(CodecError):
+        await collect(pool.transcode(chunked(b"RIFF\0\0\0\0AVI LIST"), SPEC))
+
+    limited = TranscodingPool(workers=1, cpu_seconds_per_job=0.001)
+    try:
+        with pytest.raises(CpuLimitExceeded):
+            await collect(limited.transcode(chunked(make_wav(seconds=5)), SPEC))
+    finally:
+        await limited.aclose()
+
+    # The worker is still usable after failed jobs
+    assert await collect(pool.transcode(chunked(make_wav()), SPEC))
+
+
+@pytest.mark.asyncio
+async def test_pool_replaces_crashed_worker(pool):
+    stream = pool.transcode(chunked(make_wav(seconds=5), delay=0.01), SPEC)
+    await stream.__anext__()
+    pool._processes[0].process.kill()
+    with pytest.raises(TranscodeError):
+        await collect(stream)
+
+    assert await collect(pool.transcode(chunked(make_wav()), SPEC))
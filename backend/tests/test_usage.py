@@ -0,0 +1,145 @@
+"""
+Tests for write-behind usage accounting.
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import func, select
+
+from src.api.deps import get_current_active_user, get_usage_recorder, get_voice_pipeline
+from src.main import app
+from src.models.usage import UsageDaily, UsageEvent
+from src.models.user import User
+from src.services.providers import FakeLLMProvider, FakeTTSProvider
+from src.services.usage_service import UsageRecorder, estimate_cost
+from src.services.voice_pipeline import VoicePipeline
+
+PRICES = {"gpt-4o-mini": {"prompt_per_1m": 1.0, "completion_per_1m": 2.0}}
+
+
+def session_factory(db):
+    @asynccontextmanager
+    async def factory():
+        yield db
+
+    return factory
+
+
+async def add_user(db, user_id: int = 1) -> User:
+    user = User(
+        id=user_id,
+        username=f"user{user_id}",
+        email=f"user{user_id}@example.com",
+        hashed_password="x",
+        is_active=True,
+    )
+    db.add(user)
+    await db.commit()
+    return user
+
+
+@pytest.mark.asyncio
+async def test_records_buffer_until_flushed(test_db):
+    """Recording never touches the database; flush writes events and rollups."""
+    await add_user(test_db)
+    recorder = UsageRecorder(session_factory(test_db), prices=PRICES)
+
+    recorder.record(1, "llm", "gpt-4o-mini", prompt_tokens=100, completion_tokens=50)
+    recorder.record(1, "llm", "gpt-4o-mini", prompt_tokens=300, completion_tokens=10)
+    recorder.record(1, "tts", "fake-tts", characters=40, audio_seconds=2.5)
+    assert await test_db.scalar(select(func.count()).select_from(UsageEvent)) == 0
+
+    assert await recorder.flush() == 3
+    assert recorder.pending == 0
+    assert await test_db.scalar(select(func.count()).select_from(UsageEvent)) == 3
+
+    rows = {
+        row.stage: row for row in (await test_db.execute(select(UsageDaily))).scalars()
+    }
+    assert rows["llm"].requests == 2
+    assert rows["llm"].prompt_tokens == 400
+    assert rows["llm"].completion_tokens == 60
+    assert rows["llm"].cost_usd == pytest.approx(
+        estimate_cost(PRICES, "gpt-4o-mini", 400, 60)
+    )
+    assert rows["tts"].audio_seconds == pytest.approx(2.5)
+    assert rows["tts"].day == datetime.now(timezone.utc).date()
+
+
+@pytest.mark.asyncio
+async def test_rollups_accumulate_across_flushes(test_db):
+    """Later flushes add to the existing daily rollup row."""
+    await add_user(test_db)
+    recorder = UsageRecorder(session_factory(test_db))
+    for _ in range(2):
+        recorder.record(1, "tts", "fake-tts", characters=10)
+        await recorder.flush()
+
+    row = (await test_db.execute(select(UsageDaily))).scalar_one()
+    assert row.requests == 2
+    assert row.characters == 20
+
+
+@pytest.mark.asyncio
+async def test_size_trigger_flushes_in_background(test_db):
+    """Reaching max_batch schedules a flush without awaiting it."""
+    await add_user(test_db)
+    recorder = UsageRecorder(session_factory(test_db), max_batch=5)
+    for _ in range(5):
+        recorder.record(1, "llm", "m", prompt_tokens=1)
+
+    await recorder.stop()
+    assert await test_db.scalar(select(func.count()).select_from(UsageEvent)) == 5
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_keeps_records():
+    """A database error puts the batch back for the next attempt."""
+
+    @asynccontextmanager
+    async def broken():
+        raise RuntimeError("database down")
+        yield  # pragma: no cover
+
+    recorder = UsageRecorder(broken, max_buffer=3)
+    for _ in range(5):
+        recorder.record(1, "llm", "m")
+
+    assert await recorder.flush() == 0
+    assert recorder.pending == 3
+
+
+@pytest.mark.asyncio
+async def test_voice_turn_is_accounted_and_queryable(
+    async_client: AsyncClient, test_db
+):
+    """A voice turn records LLM and TTS usage visible through /usage/me."""
+    user = await add_user(test_db)
+    recorder = UsageRecorder(session_factory(test_db))
+    app.dependency_overrides[get_current_active_user] = lambda: user
+    app.dependency_overrides[get_usage_recorder] = lambda: recorder
+    app.dependency_overrides[get_voice_pipeline] = lambda: VoicePipeline(
+        FakeLLMProvider("Hello there. Bye."), FakeTTSProvider()
+    )
+
+    response = await async_client.post("/api/v1/voice/respond", json={"text": "hi"})
+    assert response.status_code == 200
+    await asyncio.sleep(0)
+    await recorder.flush()
+
+    response = await async_client.get("/api/v1/usage/me")
+    assert response.status_code == 200
+    usage = {row["stage"]: row for row in response.json()}
+    assert usage["llm"]["model"] == "fake-llm"
+    assert usage["llm"]["prompt_tokens"] > 0
+    assert usage["llm"]["completion_tokens"] > 0
+    assert usage["tts"]["characters"] == len("Hello there.") + len("Bye.")
+
+    response = await async_client.get(
+        "/api/v1/usage/me", params={"start": "2026-02-01", "end": "2026-01-01"}
+    )
+    assert response.status_code == 400
@@ -0,0 +1,66 @@
+"""
+Tests for case-insensitive, index-backed user lookups.
+"""
+
+import pytest
+from sqlalchemy import func, select, text
+
+from src.core.security import get_password_hash
+from src.models.user import User
+from src.services.user_service import UserService
+
+
+async def add_users(db):
+    db.add_all(
+        [
+            User(id=1, username="Ana", email="Ana@Example.com", hashed_password="x"),
+            User(id=2, username="ana", email="ana@example.com", hashed_password="x"),
+            User(
+                id=3,
+                username="Bob",
+                email="bob@example.com",
+                hashed_password=get_password_hash("secret"),
+                full_name="Bob B",
+            ),
+        ]
+    )
+    await db.commit()
+    db.expunge_all()
+
+
+@pytest.mark.asyncio
+async def test_lookups_ignore_case_preferring_exact(test_db):
+    """Case variants resolve; an exact match wins over an older variant."""
+    await add_users(test_db)
+
+    assert (await UserService.get_user_by_username(test_db, "BOB")).id == 3
+    assert (await UserService.get_user_by_email(test_db, "BOB@example.COM")).id == 3
+    assert (await UserService.get_user_by_username(test_db, "ana")).id == 2
+    assert (await UserService.get_user_by_username(test_db, "ANA")).id == 1
+    assert (await UserService.get_user_by_email(test_db, "ana@example.com")).id == 2
+    assert (await UserService.get_user_by_id(test_db, 3)).username == "Bob"
+    assert await UserService.get_user_by_username(test_db, "carol") is None
+
+
+@pytest.mark.asyncio
+async def test_authenticate_loads_only_login_columns(test_db):
+    """Login reads the covering index columns and leaves the rest deferred."""
+    await add_users(test_db)
+
+    user = await UserService.authenticate_user(test_db, "bob", "secret")
+    assert user.id == 3 and user.is_active
+    assert "full_name" not in user.__dict__
+    assert await UserService.authenticate_user(test_db, "bob", "wrong") is None
+
+
+@pytest.mark.asyncio
+async def test_lookups_use_functional_indexes(test_db):
+    """The lower() predicates are answered from the expression indexes."""
+    for column, index in (
+        (User.email, "ix_users_lower_email"),
+        (User.username, "ix_users_lower_username"),
+    ):
+        query = select(User.id).where(func.lower(column) == "ana")
+        compiled = query.compile(compile_kwargs={"literal_binds": True})
+        plan = await test_db.execute(text(f"EXPLAIN QUERY PLAN {compiled}"))
+        assert index in " ".join(str(row) for row in plan)
@@ -0,0 +1,141 @@
+"""
+Tests for the local memory-mapped vector store.
+"""
+
+import numpy as np
+import pytest
+
+from src.services.vector_store import LocalVectorStore, VectorStoreError
+
+DIM = 8
+
+
+def random_vectors(n: int, seed: int = 0) -> np.ndarray:
+    return np.random.default_rng(seed).standard_normal((n, DIM)).astype(np.float32)
+
+
+@pytest.mark.asyncio
+async def test_query_returns_nearest_vectors_with_metadata(tmp_path):
+    """Cosine top-k is ordered by similarity and carries metadata."""
+    store = LocalVectorStore(str(tmp_path), DIM)
+    vectors = random_vectors(50)
+    ids = [f"doc-{i}" for i in range(50)]
+    await store.upsert("site-1", ids, vectors, [{"n": i} for i in range(50)])
+
+    matches = await store.query("site-1", vectors[7] * 3.0, top_k=5)
+
+    assert matches[0].id == "doc-7"
+    assert matches[0].score == pytest.approx(1.0, abs=1e-5)
+    assert matches[0].metadata == {"n": 7}
+    assert [m.score for m in matches] == sorted(
+        [m.score for m in matches], reverse=True
+    )
+    assert await store.count("site-1") == 50
+
+
+@pytest.mark.asyncio
+async def test_batch_query_matches_single_queries(tmp_path):
+    """Vectorized batch search agrees with per-query search."""
+    store = LocalVectorStore(str(tmp_path), DIM, metric="dot")
+    vectors = random_vectors(200)
+    await store.upsert("site", [str(i) for i in range(200)], vectors)
+    queries = random_vectors(4, seed=1)
+
+    batch = await store.query_batch("site", queries, top_k=3)
+
+    for query, matches in zip(queries, batch):
+        single = await store.query("site", query, top_k=3)
+        assert [m.id for m in matches] == [m.id for m in single]
+
+
+@pytest.mark.asyncio
+async def test_upsert_replaces_and_state_survives_reopen(tmp_path):
+    """Upserting an existing ID overwrites it; data is reloaded from disk."""
+    store = LocalVectorStore(str(tmp_path), DIM)
+    vectors = random_vectors(3)
+    await store.upsert("site", ["a", "b", "c"], vectors)
+    await store.upsert("site", ["a"], vectors[2:3], [{"v": 2}])
+    store.close()
+
+    reopened = LocalVectorStore(str(tmp_path), DIM)
+    matches = await reopened.query("site", vectors[2], top_k=2)
+
+    assert await reopened.count("site") == 3
+    assert {m.id for m in matches} == {"a", "c"}
+    assert next(m for m in matches if m.id == "a").metadata == {"v": 2}
+
+
+@pytest.mark.asyncio
+async def test_store_grows_past_initial_capacity(tmp_path):
+    """Upserts beyond the initial file capacity grow the memmap in place."""
+    store = LocalVectorStore(str(tmp_path), DIM)
+    vectors = random_vectors(3000)
+    await store.upsert("site", [str(i) for i in range(1000)], vectors[:1000])
+    await store.upsert("site", [str(i) for i in range(1000, 3000)], vectors[1000:])
+    store.close()
+
+    reopened = LocalVectorStore(str(tmp_path), DIM)
+    assert await reopened.count("site") == 3000
+    assert (await reopened.query("site", vectors[2999], top_k=1))[0].id == "2999"
+
+
+@pytest.mark.asyncio
+async def test_delete_and_compaction(tmp_path):
+    """Deleted vectors disappear and compaction reclaims their rows."""
+    store = LocalVectorStore(str(tmp_path), DIM, compact_ratio=0.5)
+    vectors = random_vectors(10)
+    ids = [str(i) for i in range(10)]
+    await store.upsert("site", ids, vectors)
+
+    await store.delete("site", ["0", "1", "2", "missing"])
+    assert await store.count("site") == 7
+    assert "0" not in {m.id for m in await store.query("site", vectors[0], 10)}
+
+    await store.delete("site", ["3", "4", "5"])  # crosses the compaction ratio
+    journals = list(tmp_path.joinpath("site").glob("rows.*.jsonl"))
+    assert len(journals) == 1
+    assert len(journals[0].read_text().splitlines()) == 4
+    store.close()
+
+    reopened = LocalVectorStore(str(tmp_path), DIM)
+    matches = await reopened.query("site", vectors[9], top_k=10)
+    assert [m.id for m in matches][0] == "9"
+    assert {m.id for m in matches} == {"6", "7", "8", "9"}
+
+
+@pytest.mark.asyncio
+async def test_namespaces_are_isolated(tmp_path):
+    """Each site namespace has its own vectors; unsafe names are rejected."""
+    store = LocalVectorStore(str(tmp_path), DIM)
+    await store.upsert("site-a", ["x"], random_vectors(1))
+
+    assert await store.count("site-b") == 0
+    assert await store.query("site-b", random_vectors(1)[0]) == []
+    with pytest.raises(VectorStoreError):
+        await store.count("../escape")
+    with pytest.raises(VectorStoreError):
+        await store.upsert("site-a", ["y"], np.zeros((1, DIM + 1)))
+
+
+@pytest.mark.asyncio
+async def test_ivf_index_recall(tmp_path):
+    """IVF search finds most exact neighbours while scoring fewer rows."""
+    rng = np.random.default_rng(3)
+    centers = rng.standard_normal((16, DIM)).astype(np.float32) * 4
+    labels = rng.integers(0, 16, 2000)
+    vectors = centers[labels] + rng.standard_normal((2000, DIM)).astype(np.float32)
+    store = LocalVectorStore(
+        str(tmp_path), DIM, ivf_nlist=16, ivf_nprobe=4, ivf_min_rows=1000
+    )
+    await store.upsert("site", [str(i) for i in range(2000)], vectors)
+    assert list(tmp_path.joinpath("site").glob("centroids.*.npy"))
+
+    queries = vectors[:50] + 0.1
+    approx = await store.query_batch("site", queries, top_k=10)
+    exact = store.query_batch_sync("site", queries, top_k=10, exact=True)
+
+    assert all(len(matches) == 10 for matches in approx)
+    hits = sum(
+        len({m.id for m in a} & {m.id for m in e}) for a, e in zip(approx, exact)
+    )
+    assert hits / (10 * len(queries)) > 0.8
@@ -0,0 +1,160 @@
+"""
+Tests for the pipelined LLM-to-TTS voice response path.
+"""
+
+import pytest
+from httpx import AsyncClient
+
+from src.api.deps import get_current_active_user, get_voice_pipeline
+from src.core.config import Settings
+from src.main import app
+from src.models.user import User
+from src.services.providers import (
+    ElevenLabsTTSProvider,
+    FakeLLMProvider,
+    FakeTTSProvider,
+    ProviderError,
+    build_tts_provider,
+)
+from src.services.voice_pipeline import SentenceSegmenter, TurnMetrics, VoicePipeline
+
+MESSAGES = [{"role": "user", "content": "hello"}]
+
+
+def test_segmenter_splits_on_sentence_boundaries():
+    """Completed sentences are emitted as soon as the following space arrives."""
+    segmenter = SentenceSegmenter()
+    assert segmenter.feed("Hello there") == []
+    assert segmenter.feed(". How are") == ["Hello there."]
+    assert segmenter.feed(" you? I am") == ["How are you?"]
+    assert segmenter.flush() == "I am"
+    assert segmenter.flush() is None
+
+
+def test_segmenter_skips_abbreviations_and_splits_long_clauses():
+    """Abbreviations don't end a sentence; long clauses split on commas."""
+    segmenter = SentenceSegmenter(min_clause_chars=20)
+    assert segmenter.feed("Ask Dr. Smith about it. ") == ["Ask Dr. Smith about it."]
+    segments = segmenter.feed("short, then a much longer clause follows, and more")
+    assert segments == ["short, then a much longer clause follows,"]
+    assert segmenter.flush() == "and more"
+
+
+def test_segmenter_splits_bare_no_but_not_number_abbreviation():
+    """A short "No." answer is its own segment; "No. 5" is not split."""
+    segmenter = SentenceSegmenter()
+    assert segmenter.feed("No. We are closed. ") == ["No.", "We are closed."]
+    assert segmenter.feed("Try No. 5 Main St. ") == []
+    assert segmenter.flush() == "Try No. 5 Main St."
+
+
+def test_fake_providers_require_explicit_opt_in(monkeypatch):
+    """Missing API keys only fall back to fakes when explicitly enabled."""
+    monkeypatch.delenv("TESTING", raising=False)
+    with pytest.raises(ProviderError):
+        build_tts_provider(Settings(ENVIRONMENT="development"))
+    enabled = Settings(VOICE_FAKE_PROVIDERS=True)
+    assert isinstance(build_tts_provider(enabled), FakeTTSProvider)
+
+
+@pytest.mark.asyncio
+async def test_elevenlabs_provider_closes_its_client():
+    """aclose releases the pooled HTTP client."""
+    provider = ElevenLabsTTSProvider("key", "voice", "model")
+    client = provider._get_client()
+    await provider.aclose()
+    assert client.is_closed
+
+
+@pytest.mark.asyncio
+async def test_pipeline_streams_audio_in_order():
+    """Audio equals the per-segment synthesis concatenated in spoken order."""
+    llm = FakeLLMProvider("One. Two two. Three three three.", token_delay=0.001)
+    tts = FakeTTSProvider(bytes_per_char=4, chunk_size=8)
+    metrics = TurnMetrics()
+
+    audio = b"".join(
+        [chunk async for chunk in VoicePipeline(llm, tts).stream(MESSAGES, metrics)]
+    )
+
+    expected = b""
+    for segment in ["One.", "Two two.", "Three three three."]:
+        expected += b"".join([chunk async for chunk in tts.synthesize(segment)])
+    assert audio == expected
+    assert metrics.segments == 3
+    assert metrics.audio_bytes == len(expected)
+    assert len(metrics.tts_durations) == 3
+    assert all(duration >= 0 for duration in metrics.tts_durations)
+    assert metrics.time_to_first_token <= metrics.time_to_first_audio
+    assert metrics.time_to_first_audio <= metrics.total_duration
+
+
+@pytest.mark.asyncio
+async def test_first_audio_arrives_before_llm_finishes():
+    """TTS for the first sentence starts while the LLM is still generating."""
+    llm = FakeLLMProvider("First sentence. " + "word " * 40, token_delay=0.005)
+    metrics = TurnMetrics()
+
+    async for _chunk in VoicePipeline(llm, FakeTTSProvider()).stream(MESSAGES, metrics):
+        pass
+
+    assert metrics.time_to_first_audio < metrics.llm_duration
+
+
+@pytest.mark.asyncio
+async def test_pipeline_propagates_provider_errors():
+    """A TTS failure surfaces to the consumer instead of hanging the stream."""
+
+    class FailingTTS(FakeTTSProvider):
+        async def synthesize(self, text):
+            raise ProviderError("boom")
+            yield b""  # pragma: no cover
+
+    with pytest.raises(ProviderError):
+        async for _chunk in VoicePipeline(FakeLLMProvider(), FailingTTS()).stream(
+            MESSAGES
+        ):
+            pass
+
+
+@pytest.mark.asyncio
+async def test_respond_endpoint_streams_audio(async_client: AsyncClient):
+    """The respond endpoint streams the pipeline's audio to the client."""
+    tts = FakeTTSProvider()
+    app.dependency_overrides[get_current_active_user] = lambda: User(
+        id=1, username="voiceuser", email="voice@example.com", is_active=True
+    )
+    app.dependency_overrides[get_voice_pipeline] = lambda: VoicePipeline(
+        FakeLLMProvider("Hi. Bye."), tts
+    )
+
+    response = await async_client.post(
+        "/api/v1/voice/respond", json={"text": "hello", "history": []}
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == tts.media_type
+    expected = b"".join([chunk async for chunk in tts.synthesize("Hi.")])
+    expected += b"".join([chunk async for chunk in tts.synthesize("Bye.")])
+    assert response.content == expected
+
+
+@pytest.mark.asyncio
+async def test_respond_endpoint_maps_provider_errors(async_client: AsyncClient):
+    """A provider failure before the first chunk returns 502, not an empty 200."""
+
+    class FailingTTS(FakeTTSProvider):
+        async def synthesize(self, text):
+            raise ProviderError("upstream rejected the API key")
+            yield b""  # pragma: no cover
+
+    app.dependency_overrides[get_current_active_user] = lambda: User(
+        id=1, username="voiceuser", email="voice@example.com", is_active=True
+    )
+    app.dependency_overrides[get_voice_pipeline] = lambda: VoicePipeline(
+        FakeLLMProvider("Hi."), FailingTTS()
+    )
+
+    response = await async_client.post("/api/v1/voice/respond", json={"text": "hi"})
+
+    assert response.status_code == 502
@@ -0,0 +1,83 @@
+"""
+Tests for startup warm-up and readiness.
+"""
+
+import asyncio
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src.api.deps import get_activity_tracker, get_usage_recorder, get_warmup
+from src.core import database
+from src.main import app
+from src.services.warmup import Warmup
+
+
+@pytest.mark.asyncio
+async def test_warmup_records_steps_and_tolerates_failures():
+    async def ok():
+        await asyncio.sleep(0)
+
+    async def broken():
+        raise RuntimeError("no backend")
+
+    async def stuck():
+        await asyncio.sleep(10)
+
+    warmup = Warmup({"ok": ok, "broken": broken, "stuck": stuck}, timeout=0.1)
+    await warmup.run()
+
+    report = warmup.report()
+    assert warmup.ready and report["ready"]
+    assert report["duration_ms"] < 1000
+    assert set(report["steps_ms"]) == {"ok", "broken"}
+    assert report["errors"] == {"broken": "no backend", "stuck": "timed out after 0s"}
+
+
+@pytest.mark.asyncio
+async def test_ready_endpoint_waits_for_warmup(async_client: AsyncClient):
+    release = asyncio.Event()
+    warmup = Warmup({"gate": release.wait})
+    app.dependency_overrides[get_warmup] = lambda: warmup
+
+    running = asyncio.ensure_future(warmup.run())
+    response = await async_client.get("/api/v1/health/ready")
+    assert response.status_code == 503
+    assert response.json()["status"] == "warming_up"
+
+    release.set()
+    await running
+    response = await async_client.get("/api/v1/health/ready")
+    assert response.status_code == 200
+    assert response.json()["warmup"]["steps_ms"].keys() == {"gate"}
+
+
+def test_lifespan_runs_warmup_steps(monkeypatch, tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/warmup.db")
+    monkeypatch.setattr(database, "engine", engine)
+    monkeypatch.setattr(database, "AsyncSessionLocal", None)
+    # Write-behind trackers flush at shutdown; keep them off the shared test DB
+    get_activity_tracker.cache_clear()
+    get_usage_recorder.cache_clear()
+    try:
+        with TestClient(app) as client:
+            deadline = time.monotonic() + 30
+            while (response := client.get("/api/v1/health/ready")).status_code != 200:
+                assert time.monotonic() < deadline
+                time.sleep(0.05)
+    finally:
+        get_activity_tracker.cache_clear()
+        get_usage_recorder.cache_clear()
+
+    warmup = response.json()["warmup"]
+    assert warmup["errors"] == {}
+    assert set(warmup["steps_ms"]) == {
+        "database",
+        "user_lookups",
+        "serializers",
+        "security",
+        "caches",
+    }